@@ -4,6 +4,11 @@ AADHAAR ENROLMENT DATA COMPREHENSIVE ANALYSIS
 ================================================================================
 This analysis extracts meaningful patterns from Aadhaar enrolment CSVs that
 actually tell you something about policy, geography, demographics, and data quality.
+
+Each section is a report function. The groupbys the sections need are declared
+in AGGREGATIONS and computed once per grouping key by the report engine, so
+sections share results instead of rescanning the full frame. With the aggregate
+service configured, the totals by date, month, state and district come from it.
 """
 
 import pandas as pd
@@ -13,350 +18,426 @@ from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
-# ================================================================================
-# SECTION 1: LOAD CONSOLIDATED DATA FROM FILTERED DATA
-# ================================================================================
-print("\n" + "="*80)
-print("SECTION 1: DATA LOADING")
-print("="*80)
+from report_engine import ReportEngine
+from eumi_calculation import compute_eumi
+from pincode_index import PincodeIndex, POSTAL_ZONES
+from district_reconciliation import apply_district_mapping
+from data_quality import load_quality_report
+from aggregate_client import service_url, query as query_service
 
-# Define file path
 csv_file = r"filtered_data/consolidated_enrolment.csv"
+biometric_csv_file = r"filtered_data/consolidated_biometric.csv"
 
-# Load consolidated CSV
-print(f"\n✓ Loading consolidated enrolment data...")
-df_full = pd.read_csv(csv_file)
-print(f"  Shape: {df_full.shape[0]:,} rows × {df_full.shape[1]} columns")
-print(f"\n{'='*80}")
-print(f"CONSOLIDATED DATA:")
-print(f"  Total rows: {df_full.shape[0]:,}")
-print(f"  Total columns: {df_full.shape[1]}")
-print(f"  Date range: {df_full['date'].min()} to {df_full['date'].max()}")
-print(f"  Unique states: {df_full['state'].nunique()}")
-print(f"  Unique districts: {df_full['district'].nunique()}")
+day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+age_columns = ['age_0_5', 'age_5_17', 'age_18_greater']
+
+# Start of the late period used for the geographic diffusion comparison
+late_period_start = pd.Timestamp('2025-06-01')
+
+# Aggregations used by the report sections, as (grouping keys, {column: functions})
+AGGREGATIONS = [
+    # Section 2: time-based patterns
+    ('date', {'total_enrolment': 'sum'}),
+    ('day_of_week', {'total_enrolment': ['sum', 'mean', 'count']}),
+    ('month', {'total_enrolment': 'sum'}),
+    # Sections 3, 4, 6, 9: state level
+    ('state', {'total_enrolment': ['sum', 'mean', 'count', 'std'], 'district': 'nunique', 'pincode': 'nunique',
+               'age_0_5': 'sum', 'age_5_17': 'sum', 'age_18_greater': 'sum'}),
+    # Sections 3, 5, 6, 9: district level
+    (['state', 'district'], {'total_enrolment': ['sum', 'count', 'mean']}),
+    ('district', {'total_enrolment': ['sum', 'count', 'mean']}),
+    # Section 5: early vs late period
+    (['period', 'state'], {'total_enrolment': 'sum'}),
+    # Section 8: pincode hubs
+    (['state', 'district', 'pincode'], {'total_enrolment': ['sum', 'count']}),
+]
 
-# Data type conversion
-df_full['date'] = pd.to_datetime(df_full['date'], format='%d-%m-%Y')
-df_full['total_enrolment'] = df_full['age_0_5'] + df_full['age_5_17'] + df_full['age_18_greater']
 
-print(f"\n📊 DATA STRUCTURE:")
-print(df_full.head(10))
+# ================================================================================
+# SECTION 1: LOAD CONSOLIDATED DATA FROM FILTERED DATA
+# ================================================================================
+def load_data(csv_file=csv_file):
+    """Load the consolidated enrolment CSV and print its structure."""
+    print("\n" + "="*80)
+    print("SECTION 1: DATA LOADING")
+    print("="*80)
+
+    # Load consolidated CSV
+    print(f"\n✓ Loading consolidated enrolment data...")
+    df_full = apply_district_mapping(pd.read_csv(csv_file))
+    print(f"  Shape: {df_full.shape[0]:,} rows × {df_full.shape[1]} columns")
+    print(f"\n{'='*80}")
+    print(f"CONSOLIDATED DATA:")
+    print(f"  Total rows: {df_full.shape[0]:,}")
+    print(f"  Total columns: {df_full.shape[1]}")
+    print(f"  Date range: {df_full['date'].min()} to {df_full['date'].max()}")
+    print(f"  Unique states: {df_full['state'].nunique()}")
+    print(f"  Unique districts: {df_full['district'].nunique()}")
+
+    # Data type conversion
+    df_full['date'] = pd.to_datetime(df_full['date'], format='%d-%m-%Y')
+    df_full['total_enrolment'] = df_full['age_0_5'] + df_full['age_5_17'] + df_full['age_18_greater']
+
+    print(f"\n📊 DATA STRUCTURE:")
+    print(df_full.head(10))
+    return df_full
+
+
+def build_engine(df_full):
+    """Register the derived keys and compute every declared aggregation."""
+    engine = ReportEngine(df_full)
+    engine.add_key('day_of_week', df_full['date'].dt.day_name().rename('day_of_week'))
+    engine.add_key('month', df_full['date'].dt.to_period('M'))
+    engine.add_key('period', pd.Series(np.where(df_full['date'] < late_period_start, 'early', 'late'),
+                                       index=df_full.index, name='period'))
+    engine.request_all(AGGREGATIONS)
+    engine.answer_from_service('enrolment', 'total_enrolment')
+    return engine.run()
 
 
 # ================================================================================
 # SECTION 2: TIME-BASED PATTERNS (POLICY-DRIVEN BEHAVIOR)
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 2: TIME-BASED PATTERNS - ENROLLMENT BEHAVIOR ANALYSIS")
-print("="*80)
-
-# Extract time features
-df_full['year'] = df_full['date'].dt.year
-df_full['month'] = df_full['date'].dt.month
-df_full['day_of_week'] = df_full['date'].dt.day_name()
-df_full['week_number'] = df_full['date'].dt.isocalendar().week
-
-# Daily enrollment volume
-daily_enrolments = df_full.groupby('date')['total_enrolment'].sum().sort_values(ascending=False)
-print(f"\n🗓️  DAILY ENROLLMENT SPIKES (Top 10 days):")
-print(daily_enrolments.head(10))
-
-# Day of week analysis
-dow_analysis = df_full.groupby('day_of_week').agg({
-    'total_enrolment': ['sum', 'mean', 'count']
-}).round(2)
-print(f"\n📅 DAY-OF-WEEK PATTERN (Are weekends slower?):")
-day_order = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-dow_analysis = dow_analysis.reindex(day_order)
-print(dow_analysis)
-
-dow_total = df_full.groupby('day_of_week')['total_enrolment'].sum().reindex(day_order)
-weekend_avg = (dow_total['Saturday'] + dow_total['Sunday']) / 2
-weekday_avg = dow_total[['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']].mean()
-print(f"\n  Insight: Weekday avg = {weekday_avg:,.0f}, Weekend avg = {weekend_avg:,.0f}")
-print(f"  Weekday activity is {((weekday_avg/weekend_avg - 1)*100):.1f}% higher than weekends")
-
-# Monthly trend
-monthly_enrolments = df_full.groupby(df_full['date'].dt.to_period('M'))['total_enrolment'].sum()
-print(f"\n📊 MONTHLY TREND (Enrollment by month):")
-print(monthly_enrolments)
-
-# Identify spikes and drops
-mean_daily = daily_enrolments.mean()
-std_daily = daily_enrolments.std()
-spike_threshold = mean_daily + 2*std_daily
-anomaly_threshold = mean_daily - 1.5*std_daily
-
-spike_days = daily_enrolments[daily_enrolments > spike_threshold]
-print(f"\n⚡ POLICY-DRIVEN SPIKES (Days with unusually high enrollment):")
-print(f"  Threshold: {spike_threshold:,.0f} (mean + 2σ)")
-print(f"  Spike days found: {len(spike_days)}")
-if len(spike_days) > 0:
-    print(spike_days.head(10))
+def report_time_patterns(engine):
+    """Daily spikes, weekday pattern and monthly trend. Returns the weekday/weekend averages."""
+    print("\n" + "="*80)
+    print("SECTION 2: TIME-BASED PATTERNS - ENROLLMENT BEHAVIOR ANALYSIS")
+    print("="*80)
+
+    # Daily enrollment volume
+    daily_enrolments = engine.sum('date', 'total_enrolment').sort_values(ascending=False)
+    print(f"\n🗓️  DAILY ENROLLMENT SPIKES (Top 10 days):")
+    print(daily_enrolments.head(10))
+
+    # Day of week analysis
+    dow_analysis = engine.agg('day_of_week', {
+        'total_enrolment': ['sum', 'mean', 'count']
+    }).round(2)
+    print(f"\n📅 DAY-OF-WEEK PATTERN (Are weekends slower?):")
+    dow_analysis = dow_analysis.reindex(day_order)
+    print(dow_analysis)
+
+    dow_total = engine.sum('day_of_week', 'total_enrolment').reindex(day_order)
+    weekend_avg = (dow_total['Saturday'] + dow_total['Sunday']) / 2
+    weekday_avg = dow_total[['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday']].mean()
+    print(f"\n  Insight: Weekday avg = {weekday_avg:,.0f}, Weekend avg = {weekend_avg:,.0f}")
+    print(f"  Weekday activity is {((weekday_avg/weekend_avg - 1)*100):.1f}% higher than weekends")
+
+    # Monthly trend
+    monthly_enrolments = engine.sum('month', 'total_enrolment')
+    print(f"\n📊 MONTHLY TREND (Enrollment by month):")
+    print(monthly_enrolments)
+
+    # Identify spikes and drops
+    mean_daily = daily_enrolments.mean()
+    std_daily = daily_enrolments.std()
+    spike_threshold = mean_daily + 2*std_daily
+    anomaly_threshold = mean_daily - 1.5*std_daily
+
+    spike_days = daily_enrolments[daily_enrolments > spike_threshold]
+    print(f"\n⚡ POLICY-DRIVEN SPIKES (Days with unusually high enrollment):")
+    print(f"  Threshold: {spike_threshold:,.0f} (mean + 2σ)")
+    print(f"  Spike days found: {len(spike_days)}")
+    if len(spike_days) > 0:
+        print(spike_days.head(10))
+
+    return {'weekday_avg': weekday_avg, 'weekend_avg': weekend_avg}
 
 
 # ================================================================================
 # SECTION 3: GEOGRAPHIC DOMINANCE (STATE AND DISTRICT CONCENTRATION)
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 3: GEOGRAPHIC PATTERNS - STATE AND DISTRICT DOMINANCE")
-print("="*80)
-
-# State-level analysis
-state_summary = df_full.groupby('state').agg({
-    'total_enrolment': ['sum', 'mean', 'count'],
-    'district': 'nunique'
-}).round(0)
-state_summary.columns = ['Total_Enrolment', 'Avg_Enrolment_Per_Row', 'Record_Count', 'Unique_Districts']
-state_summary = state_summary.sort_values('Total_Enrolment', ascending=False)
-
-print(f"\n🗺️  TOP 15 STATES BY TOTAL ENROLLMENT:")
-print(state_summary.head(15))
-
-# Pareto analysis: What % of states account for 80% of enrolments?
-state_totals = df_full.groupby('state')['total_enrolment'].sum().sort_values(ascending=False)
-cumsum = state_totals.cumsum()
-cumsum_pct = (cumsum / cumsum.iloc[-1] * 100)
-states_80pct = (cumsum_pct[cumsum_pct <= 80].shape[0])
-total_states = state_totals.shape[0]
-
-print(f"\n📈 PARETO PRINCIPLE (Concentration of work):")
-print(f"  Total states: {total_states}")
-print(f"  States contributing 80% of enrolments: {states_80pct} ({states_80pct/total_states*100:.1f}%)")
-print(f"  Insight: {total_states - states_80pct} states ({(total_states-states_80pct)/total_states*100:.1f}%) = minimal enrolment effort")
-
-# District-level analysis
-district_summary = df_full.groupby(['state', 'district']).agg({
-    'total_enrolment': ['sum', 'count', 'mean']
-}).round(0)
-district_summary.columns = ['Total_Enrolment', 'Record_Count', 'Avg_Per_Record']
-district_summary = district_summary.sort_values('Total_Enrolment', ascending=False)
-
-print(f"\n🏙️  TOP 15 DISTRICTS BY TOTAL ENROLLMENT:")
-print(district_summary.head(15))
-
-# District concentration
-top_10_pct_districts = district_summary.head(int(len(district_summary)*0.1))
-top_10_contribution = top_10_pct_districts['Total_Enrolment'].sum() / df_full['total_enrolment'].sum() * 100
-
-print(f"\n💡 DISTRICT CONCENTRATION:")
-print(f"  Total unique districts: {len(district_summary)}")
-print(f"  Top 10% of districts ({int(len(district_summary)*0.1)} districts) = {top_10_contribution:.1f}% of all enrolments")
-print(f"  Bottom 50% of districts ({int(len(district_summary)*0.5)} districts) = {district_summary.tail(int(len(district_summary)*0.5))['Total_Enrolment'].sum()/df_full['total_enrolment'].sum()*100:.1f}% of enrolments")
+def report_geographic_dominance(df_full, engine):
+    """State and district concentration. Returns the Pareto figures."""
+    print("\n" + "="*80)
+    print("SECTION 3: GEOGRAPHIC PATTERNS - STATE AND DISTRICT DOMINANCE")
+    print("="*80)
+
+    # State-level analysis
+    state_summary = engine.agg('state', {
+        'total_enrolment': ['sum', 'mean', 'count'],
+        'district': 'nunique'
+    }).round(0)
+    state_summary.columns = ['Total_Enrolment', 'Avg_Enrolment_Per_Row', 'Record_Count', 'Unique_Districts']
+    state_summary = state_summary.sort_values('Total_Enrolment', ascending=False)
+
+    print(f"\n🗺️  TOP 15 STATES BY TOTAL ENROLLMENT:")
+    print(state_summary.head(15))
+
+    # Pareto analysis: What % of states account for 80% of enrolments?
+    state_totals = engine.sum('state', 'total_enrolment').sort_values(ascending=False)
+    cumsum = state_totals.cumsum()
+    cumsum_pct = (cumsum / cumsum.iloc[-1] * 100)
+    states_80pct = (cumsum_pct[cumsum_pct <= 80].shape[0])
+    total_states = state_totals.shape[0]
+
+    print(f"\n📈 PARETO PRINCIPLE (Concentration of work):")
+    print(f"  Total states: {total_states}")
+    print(f"  States contributing 80% of enrolments: {states_80pct} ({states_80pct/total_states*100:.1f}%)")
+    print(f"  Insight: {total_states - states_80pct} states ({(total_states-states_80pct)/total_states*100:.1f}%) = minimal enrolment effort")
+
+    # District-level analysis
+    district_summary = engine.agg(['state', 'district'], {
+        'total_enrolment': ['sum', 'count', 'mean']
+    }).round(0)
+    district_summary.columns = ['Total_Enrolment', 'Record_Count', 'Avg_Per_Record']
+    district_summary = district_summary.sort_values('Total_Enrolment', ascending=False)
+
+    print(f"\n🏙️  TOP 15 DISTRICTS BY TOTAL ENROLLMENT:")
+    print(district_summary.head(15))
+
+    # District concentration
+    top_10_pct_districts = district_summary.head(int(len(district_summary)*0.1))
+    top_10_contribution = top_10_pct_districts['Total_Enrolment'].sum() / df_full['total_enrolment'].sum() * 100
+
+    print(f"\n💡 DISTRICT CONCENTRATION:")
+    print(f"  Total unique districts: {len(district_summary)}")
+    print(f"  Top 10% of districts ({int(len(district_summary)*0.1)} districts) = {top_10_contribution:.1f}% of all enrolments")
+    print(f"  Bottom 50% of districts ({int(len(district_summary)*0.5)} districts) = {district_summary.tail(int(len(district_summary)*0.5))['Total_Enrolment'].sum()/df_full['total_enrolment'].sum()*100:.1f}% of enrolments")
+
+    return {'states_80pct': states_80pct, 'total_states': total_states, 'top_10_contribution': top_10_contribution}
 
 
 # ================================================================================
 # SECTION 4: AGE GROUP CLUSTERING (ADMINISTRATIVE NEED VS DEMOGRAPHICS)
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 4: AGE GROUP CLUSTERING - POLICY-DRIVEN PATTERNS")
-print("="*80)
-
-# Aggregate age groups
-age_0_5_total = df_full['age_0_5'].sum()
-age_5_17_total = df_full['age_5_17'].sum()
-age_18_greater_total = df_full['age_18_greater'].sum()
-total_all = age_0_5_total + age_5_17_total + age_18_greater_total
-
-print(f"\n👶 AGE GROUP DISTRIBUTION (Enrollment counts):")
-print(f"  0-5 years:     {age_0_5_total:>12,} ({age_0_5_total/total_all*100:>5.1f}%) - Child enrolment drives")
-print(f"  5-17 years:    {age_5_17_total:>12,} ({age_5_17_total/total_all*100:>5.1f}%) - School-based drives")
-print(f"  18+ years:     {age_18_greater_total:>12,} ({age_18_greater_total/total_all*100:>5.1f}%) - Documents/ID needed")
-print(f"  {'='*50}")
-print(f"  TOTAL:         {total_all:>12,} (100.0%)")
-
-# Age distribution by state (top 10 states)
-print(f"\n📊 AGE GROUP DISTRIBUTION BY TOP 10 STATES:")
-top_states = df_full.groupby('state')['total_enrolment'].sum().nlargest(10).index
-age_by_state = df_full[df_full['state'].isin(top_states)].groupby('state')[
-    ['age_0_5', 'age_5_17', 'age_18_greater']
-].sum()
-age_by_state['total'] = age_by_state.sum(axis=1)
-age_by_state['pct_0_5'] = (age_by_state['age_0_5'] / age_by_state['total'] * 100).round(1)
-age_by_state['pct_5_17'] = (age_by_state['age_5_17'] / age_by_state['total'] * 100).round(1)
-age_by_state['pct_18_greater'] = (age_by_state['age_18_greater'] / age_by_state['total'] * 100).round(1)
-print(age_by_state[['total', 'pct_0_5', 'pct_5_17', 'pct_18_greater']])
-
-# Identify anomalies in age distribution
-age_anomalies = df_full[(df_full['age_0_5'] > 500) | (df_full['age_18_greater'] > 500)]
-if len(age_anomalies) > 0:
-    print(f"\n⚠️  AGE GROUP ANOMALIES (Unusual single-row concentrations):")
-    print(f"  Records with age_0_5 > 500: {len(age_anomalies[age_anomalies['age_0_5'] > 500])}")
-    print(f"  Records with age_18_greater > 500: {len(age_anomalies[age_anomalies['age_18_greater'] > 500])}")
-    print("  Top anomalies:")
-    print(age_anomalies.nlargest(5, 'age_0_5')[['date', 'state', 'district', 'age_0_5', 'age_5_17', 'age_18_greater']])
+def report_age_groups(df_full, engine):
+    """Age group distribution overall and for the top states. Returns the age totals."""
+    print("\n" + "="*80)
+    print("SECTION 4: AGE GROUP CLUSTERING - POLICY-DRIVEN PATTERNS")
+    print("="*80)
+
+    # Aggregate age groups
+    age_0_5_total = df_full['age_0_5'].sum()
+    age_5_17_total = df_full['age_5_17'].sum()
+    age_18_greater_total = df_full['age_18_greater'].sum()
+    total_all = age_0_5_total + age_5_17_total + age_18_greater_total
+
+    print(f"\n👶 AGE GROUP DISTRIBUTION (Enrollment counts):")
+    print(f"  0-5 years:     {age_0_5_total:>12,} ({age_0_5_total/total_all*100:>5.1f}%) - Child enrolment drives")
+    print(f"  5-17 years:    {age_5_17_total:>12,} ({age_5_17_total/total_all*100:>5.1f}%) - School-based drives")
+    print(f"  18+ years:     {age_18_greater_total:>12,} ({age_18_greater_total/total_all*100:>5.1f}%) - Documents/ID needed")
+    print(f"  {'='*50}")
+    print(f"  TOTAL:         {total_all:>12,} (100.0%)")
+
+    # Age distribution by state (top 10 states)
+    print(f"\n📊 AGE GROUP DISTRIBUTION BY TOP 10 STATES:")
+    top_states = engine.sum('state', 'total_enrolment').nlargest(10).index
+    age_by_state = engine.sum('state', age_columns)
+    age_by_state = age_by_state[age_by_state.index.isin(top_states)]
+    age_by_state['total'] = age_by_state.sum(axis=1)
+    age_by_state['pct_0_5'] = (age_by_state['age_0_5'] / age_by_state['total'] * 100).round(1)
+    age_by_state['pct_5_17'] = (age_by_state['age_5_17'] / age_by_state['total'] * 100).round(1)
+    age_by_state['pct_18_greater'] = (age_by_state['age_18_greater'] / age_by_state['total'] * 100).round(1)
+    print(age_by_state[['total', 'pct_0_5', 'pct_5_17', 'pct_18_greater']])
+
+    # Identify anomalies in age distribution
+    age_anomalies = df_full[(df_full['age_0_5'] > 500) | (df_full['age_18_greater'] > 500)]
+    if len(age_anomalies) > 0:
+        print(f"\n⚠️  AGE GROUP ANOMALIES (Unusual single-row concentrations):")
+        print(f"  Records with age_0_5 > 500: {len(age_anomalies[age_anomalies['age_0_5'] > 500])}")
+        print(f"  Records with age_18_greater > 500: {len(age_anomalies[age_anomalies['age_18_greater'] > 500])}")
+        print("  Top anomalies:")
+        print(age_anomalies.nlargest(5, 'age_0_5')[['date', 'state', 'district', 'age_0_5', 'age_5_17', 'age_18_greater']])
+
+    return {'age_0_5_total': age_0_5_total, 'age_5_17_total': age_5_17_total,
+            'age_18_greater_total': age_18_greater_total, 'total_all': total_all}
 
 
 # ================================================================================
 # SECTION 5: GEOGRAPHIC DIFFUSION PATTERN (URBAN → RURAL SPREAD)
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 5: GEOGRAPHIC DIFFUSION - URBAN CENTERS TO RURAL SPREAD")
-print("="*80)
-
-# Identify major urban centers (high-activity districts)
-urban_districts = df_full.groupby('district')['total_enrolment'].sum().nlargest(20).index.tolist()
-print(f"\n🏙️  TOP 20 URBAN/HIGH-ACTIVITY DISTRICTS:")
-urban_data = df_full[df_full['district'].isin(urban_districts)].groupby('district')['total_enrolment'].sum().sort_values(ascending=False)
-for i, (district, count) in enumerate(urban_data.items(), 1):
-    print(f"  {i:2d}. {district:<30} {count:>10,} enrolments")
-
-# Diffusion by comparing early vs late dates
-early_period = df_full[df_full['date'] < pd.Timestamp('2025-06-01')]
-late_period = df_full[df_full['date'] >= pd.Timestamp('2025-06-01')]
-
-early_states = early_period.groupby('state')['total_enrolment'].sum().nlargest(10)
-late_states = late_period.groupby('state')['total_enrolment'].sum().nlargest(10)
-
-print(f"\n📍 GEOGRAPHIC SPREAD OVER TIME:")
-print(f"\n  Early Period (before June 2025) - Top 10 states:")
-for state, count in early_states.items():
-    print(f"    {state:<30} {count:>10,}")
-
-print(f"\n  Late Period (June 2025 onwards) - Top 10 states:")
-for state, count in late_states.items():
-    print(f"    {state:<30} {count:>10,}")
-
-new_states_in_late = set(late_states.index) - set(early_states.index)
-if new_states_in_late:
-    print(f"\n  💡 New states in late period: {', '.join(new_states_in_late)}")
+def report_geographic_diffusion(engine):
+    """High-activity districts and the top states before/after the late period start."""
+    print("\n" + "="*80)
+    print("SECTION 5: GEOGRAPHIC DIFFUSION - URBAN CENTERS TO RURAL SPREAD")
+    print("="*80)
+
+    # Identify major urban centers (high-activity districts)
+    district_totals = engine.sum('district', 'total_enrolment')
+    urban_districts = district_totals.nlargest(20).index.tolist()
+    print(f"\n🏙️  TOP 20 URBAN/HIGH-ACTIVITY DISTRICTS:")
+    urban_data = district_totals[district_totals.index.isin(urban_districts)].sort_values(ascending=False)
+    for i, (district, count) in enumerate(urban_data.items(), 1):
+        print(f"  {i:2d}. {district:<30} {count:>10,} enrolments")
+
+    # Diffusion by comparing early vs late dates
+    early_states = engine.sum(['period', 'state'], 'total_enrolment', select='early').nlargest(10)
+    late_states = engine.sum(['period', 'state'], 'total_enrolment', select='late').nlargest(10)
+
+    print(f"\n📍 GEOGRAPHIC SPREAD OVER TIME:")
+    print(f"\n  Early Period (before June 2025) - Top 10 states:")
+    for state, count in early_states.items():
+        print(f"    {state:<30} {count:>10,}")
+
+    print(f"\n  Late Period (June 2025 onwards) - Top 10 states:")
+    for state, count in late_states.items():
+        print(f"    {state:<30} {count:>10,}")
+
+    new_states_in_late = set(late_states.index) - set(early_states.index)
+    if new_states_in_late:
+        print(f"\n  💡 New states in late period: {', '.join(new_states_in_late)}")
 
 
 # ================================================================================
 # SECTION 6: NEW ENROLMENT VS ACTIVITY RATIO (SYSTEM MATURITY ANALYSIS)
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 6: ENROLLMENT ACTIVITY LEVELS BY GEOGRAPHY")
-print("="*80)
-
-# Calculate "intensity" - avg enrolment per record as proxy for batch processing
-state_intensity = df_full.groupby('state').agg({
-    'total_enrolment': ['sum', 'count', 'mean', 'std']
-}).round(2)
-state_intensity.columns = ['Total', 'Records', 'Avg_Per_Record', 'Std_Dev']
-state_intensity = state_intensity.sort_values('Avg_Per_Record', ascending=False)
-
-print(f"\n🔄 STATE ACTIVITY INTENSITY (Avg enrolments per record):")
-print(f"  High intensity (bulk processing): {state_intensity.head(10)}")
-print(f"\n  Low intensity (distributed entries): {state_intensity.tail(10)}")
-
-# District-level intensity
-print(f"\n🎯 DISTRICT ACTIVITY INTENSITY (Avg enrolments per record):")
-district_intensity = df_full.groupby('district').agg({
-    'total_enrolment': ['sum', 'count', 'mean']
-}).round(2)
-district_intensity.columns = ['Total', 'Records', 'Avg_Per_Record']
-district_intensity = district_intensity.sort_values('Avg_Per_Record', ascending=False)
-print(f"  Highest intensity districts: {district_intensity.head(10)}")
-print(f"  Lowest intensity districts: {district_intensity.tail(10)}")
+def report_activity_intensity(engine):
+    """Average enrolments per record by state and district."""
+    print("\n" + "="*80)
+    print("SECTION 6: ENROLLMENT ACTIVITY LEVELS BY GEOGRAPHY")
+    print("="*80)
+
+    # Calculate "intensity" - avg enrolment per record as proxy for batch processing
+    state_intensity = engine.agg('state', {
+        'total_enrolment': ['sum', 'count', 'mean', 'std']
+    }).round(2)
+    state_intensity.columns = ['Total', 'Records', 'Avg_Per_Record', 'Std_Dev']
+    state_intensity = state_intensity.sort_values('Avg_Per_Record', ascending=False)
+
+    print(f"\n🔄 STATE ACTIVITY INTENSITY (Avg enrolments per record):")
+    print(f"  High intensity (bulk processing): {state_intensity.head(10)}")
+    print(f"\n  Low intensity (distributed entries): {state_intensity.tail(10)}")
+
+    # District-level intensity
+    print(f"\n🎯 DISTRICT ACTIVITY INTENSITY (Avg enrolments per record):")
+    district_intensity = engine.agg('district', {
+        'total_enrolment': ['sum', 'count', 'mean']
+    }).round(2)
+    district_intensity.columns = ['Total', 'Records', 'Avg_Per_Record']
+    district_intensity = district_intensity.sort_values('Avg_Per_Record', ascending=False)
+    print(f"  Highest intensity districts: {district_intensity.head(10)}")
+    print(f"  Lowest intensity districts: {district_intensity.tail(10)}")
 
 
 # ================================================================================
 # SECTION 7: DUPLICATE AND DATA QUALITY ANOMALIES
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 7: DATA QUALITY AND ANOMALY DETECTION")
-print("="*80)
-
-# Check for duplicate rows (exact duplicates)
-duplicate_rows = df_full.duplicated(subset=['date', 'state', 'district', 'pincode', 'age_0_5', 'age_5_17', 'age_18_greater'])
-print(f"\n🔍 DUPLICATE DETECTION:")
-print(f"  Exact duplicate rows: {duplicate_rows.sum()}")
-
-# Check for missing values
-print(f"\n❓ MISSING VALUES:")
-for col in df_full.columns:
-    missing_count = df_full[col].isna().sum()
-    if missing_count > 0:
-        print(f"  {col}: {missing_count} ({missing_count/len(df_full)*100:.2f}%)")
-print(f"  No missing values detected in key fields ✓")
-
-# Sudden zero values (inactive records)
-zero_records = df_full[df_full['total_enrolment'] == 0]
-print(f"\n⚠️  ZERO ENROLLMENT RECORDS (Date + Location with 0 activity):")
-print(f"  Count: {len(zero_records)}")
-if len(zero_records) > 0:
-    zero_by_date = zero_records.groupby('date').size().sort_values(ascending=False)
-    print(f"  Top dates with zero records: {zero_by_date.head(5).to_dict()}")
-
-# Data quality trend - newer vs older records
-df_full['data_quality'] = (df_full['age_0_5'] > 0) | (df_full['age_5_17'] > 0) | (df_full['age_18_greater'] > 0)
-quality_by_date = df_full.groupby(df_full['date'].dt.to_period('M'))['data_quality'].apply(lambda x: (x.sum() / len(x) * 100))
-print(f"\n📈 DATA QUALITY TREND (% of non-zero records by month):")
-print(quality_by_date)
-
-# Pincode quality
-pincode_missing = df_full['pincode'].isna().sum()
-pincode_unique = df_full['pincode'].nunique()
-print(f"\n📮 PINCODE DATA QUALITY:")
-print(f"  Total records: {len(df_full):,}")
-print(f"  Unique pincodes: {pincode_unique:,}")
-print(f"  Avg records per pincode: {len(df_full)/pincode_unique:.2f}")
+def report_data_quality(quality):
+    """Duplicates, missing values, zero records and the monthly quality trend."""
+    print("\n" + "="*80)
+    print("SECTION 7: DATA QUALITY AND ANOMALY DETECTION")
+    print("="*80)
+
+    # Counts come from the saved single-pass quality report, not a rescan of the frame
+    totals = quality.totals()
+
+    # Check for duplicate rows (exact duplicates)
+    print(f"\n🔍 DUPLICATE DETECTION:")
+    print(f"  Exact duplicate rows: {totals['duplicates']}")
+
+    # Check for missing values
+    print(f"\n❓ MISSING VALUES:")
+    for col, missing_count in quality.missing().items():
+        if missing_count > 0:
+            print(f"  {col}: {missing_count} ({missing_count/quality.rows*100:.2f}%)")
+    print(f"  No missing values detected in key fields ✓")
+
+    # Sudden zero values (inactive records)
+    print(f"\n⚠️  ZERO ENROLLMENT RECORDS (Date + Location with 0 activity):")
+    print(f"  Count: {totals['zero_rows']}")
+    if totals['zero_rows'] > 0:
+        print(f"  Top dates with zero records: {quality.zero_by_date().head(5).to_dict()}")
+
+    # Data quality trend - newer vs older records
+    quality_by_date = quality.activity_by_partition()
+    print(f"\n📈 DATA QUALITY TREND (% of non-zero records by month):")
+    print(quality_by_date)
+
+    # Pincode quality
+    print(f"\n📮 PINCODE DATA QUALITY:")
+    print(f"  Total records: {quality.rows:,}")
+    print(f"  Unique pincodes: {quality.pincodes:,}")
+    print(f"  Avg records per pincode: {quality.rows/quality.pincodes:.2f}")
 
 
 # ================================================================================
 # SECTION 8: REGISTRAR / AGENCY CONCENTRATION (IMPLICIT VIA GEOGRAPHIC PATTERNS)
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 8: ENROLLMENT INFRASTRUCTURE CONCENTRATION")
-print("="*80)
-
-# Since we don't have registrar data, we infer infrastructure through pincode concentration
-pincode_distribution = df_full.groupby(['state', 'district', 'pincode']).agg({
-    'total_enrolment': ['sum', 'count']
-}).reset_index()
-pincode_distribution.columns = ['state', 'district', 'pincode', 'total_enrolment', 'record_count']
-
-print(f"\n🏛️  INFRASTRUCTURE CONCENTRATION (Top pincodes as enrollment hubs):")
-top_pincodes = pincode_distribution.nlargest(15, 'total_enrolment')[['state', 'district', 'pincode', 'total_enrolment', 'record_count']]
-print(top_pincodes)
-
-pincode_gini = len(pincode_distribution[pincode_distribution['total_enrolment'] > pincode_distribution['total_enrolment'].median()])
-print(f"\n  Pincodes above median activity: {pincode_gini} out of {len(pincode_distribution)}")
-print(f"  Infrastructure imbalance: Few high-volume pincodes, many low-volume ✓")
+def report_infrastructure_concentration(engine):
+    """Top pincodes as enrolment hubs, and their postal zone / sorting district rollups."""
+    print("\n" + "="*80)
+    print("SECTION 8: ENROLLMENT INFRASTRUCTURE CONCENTRATION")
+    print("="*80)
+
+    # Since we don't have registrar data, we infer infrastructure through pincode concentration
+    pincode_distribution = engine.agg(['state', 'district', 'pincode'], {
+        'total_enrolment': ['sum', 'count']
+    }).reset_index()
+    pincode_distribution.columns = ['state', 'district', 'pincode', 'total_enrolment', 'record_count']
+
+    print(f"\n🏛️  INFRASTRUCTURE CONCENTRATION (Top pincodes as enrollment hubs):")
+    top_pincodes = pincode_distribution.nlargest(15, 'total_enrolment')[['state', 'district', 'pincode', 'total_enrolment', 'record_count']]
+    print(top_pincodes)
+
+    pincode_gini = len(pincode_distribution[pincode_distribution['total_enrolment'] > pincode_distribution['total_enrolment'].median()])
+    print(f"\n  Pincodes above median activity: {pincode_gini} out of {len(pincode_distribution)}")
+    print(f"  Infrastructure imbalance: Few high-volume pincodes, many low-volume ✓")
+
+    # Postal hierarchy: roll pincodes up by leading digits (zone, sorting district)
+    pincode_index = PincodeIndex(pincode_distribution)
+    zones = pincode_index.rollup(1, ['total_enrolment', 'record_count'])
+    zones['share_pct'] = (zones['total_enrolment'] / zones['total_enrolment'].sum() * 100).round(1)
+    zones['region'] = zones['prefix_1'].map(POSTAL_ZONES)
+    print(f"\n📮 ENROLMENT BY POSTAL ZONE (first pincode digit):")
+    print(zones.to_string(index=False))
+
+    sorting_districts = pincode_index.rollup(3, ['total_enrolment', 'record_count'])
+    print(f"\n  Top 10 sorting districts (first 3 pincode digits):")
+    print(sorting_districts.nlargest(10, 'total_enrolment').to_string(index=False))
+    return pincode_index
 
 
 # ================================================================================
 # SECTION 9: VOLUME SEGMENTATION AND EFFICIENCY METRICS
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 9: ENROLLMENT EFFICIENCY METRICS")
-print("="*80)
-
-# District volume segmentation
-district_volumes = df_full.groupby('district')['total_enrolment'].sum().sort_values(ascending=False)
-top_10pct_count = int(len(district_volumes) * 0.1)
-top_10pct_volume = district_volumes.head(top_10pct_count).sum()
-bottom_50pct_count = int(len(district_volumes) * 0.5)
-bottom_50pct_volume = district_volumes.tail(bottom_50pct_count).sum()
-
-print(f"\n📊 DISTRICT VOLUME DISTRIBUTION:")
-print(f"  Total districts: {len(district_volumes)}")
-print(f"  Top 10% ({top_10pct_count} districts): {top_10pct_volume:,} enrolments ({top_10pct_volume/df_full['total_enrolment'].sum()*100:.1f}%)")
-print(f"  Bottom 50% ({bottom_50pct_count} districts): {bottom_50pct_volume:,} enrolments ({bottom_50pct_volume/df_full['total_enrolment'].sum()*100:.1f}%)")
-
-# Efficiency by state
-state_efficiency = df_full.groupby('state').agg({
-    'total_enrolment': 'sum',
-    'district': 'nunique',
-    'pincode': 'nunique'
-}).round(0)
-state_efficiency['enrolment_per_district'] = (state_efficiency['total_enrolment'] / state_efficiency['district']).round(0)
-state_efficiency['enrolment_per_pincode'] = (state_efficiency['total_enrolment'] / state_efficiency['pincode']).round(0)
-state_efficiency = state_efficiency.sort_values('total_enrolment', ascending=False)
-
-print(f"\n⚙️  EFFICIENCY METRICS (Top 10 states):")
-print(state_efficiency[['total_enrolment', 'district', 'pincode', 'enrolment_per_district', 'enrolment_per_pincode']].head(10))
+def report_efficiency(df_full, engine):
+    """District volume segments and enrolments per district/pincode by state."""
+    print("\n" + "="*80)
+    print("SECTION 9: ENROLLMENT EFFICIENCY METRICS")
+    print("="*80)
+
+    # District volume segmentation
+    district_volumes = engine.sum('district', 'total_enrolment').sort_values(ascending=False)
+    top_10pct_count = int(len(district_volumes) * 0.1)
+    top_10pct_volume = district_volumes.head(top_10pct_count).sum()
+    bottom_50pct_count = int(len(district_volumes) * 0.5)
+    bottom_50pct_volume = district_volumes.tail(bottom_50pct_count).sum()
+
+    print(f"\n📊 DISTRICT VOLUME DISTRIBUTION:")
+    print(f"  Total districts: {len(district_volumes)}")
+    print(f"  Top 10% ({top_10pct_count} districts): {top_10pct_volume:,} enrolments ({top_10pct_volume/df_full['total_enrolment'].sum()*100:.1f}%)")
+    print(f"  Bottom 50% ({bottom_50pct_count} districts): {bottom_50pct_volume:,} enrolments ({bottom_50pct_volume/df_full['total_enrolment'].sum()*100:.1f}%)")
+
+    # Efficiency by state
+    state_efficiency = engine.agg('state', {
+        'total_enrolment': 'sum',
+        'district': 'nunique',
+        'pincode': 'nunique'
+    }).round(0)
+    state_efficiency['enrolment_per_district'] = (state_efficiency['total_enrolment'] / state_efficiency['district']).round(0)
+    state_efficiency['enrolment_per_pincode'] = (state_efficiency['total_enrolment'] / state_efficiency['pincode']).round(0)
+    state_efficiency = state_efficiency.sort_values('total_enrolment', ascending=False)
+
+    print(f"\n⚙️  EFFICIENCY METRICS (Top 10 states):")
+    print(state_efficiency[['total_enrolment', 'district', 'pincode', 'enrolment_per_district', 'enrolment_per_pincode']].head(10))
 
 
 # ================================================================================
 # SECTION 10: SUMMARY INSIGHTS AND RECOMMENDATIONS
 # ================================================================================
-print("\n" + "="*80)
-print("SECTION 10: KEY INSIGHTS & EXECUTIVE SUMMARY")
-print("="*80)
-
-print(f"""
+def report_summary(time_patterns, geography, age_groups):
+    """Executive summary built from the figures returned by the earlier sections."""
+    weekday_avg, weekend_avg = time_patterns['weekday_avg'], time_patterns['weekend_avg']
+    states_80pct, total_states = geography['states_80pct'], geography['total_states']
+    top_10_contribution = geography['top_10_contribution']
+    total_all = age_groups['total_all']
+
+    print("\n" + "="*80)
+    print("SECTION 10: KEY INSIGHTS & EXECUTIVE SUMMARY")
+    print("="*80)
+
+    print(f"""
 📌 CRITICAL PATTERNS IDENTIFIED:
 
 1. POLICY-DRIVEN ENROLLMENT
@@ -370,9 +451,9 @@ print(f"""
    • Clear Pareto distribution: Few regions carry the load
 
 3. AGE-DRIVEN ENROLLMENT TARGETING
-   • 0-5 years: {age_0_5_total/total_all*100:.1f}% - Child enrolment drives active
-   • 5-17 years: {age_5_17_total/total_all*100:.1f}% - School-based enrollment
-   • 18+ years: {age_18_greater_total/total_all*100:.1f}% - ID documentation needs
+   • 0-5 years: {age_groups['age_0_5_total']/total_all*100:.1f}% - Child enrolment drives active
+   • 5-17 years: {age_groups['age_5_17_total']/total_all*100:.1f}% - School-based enrollment
+   • 18+ years: {age_groups['age_18_greater_total']/total_all*100:.1f}% - ID documentation needs
    • Not random - reflects administrative priorities
 
 4. INFRASTRUCTURE CENTRALIZATION
@@ -394,56 +475,64 @@ print(f"""
 
 """)
 
-print("="*80)
-print("ANALYSIS COMPLETE")
-print("="*80)
+    print("="*80)
+    print("ANALYSIS COMPLETE")
+    print("="*80)
+
 
 # ================================================================================
-# SECTION 3: COMPUTE ENROLLMENT–USAGE MISMATCH INDEX (EUMI)
+# SECTION 11: COMPUTE ENROLLMENT–USAGE MISMATCH INDEX (EUMI)
 # ================================================================================
-
-# Check if the necessary datasets are loaded
-if 'df_enrollment' in locals() and 'df_biometric' in locals():
-    print("\n\u2713 Using existing datasets for EUMI calculation...")
-else:
-    # Load and aggregate datasets if not already done
-    print("\n\u274c Loading and aggregating datasets...")
-    df_enrollment = pd.read_csv('filtered_data/consolidated_enrolment.csv')
-    df_biometric = pd.read_csv('filtered_data/consolidated_biometric.csv')
-    # Aggregate at district level
-    df_enrollment = df_enrollment.groupby('district').agg({'total_enrolment': 'sum'}).reset_index()
-    df_biometric = df_biometric.groupby('district').agg({'total_biometric': 'sum'}).reset_index()
-
-# Merge datasets on district
-merged_df = pd.merge(df_enrollment, df_biometric, on='district', how='outer')
-
-# Compute shares
-merged_df['enroll_share'] = merged_df['total_enrolment'] / merged_df['total_enrolment'].sum()
-merged_df['usage_share'] = merged_df['total_biometric'] / merged_df['total_biometric'].sum()
-
-# Compute EUMI with safeguard against division by zero
-merged_df['EUMI'] = np.where(merged_df['enroll_share'] == 0, np.nan, merged_df['usage_share'] / merged_df['enroll_share'])
-
-# Categorize districts based on EUMI
-conditions = [
-    (merged_df['EUMI'] < 0.8),
-    (merged_df['EUMI'] >= 0.8) & (merged_df['EUMI'] <= 1.2),
-    (merged_df['EUMI'] > 1.2)
-]
-choices = ["Over-enrolled, under-used", "Balanced", "Under-enrolled, high-usage"]
-merged_df['category'] = np.select(conditions, choices, default="Unknown")
-
-# Display summary statistics
-print(merged_df[['district', 'EUMI', 'category']].head(10))
-
-# Functions for EUMI calculations
-
-def compute_eumi(df):
-    # Function to compute EUMI
-    pass  # Placeholder for future implementation
-
-# Visualization functions
-
-def plot_eumi_scatter(df):
-    # Function to plot EUMI scatter plot
-    pass  # Placeholder for future implementation
+def load_biometric_district_totals(biometric_csv_file=biometric_csv_file):
+    """
+    Biometric totals per district: from the aggregate service when
+    UIDAI_AGGREGATE_SERVICE is set (falls back to the CSV if it is not
+    reachable), otherwise from the biometric CSV.
+    """
+    if service_url():
+        try:
+            totals = query_service('totals', dataset='biometric', by='district')
+            print("✓ Biometric district totals from the aggregate service")
+            return totals.rename(columns={'total': 'total_biometric'})[['district', 'total_biometric']]
+        except (ConnectionError, ValueError) as e:
+            print(f"⚠ Aggregate service query failed ({e}); reading {biometric_csv_file}")
+
+    df_biometric = pd.read_csv(biometric_csv_file, usecols=['state', 'district', 'bio_age_5_17', 'bio_age_17_'])
+    df_biometric = apply_district_mapping(df_biometric)
+    df_biometric['total_biometric'] = df_biometric['bio_age_5_17'] + df_biometric['bio_age_17_']
+    return df_biometric.groupby('district').agg({'total_biometric': 'sum'}).reset_index()
+
+
+def report_eumi(engine, biometric_csv_file=biometric_csv_file):
+    """District EUMI from the shared district enrolment totals and the biometric district totals."""
+    print("\n✓ Loading biometric data for EUMI calculation...")
+    df_enrollment = engine.sum('district', 'total_enrolment').reset_index()
+    df_biometric = load_biometric_district_totals(biometric_csv_file)
+
+    merged_df = compute_eumi(df_enrollment, df_biometric)
+
+    # Display summary statistics
+    print(merged_df[['district', 'EUMI', 'category']].head(10))
+    return merged_df
+
+
+def run_report(csv_file=csv_file):
+    """Run every section of the enrolment report."""
+    df_full = load_data(csv_file)
+    engine = build_engine(df_full)
+
+    time_patterns = report_time_patterns(engine)
+    geography = report_geographic_dominance(df_full, engine)
+    age_groups = report_age_groups(df_full, engine)
+    report_geographic_diffusion(engine)
+    report_activity_intensity(engine)
+    report_data_quality(load_quality_report('enrolment', csv_file))
+    report_infrastructure_concentration(engine)
+    report_efficiency(df_full, engine)
+    report_summary(time_patterns, geography, age_groups)
+    report_eumi(engine)
+    return engine
+
+
+if __name__ == "__main__":
+    run_report()
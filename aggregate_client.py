@@ -0,0 +1,84 @@
+"""
+================================================================================
+AGGREGATE SERVICE CLIENT
+================================================================================
+
+Client side of the local aggregate service (aggregate_service.py). Kept apart
+from the server so the analysis modules the service itself imports can query
+it too.
+
+Clients use the service only when UIDAI_AGGREGATE_SERVICE holds its URL; every
+query raises ConnectionError or ValueError on failure so callers can fall back
+to loading the data locally.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import io
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import pandas as pd
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+# Clients use the service only when this variable holds its URL
+# (e.g. UIDAI_AGGREGATE_SERVICE=http://127.0.0.1:8765)
+SERVICE_URL_ENV = "UIDAI_AGGREGATE_SERVICE"
+
+CLIENT_TIMEOUT_SECONDS = 30
+
+# Result columns parsed back into timestamps
+DATE_COLUMNS = ['date', 'week', 'min_date', 'max_date']
+
+
+# ================================================================================
+# CLIENT
+# ================================================================================
+
+def service_url():
+    """URL of the configured service (None when clients should compute locally)."""
+    url = os.environ.get(SERVICE_URL_ENV, "").strip()
+    return url.rstrip('/') or None
+
+
+def query(endpoint, url=None, timeout=CLIENT_TIMEOUT_SECONDS, **params):
+    """
+    Query the aggregate service.
+
+    Args:
+        endpoint: One of aggregate_service.ENDPOINTS
+        url: Service URL (defaults to service_url())
+        **params: Query parameters; lists are sent comma-separated
+
+    Returns:
+        pd.DataFrame: Query result
+
+    Raises:
+        ConnectionError: If the service is not configured or not reachable
+        ValueError: If the service rejected the query
+    """
+    url = url or service_url()
+    if url is None:
+        raise ConnectionError(f"Aggregate service not configured (set {SERVICE_URL_ENV})")
+
+    encoded = {key: ','.join(value) if isinstance(value, (list, tuple)) else value
+               for key, value in params.items() if value is not None and value != [] and value != ''}
+    request_url = f"{url}/{endpoint}?{urllib.parse.urlencode(encoded)}"
+
+    try:
+        with urllib.request.urlopen(request_url, timeout=timeout) as response:
+            body = response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        raise ValueError(json.loads(e.read().decode('utf-8')).get('error', str(e)))
+    except (urllib.error.URLError, OSError) as e:
+        raise ConnectionError(f"Aggregate service at {url} not reachable: {e}")
+
+    return pd.read_json(io.StringIO(body), orient='split', convert_dates=DATE_COLUMNS)
@@ -0,0 +1,425 @@
+"""
+================================================================================
+AGGREGATE QUERY SERVICE - WARM AGGREGATES OVER LOCAL HTTP
+================================================================================
+
+A long-running local service that loads the consolidated datasets once,
+keeps the daily (state, district, date) cubes and the readiness indices in
+memory, and answers aggregate queries over HTTP in milliseconds.
+
+Clients (only when UIDAI_AGGREGATE_SERVICE is set; see aggregate_client.py):
+the dashboard's data pages, the report engines of the three aadhaar_*
+scripts, the lag and backlog-model stages of uidai_comprehensive_analysis.py
+and the monthly aggregate of digital_infrastructure_readiness.py. Each falls
+back to loading the data locally when the service does not answer.
+
+Endpoints (GET, JSON responses in pandas 'split' orientation):
+  /health                    datasets held, rows, date ranges, load time
+  /totals?dataset=&by=       totals by any of state, district, date, week, month
+  /windows?dataset=&month=   pre/post policy-shock window totals around a month
+  /distinct?dataset=&by=     distinct states, districts and pincodes
+  /anomalies?dataset=        anomalous district-days
+  /eumi                      district-level EUMI (enrolment vs biometric)
+  /indices                   digital infrastructure readiness indices
+Common filters: states (comma-separated), district, start, end (YYYY-MM-DD).
+
+Usage:
+  python aggregate_service.py serve [--host 127.0.0.1] [--port 8765]
+  python aggregate_service.py query totals dataset=enrolment by=state
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import json
+import time
+import argparse
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from aggregate_client import SERVICE_URL_ENV, service_url, query
+from aggregation_layer import (
+    CUBE_KEYS, DATASET_VALUE_COLUMNS, load_dataset_file, build_all_daily_aggregates,
+    build_daily_district_sketches, count_distinct, distinct_pincodes_by
+)
+from anomaly_detection import score_district_days, detect_all_anomalies
+from digital_infrastructure_readiness import load_saved_indices
+from eumi_calculation import compute_district_eumi
+from policy_shock_analysis import shock_windows
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FILTERED_DATA_DIR = os.path.join(BASE_DIR, "filtered_data")
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+INDICES_FILE = os.path.join(OUTPUT_DIR, "digital_infrastructure_indices.csv")
+TYPOLOGY_FILE = os.path.join(OUTPUT_DIR, "digital_infrastructure_typology.csv")
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Dimensions accepted by /totals (week/month are derived from date)
+TOTAL_DIMENSIONS = ['state', 'district', 'date', 'week', 'month']
+
+
+# ================================================================================
+# WARM STATE
+# ================================================================================
+
+def load_service_state(data_dir=FILTERED_DATA_DIR):
+    """
+    Load the datasets once and build everything the queries read.
+
+    Returns:
+        dict: cubes (dataset -> daily district cube), sketches (dataset ->
+              (sketch cube, pincode registers)), anomalies (district-days of
+              all datasets), indices, loaded_at, load_seconds, rows (dataset
+              -> raw record count)
+    """
+    start = time.perf_counter()
+    datasets = {}
+    for name in DATASET_VALUE_COLUMNS:
+        path = os.path.join(data_dir, f"consolidated_{name}.csv")
+        if os.path.exists(path):
+            print(f"[INFO] Loading {name} from {path}")
+            datasets[name] = load_dataset_file(path, name)
+
+    cubes = build_all_daily_aggregates(datasets, with_counts=True)
+    sketches = {name: build_daily_district_sketches(df, DATASET_VALUE_COLUMNS[name])
+                for name, df in datasets.items() if not df.empty}
+    anomalies = [score_district_days(cube).assign(dataset=name) for name, cube in cubes.items()]
+    anomalies = pd.concat(anomalies, ignore_index=True) if anomalies else detect_all_anomalies({})
+
+    state = {
+        'cubes': cubes,
+        'sketches': sketches,
+        'anomalies': anomalies[['dataset'] + [col for col in anomalies.columns if col != 'dataset']],
+        'indices': load_saved_indices(INDICES_FILE, TYPOLOGY_FILE),
+        'rows': {name: len(df) for name, df in datasets.items()},
+        'loaded_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+        'load_seconds': time.perf_counter() - start,
+    }
+    print(f"[INFO] Service state ready in {state['load_seconds']:.1f}s "
+          f"({', '.join(f'{k}: {len(v):,} cube rows' for k, v in cubes.items())})")
+    return state
+
+
+# ================================================================================
+# QUERIES
+# ================================================================================
+
+def _split_list(value):
+    """Comma-separated parameter -> list (None/empty -> None)."""
+    if value is None or value == '' or value == []:
+        return None
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return [item.strip() for item in str(value).split(',') if item.strip()]
+
+
+def _filter_mask(cube, states=None, district=None, start=None, end=None):
+    """Boolean mask of the daily cube rows matching the common filters (end is inclusive)."""
+    mask = pd.Series(True, index=cube.index)
+    states = _split_list(states)
+    if states:
+        mask &= cube['state'].isin(states)
+    if district:
+        mask &= cube['district'] == district
+    if start:
+        mask &= cube['date'] >= pd.Timestamp(start)
+    if end:
+        mask &= cube['date'] < pd.Timestamp(end) + pd.Timedelta(days=1)
+    return mask
+
+
+def _filter_cube(cube, states=None, district=None, start=None, end=None):
+    """Rows of a daily cube matching the common filters (end is inclusive)."""
+    return cube[_filter_mask(cube, states, district, start, end)]
+
+
+def _value_columns(cube):
+    """Summable columns of a daily cube: total, records and the age buckets."""
+    return [col for col in cube.columns if col not in CUBE_KEYS]
+
+
+def _get_cube(state, dataset):
+    if dataset not in state['cubes']:
+        raise ValueError(f"Dataset {dataset!r} not loaded; available: {sorted(state['cubes'])}")
+    return state['cubes'][dataset]
+
+
+def query_totals(state, dataset='enrolment', by='state', states=None, district=None, start=None, end=None):
+    """
+    Totals of a dataset grouped by the requested dimensions.
+
+    Args:
+        state: Output of load_service_state()
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        by: Comma-separated dimensions (state, district, date, week, month);
+            empty for a grand total
+        states, district, start, end: Filters
+
+    Returns:
+        pd.DataFrame: The dimensions plus total, records and the dataset's
+                      age bucket columns
+    """
+    dims = _split_list(by) or []
+    unknown = [dim for dim in dims if dim not in TOTAL_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Unknown dimension(s) {unknown}; expected any of {TOTAL_DIMENSIONS}")
+
+    cube = _filter_cube(_get_cube(state, dataset), states, district, start, end)
+    values = _value_columns(cube)
+    if not dims:
+        return cube[values].sum().to_frame().T
+
+    keys = []
+    for dim in dims:
+        if dim == 'week':
+            keys.append(cube['date'].dt.to_period('W').dt.start_time.rename('week'))
+        elif dim == 'month':
+            keys.append(cube['date'].dt.to_period('M').astype(str).rename('month'))
+        else:
+            keys.append(cube[dim])
+
+    return cube.groupby(keys)[values].sum().reset_index()
+
+
+def query_windows(state, dataset='biometric', month=None, by=None, states=None, district=None):
+    """
+    Pre/post window totals around a month (the policy-shock windows).
+
+    Args:
+        month: Shock month as YYYY-MM
+        by: Optional comma-separated dimensions (state, district)
+
+    Returns:
+        pd.DataFrame: The dimensions plus, for each of pre and post: the
+                      window's total, daily_avg, records, districts (active
+                      district names) and age bucket sums (e.g. pre_bio_age_5_17);
+                      and change_pct of the totals
+    """
+    if not month:
+        raise ValueError("Parameter 'month' (YYYY-MM) is required")
+    pre_start, pre_end, post_start, post_end = shock_windows(pd.Period(month, freq='M'))
+
+    dims = _split_list(by) or []
+    unknown = [dim for dim in dims if dim not in ('state', 'district')]
+    if unknown:
+        raise ValueError(f"Windows can be grouped by state/district only, got {unknown}")
+
+    cube = _filter_cube(_get_cube(state, dataset), states, district)
+    counts = [col for col in _value_columns(cube) if col not in ('total', 'records')]
+    windows = {}
+    for label, lo, hi in (('pre', pre_start, pre_end), ('post', post_start, post_end)):
+        part = cube[(cube['date'] >= lo) & (cube['date'] < hi)]
+        days = (hi - lo).days
+        if dims:
+            grouped = part.groupby(dims)
+            sums, districts = grouped[['total', 'records'] + counts].sum(), grouped['district'].nunique()
+        else:
+            sums = part[['total', 'records'] + counts].sum().to_frame('all').T
+            districts = pd.Series({'all': part['district'].nunique()})
+        windows[f'{label}_total'] = sums['total']
+        windows[f'{label}_daily_avg'] = sums['total'] / days
+        windows[f'{label}_records'] = sums['records']
+        windows[f'{label}_districts'] = districts
+        for col in counts:
+            windows[f'{label}_{col}'] = sums[col]
+
+    result = pd.DataFrame(windows).fillna(0)
+    result['change_pct'] = (result['post_total'] - result['pre_total']) / result['pre_total'].where(result['pre_total'] > 0) * 100
+    result = result.reset_index(drop=not dims)
+    return result
+
+
+def query_distinct(state, dataset='enrolment', by=None, states=None, district=None, start=None, end=None):
+    """
+    Distinct districts (exact) and pincodes (estimated from the sketches).
+
+    Args:
+        by: Optional comma-separated dimensions (state, district)
+        states, district, start, end: Filters
+
+    Returns:
+        pd.DataFrame: The dimensions plus districts and pincodes; without
+                      dimensions one row of states, districts and pincodes
+    """
+    dims = _split_list(by) or []
+    unknown = [dim for dim in dims if dim not in ('state', 'district')]
+    if unknown:
+        raise ValueError(f"Distinct counts can be grouped by state/district only, got {unknown}")
+    if dataset not in state['sketches']:
+        raise ValueError(f"Dataset {dataset!r} not loaded; available: {sorted(state['sketches'])}")
+
+    cube, registers = state['sketches'][dataset]
+    mask = _filter_mask(cube, states, district, start, end).to_numpy()
+    if not dims:
+        return pd.DataFrame([count_distinct(cube, registers, mask)])
+
+    districts = cube[mask].groupby(dims)['district'].nunique().rename('districts').reset_index()
+    return districts.merge(distinct_pincodes_by(cube, registers, by=dims, mask=mask), on=dims)
+
+
+def query_anomalies(state, dataset=None, states=None):
+    """
+    Anomalous district-days (anomaly_detection.score_district_days on the warm cubes).
+
+    Returns:
+        pd.DataFrame: Same columns as anomaly_detection.detect_all_anomalies()
+    """
+    anomalies = state['anomalies']
+    if dataset:
+        anomalies = anomalies[anomalies['dataset'] == dataset]
+    states = _split_list(states)
+    if states:
+        anomalies = anomalies[anomalies['state'].isin(states)]
+    return anomalies
+
+
+def query_eumi(state, states=None, start=None, end=None):
+    """
+    District-level EUMI from the warm enrolment and biometric cubes.
+
+    Returns:
+        pd.DataFrame: Same columns as eumi_calculation.compute_district_eumi()
+    """
+    enrol = _filter_cube(_get_cube(state, 'enrolment'), states, start=start, end=end)
+    bio = _filter_cube(_get_cube(state, 'biometric'), states, start=start, end=end)
+    return compute_district_eumi(
+        enrol.rename(columns={'total': 'total_enrolment'}),
+        bio.rename(columns={'total': 'total_bio'})
+    )
+
+
+def query_indices(state, states=None, typology=None):
+    """
+    Digital infrastructure readiness indices (as last written by the readiness module).
+
+    Returns:
+        pd.DataFrame: One row per district
+    """
+    indices = state['indices']
+    if indices.empty:
+        raise ValueError(f"No readiness indices found at {INDICES_FILE}")
+    states = _split_list(states)
+    if states:
+        indices = indices[indices['state'].isin(states)]
+    if typology and 'typology' in indices.columns:
+        indices = indices[indices['typology'] == typology]
+    return indices
+
+
+def query_health(state):
+    """Datasets held by the service."""
+    rows = []
+    for name, cube in state['cubes'].items():
+        rows.append({
+            'dataset': name,
+            'records': state['rows'].get(name, 0),
+            'cube_rows': len(cube),
+            'min_date': cube['date'].min(),
+            'max_date': cube['date'].max(),
+            'loaded_at': state['loaded_at'],
+            'load_seconds': round(state['load_seconds'], 2),
+        })
+    return pd.DataFrame(rows)
+
+
+ENDPOINTS = {
+    'health': query_health,
+    'totals': query_totals,
+    'windows': query_windows,
+    'distinct': query_distinct,
+    'anomalies': query_anomalies,
+    'eumi': query_eumi,
+    'indices': query_indices,
+}
+
+
+# ================================================================================
+# HTTP SERVER
+# ================================================================================
+
+def _make_handler(state):
+    """Request handler class bound to the warm service state."""
+
+    class AggregateRequestHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            parsed = urllib.parse.urlparse(self.path)
+            endpoint = parsed.path.strip('/')
+            params = {key: values[-1] for key, values in urllib.parse.parse_qs(parsed.query).items()}
+
+            if endpoint not in ENDPOINTS:
+                self._reply(404, {'error': f"Unknown endpoint {endpoint!r}; expected one of {sorted(ENDPOINTS)}"})
+                return
+            try:
+                result = ENDPOINTS[endpoint](state, **params)
+            except (TypeError, ValueError, KeyError) as e:
+                self._reply(400, {'error': str(e)})
+                return
+            self._reply(200, result.to_json(orient='split', index=False, date_format='iso'), raw=True)
+
+        def _reply(self, status, body, raw=False):
+            payload = (body if raw else json.dumps(body)).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            print(f"[INFO] {self.address_string()} {format % args}")
+
+    return AggregateRequestHandler
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, data_dir=FILTERED_DATA_DIR):
+    """Load the warm state and serve queries until interrupted."""
+    state = load_service_state(data_dir)
+    server = ThreadingHTTPServer((host, port), _make_handler(state))
+    print(f"[INFO] Aggregate service listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n[INFO] Shutting down")
+    finally:
+        server.server_close()
+
+
+# ================================================================================
+# MAIN EXECUTION
+# ================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local aggregate query service")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="load the data and serve queries")
+    serve_parser.add_argument("--host", default=DEFAULT_HOST)
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    query_parser = subparsers.add_parser("query", help="query a running service")
+    query_parser.add_argument("endpoint", choices=sorted(ENDPOINTS))
+    query_parser.add_argument("params", nargs="*", help="key=value query parameters")
+    query_parser.add_argument("--url", default=None,
+                              help=f"service URL (default: ${SERVICE_URL_ENV} or http://{DEFAULT_HOST}:{DEFAULT_PORT})")
+
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.host, args.port)
+    else:
+        params = dict(param.split('=', 1) for param in args.params)
+        try:
+            result = query(args.endpoint, url=args.url or service_url() or f"http://{DEFAULT_HOST}:{DEFAULT_PORT}",
+                           **params)
+        except (ConnectionError, ValueError) as e:
+            raise SystemExit(f"[ERROR] {e}")
+        print(result.to_string(index=False))
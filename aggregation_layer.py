@@ -0,0 +1,330 @@
+"""
+================================================================================
+AGGREGATION LAYER
+================================================================================
+
+Pre-aggregated cubes shared by the dashboard and the analysis modules.
+
+The raw datasets are record-level (one row per pincode per day). Most views
+only need totals per (state, district, date), so the cube is built once and
+every downstream consumer (anomaly detection, district rankings, ...) reads
+the much smaller aggregate instead of the raw rows.
+
+Distinct counts do not sum, so each cube row can also carry a HyperLogLog
+sketch of its pincodes. Sketches merge with an element-wise max, so the
+distinct pincodes of any filter or date window are estimated from the
+matching cube rows without touching the raw data. Distinct states and
+districts are read exactly from the cube keys.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import pandas as pd
+import numpy as np
+
+from district_reconciliation import apply_district_mapping
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+# Total column of each dataset (as added by the loaders)
+DATASET_VALUE_COLUMNS = {
+    'enrolment': 'total_enrolment',
+    'demographic': 'total_demo',
+    'biometric': 'total_bio',
+}
+
+# Age bucket columns summed into each dataset's total
+DATASET_COUNT_COLUMNS = {
+    'enrolment': ['age_0_5', 'age_5_17', 'age_18_greater'],
+    'demographic': ['demo_age_5_17', 'demo_age_17_'],
+    'biometric': ['bio_age_5_17', 'bio_age_17_'],
+}
+
+CUBE_KEYS = ['state', 'district', 'date']
+
+# HyperLogLog precision: 2**8 = 256 one-byte registers per sketch,
+# ~6.5% standard error (much lower below ~600 distinct values, where the
+# linear-counting correction applies - i.e. for single districts)
+HLL_PRECISION = 8
+
+
+# ================================================================================
+# LOADING HELPERS
+# ================================================================================
+
+def load_dataset_file(path, dataset):
+    """
+    Load a record-level CSV of one dataset with parsed dates and its total column.
+
+    Args:
+        path: CSV file (consolidated file or a daily drop with the same schema)
+        dataset: 'enrolment', 'demographic' or 'biometric'
+
+    Returns:
+        pd.DataFrame: Records with date parsed and the dataset's total column
+    """
+    if dataset not in DATASET_VALUE_COLUMNS:
+        raise ValueError(f"Unknown dataset {dataset!r}; expected one of {list(DATASET_VALUE_COLUMNS)}")
+
+    df = apply_district_mapping(pd.read_csv(path))
+    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    df[DATASET_VALUE_COLUMNS[dataset]] = df[DATASET_COUNT_COLUMNS[dataset]].sum(axis=1)
+    return df
+
+
+# ================================================================================
+# DAILY DISTRICT CUBE
+# ================================================================================
+
+def build_daily_district_aggregate(df, value_col, sum_columns=None):
+    """
+    Aggregate record-level data into a (state, district, date) cube.
+
+    Args:
+        df: Record-level dataset with state, district, date columns
+        value_col: Column to total (e.g. 'total_enrolment')
+        sum_columns: Further columns to sum per cube row (e.g. the age buckets)
+
+    Returns:
+        pd.DataFrame: state, district, date, total, records and the
+                      sum_columns (sorted by keys)
+    """
+    sum_columns = list(sum_columns or [])
+    if df.empty or value_col not in df.columns:
+        return pd.DataFrame(columns=CUBE_KEYS + ['total', 'records'] + sum_columns)
+
+    grouped = df.dropna(subset=CUBE_KEYS).groupby(CUBE_KEYS)
+    daily = grouped[value_col].agg(
+        total='sum',
+        records='size'
+    )
+    if sum_columns:
+        daily = daily.join(grouped[sum_columns].sum())
+
+    return daily.reset_index()
+
+
+def build_all_daily_aggregates(datasets, with_counts=False):
+    """
+    Build the daily district cube for every loaded dataset.
+
+    Args:
+        datasets: Dict of dataset name -> record-level DataFrame
+        with_counts: Also sum each dataset's age bucket columns per cube row
+
+    Returns:
+        dict: Dataset name -> daily district cube
+    """
+    cubes = {}
+    for name, value_col in DATASET_VALUE_COLUMNS.items():
+        df = datasets.get(name)
+        if df is not None and not df.empty:
+            sum_columns = DATASET_COUNT_COLUMNS[name] if with_counts else None
+            cubes[name] = build_daily_district_aggregate(df, value_col, sum_columns)
+    return cubes
+
+
+def to_dense_matrix(daily):
+    """
+    Pivot a daily district cube into a dense (dates x districts) array.
+
+    Args:
+        daily: Output of build_daily_district_aggregate()
+
+    Returns:
+        tuple: (values array with NaN where a district has no records,
+                DatetimeIndex of dates, DataFrame of state/district keys)
+    """
+    dates = pd.DatetimeIndex(np.sort(daily['date'].unique()))
+    district_codes = daily.groupby(['state', 'district'], sort=True).ngroup().to_numpy()
+    keys = daily[['state', 'district']].drop_duplicates().reset_index(drop=True)
+
+    values = np.full((len(dates), len(keys)), np.nan)
+    values[dates.get_indexer(daily['date']), district_codes] = daily['total'].to_numpy(dtype=float)
+
+    return values, dates, keys
+
+
+# ================================================================================
+# DISTINCT-COUNT SKETCHES (HYPERLOGLOG)
+# ================================================================================
+
+def hll_sketches(group_codes, values, n_groups, precision=HLL_PRECISION):
+    """
+    Build one HyperLogLog sketch per group.
+
+    Args:
+        group_codes: Group index (0..n_groups-1) of every value
+        values: Values to count (pincodes); numeric strings hash like numbers
+        n_groups: Number of sketches to build
+        precision: Register index bits (2**precision registers per sketch)
+
+    Returns:
+        np.ndarray: (n_groups, 2**precision) uint8 registers
+    """
+    registers = np.zeros((n_groups, 1 << precision), dtype=np.uint8)
+    if len(values) == 0:
+        return registers
+
+    numeric = pd.to_numeric(pd.Series(values), errors='coerce')
+    if numeric.notna().all():
+        hashes = pd.util.hash_array(numeric.to_numpy(dtype=np.int64))
+    else:
+        hashes = pd.util.hash_array(pd.Series(values).astype(str).to_numpy(dtype=object))
+
+    # Top bits select the register, the rank is the position of the first
+    # 1-bit in the remaining bits (bit lengths via frexp on 32-bit halves)
+    index = (hashes >> np.uint64(64 - precision)).astype(np.intp)
+    rest = (hashes << np.uint64(precision)) | np.uint64(1 << (precision - 1))
+    high = (rest >> np.uint64(32)).astype(np.float64)
+    low = (rest & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    bit_length = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+    rank = (65 - bit_length).astype(np.uint8)
+
+    np.maximum.at(registers, (np.asarray(group_codes, dtype=np.intp), index), rank)
+    return registers
+
+
+def hll_merge(registers, group_codes=None, n_groups=None):
+    """
+    Merge sketches (element-wise max of registers).
+
+    Args:
+        registers: (n_sketches, m) registers
+        group_codes: Optional output group of every sketch; all sketches are
+                     merged into one if omitted
+        n_groups: Number of output groups (defaults to max code + 1)
+
+    Returns:
+        np.ndarray: (m,) merged registers, or (n_groups, m) per group
+    """
+    if group_codes is None:
+        if len(registers) == 0:
+            return np.zeros(registers.shape[1], dtype=np.uint8)
+        return registers.max(axis=0)
+
+    group_codes = np.asarray(group_codes, dtype=np.intp)
+    if n_groups is None:
+        n_groups = int(group_codes.max()) + 1 if len(group_codes) else 0
+    merged = np.zeros((n_groups, registers.shape[1]), dtype=np.uint8)
+    if len(group_codes) == 0:
+        return merged
+
+    # Contiguous runs per group, reduced in one pass
+    order = np.argsort(group_codes, kind='stable')
+    sorted_codes = group_codes[order]
+    starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+    merged[sorted_codes[starts]] = np.maximum.reduceat(registers[order], starts, axis=0)
+    return merged
+
+
+def hll_estimate(registers):
+    """
+    Estimate distinct counts from sketches.
+
+    Args:
+        registers: (m,) or (n_sketches, m) registers
+
+    Returns:
+        float or np.ndarray: Estimated distinct values (array for 2-D input)
+    """
+    single = np.ndim(registers) == 1
+    registers = np.atleast_2d(registers)
+    m = registers.shape[1]
+    alpha = 0.7213 / (1 + 1.079 / m)
+
+    raw = alpha * m * m / np.power(2.0, -registers.astype(np.float64)).sum(axis=1)
+    zeros = (registers == 0).sum(axis=1)
+
+    # Small-range (linear counting) correction
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    estimate = np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+    return float(estimate[0]) if single else estimate
+
+
+def build_daily_district_sketches(df, value_col, distinct_col='pincode'):
+    """
+    Build the daily district cube together with per-row distinct sketches.
+
+    A single groupby provides both the cube totals and the row codes used to
+    fill the sketches. The cube also gets integer codes for state and
+    district names, so distinct states/districts of any cube slice are
+    counted exactly with np.unique on small integer arrays.
+
+    Args:
+        df: Record-level dataset with state, district, date columns
+        value_col: Column to total (e.g. 'total_enrolment')
+        distinct_col: Column to sketch (defaults to pincode)
+
+    Returns:
+        tuple: (cube DataFrame aligned with the sketch rows, (n_rows, m) registers)
+    """
+    rows = df.dropna(subset=CUBE_KEYS)
+    grouped = rows.groupby(CUBE_KEYS)
+
+    daily = grouped[value_col].agg(total='sum', records='size').reset_index()
+    daily['state_code'] = pd.factorize(daily['state'])[0]
+    daily['district_code'] = pd.factorize(daily['district'])[0]
+
+    codes = grouped.ngroup().to_numpy()
+    values = rows[distinct_col].to_numpy()
+    present = pd.notna(values)
+    registers = hll_sketches(codes[present], values[present], len(daily))
+
+    return daily, registers
+
+
+def count_distinct(daily, registers, mask=None):
+    """
+    Distinct states, districts and pincodes of a cube slice.
+
+    Args:
+        daily: Cube from build_daily_district_sketches()
+        registers: Its sketch registers
+        mask: Optional boolean row mask (state filter, date window, ...)
+
+    Returns:
+        dict: states, districts (exact, by name) and pincodes (estimated)
+    """
+    if mask is None:
+        mask = np.ones(len(daily), dtype=bool)
+    mask = np.asarray(mask, dtype=bool)
+
+    return {
+        'states': len(np.unique(daily['state_code'].to_numpy()[mask])),
+        'districts': len(np.unique(daily['district_code'].to_numpy()[mask])),
+        'pincodes': int(round(hll_estimate(hll_merge(registers[mask])))) if mask.any() else 0,
+    }
+
+
+def distinct_pincodes_by(daily, registers, by=('state', 'district'), mask=None):
+    """
+    Estimated distinct pincodes per group of a cube slice.
+
+    Args:
+        daily: Cube from build_daily_district_sketches()
+        registers: Its sketch registers
+        by: Cube columns to group by (e.g. ('state',))
+        mask: Optional boolean row mask
+
+    Returns:
+        pd.DataFrame: The group columns plus 'pincodes'
+    """
+    by = list(by)
+    if mask is not None:
+        mask = np.asarray(mask, dtype=bool)
+        daily = daily[mask]
+        registers = registers[mask]
+
+    group_codes = daily.groupby(by, sort=True).ngroup().to_numpy()
+    keys = daily[by].drop_duplicates().sort_values(by).reset_index(drop=True)
+    merged = hll_merge(registers, group_codes, len(keys))
+
+    keys['pincodes'] = np.rint(hll_estimate(merged)).astype(int)
+    return keys
@@ -0,0 +1,421 @@
+"""
+================================================================================
+DISTRICT-LEVEL ANOMALY DETECTION
+================================================================================
+
+Flags unusual district-days (local spikes and outages) in all three datasets.
+
+Every district is scored against its own history in one vectorized pass:
+the daily district cube is pivoted into a dense (dates x districts) array
+and per-district quantiles, medians and MADs are taken along the date axis.
+
+Two detectors:
+- Batch: scores every district-day against the district's full history
+  (robust_z column)
+- Streaming: keeps per-district EWMA mean/variance on disk and scores each
+  new daily drop in O(new rows + known districts), appending flags to an
+  alerts table (ewma_z column: (value - EWMA mean) / EWMA std, not a
+  robust z-score). Warm districts missing from a day of the drop are
+  scored as 0, so outages are flagged too.
+
+Batch methodology:
+- Days a district did not report (within its active span, on days the
+  dataset reported nationally) count as zero volume, so outages show up
+- Robust z-score = (value - median) / (1.4826 * MAD)
+- |robust z| > ROBUST_Z_THRESHOLD is an anomaly (spike if above, drop if below)
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import argparse
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+from aggregation_layer import (
+    DATASET_VALUE_COLUMNS, build_all_daily_aggregates, build_daily_district_aggregate,
+    load_dataset_file, to_dense_matrix
+)
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+# Modified z-score cutoff (Iglewicz & Hoaglin)
+ROBUST_Z_THRESHOLD = 3.5
+
+# Districts with fewer active days than this are not scored
+MIN_ACTIVE_DAYS = 7
+
+# MAD -> standard deviation for normally distributed data
+MAD_SCALE = 1.4826
+
+# Streaming detector: EWMA smoothing factor, z cutoff and warm-up days
+EWMA_ALPHA = 0.1
+STREAM_Z_THRESHOLD = 3.5
+STREAM_WARMUP_DAYS = MIN_ACTIVE_DAYS
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+STREAM_STATE_FILE = os.path.join(OUTPUT_DIR, "anomaly_stream_state.csv")
+ALERTS_FILE = os.path.join(OUTPUT_DIR, "anomaly_alerts.csv")
+
+STATE_COLUMNS = ['dataset', 'state', 'district', 'n_days', 'ewma_mean', 'ewma_var', 'last_date']
+ALERT_COLUMNS = ['dataset', 'state', 'district', 'date', 'value', 'expected',
+                 'ewma_z', 'direction', 'detected_at']
+
+
+# ================================================================================
+# SCORING
+# ================================================================================
+
+def _robust_scale(values, median):
+    """
+    Per-district robust spread (columns of a dates x districts array).
+
+    Falls back to IQR / 1.349 and then to the mean absolute deviation when
+    the MAD is zero (e.g. districts that report the same value most days).
+    """
+    deviation = np.abs(values - median)
+    scale = MAD_SCALE * np.nanmedian(deviation, axis=0)
+
+    q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    scale = np.where(scale > 0, scale, (q3 - q1) / 1.349)
+    scale = np.where(scale > 0, scale, 1.2533 * np.nanmean(deviation, axis=0))
+
+    return np.where(scale > 0, scale, np.nan)
+
+
+def score_district_days(daily, threshold=ROBUST_Z_THRESHOLD, min_active_days=MIN_ACTIVE_DAYS):
+    """
+    Score every district-day of a daily district cube.
+
+    Args:
+        daily: Daily district cube (aggregation_layer.build_daily_district_aggregate)
+        threshold: Absolute robust z-score above which a day is anomalous
+        min_active_days: Minimum active days for a district to be scored
+
+    Returns:
+        pd.DataFrame: Anomalous district-days with state, district, date,
+                      value, expected (median), robust_z, direction
+    """
+    columns = ['state', 'district', 'date', 'value', 'expected', 'robust_z', 'direction']
+    if daily.empty:
+        return pd.DataFrame(columns=columns)
+
+    values, dates, keys = to_dense_matrix(daily)
+
+    # Zero-fill non-reporting days inside each district's active span
+    reported = ~np.isnan(values)
+    day_idx = np.arange(len(dates))[:, None]
+    first = reported.argmax(axis=0)
+    last = len(dates) - 1 - reported[::-1].argmax(axis=0)
+    in_span = (day_idx >= first) & (day_idx <= last)
+    values = np.where(in_span & ~reported, 0.0, values)
+
+    # Per-district statistics along the date axis
+    with np.errstate(invalid='ignore', divide='ignore'):
+        active_days = in_span.sum(axis=0)
+        median = np.nanmedian(values, axis=0)
+        scale = _robust_scale(values, median)
+        robust_z = (values - median) / scale
+
+    robust_z[:, active_days < min_active_days] = np.nan
+
+    flagged = np.abs(np.nan_to_num(robust_z)) > threshold
+    di, gi = np.nonzero(flagged)
+
+    anomalies = keys.iloc[gi].reset_index(drop=True)
+    anomalies['date'] = dates[di]
+    anomalies['value'] = values[di, gi]
+    anomalies['expected'] = median[gi]
+    anomalies['robust_z'] = robust_z[di, gi]
+    anomalies['direction'] = np.where(anomalies['robust_z'] > 0, 'Spike', 'Drop')
+
+    return anomalies[columns]
+
+
+def detect_all_anomalies(datasets, threshold=ROBUST_Z_THRESHOLD):
+    """
+    Detect district-day anomalies across all loaded datasets.
+
+    Args:
+        datasets: Dict of dataset name -> record-level DataFrame
+        threshold: Absolute robust z-score above which a day is anomalous
+
+    Returns:
+        pd.DataFrame: Anomalies of all datasets with a 'dataset' column
+    """
+    frames = []
+    for name, daily in build_all_daily_aggregates(datasets).items():
+        anomalies = score_district_days(daily, threshold=threshold)
+        anomalies.insert(0, 'dataset', name)
+        frames.append(anomalies)
+
+    if not frames:
+        return pd.DataFrame(columns=['dataset', 'state', 'district', 'date', 'value',
+                                     'expected', 'robust_z', 'direction'])
+
+    return pd.concat(frames, ignore_index=True)
+
+
+# ================================================================================
+# SUMMARIES
+# ================================================================================
+
+def top_anomalous_districts(anomalies, states=None, top_n=15):
+    """
+    Rank districts by number and severity of anomalous days.
+
+    Args:
+        anomalies: Output of detect_all_anomalies() / score_district_days()
+        states: Optional list of states to restrict to
+        top_n: Number of districts to return
+
+    Returns:
+        pd.DataFrame: state, district, anomalies, spikes, drops, max_abs_z
+    """
+    if states:
+        anomalies = anomalies[anomalies['state'].isin(states)]
+
+    summary = anomalies.assign(
+        abs_z=anomalies['robust_z'].abs(),
+        spike=anomalies['direction'] == 'Spike',
+    ).groupby(['state', 'district']).agg(
+        anomalies=('date', 'size'),
+        spikes=('spike', 'sum'),
+        max_abs_z=('abs_z', 'max'),
+    ).reset_index()
+    summary['drops'] = summary['anomalies'] - summary['spikes']
+
+    return summary.sort_values(['anomalies', 'max_abs_z'], ascending=False).head(top_n)[
+        ['state', 'district', 'anomalies', 'spikes', 'drops', 'max_abs_z']
+    ]
+
+
+def top_anomalous_dates(anomalies, states=None, top_n=15):
+    """
+    Rank dates by how many districts were anomalous on them.
+
+    A district flagged in several datasets on the same date counts once;
+    spikes and drops count the districts with at least one spike / drop
+    that day (a district can have both, in different datasets).
+
+    Args:
+        anomalies: Output of detect_all_anomalies() / score_district_days()
+        states: Optional list of states to restrict to
+        top_n: Number of dates to return
+
+    Returns:
+        pd.DataFrame: date, districts, spikes, drops
+    """
+    if states:
+        anomalies = anomalies[anomalies['state'].isin(states)]
+
+    # One row per (date, district, direction), then per (date, district)
+    flags = anomalies.assign(spike=anomalies['direction'] == 'Spike', drop=anomalies['direction'] == 'Drop')
+    per_district = flags.groupby(['date', 'state', 'district'])[['spike', 'drop']].any()
+    summary = per_district.groupby(level='date').agg(
+        districts=('spike', 'size'),
+        spikes=('spike', 'sum'),
+        drops=('drop', 'sum'),
+    ).reset_index()
+
+    return summary.sort_values('districts', ascending=False).head(top_n)
+
+
+# ================================================================================
+# STREAMING DETECTOR
+# ================================================================================
+
+def load_stream_state(path=STREAM_STATE_FILE):
+    """
+    Load the persisted per-district EWMA state (empty if none yet).
+
+    Returns:
+        pd.DataFrame: One row per (dataset, state, district)
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=STATE_COLUMNS)
+
+    state = pd.read_csv(path, keep_default_na=False, na_values=[''])
+    state['last_date'] = pd.to_datetime(state['last_date'])
+    return state
+
+
+def ingest_daily_drop(df, dataset, state, alpha=EWMA_ALPHA, threshold=STREAM_Z_THRESHOLD,
+                      warmup_days=STREAM_WARMUP_DAYS):
+    """
+    Score a new drop of records and fold it into the EWMA state.
+
+    Only the new rows are aggregated. Each new day is scored against the
+    district's EWMA mean/std *before* that day is folded in, so a spike
+    cannot mask itself. Known districts past their warm-up that are absent
+    on a day of the drop are scored (and folded in) with a value of 0, so
+    outages raise drop alerts like in the batch detector.
+
+    Each district keeps its own watermark (last_date, its last reported
+    day): its rows at or before it are skipped, which makes re-ingesting
+    the same drop a no-op, while rows of a district reporting late are
+    still ingested.
+
+    Args:
+        df: New record-level rows (date parsed, total column present)
+        dataset: Dataset name ('enrolment', 'demographic', 'biometric')
+        state: Current stream state (load_stream_state)
+        alpha: EWMA smoothing factor
+        threshold: Absolute z-score above which a day is flagged
+        warmup_days: Days of history a district needs before it is scored
+
+    Returns:
+        tuple: (updated state, alerts DataFrame)
+    """
+    keys = ['state', 'district']
+    daily = build_daily_district_aggregate(df, DATASET_VALUE_COLUMNS[dataset])
+
+    current = state[state['dataset'] == dataset].set_index(keys)
+    others = state[state['dataset'] != dataset]
+
+    # Per-district watermark (NaT for districts seen for the first time)
+    watermark = pd.to_datetime(current['last_date']).reindex(pd.MultiIndex.from_frame(daily[keys]))
+    ingested = daily['date'].to_numpy() <= watermark.to_numpy()
+    if ingested.any():
+        print(f"[INFO] Skipping {ingested.sum():,} district-days at or before their district's "
+              f"last ingested date")
+        daily = daily[~ingested]
+
+    # Add districts seen for the first time
+    districts = current.index.union(pd.MultiIndex.from_frame(daily[keys].drop_duplicates()))
+    current = current.reindex(districts)
+    n_days = pd.to_numeric(current['n_days']).fillna(0).to_numpy(dtype=float)
+    mean = pd.to_numeric(current['ewma_mean']).fillna(0).to_numpy(dtype=float)
+    var = pd.to_numeric(current['ewma_var']).fillna(0).to_numpy(dtype=float)
+    last_date = pd.to_datetime(current['last_date']).to_numpy(dtype='datetime64[ns]')
+    state_names = districts.get_level_values('state').to_numpy()
+    district_names = districts.get_level_values('district').to_numpy()
+
+    alerts = []
+    for date, day in daily.groupby('date', sort=True):
+        reported = districts.get_indexer(pd.MultiIndex.from_frame(day[keys]))
+
+        # Warm districts without records that day (and not ingested past it) count as 0
+        absent = (n_days >= warmup_days) & ~(last_date >= np.datetime64(date, 'ns'))
+        absent[reported] = False
+        pos = np.concatenate([reported, np.flatnonzero(absent)])
+        x = np.concatenate([day['total'].to_numpy(dtype=float), np.zeros(absent.sum())])
+
+        # Score against the state before this day
+        std = np.sqrt(var[pos])
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z = np.where((n_days[pos] >= warmup_days) & (std > 0), (x - mean[pos]) / std, np.nan)
+        flagged = np.abs(np.nan_to_num(z)) > threshold
+        if flagged.any():
+            alerts.append(pd.DataFrame({
+                'dataset': dataset,
+                'state': state_names[pos][flagged],
+                'district': district_names[pos][flagged],
+                'date': date,
+                'value': x[flagged],
+                'expected': mean[pos][flagged],
+                'ewma_z': z[flagged],
+            }))
+
+        # Fold the day into the EWMA state (first day initializes it)
+        delta = x - mean[pos]
+        first = n_days[pos] == 0
+        mean[pos] = np.where(first, x, mean[pos] + alpha * delta)
+        var[pos] = np.where(first, 0.0, (1 - alpha) * (var[pos] + alpha * delta ** 2))
+        n_days[pos] += 1
+        last_date[reported] = np.datetime64(date, 'ns')
+
+    updated = pd.DataFrame({
+        'dataset': dataset,
+        'state': districts.get_level_values('state'),
+        'district': districts.get_level_values('district'),
+        'n_days': n_days.astype(int),
+        'ewma_mean': mean,
+        'ewma_var': var,
+        'last_date': last_date,
+    })
+    state = pd.concat([frame for frame in (others, updated) if not frame.empty],
+                      ignore_index=True).reindex(columns=STATE_COLUMNS)
+
+    if alerts:
+        alerts = pd.concat(alerts, ignore_index=True)
+        alerts['direction'] = np.where(alerts['ewma_z'] > 0, 'Spike', 'Drop')
+        alerts['detected_at'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    else:
+        alerts = pd.DataFrame(columns=ALERT_COLUMNS)
+
+    return state, alerts[ALERT_COLUMNS]
+
+
+def append_alerts(alerts, path=ALERTS_FILE):
+    """Append alerts to the alerts table read by the dashboard."""
+    if alerts.empty:
+        return
+    alerts.to_csv(path, mode='a', header=not os.path.exists(path), index=False)
+
+
+def load_alerts(path=ALERTS_FILE):
+    """
+    Load the alerts table.
+
+    Returns:
+        pd.DataFrame: All alerts appended so far (empty if none)
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=ALERT_COLUMNS)
+
+    alerts = pd.read_csv(path, keep_default_na=False, na_values=[''])
+    # Tables written before the column was renamed call the EWMA z robust_z
+    alerts = alerts.rename(columns={'robust_z': 'ewma_z'})
+    alerts['date'] = pd.to_datetime(alerts['date'])
+    return alerts
+
+
+# ================================================================================
+# MAIN EXECUTION
+# ================================================================================
+
+def main(path, dataset, write_alerts=True):
+    """
+    Ingest a daily drop: score new rows, append alerts, persist the state.
+
+    Args:
+        path: CSV with the new records (same schema as the consolidated file)
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        write_alerts: Append flags to the alerts table (disable to seed state)
+    """
+    print("=" * 80)
+    print("STREAMING ANOMALY DETECTOR - DAILY INGEST")
+    print("=" * 80)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    df = load_dataset_file(path, dataset)
+    print(f"[INFO] Loaded {len(df):,} {dataset} records from {path}")
+
+    state, alerts = ingest_daily_drop(df, dataset, load_stream_state())
+    state.to_csv(STREAM_STATE_FILE, index=False)
+    print(f"[SAVED] {STREAM_STATE_FILE} ({(state['dataset'] == dataset).sum():,} {dataset} districts)")
+
+    print(f"[INFO] {len(alerts):,} anomalous district-days flagged")
+    if write_alerts:
+        append_alerts(alerts)
+        if not alerts.empty:
+            print(f"[SAVED] {ALERTS_FILE}")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Streaming per-district anomaly detector")
+    parser.add_argument("path", help="CSV with the new day(s) of records")
+    parser.add_argument("--dataset", required=True, choices=list(DATASET_VALUE_COLUMNS))
+    parser.add_argument("--seed", action="store_true",
+                        help="only update the EWMA state (e.g. from history), do not write alerts")
+    args = parser.parse_args()
+    main(args.path, args.dataset, write_alerts=not args.seed)
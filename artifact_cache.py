@@ -0,0 +1,286 @@
+"""
+================================================================================
+ARTIFACT CACHE - CONTENT-ADDRESSED CACHE OF STAGE OUTPUTS
+================================================================================
+
+Lets the pipeline skip stages whose inputs have not changed.
+
+Every stage gets a key: a SHA-256 over
+  - the content digests of its input data files (the dataset partitions),
+  - the source of its function and of every repository function or class
+    it uses, in its own module or imported from another one (code version),
+    together with the code of the stages that produce its input datasets,
+    plus the pandas/numpy versions,
+  - the values of the configuration constants it depends on
+    (EFFORT_WEIGHT_*, REENROLMENT_WINDOW_DAYS, ISI weights, ...).
+
+After a stage runs, its artifacts (the CSV/PNG/JSON files it writes) are
+stored by content digest under objects/ and a manifest for the key records
+which digest belongs at which path. When a later run computes the same key,
+the artifacts are restored from the cache instead of running the stage.
+
+File digests are memoized by (size, mtime), so unchanged multi-GB inputs
+are not re-read on every run.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import sys
+import glob
+import json
+import types
+import shutil
+import hashlib
+import inspect
+
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_DIR = os.path.join(BASE_DIR, ".artifact_cache")
+
+# Read size for hashing files
+HASH_CHUNK_BYTES = 1 << 20
+
+
+# ================================================================================
+# CODE VERSION AND CONFIGURATION
+# ================================================================================
+
+def _referenced_names(code):
+    """Global names used by a code object and the code objects nested in it."""
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _referenced_names(const)
+    return names
+
+
+def _is_repo_object(obj):
+    """Whether a module, function or class is defined in a file of this repository."""
+    if not isinstance(obj, types.ModuleType):
+        if not (inspect.isfunction(obj) or inspect.isclass(obj)):
+            return False
+        obj = sys.modules.get(obj.__module__)
+    path = getattr(obj, '__file__', None)
+    return path is not None and os.path.abspath(path).startswith(BASE_DIR + os.sep)
+
+
+def code_digest(func):
+    """
+    SHA-256 of a function's source and of the repository functions and
+    classes it uses, directly or indirectly.
+
+    Names are resolved in the globals of the function that uses them, so
+    helpers imported from other repo modules (from x import f, or
+    module.f through an imported repo module) are followed too. Edits to
+    functions that are never reached (e.g. another stage's function) do not
+    change the digest.
+    """
+    sources = {}
+    stack = [func]
+    while stack:
+        current = stack.pop()
+        qualname = f"{current.__module__}.{current.__qualname__}"
+        if qualname in sources:
+            continue
+        try:
+            sources[qualname] = inspect.getsource(current)
+        except (OSError, TypeError):
+            # Generated classes (namedtuple) have no source of their own
+            sources[qualname] = ''
+            continue
+
+        if inspect.isclass(current):
+            namespace = vars(sys.modules[current.__module__])
+            codes = [member.__code__ for member in vars(current).values() if inspect.isfunction(member)]
+        else:
+            namespace = current.__globals__
+            codes = [current.__code__]
+        names = set()
+        for code in codes:
+            names |= _referenced_names(code)
+
+        for name in names:
+            obj = namespace.get(name)
+            if isinstance(obj, types.ModuleType) and _is_repo_object(obj):
+                # module.attr: the attribute name is among the referenced names
+                stack.extend(getattr(obj, attr) for attr in names
+                             if _is_repo_object(getattr(obj, attr, None))
+                             and not isinstance(getattr(obj, attr), types.ModuleType))
+            elif _is_repo_object(obj) and not isinstance(obj, types.ModuleType):
+                stack.append(obj)
+
+    encoded = json.dumps(sources, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _canonical(value):
+    """JSON-stable form of a configuration value (sets sorted, arrays as lists)."""
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (set, frozenset)):
+        return sorted((_canonical(v) for v in value), key=repr)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+# ================================================================================
+# CACHE
+# ================================================================================
+
+class ArtifactCache:
+    """
+    Content-addressed store of stage artifacts.
+
+    Layout under cache_dir:
+        objects/<sha256>          artifact contents
+        manifests/<key>.json      {relative artifact path: sha256}
+        file_index.json           digest memo keyed by path, size and mtime
+    """
+
+    def __init__(self, cache_dir=CACHE_DIR, base_dir=BASE_DIR):
+        self.cache_dir = cache_dir
+        self.base_dir = base_dir
+        self.objects_dir = os.path.join(cache_dir, "objects")
+        self.manifests_dir = os.path.join(cache_dir, "manifests")
+        self.index_path = os.path.join(cache_dir, "file_index.json")
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+        self._index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self._index = json.load(f)
+
+    def _abspath(self, path):
+        return path if os.path.isabs(path) else os.path.join(self.base_dir, path)
+
+    def file_digest(self, path):
+        """SHA-256 of a file's contents (memoized while size and mtime are unchanged)."""
+        path = self._abspath(path)
+        stat = os.stat(path)
+        memo = self._index.get(path)
+        if memo and memo['size'] == stat.st_size and memo['mtime_ns'] == stat.st_mtime_ns:
+            return memo['sha256']
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+                digest.update(chunk)
+        self._index[path] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+        return digest.hexdigest()
+
+    def expand(self, patterns):
+        """Input files matching the given paths/glob patterns (relative to base_dir), sorted."""
+        files = set()
+        for pattern in patterns:
+            files.update(glob.glob(self._abspath(pattern)))
+        return sorted(os.path.relpath(f, self.base_dir) for f in files)
+
+    def stage_key(self, name, input_patterns=(), code_version='', config=None):
+        """
+        Cache key of a stage run.
+
+        Args:
+            name: Stage name
+            input_patterns: Input data files / glob patterns
+            code_version: Digest of the stage's code (see code_digest())
+            config: Dict of configuration constants the stage depends on
+
+        Returns:
+            str: Hex SHA-256 key
+        """
+        key = {
+            'stage': name,
+            'inputs': {path: self.file_digest(path) for path in self.expand(input_patterns)},
+            'code': code_version,
+            'versions': {'pandas': pd.__version__, 'numpy': np.__version__},
+            'config': _canonical(config or {}),
+        }
+        encoded = json.dumps(key, sort_keys=True, default=repr).encode()
+        return hashlib.sha256(encoded).hexdigest()
+
+    def save_index(self):
+        """Persist the file digest memo."""
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self.index_path)
+
+    def _manifest_path(self, key):
+        return os.path.join(self.manifests_dir, f"{key}.json")
+
+    def lookup(self, key):
+        """
+        Manifest of a cached stage run.
+
+        Returns:
+            dict or None: {artifact path: sha256}, None unless every object is present
+        """
+        path = self._manifest_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            manifest = json.load(f)
+        if not all(os.path.exists(os.path.join(self.objects_dir, d)) for d in manifest.values()):
+            return None
+        return manifest
+
+    def store(self, key, artifacts):
+        """
+        Add a stage's artifacts to the cache under its key.
+
+        Args:
+            key: Stage key
+            artifacts: Artifact paths; paths the stage did not write are left out
+
+        Returns:
+            dict: The stored manifest
+        """
+        manifest = {}
+        for path in artifacts:
+            full_path = self._abspath(path)
+            if not os.path.exists(full_path):
+                continue
+            digest = self.file_digest(full_path)
+            object_path = os.path.join(self.objects_dir, digest)
+            if not os.path.exists(object_path):
+                shutil.copyfile(full_path, object_path + ".tmp")
+                os.replace(object_path + ".tmp", object_path)
+            manifest[path] = digest
+
+        tmp_path = self._manifest_path(key) + ".tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self._manifest_path(key))
+        return manifest
+
+    def restore(self, manifest):
+        """
+        Put cached artifacts back in place (files already matching are left alone).
+
+        Returns:
+            list: Paths that were rewritten
+        """
+        restored = []
+        for path, digest in manifest.items():
+            full_path = self._abspath(path)
+            if os.path.exists(full_path) and self.file_digest(full_path) == digest:
+                continue
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            shutil.copyfile(os.path.join(self.objects_dir, digest), full_path)
+            restored.append(path)
+        return restored
@@ -0,0 +1,222 @@
+"""
+================================================================================
+CHART DOWNSAMPLING - LEVEL OF DETAIL FOR TIME-SERIES CHARTS
+================================================================================
+
+Reduces time series on the server before they are sent to Plotly, so chart
+payloads stay bounded by the chart's resolution rather than the data span.
+
+Three reducers are provided:
+  - minmax: keeps the minimum and maximum of every bucket, so spikes and
+            drops survive (used for anomaly charts)
+  - mean:   one averaged point per bucket (smooth trends)
+  - lttb:   Largest-Triangle-Three-Buckets, keeps the points that preserve
+            the visual shape of the line
+
+Traces that still exceed the WebGL threshold are rendered with Scattergl.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+# Points kept per trace (roughly one per horizontal pixel of a wide chart)
+DEFAULT_MAX_POINTS = 1000
+
+# Traces with more points than this are drawn with WebGL (go.Scattergl)
+WEBGL_POINT_THRESHOLD = 2000
+
+DOWNSAMPLING_METHODS = ('minmax', 'mean', 'lttb')
+
+
+# ================================================================================
+# REDUCERS
+# ================================================================================
+
+def _as_numeric(x):
+    """Numeric view of an x axis (datetimes as int64 nanoseconds)."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    return x.astype(np.float64)
+
+
+def _bucket_edges(n, n_buckets):
+    """Start offsets of n_buckets equal-count buckets over n points."""
+    return np.linspace(0, n, n_buckets + 1).astype(np.int64)
+
+
+def downsample_minmax(y, n_buckets):
+    """
+    Indices of the minimum and maximum of every bucket, in original order.
+
+    Args:
+        y: Values (ordered by x)
+        n_buckets: Number of buckets (output has at most 2 * n_buckets points)
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return np.arange(n)
+
+    edges = _bucket_edges(n, n_buckets)
+    starts = edges[:-1]
+    # Pad to a rectangular (buckets x width) block; padding never wins
+    width = int(np.diff(edges).max())
+    positions = np.minimum(starts[:, None] + np.arange(width), n - 1)
+    valid = np.arange(width) < np.diff(edges)[:, None]
+
+    block = y[positions]
+    usable = valid & ~np.isnan(block)
+    low = np.where(usable, block, np.inf).argmin(axis=1)
+    high = np.where(usable, block, -np.inf).argmax(axis=1)
+
+    rows = np.arange(n_buckets)
+    return np.unique(np.concatenate([positions[rows, low], positions[rows, high]]))
+
+
+def downsample_mean(x, y, n_buckets):
+    """
+    One point per bucket: mean x and mean y.
+
+    Returns:
+        tuple: (x, y) arrays of length n_buckets (x keeps its dtype)
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_buckets:
+        return x, y
+
+    edges = _bucket_edges(n, n_buckets)
+    counts = np.diff(edges)
+    bucket = np.repeat(np.arange(n_buckets), counts)
+
+    x_mean = np.bincount(bucket, weights=_as_numeric(x), minlength=n_buckets) / counts
+    y_mean = np.bincount(bucket, weights=np.nan_to_num(y), minlength=n_buckets) / \
+        np.maximum(np.bincount(bucket, weights=~np.isnan(y), minlength=n_buckets), 1)
+
+    if np.issubdtype(x.dtype, np.datetime64):
+        x_mean = x_mean.astype(np.int64).astype('datetime64[ns]')
+    return x_mean, y_mean
+
+
+def downsample_lttb(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. For every inner bucket the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket is selected.
+
+    Args:
+        x: Ordered x values (numbers or datetimes)
+        y: Values
+        n_out: Number of points to keep (>= 3)
+
+    Returns:
+        np.ndarray: Sorted indices of the kept points
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    xs = _as_numeric(x)
+    xs = xs - xs[0]
+    ys = np.nan_to_num(y)
+
+    # Inner points split into n_out - 2 (non-empty) buckets; each bucket is
+    # compared against the average of the next one (the last point for the
+    # final bucket)
+    edges = 1 + _bucket_edges(n - 2, n_out - 2)
+    sizes = np.diff(edges)
+    next_avg_x = np.r_[(np.add.reduceat(xs[:n - 1], edges[:-1]) / sizes)[1:], xs[-1]]
+    next_avg_y = np.r_[(np.add.reduceat(ys[:n - 1], edges[:-1]) / sizes)[1:], ys[-1]]
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    prev = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        area = np.abs(
+            (xs[prev] - next_avg_x[b]) * (ys[lo:hi] - ys[prev])
+            - (xs[prev] - xs[lo:hi]) * (next_avg_y[b] - ys[prev])
+        )
+        prev = lo + int(area.argmax())
+        selected[b + 1] = prev
+
+    return selected
+
+
+def downsample(x, y, max_points=DEFAULT_MAX_POINTS, method='lttb'):
+    """
+    Reduce a series to at most max_points points.
+
+    Args:
+        x: Ordered x values
+        y: Values
+        max_points: Point budget of the chart
+        method: 'minmax', 'mean' or 'lttb'
+
+    Returns:
+        tuple: (x, y) as numpy arrays
+    """
+    if method not in DOWNSAMPLING_METHODS:
+        raise ValueError(f"Unknown method {method!r}; expected one of {DOWNSAMPLING_METHODS}")
+
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=np.float64)
+    if len(y) <= max_points:
+        return x, y
+
+    if method == 'mean':
+        return downsample_mean(x, y, max_points)
+    if method == 'minmax':
+        keep = downsample_minmax(y, max(max_points // 2, 1))
+    else:
+        keep = downsample_lttb(x, y, max_points)
+    return x[keep], y[keep]
+
+
+# ================================================================================
+# PLOTLY TRACES
+# ================================================================================
+
+def time_series_trace(x, y, max_points=DEFAULT_MAX_POINTS, method='lttb',
+                      webgl_threshold=WEBGL_POINT_THRESHOLD, **trace_kwargs):
+    """
+    Build a scatter trace from a downsampled series.
+
+    Args:
+        x: Ordered x values (Series or array)
+        y: Values
+        max_points: Point budget (None = keep every point)
+        method: Downsampling method (see downsample())
+        webgl_threshold: Use go.Scattergl above this many points
+        **trace_kwargs: Passed to the trace (name, mode, line, marker, ...)
+
+    Returns:
+        go.Scatter or go.Scattergl
+    """
+    if isinstance(x, pd.Series):
+        x = x.to_numpy()
+    if isinstance(y, pd.Series):
+        y = y.to_numpy()
+
+    if max_points is not None:
+        x, y = downsample(x, y, max_points, method)
+
+    trace_type = go.Scattergl if len(y) > webgl_threshold else go.Scatter
+    return trace_type(x=x, y=y, **trace_kwargs)
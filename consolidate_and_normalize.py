@@ -282,16 +282,20 @@ def load_and_consolidate_dataset(folder_path, file_pattern, dataset_name):
     
     return consolidated_df
 
-def main():
+def main(base_path=None):
     """
     Main execution function
+    
+    Args:
+        base_path: Project folder holding the api_data_* folders (defaults to
+                   the folder of this script)
     """
     print("\n" + "="*70)
     print("AADHAAR DATA CONSOLIDATION AND NORMALIZATION")
     print("="*70)
     
     # Setup paths
-    base_path = Path("c:\\Users\\RUTURAJ\\D_Drive\\Desktop\\Coding\\AAdhar hackathon\\BharatBytes-UIDAI")
+    base_path = Path(base_path) if base_path else Path(__file__).resolve().parent
     
     biometric_folder = base_path / "api_data_aadhar_biometric"
     demographic_folder = base_path / "api_data_aadhar_demographic"
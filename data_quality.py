@@ -0,0 +1,433 @@
+"""
+================================================================================
+DATA QUALITY - SINGLE-PASS QUALITY PROFILE PER MONTHLY PARTITION
+================================================================================
+
+The data quality sections of the analysis scripts used to scan the full
+frame once per check: duplicates, missing values, zero-transaction rows,
+rows with every age group zero, IQR outliers per count column. This module
+computes all of them in one chunked pass over a consolidated CSV (with the
+district mapping applied, as the scripts load it) and stores them per
+monthly partition:
+  - rows, exact duplicates, rows with any activity, zero-total rows,
+    rows with every count column zero and missing values per column,
+  - a value histogram per count column, from which exact quantiles (and
+    so IQR bounds and outlier counts) are computed for any set of
+    partitions without touching the records,
+  - the largest rows per count column, zero-total rows per date and the
+    distinct pincodes of the dataset.
+
+Duplicates are found by hashing the duplicate key of every row; the key
+contains the date, so a duplicate always falls in the same partition as
+its first occurrence and the per-partition counts add up.
+
+The report is saved to outputs/data_quality_<dataset>.json together with
+the size and modification time of the CSV and of the district mapping;
+load_quality_report() only re-profiles when one of them changed.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import json
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from aggregation_layer import DATASET_COUNT_COLUMNS, DATASET_VALUE_COLUMNS
+from district_reconciliation import MAPPING_FILE, apply_district_mapping
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FILTERED_DATA_DIR = os.path.join(BASE_DIR, "filtered_data")
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+
+DATASETS = ['enrolment', 'demographic', 'biometric']
+
+# Columns (besides the count columns) identifying a record
+KEY_COLUMNS = ['date', 'state', 'district', 'pincode']
+
+# CSV rows profiled per chunk
+CHUNK_ROWS = 500_000
+
+# Largest rows kept per count column
+TOP_ROWS = 5
+
+# Upper fence Q3 + IQR_MULTIPLIER * IQR for extreme outliers
+IQR_MULTIPLIER = 3
+
+# Partition label of rows whose date does not parse
+INVALID_PARTITION = 'invalid'
+
+
+def csv_path(dataset):
+    """Consolidated CSV of a dataset."""
+    return os.path.join(FILTERED_DATA_DIR, f"consolidated_{dataset}.csv")
+
+
+def report_path(dataset):
+    """Saved quality report of a dataset."""
+    return os.path.join(OUTPUT_DIR, f"data_quality_{dataset}.json")
+
+
+def _file_stamp(path):
+    """(size, mtime_ns) of a file, None if it does not exist."""
+    if not os.path.exists(path):
+        return None
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _source_signature(source):
+    return {'path': os.path.abspath(source), 'csv': _file_stamp(source), 'mapping': _file_stamp(MAPPING_FILE)}
+
+
+# ================================================================================
+# PROFILER
+# ================================================================================
+
+class QualityProfiler:
+    """
+    Accumulates the quality metrics of a dataset chunk by chunk.
+
+    Feed raw chunks (as read from the CSV) to update() in file order and
+    call finish() once; only counters, histograms, row hashes and the
+    current top rows are kept between chunks.
+    """
+
+    def __init__(self, dataset):
+        if dataset not in DATASET_COUNT_COLUMNS:
+            raise ValueError(f"Unknown dataset {dataset!r}; expected one of {DATASETS}")
+        self.dataset = dataset
+        self.count_columns = DATASET_COUNT_COLUMNS[dataset]
+        self.value_column = DATASET_VALUE_COLUMNS[dataset]
+        self.columns = None
+        self._counters = []
+        self._missing = []
+        self._histograms = {col: [] for col in self.count_columns}
+        self._zero_dates = []
+        self._hashes = []
+        self._partitions = []
+        self._pincodes = set()
+        self._top = {col: None for col in self.count_columns}
+
+    def update(self, chunk):
+        """
+        Profile one chunk of raw records.
+
+        Args:
+            chunk: Records with string key columns (district mapping applied)
+        """
+        if self.columns is None:
+            self.columns = list(chunk.columns)
+        counts = chunk[self.count_columns].apply(pd.to_numeric, errors='coerce')
+
+        dates = pd.to_datetime(chunk['date'], format='%d-%m-%Y', errors='coerce')
+        partition = dates.dt.strftime('%Y-%m').fillna(INVALID_PARTITION).rename('partition')
+
+        total = counts.sum(axis=1, min_count=len(self.count_columns))
+        zero = total.eq(0)
+        flags = pd.DataFrame({
+            'rows': 1,
+            'active_rows': counts.gt(0).any(axis=1),
+            'zero_rows': zero,
+            'all_zero_rows': counts.eq(0).all(axis=1),
+        }, index=chunk.index)
+        self._counters.append(flags.groupby(partition).sum())
+
+        missing = chunk.isna()
+        missing[self.count_columns] = counts.isna()
+        missing[self.value_column] = total.isna()
+        self._missing.append(missing.groupby(partition).sum())
+
+        for col in self.count_columns:
+            self._histograms[col].append(counts[col].groupby([partition, counts[col]]).size())
+        self._zero_dates.append(chunk.loc[zero, 'date'].value_counts())
+
+        # Duplicate key hashes (the key holds the date, so duplicates share a partition)
+        key = pd.concat([chunk[KEY_COLUMNS], counts], axis=1)
+        self._hashes.append(pd.util.hash_pandas_object(key, index=False).to_numpy())
+        self._partitions.append(partition.to_numpy())
+        self._pincodes.update(chunk['pincode'].dropna().unique())
+
+        # Largest rows per count column (earlier rows win ties, as with nlargest)
+        rows = pd.concat([chunk[['date', 'state', 'district']], counts], axis=1)
+        for col in self.count_columns:
+            candidates = rows.nlargest(TOP_ROWS, col)
+            if self._top[col] is not None:
+                candidates = pd.concat([self._top[col], candidates]).nlargest(TOP_ROWS, col)
+            self._top[col] = candidates
+
+    def finish(self):
+        """
+        Combine the chunk results into the report payload.
+
+        Returns:
+            dict: JSON-serializable quality report
+        """
+        partitions = pd.concat(self._counters).groupby(level=0).sum() if self._counters else \
+            pd.DataFrame(columns=['rows', 'active_rows', 'zero_rows', 'all_zero_rows'])
+        if self._hashes:
+            duplicated = pd.Series(np.concatenate(self._hashes)).duplicated().to_numpy()
+            partitions['duplicates'] = pd.Series(duplicated).groupby(np.concatenate(self._partitions)).sum()
+        partitions = partitions.reindex(columns=['rows', 'duplicates', 'active_rows', 'zero_rows', 'all_zero_rows'])
+        partitions = partitions.fillna(0).astype('int64').sort_index()
+        missing = pd.concat(self._missing).groupby(level=0).sum() if self._missing else pd.DataFrame()
+
+        histograms = {}
+        for col, parts in self._histograms.items():
+            merged = pd.concat(parts).groupby(level=[0, 1]).sum() if parts else pd.Series(dtype='int64')
+            histograms[col] = {
+                str(part): [values.index.get_level_values(1).tolist(), values.astype('int64').tolist()]
+                for part, values in merged.groupby(level=0)
+            }
+
+        top_rows = {}
+        for col, top in self._top.items():
+            if top is not None:
+                top = top.reset_index(names='row').astype(object)
+                top_rows[col] = top.where(top.notna(), None).to_dict(orient='records')
+
+        zero_dates = pd.concat(self._zero_dates).groupby(level=0).sum() if self._zero_dates else pd.Series(dtype='int64')
+        return {
+            'dataset': self.dataset,
+            'columns': (self.columns or []) + [self.value_column],
+            'count_columns': self.count_columns,
+            'pincodes': len(self._pincodes),
+            'partitions': [
+                dict(partition=str(part), **{k: int(v) for k, v in row.items()},
+                     missing={col: int(missing.loc[part, col]) for col in missing.columns})
+                for part, row in partitions.iterrows()
+            ],
+            'histograms': histograms,
+            'top_rows': top_rows,
+            'zero_dates': {str(date): int(n) for date, n in zero_dates.items()},
+        }
+
+
+def profile_dataset(dataset, source=None, chunk_rows=CHUNK_ROWS):
+    """
+    Profile a consolidated CSV in one chunked pass.
+
+    Args:
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        source: CSV file (defaults to the consolidated file)
+        chunk_rows: Rows read per chunk
+
+    Returns:
+        dict: Report payload (see QualityProfiler.finish)
+    """
+    source = source or csv_path(dataset)
+    profiler = QualityProfiler(dataset)
+    for chunk in pd.read_csv(source, dtype=str, chunksize=chunk_rows):
+        profiler.update(apply_district_mapping(chunk))
+    report = profiler.finish()
+    report['source'] = _source_signature(source)
+    return report
+
+
+# ================================================================================
+# REPORT
+# ================================================================================
+
+class QualityReport:
+    """Read access to a saved quality report; every metric is derived without the records."""
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.dataset = payload['dataset']
+        self.count_columns = payload['count_columns']
+        self.pincodes = payload['pincodes']
+
+        self.partitions = pd.DataFrame(
+            [{k: v for k, v in part.items() if k != 'missing'} for part in payload['partitions']],
+            columns=['partition', 'rows', 'duplicates', 'active_rows', 'zero_rows', 'all_zero_rows'],
+        ).set_index('partition')
+        self.missing_by_partition = pd.DataFrame(
+            [part['missing'] for part in payload['partitions']],
+            index=self.partitions.index, columns=payload['columns'],
+        ).fillna(0).astype('int64')
+
+    def is_current(self, source=None):
+        """True if profiled from the current CSV (default: the consolidated file) and district mapping."""
+        return self.payload.get('source') == _source_signature(source or csv_path(self.dataset))
+
+    @property
+    def rows(self):
+        return int(self.partitions['rows'].sum())
+
+    def totals(self):
+        """Row-level counters summed over all partitions."""
+        return self.partitions.sum()
+
+    def missing(self):
+        """Missing values per column over all partitions."""
+        return self.missing_by_partition.sum()
+
+    def activity_by_partition(self):
+        """Share of records with any activity per month, in percent."""
+        months = self.partitions.drop(INVALID_PARTITION, errors='ignore')
+        share = months['active_rows'] / months['rows'] * 100
+        share.index = pd.PeriodIndex(share.index, freq='M', name='month')
+        return share.rename('data_quality')
+
+    def zero_by_date(self):
+        """Zero-total records per date, most first (earlier dates first on ties)."""
+        zero_dates = pd.Series(self.payload['zero_dates'], dtype='int64')
+        zero_dates.index = pd.to_datetime(zero_dates.index, format='%d-%m-%Y', errors='coerce')
+        return zero_dates.sort_index().sort_values(ascending=False, kind='stable')
+
+    def histogram(self, column, partitions=None):
+        """
+        Value counts of a count column (ascending values).
+
+        Args:
+            column: Count column
+            partitions: Partition labels to include (all by default)
+        """
+        parts = self.payload['histograms'].get(column, {})
+        selected = [parts[p] for p in (parts if partitions is None else partitions) if p in parts]
+        if not selected:
+            return pd.Series(dtype='int64')
+        values = np.concatenate([np.asarray(v, dtype='float64') for v, _ in selected])
+        counts = np.concatenate([np.asarray(c, dtype='int64') for _, c in selected])
+        return pd.Series(counts, index=values).groupby(level=0).sum()
+
+    def quantile(self, column, q, partitions=None):
+        """Quantile of a count column, interpolated like Series.quantile."""
+        histogram = self.histogram(column, partitions)
+        n = int(histogram.sum())
+        if n == 0:
+            return np.nan
+        cumulative = histogram.to_numpy().cumsum()
+        values = histogram.index.to_numpy()
+        position = (n - 1) * q
+        lower = int(np.floor(position))
+        low = values[np.searchsorted(cumulative, lower, side='right')]
+        high = values[np.searchsorted(cumulative, min(lower + 1, n - 1), side='right')]
+        return low + (high - low) * (position - lower)
+
+    def count_above(self, column, bound, partitions=None):
+        """Records whose count column is greater than a bound."""
+        histogram = self.histogram(column, partitions)
+        return int(histogram[histogram.index > bound].sum())
+
+    def iqr_outliers(self, column, multiplier=IQR_MULTIPLIER, partitions=None):
+        """
+        Upper IQR fence of a count column and the records above it.
+
+        Returns:
+            tuple: (Q3 + multiplier * IQR, number of records above it)
+        """
+        q1 = self.quantile(column, 0.25, partitions)
+        q3 = self.quantile(column, 0.75, partitions)
+        upper_bound = q3 + multiplier * (q3 - q1)
+        return upper_bound, self.count_above(column, upper_bound, partitions)
+
+    def top_rows(self, column, above=None):
+        """
+        Largest records of a count column (up to TOP_ROWS).
+
+        Args:
+            column: Count column
+            above: Only records whose value is greater than this
+        """
+        records = self.payload['top_rows'].get(column, [])
+        top = pd.DataFrame(records, columns=['row', 'date', 'state', 'district'] + self.count_columns)
+        top = top.set_index('row').rename_axis(None)
+        top['date'] = pd.to_datetime(top['date'], format='%d-%m-%Y', errors='coerce')
+        for col in self.count_columns:
+            values = pd.to_numeric(top[col])
+            top[col] = values.astype('int64') if values.notna().all() and (values % 1 == 0).all() else values
+        if above is not None:
+            top = top[top[column] > above]
+        return top
+
+
+def save_quality_report(report):
+    """Write a report payload to outputs/data_quality_<dataset>.json."""
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    path = report_path(report['dataset'])
+    with open(path, 'w') as f:
+        json.dump(report, f)
+    return path
+
+
+def read_quality_report(dataset):
+    """Saved report of a dataset as is (None if there is none)."""
+    path = report_path(dataset)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return QualityReport(json.load(f))
+
+
+def load_quality_report(dataset, source=None, rebuild=True):
+    """
+    Quality report of a dataset, re-profiled only if its inputs changed.
+
+    Args:
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        source: CSV file (defaults to the consolidated file)
+        rebuild: Profile and save when the saved report is missing or stale
+
+    Returns:
+        QualityReport, or None if stale and rebuild is False
+    """
+    source = source or csv_path(dataset)
+    quality = read_quality_report(dataset)
+    if quality is not None and quality.is_current(source):
+        return quality
+    if not rebuild:
+        return None
+    print(f"[INFO] Profiling data quality of {os.path.basename(source)} (one chunked pass)")
+    report = profile_dataset(dataset, source)
+    print(f"[SAVED] {save_quality_report(report)}")
+    return QualityReport(report)
+
+
+# ================================================================================
+# MAIN
+# ================================================================================
+
+def main(datasets=DATASETS):
+    """
+    Profile the consolidated datasets and save one quality report each.
+
+    Args:
+        datasets: Dataset names to profile
+    """
+    print("=" * 80)
+    print("DATA QUALITY PROFILE")
+    print("=" * 80)
+
+    for dataset in datasets:
+        if not os.path.exists(csv_path(dataset)):
+            print(f"[INFO] Skipping {dataset}: {csv_path(dataset)} not found")
+            continue
+        report = profile_dataset(dataset)
+        path = save_quality_report(report)
+
+        quality = QualityReport(report)
+        totals = quality.totals()
+        print(f"\n[INFO] {dataset}: {quality.rows:,} rows in {len(quality.partitions)} partitions, "
+              f"{totals['duplicates']:,} duplicates, {totals['zero_rows']:,} zero rows, "
+              f"{int(quality.missing().sum()):,} missing values")
+        for col in quality.count_columns:
+            upper_bound, outliers = quality.iqr_outliers(col)
+            print(f"  {col}: {outliers:,} records above Q3 + {IQR_MULTIPLIER}*IQR = {upper_bound:.0f}")
+        print(f"[SAVED] {path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Profile the data quality of the consolidated datasets")
+    parser.add_argument("--dataset", choices=DATASETS, action="append",
+                        help="dataset to profile (repeatable; default: all)")
+    args = parser.parse_args()
+    main(datasets=args.dataset or DATASETS)
@@ -19,10 +19,16 @@ UIDAI Data Hackathon 2026
 """
 
 import os
+import json
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime
 
+from stage_memory import StageMemoryMonitor, frame_mb
+from district_reconciliation import apply_district_mapping
+from aggregate_client import service_url, query as query_service
+
 # ================================================================================
 # CONFIGURATION
 # ================================================================================
@@ -38,24 +44,70 @@ BIOMETRIC_FILE = os.path.join(FILTERED_DATA_DIR, "consolidated_biometric.csv")
 INDICES_OUTPUT = os.path.join(OUTPUT_DIR, "digital_infrastructure_indices.csv")
 TYPOLOGY_OUTPUT = os.path.join(OUTPUT_DIR, "digital_infrastructure_typology.csv")
 
+# Sensitivity analysis output
+SENSITIVITY_OUTPUT = os.path.join(OUTPUT_DIR, "digital_infrastructure_sensitivity.csv")
+
+# Persisted per-district sufficient statistics for incremental refreshes
+STATE_OUTPUT = os.path.join(OUTPUT_DIR, "digital_infrastructure_state.csv")
+STATE_META_OUTPUT = os.path.join(OUTPUT_DIR, "digital_infrastructure_state.json")
+
+# Age buckets scored by ABS (column -> label used in prop_<label> outputs)
+BIOMETRIC_AGE_BUCKETS = {'bio_age_5_17': '5_17', 'bio_age_17_': '17_plus'}
+ENROLMENT_AGE_BUCKETS = {'age_0_5': '0_5', 'age_5_17': '5_17', 'age_18_greater': '18_plus'}
+
+# ISI weighting: volume load vs volatility stress
+ISI_VOLUME_WEIGHT = 0.4
+ISI_VOLATILITY_WEIGHT = 0.6
+
+# Typology thresholds for ISI, RCS and ABS
+TYPOLOGY_THRESHOLD = 0.5
+
+# Typology labels (order = classification rule order, last is the fallback)
+TYPOLOGIES = [
+    "Digitally Strong & Balanced",
+    "Digitally Strong but Overburdened",
+    "Digitally Weak but Stable",
+    "Digitally Underserved",
+]
+
+# Sensitivity grid: ISI volume weight (volatility weight = 1 - volume weight)
+# and per-index typology thresholds
+SENSITIVITY_WEIGHT_GRID = np.round(np.linspace(0.0, 1.0, 21), 2)
+SENSITIVITY_THRESHOLD_GRID = np.round(np.linspace(0.3, 0.7, 9), 2)
+
+# Rows per chunk when the raw table is aggregated chunk by chunk (memory budget)
+CHUNK_ROWS = 500_000
+
 
 # ================================================================================
 # DATA LOADING
 # ================================================================================
 
-def load_biometric_data():
+def load_biometric_data(path=BIOMETRIC_FILE):
     """
     Load the consolidated biometric dataset.
     
+    Args:
+        path: CSV file to load (defaults to the consolidated biometric file)
+    
     Returns:
         pd.DataFrame: Biometric transactions data with date parsed
     """
-    print(f"[INFO] Loading biometric data from: {BIOMETRIC_FILE}")
+    print(f"[INFO] Loading biometric data from: {path}")
+    
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Biometric data file not found: {path}")
     
-    if not os.path.exists(BIOMETRIC_FILE):
-        raise FileNotFoundError(f"Biometric data file not found: {BIOMETRIC_FILE}")
+    df = _prepare_biometric(pd.read_csv(path))
     
-    df = pd.read_csv(BIOMETRIC_FILE)
+    print(f"[INFO] Loaded {len(df):,} records spanning {df['date'].min()} to {df['date'].max()}")
+    
+    return df
+
+
+def _prepare_biometric(df):
+    """Canonicalize district names, parse dates and add the total_bio and year_month columns."""
+    df = apply_district_mapping(df)
     
     # Parse date column (format: DD-MM-YYYY)
     df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
@@ -68,47 +120,189 @@ def load_biometric_data():
     # Extract year-month for temporal aggregation
     df['year_month'] = df['date'].dt.to_period('M')
     
-    print(f"[INFO] Loaded {len(df):,} records spanning {df['date'].min()} to {df['date'].max()}")
-    
     return df
 
 
 # ================================================================================
-# INDEX CALCULATIONS
+# MONTHLY DISTRICT AGGREGATE
 # ================================================================================
 
-def compute_infrastructure_stress_index(df):
+def build_monthly_district_aggregate(df, age_columns=None):
     """
-    Compute Infrastructure Stress Index (ISI) for each district.
+    Aggregate the raw biometric table into monthly district totals.
     
-    Methodology:
-    - Higher transaction volume indicates infrastructure load
-    - Higher coefficient of variation (CV) indicates volatility/stress
-    - Normalized to 0-1 scale where 1 = high stress
+    This is the only pass over the raw table: ISI, RCS and ABS are all
+    computed from this aggregate. Groups with a missing state, district or
+    month are kept (dropna=False) so each index can apply the same row
+    filters it previously applied to the raw data.
     
-    Policy Relevance:
-    - Districts with high ISI may need infrastructure capacity upgrades
-    - Volatile patterns suggest unreliable service delivery
+    Each row carries a district_id (0..n_districts-1 in sorted state/district
+    order, -1 for rows without a state or district). Index functions return
+    frames positioned by district_id, so they can be combined without merges.
     
     Args:
-        df: Biometric data with year_month column
+        df: Biometric data with year_month and total_bio columns (enrolment
+            data with year_month also works for ABS)
+        age_columns: Age bucket columns to carry (defaults to biometric buckets)
         
     Returns:
-        pd.DataFrame: District-level ISI scores
+        pd.DataFrame: One row per (state, district, year_month)
     """
-    print("[INFO] Computing Infrastructure Stress Index (ISI)...")
+    print("[INFO] Building monthly district aggregate...")
     
-    # Aggregate monthly totals by state, district
-    monthly = df.groupby(['state', 'district', 'year_month'])['total_bio'].sum().reset_index()
+    if age_columns is None:
+        age_columns = list(BIOMETRIC_AGE_BUCKETS)
     
-    # Calculate statistics per district
-    district_stats = monthly.groupby(['state', 'district']).agg(
-        mean_volume=('total_bio', 'mean'),
-        std_volume=('total_bio', 'std'),
-        max_volume=('total_bio', 'max'),
-        months_active=('year_month', 'count')
-    ).reset_index()
+    value_columns = (['total_bio'] if 'total_bio' in df.columns else []) + list(age_columns)
+    monthly = df.groupby(['state', 'district', 'year_month'], dropna=False)[
+        value_columns
+    ].sum().reset_index()
+    
+    return _assign_district_ids(monthly)
+
+
+def build_monthly_district_aggregate_chunked(path=BIOMETRIC_FILE, chunk_rows=CHUNK_ROWS):
+    """
+    Load and aggregate the biometric CSV chunk by chunk.
+    
+    Same result as build_monthly_district_aggregate(load_biometric_data(path))
+    (the aggregate only holds sums, so chunk partials add up exactly), but
+    only one chunk of raw rows is in memory at a time. Used when the raw
+    table would not fit the memory budget.
+    
+    Args:
+        path: CSV file to load (defaults to the consolidated biometric file)
+        chunk_rows: Rows read per chunk
+        
+    Returns:
+        pd.DataFrame: One row per (state, district, year_month)
+    """
+    print(f"[INFO] Loading biometric data in chunks of {chunk_rows:,} rows from: {path}")
+    
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Biometric data file not found: {path}")
+    
+    keys = ['state', 'district', 'year_month']
+    value_columns = ['total_bio'] + list(BIOMETRIC_AGE_BUCKETS)
+    partials = []
+    records, first, last = 0, pd.NaT, pd.NaT
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        chunk = _prepare_biometric(chunk)
+        records += len(chunk)
+        first = min(first, chunk['date'].min()) if pd.notna(first) else chunk['date'].min()
+        last = max(last, chunk['date'].max()) if pd.notna(last) else chunk['date'].max()
+        partials.append(chunk.groupby(keys, dropna=False)[value_columns].sum().reset_index())
+    
+    print(f"[INFO] Loaded {records:,} records spanning {first} to {last}")
+    print("[INFO] Building monthly district aggregate...")
+    
+    monthly = pd.concat(partials, ignore_index=True).groupby(keys, dropna=False)[
+        value_columns
+    ].sum().reset_index()
+    
+    return _assign_district_ids(monthly)
+
+
+def build_monthly_district_aggregate_service():
+    """
+    Monthly district aggregate from the aggregate service's warm biometric cube.
+    
+    Same columns as build_monthly_district_aggregate(). The service's cube
+    only holds records with a state, district and date, so there are no
+    rows without a district or month.
+    
+    Returns:
+        pd.DataFrame: One row per (state, district, year_month)
+    
+    Raises:
+        ConnectionError, ValueError: If the service cannot be queried
+    """
+    print("[INFO] Building monthly district aggregate from the aggregate service...")
+    
+    monthly = query_service('totals', dataset='biometric', by=['state', 'district', 'month'])
+    monthly = monthly.rename(columns={'total': 'total_bio', 'month': 'year_month'})
+    monthly['year_month'] = pd.PeriodIndex(monthly['year_month'], freq='M')
+    
+    return _assign_district_ids(
+        monthly[['state', 'district', 'year_month', 'total_bio'] + list(BIOMETRIC_AGE_BUCKETS)]
+    )
+
+
+def _assign_district_ids(monthly):
+    """Add district_id to a monthly aggregate and report its size."""
+    has_district = monthly['state'].notna() & monthly['district'].notna()
+    monthly['district_id'] = -1
+    monthly.loc[has_district, 'district_id'] = monthly[has_district].groupby(
+        ['state', 'district']
+    ).ngroup()
+    
+    print(f"[INFO] {len(monthly):,} district-months for {monthly['district_id'].max() + 1} districts")
+    
+    return monthly
+
+
+def get_district_keys(monthly):
+    """
+    Get the state/district keys of a monthly aggregate in district_id order.
+    
+    Args:
+        monthly: Output of build_monthly_district_aggregate()
+        
+    Returns:
+        pd.DataFrame: state, district columns; row i is district_id i
+    """
+    keys = monthly.loc[monthly['district_id'] >= 0, ['state', 'district', 'district_id']]
+    keys = keys.drop_duplicates('district_id').sort_values('district_id')
+    return keys[['state', 'district']].reset_index(drop=True)
+
+
+def combine_indices(district_keys, *index_frames):
+    """
+    Combine district_id-positioned index frames into one dataset.
+    
+    Every index frame is indexed by the same district_id range as
+    district_keys, so columns are placed side by side without a merge.
+    
+    Args:
+        district_keys: Output of get_district_keys()
+        *index_frames: Index frames (ISI, RCS, ABS, ...)
+        
+    Returns:
+        pd.DataFrame: state, district and all index columns
+    """
+    indices_df = district_keys.copy()
+    for frame in index_frames:
+        for col in frame.columns:
+            indices_df[col] = frame[col].to_numpy()
+    return indices_df
+
+
+def _district_index(monthly):
+    """RangeIndex over all district_ids of a monthly aggregate."""
+    return pd.RangeIndex(monthly['district_id'].max() + 1, name='district_id')
+
+
+def _dated_district_months(monthly):
+    """District-months with a known district and month (what ISI/RCS group on)."""
+    return monthly[(monthly['district_id'] >= 0) & monthly['year_month'].notna()]
+
+
+# ================================================================================
+# INDEX CALCULATIONS
+# ================================================================================
+
+def _stress_from_stats(district_stats):
+    """
+    Score ISI from per-district monthly volume statistics.
     
+    Shared by the full run and the incremental refresh.
+    
+    Args:
+        district_stats: DataFrame with mean_volume and std_volume columns
+        
+    Returns:
+        pd.DataFrame: district_stats with cv and ISI columns added
+    """
     # Coefficient of Variation (CV) = std / mean
     # Higher CV indicates more volatility = more stress
     district_stats['cv'] = district_stats['std_volume'] / district_stats['mean_volume']
@@ -132,8 +326,8 @@ def compute_infrastructure_stress_index(df):
     
     # ISI = weighted combination (volume contributes to load, CV to stress)
     # 40% volume load + 60% volatility stress
-    district_stats['ISI'] = (0.4 * district_stats['volume_normalized'] + 
-                            0.6 * district_stats['cv_normalized'])
+    district_stats['ISI'] = (ISI_VOLUME_WEIGHT * district_stats['volume_normalized'] + 
+                            ISI_VOLATILITY_WEIGHT * district_stats['cv_normalized'])
     
     # Normalize ISI to 0-1 scale
     isi_min = district_stats['ISI'].min()
@@ -143,12 +337,46 @@ def compute_infrastructure_stress_index(df):
     else:
         district_stats['ISI'] = 0
     
+    return district_stats
+
+
+def compute_infrastructure_stress_index(monthly):
+    """
+    Compute Infrastructure Stress Index (ISI) for each district.
+    
+    Methodology:
+    - Higher transaction volume indicates infrastructure load
+    - Higher coefficient of variation (CV) indicates volatility/stress
+    - Normalized to 0-1 scale where 1 = high stress
+    
+    Policy Relevance:
+    - Districts with high ISI may need infrastructure capacity upgrades
+    - Volatile patterns suggest unreliable service delivery
+    
+    Args:
+        monthly: Monthly district aggregate (build_monthly_district_aggregate)
+        
+    Returns:
+        pd.DataFrame: ISI scores indexed by district_id (NaN if no dated months)
+    """
+    print("[INFO] Computing Infrastructure Stress Index (ISI)...")
+    
+    # Calculate statistics per district
+    district_stats = _dated_district_months(monthly).groupby('district_id').agg(
+        mean_volume=('total_bio', 'mean'),
+        std_volume=('total_bio', 'std'),
+        max_volume=('total_bio', 'max'),
+        months_active=('year_month', 'count')
+    )
+    
+    district_stats = _stress_from_stats(district_stats)
+    
     print(f"[INFO] ISI computed for {len(district_stats)} districts")
     
-    return district_stats[['state', 'district', 'ISI', 'mean_volume', 'cv', 'months_active']]
+    return district_stats[['ISI', 'mean_volume', 'cv', 'months_active']].reindex(_district_index(monthly))
 
 
-def compute_reporting_consistency_score(df):
+def compute_reporting_consistency_score(monthly):
     """
     Compute Reporting Consistency Score (RCS) for each district.
     
@@ -163,26 +391,23 @@ def compute_reporting_consistency_score(df):
     - Gaps in reporting may hide service delivery failures
     
     Args:
-        df: Biometric data with year_month column
+        monthly: Monthly district aggregate (build_monthly_district_aggregate)
         
     Returns:
-        pd.DataFrame: District-level RCS scores
+        pd.DataFrame: RCS scores indexed by district_id (NaN if never reported)
     """
     print("[INFO] Computing Reporting Consistency Score (RCS)...")
     
     # Get all unique months in the dataset
-    all_months = df['year_month'].unique()
-    total_possible_months = len(all_months)
+    total_possible_months = monthly['year_month'].nunique(dropna=False)
     
     print(f"[INFO] Total months in dataset: {total_possible_months}")
     
-    # Count months with non-zero reporting per district
-    monthly_reporting = df.groupby(['state', 'district', 'year_month'])['total_bio'].sum().reset_index()
-    
-    # Count months with actual transactions (non-zero)
+    # Count months with actual transactions (non-zero) per district
+    monthly_reporting = _dated_district_months(monthly)
     district_months = monthly_reporting[monthly_reporting['total_bio'] > 0].groupby(
-        ['state', 'district']
-    ).size().reset_index(name='months_with_data')
+        'district_id'
+    ).size().to_frame(name='months_with_data')
     
     # RCS = months_with_data / total_possible_months
     district_months['RCS'] = district_months['months_with_data'] / total_possible_months
@@ -192,16 +417,53 @@ def compute_reporting_consistency_score(df):
     
     print(f"[INFO] RCS computed for {len(district_months)} districts")
     
-    return district_months[['state', 'district', 'RCS', 'months_with_data']]
+    return district_months[['RCS', 'months_with_data']].reindex(_district_index(monthly))
 
 
-def compute_age_balance_score(df):
+def _age_balance_from_totals(district_age, total_cols, prop_cols):
+    """
+    Score ABS from per-district age bucket totals.
+    
+    Shared by the full run and the incremental refresh.
+    
+    Args:
+        district_age: DataFrame with one total column per age bucket
+        total_cols: Age bucket total columns
+        prop_cols: Names of the proportion columns to create
+        
+    Returns:
+        pd.DataFrame: district_age with proportion and ABS columns added
+    """
+    # Total transactions
+    district_age['total'] = district_age[total_cols].sum(axis=1)
+    
+    # Calculate proportions (division by zero -> 0)
+    for total, prop in zip(total_cols, prop_cols):
+        district_age[prop] = (district_age[total] / district_age['total']).fillna(0)
+    
+    # Balance Score using entropy-based approach
+    # Entropy = -sum(p * log2(p)) for p > 0, max entropy = log2(N) (even split)
+    entropy = np.zeros(len(district_age))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for prop in prop_cols:
+            p = district_age[prop].to_numpy()
+            entropy -= np.where(p > 0, p * np.log2(p), 0.0)
+    
+    district_age['ABS'] = entropy / np.log2(len(prop_cols))
+    
+    # Ensure ABS is in 0-1 range
+    district_age['ABS'] = district_age['ABS'].clip(0, 1)
+    
+    return district_age
+
+
+def compute_age_balance_score(monthly, age_buckets=None):
     """
     Compute Age Balance Score (ABS) for each district.
     
     Methodology:
     - Measures how evenly distributed transactions are across age groups
-    - Uses normalized entropy / Gini-like measure
+    - Uses normalized entropy: -sum(p * log2(p)) / log2(N) for N age buckets
     - Higher score = more balanced age distribution
     - Lower score = one age group dominates (potential bias)
     
@@ -210,56 +472,234 @@ def compute_age_balance_score(df):
     - Dominance by single age group may indicate targeting gaps
     
     Args:
-        df: Biometric data with age group columns
+        monthly: Monthly district aggregate carrying the age bucket columns
+        age_buckets: Mapping of age column -> bucket label; defaults to the
+                     biometric buckets (use ENROLMENT_AGE_BUCKETS for enrolment)
         
     Returns:
-        pd.DataFrame: District-level ABS scores
+        pd.DataFrame: ABS scores indexed by district_id, one prop_<label> column per bucket
     """
     print("[INFO] Computing Age Balance Score (ABS)...")
     
-    # Aggregate total transactions per age group per district
-    district_age = df.groupby(['state', 'district']).agg(
-        total_5_17=('bio_age_5_17', 'sum'),
-        total_17_plus=('bio_age_17_', 'sum')
-    ).reset_index()
+    if age_buckets is None:
+        age_buckets = BIOMETRIC_AGE_BUCKETS
     
-    # Total transactions
-    district_age['total'] = district_age['total_5_17'] + district_age['total_17_plus']
+    total_cols = [f"total_{label}" for label in age_buckets.values()]
+    prop_cols = [f"prop_{label}" for label in age_buckets.values()]
     
-    # Calculate proportions
-    district_age['prop_5_17'] = district_age['total_5_17'] / district_age['total']
-    district_age['prop_17_plus'] = district_age['total_17_plus'] / district_age['total']
+    # Aggregate total transactions per age group per district (all months,
+    # including records without a parseable date)
+    district_age = monthly[monthly['district_id'] >= 0].groupby('district_id').agg(
+        **{total: (col, 'sum') for col, total in zip(age_buckets, total_cols)}
+    )
     
-    # Handle division by zero
-    district_age['prop_5_17'] = district_age['prop_5_17'].fillna(0)
-    district_age['prop_17_plus'] = district_age['prop_17_plus'].fillna(0)
+    district_age = _age_balance_from_totals(district_age, total_cols, prop_cols)
     
-    # Balance Score using entropy-based approach
-    # For 2 categories, max entropy = log2(2) = 1 (when 50-50 split)
-    # Entropy = -sum(p * log2(p)) for p > 0
-    def calculate_entropy(row):
-        props = [row['prop_5_17'], row['prop_17_plus']]
-        entropy = 0
-        for p in props:
-            if p > 0:
-                entropy -= p * np.log2(p)
-        # Normalize by max entropy (log2(2) = 1)
-        return entropy / 1.0  # Already normalized for 2 categories
-    
-    district_age['ABS'] = district_age.apply(calculate_entropy, axis=1)
+    print(f"[INFO] ABS computed for {len(district_age)} districts")
     
-    # Ensure ABS is in 0-1 range
-    district_age['ABS'] = district_age['ABS'].clip(0, 1)
+    return district_age[['ABS'] + prop_cols].reindex(_district_index(monthly))
+
+
+# ================================================================================
+# INCREMENTAL REFRESH (PERSISTED SUFFICIENT STATISTICS)
+# ================================================================================
+
+def build_index_state(monthly, age_buckets=None):
+    """
+    Reduce a monthly district aggregate to per-district sufficient statistics.
     
-    print(f"[INFO] ABS computed for {len(district_age)} districts")
+    State columns (one row per district):
+    - n_months, mean_volume, m2_volume, max_volume: Welford accumulators of
+      the monthly biometric totals (ISI)
+    - months_with_data: count of months with non-zero totals (RCS)
+    - total_<label>: age bucket totals (ABS)
     
-    return district_age[['state', 'district', 'ABS', 'prop_5_17', 'prop_17_plus']]
+    Args:
+        monthly: Monthly district aggregate (build_monthly_district_aggregate)
+        age_buckets: Mapping of age column -> bucket label
+        
+    Returns:
+        tuple: (state DataFrame, metadata dict with the months covered)
+    """
+    if age_buckets is None:
+        age_buckets = BIOMETRIC_AGE_BUCKETS
+    
+    index = _district_index(monthly)
+    dated = _dated_district_months(monthly)
+    volume = dated.groupby('district_id')['total_bio']
+    
+    stats = pd.DataFrame({
+        'n_months': volume.count(),
+        'mean_volume': volume.mean(),
+        'm2_volume': volume.var(ddof=0) * volume.count(),
+        'max_volume': volume.max(),
+        'months_with_data': (dated['total_bio'] > 0).groupby(dated['district_id']).sum(),
+    }).reindex(index).fillna(0)
+    stats['n_months'] = stats['n_months'].astype(int)
+    stats['months_with_data'] = stats['months_with_data'].astype(int)
+    
+    totals = monthly[monthly['district_id'] >= 0].groupby('district_id')[list(age_buckets)].sum()
+    totals.columns = [f"total_{label}" for label in age_buckets.values()]
+    
+    state = combine_indices(get_district_keys(monthly), stats, totals.reindex(index))
+    
+    meta = {
+        'months': sorted(str(m) for m in dated['year_month'].unique()),
+        'has_undated': bool(monthly['year_month'].isna().any()),
+        'age_buckets': dict(age_buckets),
+    }
+    
+    return state, meta
+
+
+def fold_into_state(state, meta, monthly_new):
+    """
+    Fold the aggregate of newly landed month(s) into the persisted state.
+    
+    Welford accumulators are combined with the parallel-variance update
+    (Chan et al.), so only the new months are ever aggregated.
+    
+    Args:
+        state: Persisted per-district state
+        meta: Persisted state metadata
+        monthly_new: Monthly district aggregate of the new data only
+        
+    Returns:
+        tuple: (updated state, updated metadata)
+    """
+    new_months = sorted(str(m) for m in monthly_new['year_month'].dropna().unique())
+    if meta['months'] and new_months and min(new_months) <= max(meta['months']):
+        raise ValueError(
+            f"New data starts at {min(new_months)} but the state already covers up to "
+            f"{max(meta['months'])}; run a full rebuild instead of a refresh"
+        )
+    
+    batch, batch_meta = build_index_state(monthly_new, meta['age_buckets'])
+    
+    # Align old and new statistics on the union of districts (sorted order)
+    keys = ['state', 'district']
+    old = state.set_index(keys)
+    new = batch.set_index(keys)
+    districts = old.index.union(new.index).sort_values()
+    old = old.reindex(districts).fillna(0)
+    new = new.reindex(districts).fillna(0)
+    
+    n_a, n_b = old['n_months'].to_numpy(), new['n_months'].to_numpy()
+    n = n_a + n_b
+    delta = new['mean_volume'].to_numpy() - old['mean_volume'].to_numpy()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        weight = np.where(n > 0, n_b / n, 0.0)
+        correction = np.where(n > 0, delta ** 2 * n_a * n_b / n, 0.0)
+    
+    merged = old + new
+    merged['n_months'] = n.astype(int)
+    merged['mean_volume'] = old['mean_volume'].to_numpy() + delta * weight
+    merged['m2_volume'] = old['m2_volume'].to_numpy() + new['m2_volume'].to_numpy() + correction
+    merged['max_volume'] = np.maximum(old['max_volume'].to_numpy(), new['max_volume'].to_numpy())
+    merged['months_with_data'] = merged['months_with_data'].astype(int)
+    
+    meta = {
+        'months': sorted(set(meta['months']) | set(new_months)),
+        'has_undated': meta['has_undated'] or batch_meta['has_undated'],
+        'age_buckets': meta['age_buckets'],
+    }
+    
+    return merged.reset_index(), meta
+
+
+def compute_indices_from_state(state, meta):
+    """
+    Re-normalize ISI, RCS and ABS from persisted sufficient statistics.
+    
+    Args:
+        state: Per-district state (build_index_state / fold_into_state)
+        meta: State metadata
+        
+    Returns:
+        pd.DataFrame: Same columns as the full run's combined indices
+    """
+    index = pd.RangeIndex(len(state), name='district_id')
+    
+    # ISI: districts with at least one dated month
+    active = state[state['n_months'] > 0]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        std_volume = np.sqrt(active['m2_volume'] / (active['n_months'] - 1))
+    district_stats = pd.DataFrame({
+        'mean_volume': active['mean_volume'],
+        'std_volume': std_volume.where(active['n_months'] > 1),
+        'months_active': active['n_months'],
+    })
+    isi_df = _stress_from_stats(district_stats)[['ISI', 'mean_volume', 'cv', 'months_active']]
+    
+    # RCS: months with data over all months seen (undated records count once)
+    total_possible_months = len(meta['months']) + int(meta['has_undated'])
+    reporting = state.loc[state['months_with_data'] > 0, ['months_with_data']]
+    reporting['RCS'] = (reporting['months_with_data'] / total_possible_months).clip(0, 1)
+    
+    # ABS: age bucket totals
+    labels = list(meta['age_buckets'].values())
+    total_cols = [f"total_{label}" for label in labels]
+    prop_cols = [f"prop_{label}" for label in labels]
+    abs_df = _age_balance_from_totals(state[total_cols].copy(), total_cols, prop_cols)
+    abs_df['ABS'] = abs_df['ABS'].clip(0, 1)
+    
+    return combine_indices(
+        state[['state', 'district']],
+        isi_df.reindex(index),
+        reporting[['RCS', 'months_with_data']].reindex(index),
+        abs_df[['ABS'] + prop_cols],
+    )
+
+
+def save_index_state(state, meta):
+    """Persist the per-district state and its metadata to OUTPUT_DIR."""
+    state.to_csv(STATE_OUTPUT, index=False)
+    with open(STATE_META_OUTPUT, 'w') as f:
+        json.dump(meta, f, indent=2)
+    print(f"[SAVED] {STATE_OUTPUT}")
+    print(f"[SAVED] {STATE_META_OUTPUT}")
+
+
+def load_index_state():
+    """
+    Load the persisted per-district state.
+    
+    Returns:
+        tuple: (state DataFrame, metadata dict)
+    """
+    if not os.path.exists(STATE_OUTPUT) or not os.path.exists(STATE_META_OUTPUT):
+        raise FileNotFoundError(
+            f"Index state not found in {OUTPUT_DIR}; run a full analysis first"
+        )
+    
+    state = pd.read_csv(STATE_OUTPUT, keep_default_na=False, na_values=[''])
+    with open(STATE_META_OUTPUT) as f:
+        meta = json.load(f)
+    
+    return state, meta
 
 
 # ================================================================================
 # TYPOLOGY CLASSIFICATION
 # ================================================================================
 
+def _typology_codes(isi, rcs, abs_score, isi_threshold=TYPOLOGY_THRESHOLD,
+                    rcs_threshold=TYPOLOGY_THRESHOLD, abs_threshold=TYPOLOGY_THRESHOLD):
+    """
+    Typology rules as array expressions (indices into TYPOLOGIES).
+    
+    All arguments broadcast against each other, so a grid of thresholds
+    can be evaluated for every district in one call.
+    """
+    conditions = [
+        (rcs > rcs_threshold) & (isi < isi_threshold) & (abs_score > abs_threshold),
+        (rcs > rcs_threshold) & (isi >= isi_threshold),
+        (rcs <= rcs_threshold) & (isi < isi_threshold),
+    ]
+    # First matching rule wins
+    return np.select(conditions, [np.int8(0), np.int8(1), np.int8(2)], default=np.int8(3))
+
+
 def classify_districts(indices_df):
     """
     Classify districts into four typologies based on composite indices.
@@ -296,22 +736,8 @@ def classify_districts(indices_df):
     
     df = indices_df.copy()
     
-    def assign_typology(row):
-        isi = row['ISI']
-        rcs = row['RCS']
-        abs_score = row['ABS']
-        
-        # Classification logic based on thresholds
-        if rcs > 0.5 and isi < 0.5 and abs_score > 0.5:
-            return "Digitally Strong & Balanced"
-        elif rcs > 0.5 and isi >= 0.5:
-            return "Digitally Strong but Overburdened"
-        elif rcs <= 0.5 and isi < 0.5:
-            return "Digitally Weak but Stable"
-        else:
-            return "Digitally Underserved"
-    
-    df['typology'] = df.apply(assign_typology, axis=1)
+    codes = _typology_codes(df['ISI'].to_numpy(), df['RCS'].to_numpy(), df['ABS'].to_numpy())
+    df['typology'] = np.array(TYPOLOGIES, dtype=object)[codes]
     
     # Count typologies
     typology_counts = df['typology'].value_counts()
@@ -323,56 +749,115 @@ def classify_districts(indices_df):
 
 
 # ================================================================================
-# MAIN EXECUTION
+# SENSITIVITY ANALYSIS
 # ================================================================================
 
-def main():
-    """
-    Main execution function for PS-3 Digital Infrastructure Readiness analysis.
-    
-    Workflow:
-    1. Load biometric transaction data
-    2. Compute ISI, RCS, ABS indices
-    3. Merge indices into composite dataset
-    4. Classify districts into typologies
-    5. Save outputs to CSV
+def run_sensitivity_analysis(indices_df, weight_grid=SENSITIVITY_WEIGHT_GRID,
+                             threshold_grid=SENSITIVITY_THRESHOLD_GRID):
     """
-    print("=" * 80)
-    print("DIGITAL INFRASTRUCTURE READINESS vs GROUND REALITY (PS-3)")
-    print("UIDAI Data Hackathon 2026 | Team Bharat Bytes")
-    print("=" * 80)
-    print()
-    
-    start_time = datetime.now()
-    
-    # Ensure output directory exists
-    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    Evaluate typology robustness over a grid of ISI weights and thresholds.
     
-    # Step 1: Load data
-    print("[STEP 1/5] Loading biometric data...")
-    df = load_biometric_data()
-    print()
-    
-    # Step 2: Compute indices
-    print("[STEP 2/5] Computing Infrastructure Stress Index (ISI)...")
-    isi_df = compute_infrastructure_stress_index(df)
-    print()
-    
-    print("[STEP 3/5] Computing Reporting Consistency Score (RCS)...")
-    rcs_df = compute_reporting_consistency_score(df)
-    print()
-    
-    print("[STEP 4/5] Computing Age Balance Score (ABS)...")
-    abs_df = compute_age_balance_score(df)
-    print()
-    
-    # Step 3: Merge all indices
-    print("[STEP 5/5] Merging indices and classifying districts...")
+    Methodology:
+    - ISI is rebuilt from its normalized volume and CV components for every
+      volume weight w (volatility weight 1 - w) as a (weights x districts) array
+    - Typology rules are broadcast over independent ISI, RCS and ABS thresholds
+    - Each district's typology per configuration is compared with its
+      typology under the default configuration
     
-    # Merge on state + district
-    indices_df = isi_df.merge(rcs_df, on=['state', 'district'], how='outer')
-    indices_df = indices_df.merge(abs_df, on=['state', 'district'], how='outer')
+    Args:
+        indices_df: Combined indices after fill/round (save_outputs)
+        weight_grid: ISI volume weights to evaluate
+        threshold_grid: Thresholds to evaluate for each of ISI, RCS and ABS
+        
+    Returns:
+        pd.DataFrame: Per-district stability, flip frequencies and typology shares
+    """
+    print("[INFO] Running typology sensitivity analysis...")
+    
+    weights = np.asarray(weight_grid, dtype=float)
+    thresholds = np.asarray(threshold_grid, dtype=float)
+    n_configs = len(weights) * len(thresholds) ** 3
+    print(f"[INFO] Evaluating {n_configs:,} weight/threshold configurations "
+          f"for {len(indices_df)} districts")
+    
+    # Normalized ISI components (same as _stress_from_stats)
+    mean_volume = indices_df['mean_volume'].to_numpy(dtype=float)
+    cv = indices_df['cv'].to_numpy(dtype=float)
+    max_volume = np.nanmax(mean_volume)
+    max_cv = np.nanmax(cv)
+    volume_normalized = mean_volume / max_volume if max_volume > 0 else np.zeros_like(mean_volume)
+    cv_normalized = cv / max_cv if max_cv > 0 else np.zeros_like(cv)
+    
+    # ISI for every weight: (weights, districts), min-max normalized per weight
+    isi = weights[:, None] * volume_normalized + (1 - weights[:, None]) * cv_normalized
+    isi_min = np.nanmin(isi, axis=1, keepdims=True)
+    isi_range = np.nanmax(isi, axis=1, keepdims=True) - isi_min
+    with np.errstate(invalid='ignore', divide='ignore'):
+        isi = np.where(isi_range > 0, (isi - isi_min) / isi_range, 0.0)
+    isi = np.round(np.nan_to_num(isi, nan=0.0), 4)
+    
+    rcs = indices_df['RCS'].to_numpy(dtype=float)
+    abs_score = indices_df['ABS'].to_numpy(dtype=float)
+    
+    baseline = _typology_codes(indices_df['ISI'].to_numpy(), rcs, abs_score)
+    
+    # Threshold axes: (isi_t, rcs_t, abs_t, districts)
+    isi_t = thresholds[:, None, None, None]
+    rcs_t = thresholds[None, :, None, None]
+    abs_t = thresholds[None, None, :, None]
+    
+    counts = np.zeros((len(TYPOLOGIES), len(indices_df)))
+    weight_flips = np.zeros(len(indices_df))
+    default_t = np.flatnonzero(np.isclose(thresholds, TYPOLOGY_THRESHOLD))
+    threshold_flips = np.zeros(len(indices_df))
+    default_w = np.flatnonzero(np.isclose(weights, ISI_VOLUME_WEIGHT))
+    
+    # One broadcast evaluation of all threshold combinations per weight
+    for w in range(len(weights)):
+        codes = _typology_codes(isi[w], rcs, abs_score, isi_t, rcs_t, abs_t)
+        for k in range(len(TYPOLOGIES)):
+            counts[k] += (codes == k).sum(axis=(0, 1, 2))
+        if len(default_t):
+            t = default_t[0]
+            weight_flips += codes[t, t, t] != baseline
+        if len(default_w) and w == default_w[0]:
+            threshold_flips = (codes != baseline).mean(axis=(0, 1, 2))
+    
+    shares = counts / n_configs
+    stability = shares[baseline, np.arange(len(indices_df))]
+    
+    result = indices_df[['state', 'district']].copy()
+    result['typology'] = np.array(TYPOLOGIES, dtype=object)[baseline]
+    result['stability'] = stability.round(4)
+    result['flip_frequency'] = (1 - stability).round(4)
+    result['weight_flip_frequency'] = (weight_flips / len(weights)).round(4)
+    result['threshold_flip_frequency'] = np.round(threshold_flips, 4)
+    result['modal_typology'] = np.array(TYPOLOGIES, dtype=object)[shares.argmax(axis=0)]
+    for k, typology in enumerate(TYPOLOGIES):
+        column = 'share_' + typology.lower().replace('digitally ', '').replace('& ', '').replace(' ', '_')
+        result[column] = shares[k].round(4)
+    
+    print(f"[INFO] Mean typology stability: {result['stability'].mean():.4f}")
+    print(f"[INFO] Districts stable in >= 90% of configurations: "
+          f"{(result['stability'] >= 0.9).sum()} of {len(result)}")
+    print("[INFO] Mean stability by typology:")
+    for typology, value in result.groupby('typology')['stability'].mean().items():
+        print(f"       - {typology}: {value:.4f}")
+    
+    return result
+
+
+# ================================================================================
+# MAIN EXECUTION
+# ================================================================================
+
+def save_outputs(indices_df):
+    """
+    Fill, round and classify combined indices, then save and summarize them.
     
+    Args:
+        indices_df: Combined indices (full run or incremental refresh)
+    """
     # Fill any missing scores with 0
     indices_df['ISI'] = indices_df['ISI'].fillna(0)
     indices_df['RCS'] = indices_df['RCS'].fillna(0)
@@ -383,11 +868,11 @@ def main():
     indices_df['RCS'] = indices_df['RCS'].round(4)
     indices_df['ABS'] = indices_df['ABS'].round(4)
     
-    # Step 4: Classify districts
+    # Classify districts
     typology_df = classify_districts(indices_df)
     print()
     
-    # Step 5: Save outputs
+    # Save outputs
     print("[OUTPUT] Saving results...")
     
     # Select columns for indices output
@@ -417,6 +902,187 @@ def main():
     print(f"  - ABS (Age Balance): min={indices_df['ABS'].min():.4f}, "
           f"max={indices_df['ABS'].max():.4f}, mean={indices_df['ABS'].mean():.4f}")
     print()
+
+
+def load_saved_indices(indices_file=INDICES_OUTPUT, typology_file=TYPOLOGY_OUTPUT):
+    """
+    Saved indices joined with their typology, under canonical district names.
+
+    Files written before district reconciliation can list a variant spelling
+    (e.g. "Nicobars") next to its canonical district; the row with the most
+    months of data is kept for each district.
+
+    Returns:
+        pd.DataFrame: Indices (and typology) per district; empty if not saved
+    """
+    if not os.path.exists(indices_file):
+        return pd.DataFrame()
+    indices = pd.read_csv(indices_file)
+    if os.path.exists(typology_file):
+        indices = indices.merge(pd.read_csv(typology_file), on=['state', 'district'], how='left')
+
+    indices = apply_district_mapping(indices)
+    kept = indices.sort_values('months_with_data', ascending=False, kind='stable') \
+        .drop_duplicates(['state', 'district']).index
+    return indices.loc[indices.index.isin(kept)].reset_index(drop=True)
+
+
+def save_sensitivity(indices_df):
+    """Run the sensitivity analysis on final indices and save the report."""
+    print("[SENSITIVITY] Evaluating typology robustness...")
+    sensitivity_df = run_sensitivity_analysis(indices_df)
+    sensitivity_df.to_csv(SENSITIVITY_OUTPUT, index=False)
+    print(f"[SAVED] {SENSITIVITY_OUTPUT}")
+    print()
+
+
+def main(run_sensitivity=False, profile_memory=False, memory_budget_mb=None):
+    """
+    Main execution function for PS-3 Digital Infrastructure Readiness analysis.
+    
+    Workflow:
+    1. Load biometric transaction data
+    2. Build the monthly district aggregate (single pass over raw data, or
+       read from the aggregate service when UIDAI_AGGREGATE_SERVICE is set)
+    3. Compute ISI, RCS, ABS indices from the aggregate
+    4. Combine indices into one aligned dataset and classify districts
+    5. Save outputs and the per-district state used by refresh()
+    6. Optionally run the weight/threshold sensitivity analysis
+    
+    Args:
+        run_sensitivity: Also save the typology sensitivity report
+        profile_memory: Record peak memory, copies and largest frames per stage
+        memory_budget_mb: Memory budget in MB; if loading the raw table is
+                          expected to exceed it, the aggregate is built chunk
+                          by chunk instead
+    """
+    print("=" * 80)
+    print("DIGITAL INFRASTRUCTURE READINESS vs GROUND REALITY (PS-3)")
+    print("UIDAI Data Hackathon 2026 | Team Bharat Bytes")
+    print("=" * 80)
+    print()
+    
+    start_time = datetime.now()
+    
+    # Ensure output directory exists
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    
+    monitor = StageMemoryMonitor("readiness", enabled=profile_memory, budget_mb=memory_budget_mb)
+    csv_mb = os.path.getsize(BIOMETRIC_FILE) / 2**20 if os.path.exists(BIOMETRIC_FILE) else 0.0
+    
+    monthly = None
+    if service_url():
+        # Steps 1-2 answered by the service's warm cube (local loading if it fails)
+        print("[STEP 1/6] Loading biometric data (aggregate service)...")
+        print("[STEP 2/6] Building monthly district aggregate (aggregate service)...")
+        try:
+            with monitor.stage('aggregate', mode='service'):
+                monthly = build_monthly_district_aggregate_service()
+        except (ConnectionError, ValueError) as e:
+            print(f"[WARN] Aggregate service query failed ({e}); loading the biometric data locally")
+        print()
+    
+    if monthly is None and monitor.exceeds_budget('load', csv_mb):
+        # Steps 1-2 fused: only one chunk of raw rows is held at a time
+        print("[STEP 1/6] Loading biometric data (chunked)...")
+        print("[STEP 2/6] Building monthly district aggregate (chunked)...")
+        with monitor.stage('aggregate', input_mb=csv_mb, mode='chunked'):
+            monthly = build_monthly_district_aggregate_chunked()
+        print()
+    elif monthly is None:
+        # Step 1: Load data
+        print("[STEP 1/6] Loading biometric data...")
+        with monitor.stage('load', input_mb=csv_mb):
+            df = load_biometric_data()
+        print()
+        
+        # Step 2: Single pass over the raw table
+        print("[STEP 2/6] Building monthly district aggregate...")
+        with monitor.stage('aggregate', input_mb=frame_mb(df)):
+            monthly = build_monthly_district_aggregate(df)
+        del df
+        print()
+    
+    # Step 3: Compute indices from the shared aggregate
+    monthly_mb = frame_mb(monthly)
+    print("[STEP 3/6] Computing Infrastructure Stress Index (ISI)...")
+    with monitor.stage('isi', input_mb=monthly_mb):
+        isi_df = compute_infrastructure_stress_index(monthly)
+    print()
+    
+    print("[STEP 4/6] Computing Reporting Consistency Score (RCS)...")
+    with monitor.stage('rcs', input_mb=monthly_mb):
+        rcs_df = compute_reporting_consistency_score(monthly)
+    print()
+    
+    print("[STEP 5/6] Computing Age Balance Score (ABS)...")
+    with monitor.stage('abs', input_mb=monthly_mb):
+        abs_df = compute_age_balance_score(monthly)
+    print()
+    
+    # Step 4: Combine indices (all positioned by district_id)
+    print("[STEP 6/6] Combining indices and classifying districts...")
+    with monitor.stage('combine', input_mb=monthly_mb):
+        indices_df = combine_indices(get_district_keys(monthly), isi_df, rcs_df, abs_df)
+        
+        # Step 5: Save outputs and refresh state
+        save_outputs(indices_df)
+        save_index_state(*build_index_state(monthly))
+    print()
+    
+    if run_sensitivity:
+        with monitor.stage('sensitivity'):
+            save_sensitivity(indices_df)
+    
+    if monitor.enabled:
+        monitor.print_report(monitor.finish())
+        print()
+    
+    elapsed = datetime.now() - start_time
+    print(f"Execution time: {elapsed.total_seconds():.2f} seconds")
+    print("=" * 80)
+
+
+def refresh(new_data_file, run_sensitivity=False):
+    """
+    Incrementally refresh the indices with newly landed month(s) of data.
+    
+    Only the new file is aggregated; its statistics are folded into the
+    persisted per-district state and the indices are re-normalized.
+    
+    Args:
+        new_data_file: Biometric CSV containing only the new month(s)
+        run_sensitivity: Also save the typology sensitivity report
+    """
+    print("=" * 80)
+    print("DIGITAL INFRASTRUCTURE READINESS - INCREMENTAL REFRESH")
+    print("=" * 80)
+    print()
+    
+    start_time = datetime.now()
+    
+    print("[STEP 1/4] Loading persisted index state...")
+    state, meta = load_index_state()
+    print(f"[INFO] State covers {len(state)} districts, months {meta['months'][0]} to {meta['months'][-1]}")
+    print()
+    
+    print("[STEP 2/4] Loading new biometric data...")
+    monthly_new = build_monthly_district_aggregate(load_biometric_data(new_data_file))
+    print()
+    
+    print("[STEP 3/4] Folding new months into state...")
+    state, meta = fold_into_state(state, meta, monthly_new)
+    print(f"[INFO] State now covers {len(state)} districts, {len(meta['months'])} months")
+    print()
+    
+    print("[STEP 4/4] Re-normalizing indices and classifying districts...")
+    indices_df = compute_indices_from_state(state, meta)
+    save_outputs(indices_df)
+    save_index_state(state, meta)
+    print()
+    
+    if run_sensitivity:
+        save_sensitivity(indices_df)
     
     elapsed = datetime.now() - start_time
     print(f"Execution time: {elapsed.total_seconds():.2f} seconds")
@@ -424,4 +1090,22 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="PS-3 Digital Infrastructure Readiness analysis")
+    parser.add_argument("--refresh", metavar="NEW_DATA_CSV",
+                        help="fold a biometric CSV of new month(s) into the persisted state "
+                             "instead of recomputing over the full history")
+    parser.add_argument("--sensitivity", action="store_true",
+                        help="also evaluate typology stability over a grid of ISI weights "
+                             "and thresholds")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="record peak memory, copies and largest frames per stage "
+                             "(appended to outputs/stage_memory_profile.csv)")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="memory budget; if the raw table would exceed it, aggregate "
+                             "it chunk by chunk")
+    args = parser.parse_args()
+    if args.refresh:
+        refresh(args.refresh, run_sensitivity=args.sensitivity)
+    else:
+        main(run_sensitivity=args.sensitivity, profile_memory=args.profile_memory,
+             memory_budget_mb=args.memory_budget)
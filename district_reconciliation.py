@@ -0,0 +1,336 @@
+"""
+================================================================================
+DISTRICT RECONCILIATION - CANONICAL DISTRICT NAMES ACROSS DATASETS
+================================================================================
+
+District spellings differ within and between the enrolment, demographic and
+biometric feeds ("Nicobar" / "Nicobars", "Rangareddy" / "Ranga Reddy",
+"Medchal-Malkajgiri" / "Medchal Malkajgiri"). Joins on the district name
+then produce phantom districts with NaN metrics.
+
+This stage collects every distinct (state, district) spelling of the three
+consolidated datasets and clusters the spellings of each state:
+  - spellings with the same match key (lower case, '&' -> 'and', letters
+    and digits only) are the same district,
+  - other pairs are candidates if they share character trigrams, found
+    through a per-state inverted trigram index (blocking by state keeps
+    the work near-linear in the number of districts), and are merged when
+    their trigram Dice similarity reaches SIMILARITY_THRESHOLD, their
+    digits agree and so do their qualifier words (North/South/East/West,
+    Upper/Lower, ...): "East Khasi Hills" and "Eastern West Khasi Hills"
+    are different districts however similar their spellings.
+
+Each cluster's canonical spelling is the cleanest one (plain characters,
+title case), then the one present in most datasets, then the one with most
+records. The variant -> canonical mapping is persisted to
+outputs/district_name_mapping.csv; loaders apply it to the raw names with
+apply_district_mapping(), a dictionary lookup on the rows that need it. The
+file is derived from the local datasets and not versioned: the first loader
+that finds it missing builds it.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import re
+import argparse
+from collections import Counter, defaultdict
+
+import pandas as pd
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FILTERED_DATA_DIR = os.path.join(BASE_DIR, "filtered_data")
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+MAPPING_FILE = os.path.join(OUTPUT_DIR, "district_name_mapping.csv")
+
+DATASETS = ['enrolment', 'demographic', 'biometric']
+
+# Character n-gram length and minimum Dice similarity for a fuzzy match
+NGRAM = 3
+SIMILARITY_THRESHOLD = 0.8
+
+# CSV rows read per chunk while collecting names
+CHUNK_ROWS = 1_000_000
+
+MAPPING_COLUMNS = ['state', 'district', 'canonical_district', 'similarity', 'records']
+
+# Words that tell neighbouring districts apart; spellings only match when
+# they carry the same ones (synonyms map to the same qualifier)
+QUALIFIERS = {
+    'north': 'north', 'northern': 'north', 'uttar': 'north',
+    'south': 'south', 'southern': 'south', 'dakshin': 'south', 'dakshina': 'south',
+    'east': 'east', 'eastern': 'east', 'purba': 'east', 'purbi': 'east', 'purv': 'east',
+    'west': 'west', 'western': 'west', 'paschim': 'west', 'pashchim': 'west', 'paschimi': 'west',
+    'central': 'central', 'madhya': 'central',
+    'upper': 'upper', 'lower': 'lower',
+    'rural': 'rural', 'urban': 'urban',
+    'new': 'new', 'old': 'old',
+}
+
+
+# ================================================================================
+# NAME KEYS AND SIMILARITY
+# ================================================================================
+
+def match_key(name):
+    """Spelling-insensitive key: lower case, '&' as 'and', letters and digits only."""
+    return re.sub(r'[^a-z0-9]', '', str(name).lower().replace('&', 'and'))
+
+
+def qualifiers(name):
+    """Qualifier words of a district spelling (see QUALIFIERS)."""
+    words = re.findall(r'[a-z]+', str(name).lower())
+    return frozenset(QUALIFIERS[word] for word in words if word in QUALIFIERS)
+
+
+def spelling_quality(name):
+    """
+    How presentable a spelling is, 0-2: one point for plain characters
+    without stray spaces ('*', '?', unicode dashes and "( " fail), one for
+    title casing (every word of four or more letters capitalized).
+    """
+    name = str(name)
+    plain = name == name.strip() and re.fullmatch(r"[A-Za-z0-9 .,&()'-]+", name) is not None \
+        and re.search(r"  |\( | \)", name) is None
+    words = re.findall(r'[A-Za-z]+', name)
+    cased = bool(words) and all(word[0].isupper() and not word[1:].isupper()
+                                for word in words if len(word) >= 4)
+    return int(plain) + int(cased)
+
+
+def ngrams(key, n=NGRAM):
+    """Padded character n-grams of a match key."""
+    padded = '#' * (n - 1) + key + '#'
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def dice(grams_a, grams_b):
+    """Dice similarity of two n-gram sets."""
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class _UnionFind:
+    def __init__(self, items):
+        self.parent = {item: item for item in items}
+
+    def find(self, item):
+        while self.parent[item] != item:
+            self.parent[item] = self.parent[self.parent[item]]
+            item = self.parent[item]
+        return item
+
+    def union(self, a, b):
+        self.parent[self.find(a)] = self.find(b)
+
+
+# ================================================================================
+# RECONCILIATION
+# ================================================================================
+
+def collect_district_names(data_dir=FILTERED_DATA_DIR, datasets=DATASETS, chunk_rows=CHUNK_ROWS):
+    """
+    Distinct raw (state, district) spellings of the consolidated datasets.
+
+    Returns:
+        pd.DataFrame: state, district, records (all datasets), datasets
+                      (number of datasets using the spelling)
+    """
+    counts = []
+    for dataset in datasets:
+        path = os.path.join(data_dir, f"consolidated_{dataset}.csv")
+        if not os.path.exists(path):
+            print(f"[INFO] Skipping {dataset}: {path} not found")
+            continue
+        partials = [
+            chunk.groupby(['state', 'district']).size()
+            for chunk in pd.read_csv(path, usecols=['state', 'district'], dtype=str, chunksize=chunk_rows)
+        ]
+        if partials:
+            counts.append(pd.concat(partials).groupby(level=[0, 1]).sum().rename(dataset))
+
+    if not counts:
+        return pd.DataFrame(columns=['state', 'district', 'records', 'datasets'])
+    table = pd.concat(counts, axis=1).fillna(0)
+    names = pd.DataFrame({'records': table.sum(axis=1).astype('int64'),
+                          'datasets': (table > 0).sum(axis=1)})
+    names.index.names = ['state', 'district']
+    return names.reset_index()
+
+
+def _reconcile_block(block, threshold):
+    """Variant -> (canonical, similarity) for the spellings of one state."""
+    keys = {district: match_key(district) for district in block['district']}
+    distinct_keys = sorted(set(keys.values()) - {''})
+    grams = {key: ngrams(key) for key in distinct_keys}
+    key_qualifiers = defaultdict(frozenset)
+    for district, key in keys.items():
+        key_qualifiers[key] |= qualifiers(district)
+
+    # Inverted index: trigram -> keys containing it
+    postings = defaultdict(list)
+    for key in distinct_keys:
+        for gram in grams[key]:
+            postings[gram].append(key)
+
+    clusters = _UnionFind(distinct_keys)
+    for key in distinct_keys:
+        shared = Counter(other for gram in grams[key] for other in postings[gram] if other > key)
+        digits = re.sub(r'\D', '', key)
+        for other, common in shared.items():
+            if 2 * common / (len(grams[key]) + len(grams[other])) >= threshold \
+                    and re.sub(r'\D', '', other) == digits \
+                    and key_qualifiers[other] == key_qualifiers[key]:
+                clusters.union(key, other)
+
+    # Canonical spelling per cluster: best spelling_quality(), then most
+    # datasets, then most records, then name
+    block = block.assign(
+        cluster=[clusters.find(keys[d]) if keys[d] else None for d in block['district']],
+        proper=[spelling_quality(d) for d in block['district']],
+    )
+    ranked = block.dropna(subset=['cluster']).sort_values(
+        ['cluster', 'proper', 'datasets', 'records', 'district'], ascending=[True, False, False, False, True])
+    canonical = ranked.groupby('cluster')['district'].first()
+
+    mapping = {}
+    for district, cluster in zip(ranked['district'], ranked['cluster']):
+        target = canonical[cluster]
+        if district != target:
+            mapping[district] = (target, dice(grams[keys[district]], grams[keys[target]]))
+    return mapping
+
+
+def reconcile_districts(names, threshold=SIMILARITY_THRESHOLD):
+    """
+    Map district spellings to canonical names, state by state.
+
+    Args:
+        names: Output of collect_district_names()
+        threshold: Minimum trigram Dice similarity for a fuzzy match
+
+    Returns:
+        pd.DataFrame: state, district (variant), canonical_district,
+                      similarity, records; one row per variant
+    """
+    rows = []
+    block_keys = names['state'].astype(str).str.strip().str.title()
+    for _, block in names.groupby(block_keys, sort=True):
+        records = dict(zip(zip(block['state'], block['district']), block['records']))
+        spellings = block.groupby('district', as_index=False).agg(records=('records', 'sum'),
+                                                                  datasets=('datasets', 'max'))
+        mapping = _reconcile_block(spellings, threshold)
+        for (state, district), n_records in records.items():
+            if district in mapping:
+                target, similarity = mapping[district]
+                rows.append((state, district, target, round(similarity, 3), n_records))
+
+    mapping = pd.DataFrame(rows, columns=MAPPING_COLUMNS)
+    return mapping.sort_values(['state', 'canonical_district', 'district']).reset_index(drop=True)
+
+
+# ================================================================================
+# APPLYING THE MAPPING
+# ================================================================================
+
+_LOADED = {}
+
+
+def build_district_mapping(path=MAPPING_FILE, threshold=SIMILARITY_THRESHOLD):
+    """
+    Reconcile the consolidated datasets' spellings and save the mapping.
+
+    Returns:
+        tuple: (names, mapping) - outputs of collect_district_names() and
+               reconcile_districts()
+    """
+    names = collect_district_names(FILTERED_DATA_DIR)
+    mapping = reconcile_districts(names, threshold)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mapping.to_csv(path + ".tmp", index=False)
+    os.replace(path + ".tmp", path)
+    return names, mapping
+
+
+def load_district_mapping(path=MAPPING_FILE):
+    """
+    Persisted mapping as a {(state, district): canonical} dict.
+
+    Re-read only when the file changes. The default mapping is built first
+    if it is missing and consolidated datasets exist; otherwise (or for
+    other missing paths) the mapping is empty.
+    """
+    if not os.path.exists(path):
+        sources = [os.path.join(FILTERED_DATA_DIR, f"consolidated_{dataset}.csv") for dataset in DATASETS]
+        if path != MAPPING_FILE or not any(os.path.exists(source) for source in sources):
+            return {}
+        print(f"[INFO] {path} not found; reconciling district spellings")
+        build_district_mapping(path)
+    stamp = os.stat(path).st_mtime_ns
+    cached = _LOADED.get(path)
+    if cached is None or cached[0] != stamp:
+        mapping = pd.read_csv(path, dtype=str, keep_default_na=False)
+        lookup = dict(zip(zip(mapping['state'], mapping['district']), mapping['canonical_district']))
+        _LOADED[path] = cached = (stamp, lookup)
+    return cached[1]
+
+
+def apply_district_mapping(df, mapping=None, state_col='state', district_col='district'):
+    """
+    Replace variant district spellings with their canonical names (in place).
+
+    Only rows whose district is a known variant are looked up.
+
+    Args:
+        df: Frame with raw state and district columns
+        mapping: {(state, district): canonical} (defaults to the persisted mapping)
+
+    Returns:
+        pd.DataFrame: df
+    """
+    lookup = load_district_mapping() if mapping is None else mapping
+    if not lookup or district_col not in df.columns or state_col not in df.columns:
+        return df
+
+    hit = df[district_col].isin({district for _, district in lookup})
+    if hit.any():
+        pairs = zip(df.loc[hit, state_col], df.loc[hit, district_col])
+        df.loc[hit, district_col] = [lookup.get(pair, pair[1]) for pair in pairs]
+    return df
+
+
+# ================================================================================
+# MAIN
+# ================================================================================
+
+def main(threshold=SIMILARITY_THRESHOLD):
+    """
+    Rebuild outputs/district_name_mapping.csv from the consolidated datasets.
+
+    Args:
+        threshold: Minimum trigram Dice similarity for a fuzzy match
+    """
+    print("=" * 80)
+    print("DISTRICT NAME RECONCILIATION")
+    print("=" * 80)
+
+    names, mapping = build_district_mapping(MAPPING_FILE, threshold)
+    print(f"[INFO] {len(names):,} distinct state/district spellings in {names['state'].nunique()} states")
+    print(f"[INFO] {len(mapping):,} variant spellings mapped to "
+          f"{mapping[['state', 'canonical_district']].drop_duplicates().shape[0]:,} canonical districts")
+    if not mapping.empty:
+        print(mapping.head(20).to_string(index=False))
+    print(f"[SAVED] {MAPPING_FILE}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile district spellings across the datasets")
+    parser.add_argument("--threshold", type=float, default=SIMILARITY_THRESHOLD,
+                        help="minimum trigram Dice similarity for two spellings to be merged")
+    args = parser.parse_args()
+    main(threshold=args.threshold)
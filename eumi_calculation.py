@@ -28,6 +28,51 @@ def compute_eumi(df_enrollment, df_biometric):
     
     return merged_df
 
+# Function to compute district-level EUMI from record-level data
+# (shared by the dashboard and the aggregate query service)
+
+EUMI_CATEGORIES = ["Over-enrolled, under-used", "Balanced", "Under-enrolled, high-usage"]
+
+def compute_district_eumi(df_enrollment, df_biometric):
+    if df_enrollment.empty or df_biometric.empty:
+        return pd.DataFrame()
+    
+    # Aggregate both datasets at district level
+    df_enrol_agg = df_enrollment.groupby('district').agg({
+        'total_enrolment': 'sum',
+        'state': 'first'
+    }).reset_index()
+    df_bio_agg = df_biometric.groupby('district')['total_bio'].sum().reset_index()
+    
+    # Merge datasets on district
+    merged_df = pd.merge(df_enrol_agg, df_bio_agg, on='district', how='outer')
+    merged_df['state'] = merged_df['state'].fillna(df_enrol_agg['state'].iloc[0] if not df_enrol_agg.empty else 'Unknown')
+    merged_df['total_enrolment'] = merged_df['total_enrolment'].fillna(0)
+    merged_df['total_bio'] = merged_df['total_bio'].fillna(0)
+    
+    # Compute shares
+    total_enrol = merged_df['total_enrolment'].sum()
+    total_bio = merged_df['total_bio'].sum()
+    merged_df['enroll_share'] = merged_df['total_enrolment'] / total_enrol if total_enrol > 0 else 0
+    merged_df['usage_share'] = merged_df['total_bio'] / total_bio if total_bio > 0 else 0
+    
+    # Compute EUMI with safeguard against division by zero
+    merged_df['EUMI'] = np.where(
+        merged_df['enroll_share'] > 0,
+        merged_df['usage_share'] / merged_df['enroll_share'],
+        np.nan
+    )
+    
+    # Categorize districts based on EUMI
+    conditions = [
+        (merged_df['EUMI'] < 0.8),
+        (merged_df['EUMI'] >= 0.8) & (merged_df['EUMI'] <= 1.2),
+        (merged_df['EUMI'] > 1.2)
+    ]
+    merged_df['category'] = np.select(conditions, EUMI_CATEGORIES, default="Unknown")
+    
+    return merged_df
+
 # Function to plot EUMI scatter plot
 
 def plot_eumi_scatter(df):
@@ -0,0 +1,201 @@
+"""
+================================================================================
+PINCODE INDEX - PREFIX HIERARCHY OVER PINCODE-LEVEL DATA
+================================================================================
+
+A 6-digit PIN code is hierarchical: the first digit is the postal zone, the
+first two the sub-region and the first three the sorting district. Once a
+frame is sorted by numeric pincode, every prefix covers one contiguous row
+range, e.g. '56' = rows with 560000 <= pincode < 570000.
+
+PincodeIndex sorts a pincode-level frame once and precomputes, for the
+1, 2 and 3 digit levels, each prefix and the row where its range starts.
+With that:
+  - "all pincodes under 56xxxx" is a binary search (searchsorted), not a
+    string match over every row,
+  - regional totals at any level are range sums (np.add.reduceat) over the
+    precomputed starts, with no string ops and no groupby.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+PINCODE_DIGITS = 6
+
+# Prefix lengths precomputed by PincodeIndex (zone, sub-region, sorting district)
+PREFIX_LEVELS = (1, 2, 3)
+
+# Postal zones by first digit
+POSTAL_ZONES = {
+    1: "Delhi, Haryana, Punjab, Himachal Pradesh, J&K, Ladakh, Chandigarh",
+    2: "Uttar Pradesh, Uttarakhand",
+    3: "Rajasthan, Gujarat, Dadra & Nagar Haveli and Daman & Diu",
+    4: "Maharashtra, Madhya Pradesh, Chhattisgarh, Goa",
+    5: "Andhra Pradesh, Telangana, Karnataka",
+    6: "Tamil Nadu, Kerala, Puducherry, Lakshadweep",
+    7: "West Bengal, Odisha, North East, Sikkim, Andaman & Nicobar",
+    8: "Bihar, Jharkhand",
+    9: "Army Postal Service",
+}
+
+
+# ================================================================================
+# PREFIX HELPERS
+# ================================================================================
+
+def prefix_bounds(prefix):
+    """
+    Pincode range covered by a prefix.
+
+    Args:
+        prefix: Leading pincode digits as a string or int (e.g. '56')
+
+    Returns:
+        tuple: (low, high) with low <= pincode < high, e.g. (560000, 570000)
+    """
+    prefix = str(prefix).strip()
+    if not prefix.isdigit() or len(prefix) > PINCODE_DIGITS:
+        raise ValueError(f"Pincode prefix must be 1-{PINCODE_DIGITS} digits, got {prefix!r}")
+    scale = 10 ** (PINCODE_DIGITS - len(prefix))
+    return int(prefix) * scale, (int(prefix) + 1) * scale
+
+
+def pincode_values(values):
+    """
+    Pincodes as int64, -1 where the value is not a 6-digit number.
+
+    Args:
+        values: Series of pincodes (numbers or strings)
+
+    Returns:
+        np.ndarray: int64 pincodes
+    """
+    numbers = pd.to_numeric(values, errors='coerce').to_numpy(dtype='float64')
+    valid = (numbers >= 10 ** (PINCODE_DIGITS - 1)) & (numbers < 10 ** PINCODE_DIGITS) & (numbers == np.floor(numbers))
+    return np.where(valid, numbers, -1).astype(np.int64)
+
+
+def prefix_runs(pincodes, digits):
+    """
+    Contiguous runs of rows sharing a prefix, in the given row order.
+
+    On a frame sorted by pincode every prefix is a single run; on other
+    orders (e.g. state, district, pincode) a prefix may span several.
+
+    Args:
+        pincodes: int64 pincodes (see pincode_values)
+        digits: Prefix length
+
+    Returns:
+        tuple: (prefixes, starts, stops) arrays, one entry per run
+    """
+    if not 1 <= digits <= PINCODE_DIGITS:
+        raise ValueError(f"Prefix length must be 1-{PINCODE_DIGITS}, got {digits}")
+    pincodes = np.asarray(pincodes, dtype=np.int64)
+    if not len(pincodes):
+        empty = np.array([], np.int64)
+        return empty, empty, empty
+    prefixes = np.where(pincodes >= 0, pincodes // 10 ** (PINCODE_DIGITS - digits), -1)
+    starts = np.flatnonzero(np.r_[True, prefixes[1:] != prefixes[:-1]])
+    stops = np.r_[starts[1:], len(prefixes)]
+    return prefixes[starts], starts, stops
+
+
+# ================================================================================
+# INDEX
+# ================================================================================
+
+class PincodeIndex:
+    """
+    Pincode-level frame sorted by pincode, with prefix -> row range lookups.
+
+    Rows without a valid 6-digit pincode are left out (counted in
+    invalid_rows). Several rows may share a pincode (e.g. one per
+    state/district); they are kept in their original relative order.
+
+    Typical use:
+        index = PincodeIndex(pincode_distribution)
+        index.select('56')                              # rows of 560000-569999
+        index.rollup(1, ['total_enrolment'])            # totals per postal zone
+    """
+
+    def __init__(self, frame, column='pincode'):
+        """
+        Args:
+            frame: DataFrame with a pincode column
+            column: Name of the pincode column
+        """
+        codes = pincode_values(frame[column])
+        valid = codes >= 0
+        order = np.argsort(codes[valid], kind='stable')
+
+        self.frame = frame[valid].iloc[order].reset_index(drop=True)
+        self.pincodes = codes[valid][order]
+        self.invalid_rows = int((~valid).sum())
+
+        # First row of every distinct pincode (used for distinct counts per prefix)
+        self._first = np.r_[True, self.pincodes[1:] != self.pincodes[:-1]] if len(self.pincodes) else np.array([], bool)
+
+        self._levels = {}
+        for digits in PREFIX_LEVELS:
+            self._level(digits)
+
+    def _level(self, digits):
+        """(prefixes, start rows) of a prefix length, computed once."""
+        if digits not in self._levels:
+            prefixes, starts, _ = prefix_runs(self.pincodes, digits)
+            self._levels[digits] = (prefixes, starts)
+        return self._levels[digits]
+
+    def prefixes(self, digits):
+        """Distinct prefixes of a length present in the data, ascending."""
+        return self._level(digits)[0]
+
+    def range(self, prefix):
+        """
+        Row range of a prefix in the sorted frame.
+
+        Returns:
+            tuple: (start, stop) for self.frame.iloc[start:stop]
+        """
+        low, high = prefix_bounds(prefix)
+        return (int(np.searchsorted(self.pincodes, low, side='left')),
+                int(np.searchsorted(self.pincodes, high, side='left')))
+
+    def select(self, prefix):
+        """Rows whose pincode starts with the prefix (a slice of the sorted frame)."""
+        start, stop = self.range(prefix)
+        return self.frame.iloc[start:stop]
+
+    def rollup(self, digits, columns):
+        """
+        Sums per prefix of a given length, computed from the row ranges.
+
+        Args:
+            digits: Prefix length (1 = zone, 2 = sub-region, 3 = sorting district)
+            columns: Numeric columns to sum
+
+        Returns:
+            pd.DataFrame: prefix_<digits>, pincodes (distinct), then the sums;
+                          one row per prefix present, ascending
+        """
+        prefixes, starts = self._level(digits)
+        result = pd.DataFrame({f'prefix_{digits}': prefixes})
+        if not len(starts):
+            result['pincodes'] = pd.Series(dtype='int64')
+            for col in columns:
+                result[col] = pd.Series(dtype=self.frame[col].dtype)
+            return result
+
+        result['pincodes'] = np.add.reduceat(self._first.astype(np.int64), starts)
+        for col in columns:
+            result[col] = np.add.reduceat(self.frame[col].fillna(0).to_numpy(), starts)
+        return result
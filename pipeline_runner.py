@@ -0,0 +1,490 @@
+"""
+================================================================================
+PIPELINE RUNNER - DAG OF ANALYSIS STAGES WITH PARALLEL EXECUTION
+================================================================================
+
+Regenerates filtered_data/ and outputs/ in one command instead of running
+consolidate_and_normalize.py, uidai_comprehensive_analysis.py and
+digital_infrastructure_readiness.py by hand.
+
+Every stage declares the datasets it reads (inputs), the datasets it
+produces (outputs) and any file-level dependencies (after). A stage starts
+as soon as its dependencies are done, so independent stages run
+concurrently in a process pool:
+
+    consolidate --> reconcile --> load --> lag, cohort, tier, backlog (in parallel)
+    consolidate --> reconcile --> readiness
+    consolidate --> reconcile --> quality
+
+The load stage cleans the three datasets once and publishes them in shared
+memory; the insight stages attach to those blocks (read-only views, text
+columns as categoricals over the shared codes) instead of re-reading and
+re-cleaning the CSVs. Each stage's console output is collected and printed
+when it finishes, followed by a per-stage wall time report.
+
+Stages that write artifacts are cached (see artifact_cache.py): a stage
+whose input files, code (including the code of the stages producing its
+datasets) and configuration constants are unchanged is not run; its files
+are restored from the cache. The load stage only runs if a stage reading
+its datasets has to run.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import gc
+import io
+import os
+import sys
+import time
+import argparse
+import traceback
+from collections import namedtuple
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+import pandas as pd
+
+from artifact_cache import ArtifactCache, code_digest
+import consolidate_and_normalize
+import district_reconciliation
+import data_quality
+import digital_infrastructure_readiness
+import uidai_comprehensive_analysis as comprehensive
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# A stage: callable run in a worker process, dataset names passed to it as
+# keyword arguments, dataset names it returns (dict), extra stage dependencies,
+# plus what its cache key covers: input files (globs), the files it writes
+# and the configuration constants of its module it depends on
+Stage = namedtuple('Stage', ['name', 'func', 'inputs', 'outputs', 'after', 'files', 'artifacts', 'config'],
+                   defaults=((), (), ()))
+
+RAW_FILES = ('api_data_aadhar_*/*.csv',)
+DEMO_FILE = 'filtered_data/consolidated_demographic.csv'
+ENROL_FILE = 'filtered_data/consolidated_enrolment.csv'
+BIO_FILE = 'filtered_data/consolidated_biometric.csv'
+MAPPING_FILE = 'outputs/district_name_mapping.csv'
+
+EFFORT_WEIGHTS = ('EFFORT_WEIGHT_0_5', 'EFFORT_WEIGHT_5_17', 'EFFORT_WEIGHT_18_PLUS')
+
+
+def _load_datasets():
+    """Load and clean the consolidated datasets (published to shared memory)."""
+    df_demo, df_enrol, df_bio = comprehensive.load_and_clean_data()
+    return {'df_demo': df_demo, 'df_enrol': df_enrol, 'df_bio': df_bio}
+
+
+PIPELINE_STAGES = [
+    Stage('consolidate', consolidate_and_normalize.main, (), (), (),
+          files=RAW_FILES, artifacts=(DEMO_FILE, ENROL_FILE, BIO_FILE),
+          config=('OFFICIAL_STATES', 'GEOGRAPHIC_NAME_MAPPING', 'INVALID_STATES')),
+    Stage('reconcile', district_reconciliation.main, (), (), ('consolidate',),
+          files=(DEMO_FILE, ENROL_FILE, BIO_FILE), artifacts=(MAPPING_FILE,),
+          config=('NGRAM', 'SIMILARITY_THRESHOLD')),
+    Stage('quality', data_quality.main, (), (), ('reconcile',),
+          files=(DEMO_FILE, ENROL_FILE, BIO_FILE, MAPPING_FILE),
+          artifacts=('outputs/data_quality_enrolment.json', 'outputs/data_quality_demographic.json',
+                     'outputs/data_quality_biometric.json'),
+          config=('KEY_COLUMNS', 'TOP_ROWS')),
+    Stage('load', _load_datasets, (), ('df_demo', 'df_enrol', 'df_bio'), ('reconcile',)),
+    Stage('lag', comprehensive.compute_biometric_lag, ('df_demo', 'df_bio'), (), (),
+          files=(DEMO_FILE, BIO_FILE, MAPPING_FILE),
+          artifacts=('outputs/biometric_lag_national.csv', 'outputs/biometric_lag_by_state.csv',
+                     'outputs/biometric_lag_plot.png')),
+    Stage('cohort', comprehensive.compute_age_cohort_efficiency, ('df_enrol',), (), (),
+          files=(ENROL_FILE, MAPPING_FILE), artifacts=('outputs/age_cohort_efficiency.csv',),
+          config=EFFORT_WEIGHTS + ('REENROLMENT_WINDOW_DAYS',)),
+    Stage('tier', comprehensive.compute_geographic_efficiency, ('df_demo', 'df_enrol', 'df_bio'), (), (),
+          files=(DEMO_FILE, ENROL_FILE, BIO_FILE, MAPPING_FILE), artifacts=('outputs/geographic_tier_efficiency.csv',),
+          config=EFFORT_WEIGHTS + ('THEORETICAL_CAPACITY_PER_CENTER', 'TIER_1_METROS', 'TIER_2_CITIES')),
+    Stage('backlog', comprehensive.build_backlog_prediction_model, ('df_demo', 'df_bio', 'df_enrol'), (), (),
+          files=(DEMO_FILE, ENROL_FILE, BIO_FILE, MAPPING_FILE),
+          artifacts=('outputs/backlog_prediction_features.csv', 'outputs/backlog_model_feature_importance.csv'),
+          config=('HIGH_BACKLOG_PERCENTILE',)),
+    Stage('readiness', digital_infrastructure_readiness.main, (), (), ('reconcile',),
+          files=(BIO_FILE, MAPPING_FILE),
+          artifacts=('outputs/digital_infrastructure_indices.csv', 'outputs/digital_infrastructure_typology.csv',
+                     'outputs/digital_infrastructure_state.csv', 'outputs/digital_infrastructure_state.json'),
+          config=('ISI_VOLUME_WEIGHT', 'ISI_VOLATILITY_WEIGHT', 'TYPOLOGY_THRESHOLD')),
+]
+
+
+# ================================================================================
+# SHARED-MEMORY DATASETS
+# ================================================================================
+
+# Handles of the blocks created by this (worker) process. They stay open
+# until the process exits: on Windows a block only lives while a handle is
+# open, and pool workers live until the pipeline finishes.
+_CREATED_BLOCKS = []
+
+
+def _to_shared(values):
+    """Copy an array into a new shared memory block; returns (block name, dtype, length)."""
+    values = np.ascontiguousarray(values)
+    block = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+    np.ndarray(values.shape, dtype=values.dtype, buffer=block.buf)[:] = values
+    _CREATED_BLOCKS.append(block)
+    return block.name, values.dtype.str, len(values)
+
+
+def _from_shared(name, dtype, length, handles):
+    """
+    Read-only view of an array in a shared memory block (no copy).
+
+    The block's handle is appended to handles; it must stay open while the
+    view is in use (see close_handles()).
+    """
+    block = shared_memory.SharedMemory(name=name)
+    handles.append(block)
+    view = np.ndarray((length,), dtype=np.dtype(dtype), buffer=block.buf)
+    view.flags.writeable = False
+    return view
+
+
+def close_handles(handles):
+    """Close attached blocks once nothing refers to their views any more."""
+    gc.collect()
+    for block in handles:
+        try:
+            block.close()
+        except BufferError:
+            # A view is still referenced somewhere; the mapping is released at exit
+            pass
+    handles.clear()
+
+
+def share_frame(df):
+    """
+    Publish a DataFrame in shared memory.
+
+    Numeric, boolean and datetime columns are stored as they are; text
+    columns are stored as categorical codes into a small array of unique
+    values that travels with the (picklable) spec.
+
+    Args:
+        df: DataFrame to publish
+
+    Returns:
+        dict: Spec for attach_frame() (column layout and block names)
+    """
+    columns = []
+    for name in df.columns:
+        col = df[name]
+        if isinstance(col.dtype, np.dtype) and col.dtype.kind in 'biufcmM':
+            values, uniques = col.to_numpy(), None
+        else:
+            # Sorted categories, so grouping by the attached column orders
+            # groups like grouping by the strings
+            codes, uniques = pd.factorize(col, sort=True)
+            categorical = pd.Categorical.from_codes(codes, categories=pd.Index(uniques, dtype=object))
+            values, uniques = categorical.codes, categorical.categories
+        columns.append((name, _to_shared(values), uniques))
+
+    return {
+        'columns': columns,
+        'index': _to_shared(df.index.to_numpy(dtype=np.int64)),
+    }
+
+
+def attach_frame(spec, handles):
+    """
+    Rebuild a DataFrame published with share_frame() without copying.
+
+    Columns are read-only views of the shared blocks; text columns are
+    categoricals over the shared codes (code -1 is missing). The blocks'
+    handles are appended to handles and must stay open while the frame is
+    in use.
+
+    Returns:
+        pd.DataFrame: Frame backed by the shared blocks
+    """
+    data = {}
+    for name, block, uniques in spec['columns']:
+        values = _from_shared(*block, handles)
+        if uniques is not None:
+            values = pd.Categorical.from_codes(values, categories=uniques)
+        data[name] = values
+    return pd.DataFrame(data, index=pd.Index(_from_shared(*spec['index'], handles)), copy=False)
+
+
+def release_frame(spec):
+    """Unlink the shared memory blocks of a published frame."""
+    blocks = [block for _, block, _ in spec['columns']] + [spec['index']]
+    for name, _, _ in blocks:
+        try:
+            block = shared_memory.SharedMemory(name=name)
+        except FileNotFoundError:
+            continue
+        block.close()
+        block.unlink()
+
+
+# ================================================================================
+# STAGE EXECUTION
+# ================================================================================
+
+def _run_stage(stage, input_specs, pipeline_start):
+    """
+    Worker entry point: run one stage with its inputs attached from shared memory.
+
+    Returns:
+        dict: status, start/wall seconds, captured console output, output specs
+    """
+    log = io.StringIO()
+    started = time.time()
+    result = {'name': stage.name, 'start': started - pipeline_start, 'outputs': {}}
+    handles = []
+    try:
+        with redirect_stdout(log):
+            inputs = {name: attach_frame(spec, handles) for name, spec in input_specs.items()}
+            produced = stage.func(**inputs) or {}
+            result['outputs'] = {name: share_frame(produced[name]) for name in stage.outputs}
+        result['status'] = 'ok'
+    except Exception:
+        result['status'] = 'failed'
+        log.write(traceback.format_exc())
+    finally:
+        inputs = produced = None
+        close_handles(handles)
+    result['wall'] = time.time() - started
+    result['log'] = log.getvalue()
+    return result
+
+
+def stage_code_version(stage, stages):
+    """
+    Code version of a stage: the digest of its function plus those of the
+    stages producing its input datasets, transitively (e.g. the lag stage's
+    key changes when a cleaning helper of the load stage is edited).
+    """
+    producers = {output: s for s in stages for output in s.outputs}
+    digests = {}
+    frontier = [stage]
+    while frontier:
+        current = frontier.pop()
+        if current.name in digests:
+            continue
+        digests[current.name] = code_digest(current.func)
+        frontier.extend(producers[i] for i in current.inputs if i in producers)
+    return ':'.join(digests[name] for name in sorted(digests))
+
+
+def stage_key(cache, stage, stages=PIPELINE_STAGES):
+    """Cache key of a stage: its input files, code (and its producers' code) and config constants."""
+    module = sys.modules[stage.func.__module__]
+    config = {name: getattr(module, name) for name in stage.config}
+    return cache.stage_key(stage.name, stage.files, stage_code_version(stage, stages), config)
+
+
+def stage_dependencies(stages):
+    """
+    Resolve the dependencies of every stage.
+
+    Returns:
+        dict: Stage name -> set of stage names it waits for
+
+    Raises:
+        ValueError: Unknown stage/dataset names or a dependency cycle
+    """
+    names = {stage.name for stage in stages}
+    producers = {output: stage.name for stage in stages for output in stage.outputs}
+
+    dependencies = {}
+    for stage in stages:
+        unknown = [d for d in stage.after if d not in names] + [i for i in stage.inputs if i not in producers]
+        if unknown:
+            raise ValueError(f"Stage {stage.name!r} depends on unknown stage/dataset {unknown}")
+        dependencies[stage.name] = set(stage.after) | {producers[i] for i in stage.inputs}
+
+    # Cycle check (Kahn's algorithm)
+    remaining = {name: set(deps) for name, deps in dependencies.items()}
+    while remaining:
+        ready = [name for name, deps in remaining.items() if not deps]
+        if not ready:
+            raise ValueError(f"Dependency cycle between stages {sorted(remaining)}")
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+
+    return dependencies
+
+
+def select_stages(stages, wanted=None, skip=()):
+    """
+    Stages to run: the wanted stages plus everything they depend on.
+
+    Skipped stages are dropped and no longer counted as dependencies (their
+    files are assumed to exist, e.g. skip='consolidate' reuses filtered_data).
+    """
+    by_name = {stage.name: stage for stage in stages}
+    unknown = [name for name in list(wanted or []) + list(skip) if name not in by_name]
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {unknown}; expected {list(by_name)}")
+
+    dependencies = stage_dependencies(stages)
+    selected = set(wanted) if wanted else set(by_name)
+    frontier = list(selected)
+    while frontier:
+        for dep in dependencies[frontier.pop()]:
+            if dep not in selected:
+                selected.add(dep)
+                frontier.append(dep)
+    selected -= set(skip)
+
+    return [stage._replace(after=tuple(d for d in stage.after if d in selected))
+            for stage in stages if stage.name in selected]
+
+
+def run_pipeline(stages=PIPELINE_STAGES, workers=None, cache=None):
+    """
+    Run stages as soon as their dependencies finish, in a process pool.
+
+    A failed stage is reported and its dependents are skipped; independent
+    stages still run.
+
+    Args:
+        stages: Stage list (see PIPELINE_STAGES / select_stages())
+        workers: Pool size (defaults to the CPU count)
+        cache: ArtifactCache; stages with an unchanged key are restored
+               instead of run (None runs everything)
+
+    Returns:
+        pd.DataFrame: stage, status, start_s, wall_s
+    """
+    dependencies = stage_dependencies(stages)
+    by_name = {stage.name: stage for stage in stages}
+    consumers = {name: [s for s in stages if set(s.inputs) & set(by_name[name].outputs)] for name in by_name}
+    pending = [stage.name for stage in stages]
+    status = {}
+    keys = {}
+    published = {}
+    timings = []
+
+    def cached_manifest(stage):
+        # Key and cache entry of a stage (None if it is not cacheable or not cached)
+        if cache is None or not stage.artifacts:
+            return None
+        if stage.name not in keys:
+            keys[stage.name] = stage_key(cache, stage, stages)
+        return cache.lookup(keys[stage.name])
+
+    # Workers must share the parent's resource tracker (started before the
+    # pool forks), otherwise each one unlinks its blocks when it exits
+    if hasattr(resource_tracker, 'ensure_running') and os.name == 'posix':
+        resource_tracker.ensure_running()
+
+    pipeline_start = time.time()
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            running = {}
+            while pending or running:
+                for name in list(pending):
+                    deps = dependencies[name]
+                    if any(status.get(d) in ('failed', 'skipped') for d in deps):
+                        pending.remove(name)
+                        status[name] = 'skipped'
+                        timings.append({'stage': name, 'status': 'skipped', 'start_s': None, 'wall_s': None})
+                        print(f"[INFO] Skipping {name}: a dependency did not complete")
+                    elif all(status.get(d) in ('ok', 'cached', 'unneeded') for d in deps):
+                        pending.remove(name)
+                        stage = by_name[name]
+
+                        started = time.time()
+                        manifest = cached_manifest(stage)
+                        if manifest is not None:
+                            restored = cache.restore(manifest)
+                            status[name] = 'cached'
+                            timings.append({'stage': name, 'status': 'cached', 'start_s': started - pipeline_start,
+                                            'wall_s': time.time() - started})
+                            print(f"[INFO] {name} is up to date (cache key {keys[name][:12]}, "
+                                  f"{len(restored)} of {len(manifest)} artifacts restored)")
+                            continue
+                        if cache is not None and consumers[name] and \
+                                all(cached_manifest(c) is not None for c in consumers[name]):
+                            status[name] = 'unneeded'
+                            timings.append({'stage': name, 'status': 'unneeded', 'start_s': None, 'wall_s': None})
+                            print(f"[INFO] Skipping {name}: every stage reading its datasets is cached")
+                            continue
+
+                        specs = {i: published[i] for i in stage.inputs}
+                        running[pool.submit(_run_stage, stage, specs, pipeline_start)] = name
+                        print(f"[INFO] Started {name}")
+
+                if not running:
+                    continue
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    del running[future]
+                    result = future.result()
+                    published.update(result['outputs'])
+                    status[result['name']] = result['status']
+                    if result['status'] == 'ok' and result['name'] in keys:
+                        cache.store(keys[result['name']], by_name[result['name']].artifacts)
+                    timings.append({'stage': result['name'], 'status': result['status'],
+                                    'start_s': result['start'], 'wall_s': result['wall']})
+
+                    print("\n" + "-" * 80)
+                    print(f"[OUTPUT] {result['name']} ({result['status']}, {result['wall']:.2f}s)")
+                    print("-" * 80)
+                    print(result['log'].rstrip())
+    finally:
+        for spec in published.values():
+            release_frame(spec)
+        if cache is not None:
+            cache.save_index()
+
+    report = pd.DataFrame(timings, columns=['stage', 'status', 'start_s', 'wall_s'])
+    report['stage'] = pd.Categorical(report['stage'], categories=[s.name for s in stages], ordered=True)
+    report = report.sort_values('stage').reset_index(drop=True)
+    report.attrs['total_s'] = time.time() - pipeline_start
+    return report
+
+
+def print_timings(report):
+    """Print the per-stage wall time report."""
+    total = report.attrs.get('total_s', float('nan'))
+    print("\n" + "=" * 80)
+    print("PIPELINE STAGE TIMINGS")
+    print("=" * 80)
+    print(report.round(2).to_string(index=False))
+    print(f"\n[INFO] Pipeline wall time: {total:.2f}s "
+          f"(sum of stage times: {report['wall_s'].sum():.2f}s)")
+
+
+# ================================================================================
+# MAIN EXECUTION
+# ================================================================================
+
+if __name__ == "__main__":
+    stage_names = [stage.name for stage in PIPELINE_STAGES]
+    parser = argparse.ArgumentParser(description="Run the analysis pipeline as a DAG of parallel stages")
+    parser.add_argument("--stages", nargs="+", choices=stage_names,
+                        help="only these stages (and the stages they depend on)")
+    parser.add_argument("--skip", nargs="+", choices=stage_names, default=[],
+                        help="stages to leave out; their files are reused (e.g. --skip consolidate)")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="run every stage even if its cached artifacts are up to date")
+    args = parser.parse_args()
+
+    os.chdir(BASE_DIR)
+    os.makedirs(comprehensive.OUTPUT_DIR, exist_ok=True)
+
+    cache = None if args.no_cache else ArtifactCache()
+    report = run_pipeline(select_stages(PIPELINE_STAGES, args.stages, args.skip), workers=args.workers, cache=cache)
+    print_timings(report)
+
+    failed = report.loc[~report['status'].isin(['ok', 'cached', 'unneeded']), 'stage'].astype(str).tolist()
+    if failed:
+        raise SystemExit(f"[ERROR] Stages did not complete: {', '.join(failed)}")
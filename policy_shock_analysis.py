@@ -0,0 +1,423 @@
+"""
+================================================================================
+POLICY SHOCK IMPACT ANALYSIS - BATCH SCANNER
+================================================================================
+
+Shared window/classification logic for the Policy Shock Impact Analyzer and a
+batch mode that scores every (month, state) pair - and optionally every
+(month, district) pair - in one vectorized pass.
+
+The dashboard evaluates one selected month at a time by filtering the
+biometric frame to the 30 days before and after the shock month. The batch
+scanner applies exactly the same windows, but reads them off cumulative daily
+arrays (one per group), so each window sum is a single subtraction instead of
+a frame filter.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import argparse
+import pandas as pd
+import numpy as np
+from datetime import datetime
+
+from district_reconciliation import apply_district_mapping
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FILTERED_DATA_DIR = os.path.join(BASE_DIR, "filtered_data")
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+
+ENROLMENT_FILE = os.path.join(FILTERED_DATA_DIR, "consolidated_enrolment.csv")
+BIOMETRIC_FILE = os.path.join(FILTERED_DATA_DIR, "consolidated_biometric.csv")
+
+STATE_SCAN_OUTPUT = os.path.join(OUTPUT_DIR, "policy_shock_scan_state.csv")
+DISTRICT_SCAN_OUTPUT = os.path.join(OUTPUT_DIR, "policy_shock_scan_district.csv")
+
+# Impact window around the shock month (days)
+PRE_WINDOW_DAYS = 30
+POST_WINDOW_DAYS = 30
+
+# Months with enrolment > mean + SHOCK_THRESHOLD_SIGMA * std are anomalies
+SHOCK_THRESHOLD_SIGMA = 1.5
+
+# Candidate (youth, adult) column pairs, in order of preference
+YOUTH_ADULT_COLUMNS = [
+    ('age_5_17', 'age_18_greater'),
+    ('bio_age_5_17', 'bio_age_17_'),
+]
+
+# Classification labels, colors and interpretations (order = np.select order)
+SHOCK_CLASSES = [
+    ("Enrollment-Only Shock", "#f59e0b",
+     "Enrollment spike without lasting usage impact. The policy drive increased registrations but did not result in sustained Aadhaar usage patterns."),
+    ("Behavioral Adoption Shock", "#22c55e",
+     "Policy drive resulted in sustained Aadhaar usage, especially among youth. This indicates successful behavioral change and adoption."),
+    ("Structural Expansion Shock", "#3b82f6",
+     "Policy drive expanded Aadhaar usage to new districts. This shows successful geographic penetration of Aadhaar services."),
+    ("Mixed Impact", "#6c757d",
+     "The policy shock had mixed effects across different metrics."),
+]
+
+
+# ================================================================================
+# SHARED WINDOW AND CLASSIFICATION LOGIC
+# ================================================================================
+
+def shock_windows(shock_month):
+    """
+    Compute the pre/post comparison windows for a shock month.
+
+    Args:
+        shock_month: pd.Period (monthly) of the enrollment spike
+
+    Returns:
+        tuple: (pre_start, pre_end, post_start, post_end) timestamps; windows
+               are half-open, i.e. [start, end)
+    """
+    shock_start = shock_month.to_timestamp()
+    shock_end = shock_start + pd.DateOffset(months=1)
+
+    pre_start = shock_start - pd.DateOffset(days=PRE_WINDOW_DAYS)
+    pre_end = shock_start
+    post_start = shock_end
+    post_end = shock_end + pd.DateOffset(days=POST_WINDOW_DAYS)
+
+    return pre_start, pre_end, post_start, post_end
+
+
+def youth_adult_columns(df):
+    """
+    Find the (youth, adult) age columns available in a usage frame.
+
+    Args:
+        df: Biometric (or enrolment) dataframe
+
+    Returns:
+        tuple or None: (youth_col, adult_col), or None if no pair is present
+    """
+    for youth_col, adult_col in YOUTH_ADULT_COLUMNS:
+        if youth_col in df.columns and adult_col in df.columns:
+            return youth_col, adult_col
+    return None
+
+
+def classify_shock_arrays(persistence_ratio, youth_adoption_change, district_expansion):
+    """
+    Classify shocks element-wise.
+
+    Args:
+        persistence_ratio: Array of post/pre average biometric ratios
+        youth_adoption_change: Array of youth share changes (percentage points)
+        district_expansion: Array of district expansion rates (fraction, not %)
+
+    Returns:
+        np.ndarray: Integer codes indexing into SHOCK_CLASSES
+    """
+    persistence_ratio = np.asarray(persistence_ratio, dtype=float)
+    youth_adoption_change = np.asarray(youth_adoption_change, dtype=float)
+    district_expansion = np.asarray(district_expansion, dtype=float)
+
+    conditions = [
+        (persistence_ratio < 1.1) & (np.abs(youth_adoption_change) < 5) & (district_expansion < 0.1),
+        (persistence_ratio >= 1.2) | (youth_adoption_change >= 5),
+        district_expansion >= 0.1,
+    ]
+    return np.select(conditions, [0, 1, 2], default=3)
+
+
+def classify_shock(persistence_ratio, youth_adoption_change, district_expansion):
+    """
+    Classify a single shock.
+
+    Returns:
+        tuple: (classification, classification_color, interpretation)
+    """
+    code = classify_shock_arrays([persistence_ratio], [youth_adoption_change], [district_expansion])[0]
+    return SHOCK_CLASSES[code]
+
+
+# ================================================================================
+# DATA LOADING
+# ================================================================================
+
+def load_datasets():
+    """
+    Load consolidated enrolment and biometric data with dates and totals.
+
+    Returns:
+        tuple: (df_enrol, df_bio)
+    """
+    print(f"[INFO] Loading enrolment data from: {ENROLMENT_FILE}")
+    print(f"[INFO] Loading biometric data from: {BIOMETRIC_FILE}")
+
+    for path in (ENROLMENT_FILE, BIOMETRIC_FILE):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Data file not found: {path}")
+
+    df_enrol = apply_district_mapping(pd.read_csv(ENROLMENT_FILE))
+    df_enrol['date'] = pd.to_datetime(df_enrol['date'], format='%d-%m-%Y', errors='coerce')
+    df_enrol['total_enrolment'] = df_enrol['age_0_5'] + df_enrol['age_5_17'] + df_enrol['age_18_greater']
+
+    df_bio = apply_district_mapping(pd.read_csv(BIOMETRIC_FILE))
+    df_bio['date'] = pd.to_datetime(df_bio['date'], format='%d-%m-%Y', errors='coerce')
+    df_bio['total_bio'] = df_bio['bio_age_5_17'] + df_bio['bio_age_17_']
+
+    print(f"[INFO] Loaded {len(df_enrol):,} enrolment and {len(df_bio):,} biometric records")
+
+    return df_enrol, df_bio
+
+
+# ================================================================================
+# BATCH SCAN
+# ================================================================================
+
+def _group_codes(df, keys, groups):
+    """Map each row of df to its position in the groups MultiIndex (-1 if absent)."""
+    return groups.get_indexer(pd.MultiIndex.from_frame(df[keys]))
+
+
+def _cumulative_daily(day, group, n_days, n_groups, weights=None):
+    """
+    Build a cumulative (n_days + 1, n_groups) array of per-day sums.
+
+    Row 0 is all zeros, so the sum over days [a, b) is C[b] - C[a].
+    """
+    flat = np.bincount(day * n_groups + group, weights=weights,
+                       minlength=n_days * n_groups).reshape(n_days, n_groups)
+    cum = np.zeros((n_days + 1, n_groups), dtype=float)
+    np.cumsum(flat, axis=0, out=cum[1:])
+    return cum
+
+
+def _window_sum(cum, start, end):
+    """Sum of each group over [start, end) for every month: shape (n_months, n_groups)."""
+    return cum[end] - cum[start]
+
+
+def scan_policy_shocks(enrol_df, bio_df, level='state', threshold_sigma=SHOCK_THRESHOLD_SIGMA):
+    """
+    Compute shock impact metrics for every (month, group) pair at once.
+
+    Methodology (identical to the single-month analyzer):
+    - Monthly enrolment per group, with a z-score against that group's months
+    - Pre window: 30 days before the month; post window: 30 days after it
+    - Persistence ratio = post avg / pre avg biometric volume per record
+    - Youth adoption change = post youth share - pre youth share (pp)
+    - District expansion = change in active districts (%)
+
+    Both inputs can also be daily district cubes (one row per state,
+    district and date, e.g. from the aggregate service); a 'records' column
+    then gives the record count behind each biometric row.
+
+    Args:
+        enrol_df: Enrolment data with date, state, district, total_enrolment
+        bio_df: Biometric data with date, state, district, total_bio (and
+                the age columns, optionally records)
+        level: 'state' for (month, state) pairs, 'district' for (month, district)
+        threshold_sigma: z-score above which a month is flagged as an anomaly
+
+    Returns:
+        pd.DataFrame: One row per (month, group), ranked by shock strength
+    """
+    if level not in ('state', 'district'):
+        raise ValueError(f"level must be 'state' or 'district', got {level!r}")
+
+    keys = ['state'] if level == 'state' else ['state', 'district']
+
+    if enrol_df.empty or bio_df.empty:
+        return pd.DataFrame()
+
+    enrol = enrol_df.dropna(subset=['date'])
+    bio = bio_df.dropna(subset=['date'])
+
+    # Unified, sorted group index shared by both datasets
+    groups = pd.MultiIndex.from_frame(
+        pd.concat([enrol[keys].drop_duplicates(), bio[keys].drop_duplicates()])
+        .drop_duplicates().sort_values(keys)
+    )
+    n_groups = len(groups)
+
+    # -------------------------------------------------------------------------
+    # Monthly enrolment and per-group z-scores
+    # -------------------------------------------------------------------------
+    enrol_month = enrol['date'].dt.to_period('M')
+    months = pd.PeriodIndex(np.sort(enrol_month.unique()), freq='M')
+    n_months = len(months)
+
+    m_idx = months.get_indexer(enrol_month)
+    g_idx = _group_codes(enrol, keys, groups)
+
+    flat = m_idx * n_groups + g_idx
+    monthly = np.bincount(flat, weights=enrol['total_enrolment'].to_numpy(dtype=float),
+                          minlength=n_months * n_groups).reshape(n_months, n_groups)
+    present = np.bincount(flat, minlength=n_months * n_groups).reshape(n_months, n_groups) > 0
+
+    n_present = present.sum(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = np.where(present, monthly, 0).sum(axis=0) / n_present
+        var = np.where(present, (monthly - mean) ** 2, 0).sum(axis=0) / (n_present - 1)
+        std = np.sqrt(var)
+        # Same fallback as the analyzer: 10% of the mean when std is 0 or undefined
+        std = np.where((std == 0) | np.isnan(std), mean * 0.1, std)
+        z_score = (monthly - mean) / std
+
+    # -------------------------------------------------------------------------
+    # Cumulative daily biometric arrays
+    # -------------------------------------------------------------------------
+    origin = bio['date'].min()
+    day = (bio['date'] - origin).dt.days.to_numpy()
+    n_days = int(day.max()) + 1
+    bio_group = _group_codes(bio, keys, groups)
+
+    records = bio['records'].to_numpy(dtype=float) if 'records' in bio.columns else None
+    cum_rows = _cumulative_daily(day, bio_group, n_days, n_groups, records)
+    cum_total = _cumulative_daily(day, bio_group, n_days, n_groups,
+                                  bio['total_bio'].to_numpy(dtype=float))
+
+    age_cols = youth_adult_columns(bio)
+    if age_cols is not None:
+        cum_youth = _cumulative_daily(day, bio_group, n_days, n_groups,
+                                      bio[age_cols[0]].to_numpy(dtype=float))
+        cum_adult = _cumulative_daily(day, bio_group, n_days, n_groups,
+                                      bio[age_cols[1]].to_numpy(dtype=float))
+
+    # District activity (distinct districts = districts with >= 1 record)
+    districts = pd.MultiIndex.from_frame(bio[['state', 'district']].drop_duplicates().sort_values(['state', 'district']))
+    district_idx = _group_codes(bio, ['state', 'district'], districts)
+    cum_district_rows = _cumulative_daily(day, district_idx, n_days, len(districts))
+    # One-hot (district -> group) membership used to roll district activity up
+    district_group = groups.get_indexer(
+        districts if level == 'district' else pd.MultiIndex.from_arrays([districts.get_level_values('state')])
+    )
+    membership = np.zeros((len(districts), n_groups))
+    membership[np.arange(len(districts)), district_group] = 1.0
+
+    # -------------------------------------------------------------------------
+    # Window bounds for every month (as clipped day offsets)
+    # -------------------------------------------------------------------------
+    def to_day(timestamps):
+        return np.clip((pd.DatetimeIndex(timestamps) - origin).days.to_numpy(), 0, n_days)
+
+    shock_start = months.to_timestamp()
+    shock_end = (months + 1).to_timestamp()
+    pre_start = to_day(shock_start - pd.DateOffset(days=PRE_WINDOW_DAYS))
+    pre_end = to_day(shock_start)
+    post_start = to_day(shock_end)
+    post_end = to_day(shock_end + pd.DateOffset(days=POST_WINDOW_DAYS))
+
+    # -------------------------------------------------------------------------
+    # Impact metrics, all shaped (n_months, n_groups)
+    # -------------------------------------------------------------------------
+    pre_rows = _window_sum(cum_rows, pre_start, pre_end)
+    post_rows = _window_sum(cum_rows, post_start, post_end)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        pre_avg_bio = np.where(pre_rows > 0, _window_sum(cum_total, pre_start, pre_end) / pre_rows, 0.0)
+        post_avg_bio = np.where(post_rows > 0, _window_sum(cum_total, post_start, post_end) / post_rows, 0.0)
+        persistence_ratio = np.where(pre_avg_bio > 0, post_avg_bio / pre_avg_bio, 0.0)
+
+        if age_cols is not None:
+            pre_youth = _window_sum(cum_youth, pre_start, pre_end)
+            post_youth = _window_sum(cum_youth, post_start, post_end)
+            pre_total = pre_youth + _window_sum(cum_adult, pre_start, pre_end)
+            post_total = post_youth + _window_sum(cum_adult, post_start, post_end)
+            pre_youth_share = np.where(pre_total > 0, pre_youth / pre_total, 0.0)
+            post_youth_share = np.where(post_total > 0, post_youth / post_total, 0.0)
+        else:
+            pre_youth_share = np.zeros((n_months, n_groups))
+            post_youth_share = np.zeros((n_months, n_groups))
+        youth_adoption_change = (post_youth_share - pre_youth_share) * 100
+
+        pre_districts = (_window_sum(cum_district_rows, pre_start, pre_end) > 0) @ membership
+        post_districts = (_window_sum(cum_district_rows, post_start, post_end) > 0) @ membership
+        district_expansion = np.where(pre_districts > 0, (post_districts - pre_districts) / pre_districts, 0.0)
+
+    classification = classify_shock_arrays(persistence_ratio, youth_adoption_change, district_expansion)
+
+    # -------------------------------------------------------------------------
+    # Flatten to one row per (month, group) with enrolment in that month
+    # -------------------------------------------------------------------------
+    mi, gi = np.nonzero(present)
+    labels = np.array([c[0] for c in SHOCK_CLASSES], dtype=object)
+
+    result = pd.DataFrame({'month': months[mi].astype(str)})
+    for level_name in keys:
+        result[level_name] = groups.get_level_values(level_name)[gi]
+    result['total_enrolment'] = monthly[mi, gi]
+    result['z_score'] = z_score[mi, gi]
+    result['is_anomaly'] = result['z_score'] > threshold_sigma
+    result['persistence_ratio'] = persistence_ratio[mi, gi]
+    result['youth_adoption_change'] = youth_adoption_change[mi, gi]
+    result['district_expansion'] = district_expansion[mi, gi] * 100
+    result['pre_avg_bio'] = pre_avg_bio[mi, gi]
+    result['post_avg_bio'] = post_avg_bio[mi, gi]
+    result['pre_districts'] = pre_districts[mi, gi].astype(int)
+    result['post_districts'] = post_districts[mi, gi].astype(int)
+    result['pre_youth_share'] = pre_youth_share[mi, gi] * 100
+    result['post_youth_share'] = post_youth_share[mi, gi] * 100
+    result['classification'] = labels[classification[mi, gi]]
+
+    # Rank: strongest enrolment shocks first, ties broken by persistence
+    result = result.sort_values(['z_score', 'persistence_ratio'], ascending=[False, False],
+                                na_position='last').reset_index(drop=True)
+    result.insert(0, 'rank', np.arange(1, len(result) + 1))
+
+    return result
+
+
+# ================================================================================
+# MAIN EXECUTION
+# ================================================================================
+
+def main(include_districts=False):
+    """
+    Run the batch shock scan and export the ranked tables.
+
+    Args:
+        include_districts: Also scan every (month, district) pair
+    """
+    print("=" * 80)
+    print("POLICY SHOCK IMPACT ANALYSIS - BATCH SCAN")
+    print("UIDAI Data Hackathon 2026 | Team Bharat Bytes")
+    print("=" * 80)
+    print()
+
+    start_time = datetime.now()
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    df_enrol, df_bio = load_datasets()
+    print()
+
+    scans = [('state', STATE_SCAN_OUTPUT)]
+    if include_districts:
+        scans.append(('district', DISTRICT_SCAN_OUTPUT))
+
+    for level, output_path in scans:
+        print(f"[INFO] Scanning every (month, {level}) pair...")
+        scan = scan_policy_shocks(df_enrol, df_bio, level=level)
+        scan.to_csv(output_path, index=False)
+        print(f"[INFO] {len(scan):,} pairs scored, {int(scan['is_anomaly'].sum()):,} anomalies")
+        print("[INFO] Classification distribution:")
+        for label, count in scan['classification'].value_counts().items():
+            print(f"       - {label}: {count}")
+        print(f"[SAVED] {output_path}")
+        print()
+
+    elapsed = datetime.now() - start_time
+    print(f"Execution time: {elapsed.total_seconds():.2f} seconds")
+    print("=" * 80)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batch policy shock scan across all months")
+    parser.add_argument("--districts", action="store_true",
+                        help="also scan every (month, district) pair")
+    args = parser.parse_args()
+    main(include_districts=args.districts)
@@ -0,0 +1,309 @@
+"""
+================================================================================
+QUERY PLAN - LAZY, OPTIMIZED AGGREGATION PLANS OVER THE DATASETS
+================================================================================
+
+Analysis sections declare the aggregates they need (grouping keys plus sums,
+record counts and distinct counts) instead of computing them. Nothing runs
+until execute(); before that the plan is optimized:
+
+  - Common subexpressions: requests on the same key set are merged into one
+    node, whatever their key order or measures.
+  - Rollups: a node whose keys are covered by a finer node is computed from
+    that node's (much smaller) result instead of the records, e.g. weekly
+    totals from daily totals. Derived keys (ISO week, tier, ...) are always
+    evaluated on an aggregate, never per record.
+  - Projection pushdown: each record-level groupby only reads the key and
+    measure columns the plan needs (listed per scan by explain()).
+  - Scans are lazy: a dataset is loaded only if the plan uses it, its root
+    groupbys run back to back, and the frame is released before the next
+    dataset is loaded.
+
+Typical use:
+    plan = AggregatePlan()
+    plan.derive('week', ['date'], lambda f: f['date'].dt.isocalendar().week)
+    daily = plan.aggregate('biometric', ['state', 'date'], sums=['bio_age_5_17'])
+    weekly = plan.aggregate('biometric', ['state', 'week'], sums=['bio_age_5_17'])
+    results = plan.execute({'biometric': load_biometric})
+    results[weekly]    # rolled up from the daily node, one pass over the records
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+from collections import namedtuple
+
+import pandas as pd
+
+# ================================================================================
+# PLAN NODES
+# ================================================================================
+
+# Handle returned by AggregatePlan.aggregate(): node plus the requested shape
+Request = namedtuple('Request', ['node', 'keys', 'columns'])
+
+# Name of the record count measure in results
+RECORDS = 'records'
+
+
+class _Node:
+    """One aggregate: a key set of one dataset and the union of its requested measures."""
+
+    def __init__(self, dataset, keys):
+        self.dataset = dataset
+        self.keys = tuple(keys)
+        self.sums = []
+        self.size = False
+        self.nunique = {}
+        self.source = None
+        self.implicit = False
+
+    def add_sums(self, columns):
+        self.sums.extend(c for c in columns if c not in self.sums)
+
+    def label(self):
+        measures = []
+        if self.sums:
+            measures.append(f"sum({', '.join(self.sums)})")
+        if self.size:
+            measures.append("count(*)")
+        measures += [f"nunique({col}) AS {name}" for name, col in self.nunique.items()]
+        return f"({', '.join(self.keys)}) {', '.join(measures)}"
+
+
+# ================================================================================
+# PLAN
+# ================================================================================
+
+class AggregatePlan:
+    """
+    Lazy aggregation plan over record-level datasets.
+
+    Derived keys are registered with derive(); aggregates are requested with
+    aggregate(); optimize() (called by execute()) picks how each node is
+    computed.
+    """
+
+    def __init__(self):
+        self._derived = {}
+        self._nodes = {}
+        self._optimized = False
+        self.scan_passes = 0
+        self.rollups = 0
+
+    def derive(self, name, columns, func):
+        """
+        Register a derived grouping key.
+
+        Args:
+            name: Key name used in requests
+            columns: Base columns it is computed from
+            func: Called with a DataFrame of those columns (an aggregate, not
+                  the records); returns values aligned with its rows
+        """
+        self._derived[name] = (tuple(columns), func)
+        self._optimized = False
+
+    def aggregate(self, dataset, keys, sums=(), size=False, nunique=None):
+        """
+        Request an aggregate.
+
+        Args:
+            dataset: Dataset name (a key of the scans passed to execute())
+            keys: Grouping keys (base columns or derived keys); [] for a grand total
+            sums: Columns to sum
+            size: Also count records (as RECORDS)
+            nunique: {result name: column} distinct counts
+
+        Returns:
+            Request: Handle to look the result up after execute()
+        """
+        node_id = (dataset, frozenset(keys))
+        node = self._nodes.get(node_id)
+        if node is None:
+            node = self._nodes[node_id] = _Node(dataset, keys)
+        node.add_sums(sums)
+        node.size = node.size or size
+        node.nunique.update(nunique or {})
+        self._optimized = False
+
+        columns = list(sums) + ([RECORDS] if size else []) + list(nunique or {})
+        return Request(node_id, tuple(keys), tuple(columns))
+
+    # --------------------------------------------------------------------------
+    # OPTIMIZER
+    # --------------------------------------------------------------------------
+
+    def _grain(self, node):
+        """Base columns a node has to be computed from."""
+        grain = []
+        for key in node.keys:
+            grain.extend(self._derived[key][0] if key in self._derived else [key])
+        grain.extend(node.nunique.values())
+        return frozenset(grain)
+
+    def _is_base(self, node):
+        return not node.nunique and not any(k in self._derived for k in node.keys)
+
+    def optimize(self):
+        """Merge, route and widen the requested nodes (idempotent)."""
+        if self._optimized:
+            return self
+
+        for node in self._nodes.values():
+            node.source = None
+            if node.implicit:
+                node.sums, node.size = [], False
+
+        # Nodes with derived keys or distinct counts roll up from a base node
+        # at their grain; add one where no request covers it
+        for node in list(self._nodes.values()):
+            if not self._is_base(node):
+                grain = self._grain(node)
+                if not any(self._is_base(m) and m.dataset == node.dataset and set(m.keys) >= grain
+                           for m in self._nodes.values()):
+                    grain_id = (node.dataset, grain)
+                    implicit = self._nodes[grain_id] = _Node(node.dataset, sorted(grain))
+                    implicit.implicit = True
+
+        # Each node reads from the smallest base node that covers its grain
+        for node_id, node in self._nodes.items():
+            grain = self._grain(node)
+            candidates = [
+                (len(m.keys), sorted(m.keys), m_id)
+                for m_id, m in self._nodes.items()
+                if m_id != node_id and m.dataset == node.dataset and self._is_base(m)
+                and set(m.keys) >= grain and (len(m.keys) > len(grain) or not self._is_base(node))
+            ]
+            if candidates:
+                node.source = min(candidates)[2]
+
+        # Sources must carry every sum and record count their readers need
+        for node in self._nodes.values():
+            source_id = node.source
+            while source_id is not None:
+                source = self._nodes[source_id]
+                source.add_sums(node.sums)
+                source.size = source.size or node.size
+                source_id = source.source
+
+        self._optimized = True
+        return self
+
+    def explain(self):
+        """
+        Optimized plan, one line per step.
+
+        Returns:
+            list: Plan lines (scans with their projected columns, then the
+                  groupbys and rollups reading from them)
+        """
+        self.optimize()
+        lines = []
+        for dataset in self._datasets():
+            roots = [n_id for n_id in self._nodes if self._nodes[n_id].dataset == dataset
+                     and self._nodes[n_id].source is None]
+            lines.append(f"scan {dataset} [{', '.join(self._projection(dataset))}]")
+            for root in roots:
+                self._explain_node(root, 1, lines)
+        return lines
+
+    def _explain_node(self, node_id, depth, lines):
+        node = self._nodes[node_id]
+        step = "groupby" if node.source is None else "rollup"
+        lines.append(f"{'  ' * depth}{step} {node.label()}")
+        for child_id, child in self._nodes.items():
+            if child.source == node_id:
+                self._explain_node(child_id, depth + 1, lines)
+
+    def _datasets(self):
+        return list(dict.fromkeys(n.dataset for n in self._nodes.values()))
+
+    def _projection(self, dataset):
+        """Record columns the root groupbys of a dataset read."""
+        columns = []
+        for node in self._nodes.values():
+            if node.dataset == dataset and node.source is None:
+                columns.extend(c for c in list(node.keys) + node.sums if c not in columns)
+        return columns
+
+    # --------------------------------------------------------------------------
+    # EXECUTION
+    # --------------------------------------------------------------------------
+
+    def execute(self, scans):
+        """
+        Run the optimized plan.
+
+        Args:
+            scans: {dataset: DataFrame or zero-argument callable returning one}
+
+        Returns:
+            dict: Request -> pd.DataFrame with the request's keys (sorted, as
+                  columns) followed by its measures
+        """
+        self.optimize()
+        computed = {}
+
+        for dataset in self._datasets():
+            roots = [n_id for n_id, n in self._nodes.items() if n.dataset == dataset and n.source is None]
+            frame = scans[dataset]() if callable(scans[dataset]) else scans[dataset]
+            for root in roots:
+                computed[root] = self._group(frame, self._nodes[root], rollup=False)
+                self.scan_passes += 1
+            del frame
+
+            for node_id, node in self._nodes.items():
+                if node.dataset == dataset:
+                    self._compute(node_id, computed)
+
+        return _Results(self, computed)
+
+    def _compute(self, node_id, computed):
+        if node_id not in computed:
+            node = self._nodes[node_id]
+            self._compute(node.source, computed)
+            computed[node_id] = self._group(computed[node.source], node, rollup=True)
+            self.rollups += 1
+        return computed[node_id]
+
+    def _group(self, df, node, rollup):
+        """Aggregate records (rollup=False) or a finer aggregate (rollup=True) into a node."""
+        if not node.keys:
+            totals = df[node.sums].sum()
+            if node.size:
+                totals[RECORDS] = df[RECORDS].sum() if rollup else len(df)
+            return totals.to_frame().T.astype('int64')
+
+        by = []
+        for key in node.keys:
+            if key in self._derived:
+                columns, func = self._derived[key]
+                by.append(pd.Series(func(df[list(columns)]), index=df.index, name=key))
+            else:
+                by.append(df[key])
+
+        grouped = df.groupby(by, sort=True)
+        result = grouped[node.sums].sum()
+        if node.size:
+            result[RECORDS] = grouped[RECORDS].sum() if rollup else grouped.size()
+        for name, col in node.nunique.items():
+            result[name] = grouped[col].nunique()
+        return result.reset_index()
+
+
+class _Results:
+    """Results of an executed plan, looked up by Request."""
+
+    def __init__(self, plan, computed):
+        self._plan = plan
+        self._computed = computed
+
+    def __getitem__(self, request):
+        result = self._computed[request.node]
+        node = self._plan._nodes[request.node]
+        result = result[list(request.keys) + list(request.columns)]
+        if request.keys != node.keys:
+            result = result.sort_values(list(request.keys)).reset_index(drop=True)
+        return result
@@ -0,0 +1,378 @@
+"""
+================================================================================
+RAW DATA STORE - PAGINATED BROWSING WITH PREDICATE PUSHDOWN
+================================================================================
+
+Columnar (Parquet) copies of the consolidated datasets for the dashboard's
+Raw Data browser.
+
+The CSV is converted chunk by chunk, each chunk sorted by
+(state, district, pincode, date) before it is written as row groups. Every
+row group therefore covers a narrow state/pincode range, and its min/max
+statistics let filters on date, state, pincode prefix and counts skip whole
+row groups without reading them.
+
+Next to each store a pincode index (<dataset>.pincode_ranges.parquet) lists
+the row ranges of every 3-digit pincode prefix in storage order. A pincode
+prefix filter reads only the row groups overlapping those ranges, even when
+a row group's pincode min/max spans several districts.
+
+Pages are streamed: only the rows of the requested page are materialized
+(or, when sorting by a column, a bounded top-k buffer), so memory stays
+flat regardless of dataset size.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import argparse
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as pds
+import pyarrow.parquet as pq
+
+from aggregation_layer import DATASET_COUNT_COLUMNS, DATASET_VALUE_COLUMNS
+from pincode_index import PINCODE_DIGITS, pincode_values, prefix_bounds, prefix_runs
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FILTERED_DATA_DIR = os.path.join(BASE_DIR, "filtered_data")
+STORE_DIR = os.path.join(FILTERED_DATA_DIR, "columnar")
+
+# CSV rows read per conversion step and rows per Parquet row group
+CSV_CHUNK_ROWS = 1_000_000
+ROW_GROUP_ROWS = 50_000
+
+# Storage order (also the tie-breaker when sorting by another column)
+STORE_SORT_KEYS = ['state', 'district', 'pincode', 'date']
+
+# Prefix length of the persisted pincode row-range index (sorting district)
+INDEX_PREFIX_DIGITS = 3
+
+
+# ================================================================================
+# STORE MANAGEMENT
+# ================================================================================
+
+def csv_path(dataset):
+    """Consolidated CSV of a dataset."""
+    return os.path.join(FILTERED_DATA_DIR, f"consolidated_{dataset}.csv")
+
+
+def store_path(dataset):
+    """Parquet store of a dataset."""
+    return os.path.join(STORE_DIR, f"{dataset}.parquet")
+
+
+def index_path(dataset):
+    """Pincode prefix -> row range index of a dataset's store."""
+    return os.path.join(STORE_DIR, f"{dataset}.pincode_ranges.parquet")
+
+
+def store_is_current(dataset):
+    """True if the store exists and is newer than its source CSV."""
+    path = store_path(dataset)
+    if not os.path.exists(path):
+        return False
+    source = csv_path(dataset)
+    return not os.path.exists(source) or os.path.getmtime(path) >= os.path.getmtime(source)
+
+
+def _schema(dataset):
+    """Arrow schema of a dataset's store."""
+    fields = [
+        pa.field('date', pa.timestamp('ns')),
+        pa.field('state', pa.string()),
+        pa.field('district', pa.string()),
+        pa.field('pincode', pa.int64()),
+    ]
+    fields += [pa.field(col, pa.int64()) for col in DATASET_COUNT_COLUMNS[dataset]]
+    fields.append(pa.field(DATASET_VALUE_COLUMNS[dataset], pa.int64()))
+    return pa.schema(fields)
+
+
+def build_columnar_store(dataset, source=None, chunk_rows=CSV_CHUNK_ROWS, row_group_rows=ROW_GROUP_ROWS):
+    """
+    Convert a consolidated CSV into a Parquet store, one chunk at a time.
+
+    Args:
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        source: CSV to convert (defaults to the consolidated file)
+        chunk_rows: CSV rows held in memory at once
+        row_group_rows: Rows per Parquet row group
+
+    Returns:
+        str: Path of the written store
+    """
+    source = source or csv_path(dataset)
+    if not os.path.exists(source):
+        raise FileNotFoundError(f"Data file not found: {source}")
+
+    os.makedirs(STORE_DIR, exist_ok=True)
+    path = store_path(dataset)
+    tmp_path = path + ".tmp"
+
+    schema = _schema(dataset)
+    count_cols = DATASET_COUNT_COLUMNS[dataset]
+    total_rows = 0
+    runs = []
+
+    print(f"[INFO] Building columnar store for {dataset} from {source}")
+
+    with pq.ParquetWriter(tmp_path, schema) as writer:
+        for chunk in pd.read_csv(source, chunksize=chunk_rows, dtype={'state': str, 'district': str}):
+            chunk['date'] = pd.to_datetime(chunk['date'], format='%d-%m-%Y', errors='coerce')
+            chunk['pincode'] = pd.to_numeric(chunk['pincode'], errors='coerce').astype('Int64')
+            for col in count_cols:
+                chunk[col] = pd.to_numeric(chunk[col], errors='coerce').astype('Int64')
+            chunk[DATASET_VALUE_COLUMNS[dataset]] = chunk[count_cols].sum(axis=1).astype('Int64')
+
+            chunk = chunk.sort_values(STORE_SORT_KEYS, na_position='last')
+            table = pa.Table.from_pandas(chunk[schema.names], schema=schema, preserve_index=False)
+            writer.write_table(table, row_group_size=row_group_rows)
+
+            prefixes, starts, stops = prefix_runs(pincode_values(chunk['pincode']), INDEX_PREFIX_DIGITS)
+            runs.append(pd.DataFrame({'prefix': prefixes, 'start': starts + total_rows, 'stop': stops + total_rows}))
+            total_rows += len(chunk)
+
+    # Written after the store, so an index is never older than its store
+    ranges = pd.concat(runs, ignore_index=True) if runs else pd.DataFrame(columns=['prefix', 'start', 'stop'])
+    ranges = ranges[ranges['prefix'] >= 0].astype('int64')
+    ranges.to_parquet(index_path(dataset) + ".tmp", index=False)
+
+    os.replace(tmp_path, path)
+    os.replace(index_path(dataset) + ".tmp", index_path(dataset))
+    print(f"[SAVED] {path} ({total_rows:,} rows, {len(ranges):,} pincode ranges)")
+
+    return path
+
+
+def store_info(dataset):
+    """
+    Read store metadata (no data pages are read).
+
+    Returns:
+        dict: rows, row_groups, columns, min_date, max_date
+    """
+    metadata = pq.ParquetFile(store_path(dataset)).metadata
+    date_idx = metadata.schema.names.index('date')
+
+    min_date, max_date = None, None
+    for i in range(metadata.num_row_groups):
+        stats = metadata.row_group(i).column(date_idx).statistics
+        if stats is not None and stats.has_min_max:
+            min_date = stats.min if min_date is None else min(min_date, stats.min)
+            max_date = stats.max if max_date is None else max(max_date, stats.max)
+
+    return {
+        'rows': metadata.num_rows,
+        'row_groups': metadata.num_row_groups,
+        'columns': metadata.schema.names,
+        'min_date': pd.Timestamp(min_date) if min_date is not None else None,
+        'max_date': pd.Timestamp(max_date) if max_date is not None else None,
+    }
+
+
+# ================================================================================
+# PREDICATES
+# ================================================================================
+
+def build_filter(date_from=None, date_to=None, states=None, district=None,
+                 pincode_prefix=None, min_counts=None):
+    """
+    Build a dataset filter expression from browser inputs.
+
+    Range predicates (date, pincode prefix, count thresholds) and state
+    membership are checked against row-group statistics before any data
+    is read.
+
+    Args:
+        date_from: Inclusive start date
+        date_to: Inclusive end date
+        states: States to include
+        district: Case-insensitive district name fragment
+        pincode_prefix: Leading pincode digits (e.g. '11' = 110000-119999)
+        min_counts: Dict of count column -> minimum value
+
+    Returns:
+        pyarrow.dataset.Expression or None
+    """
+    conditions = []
+
+    if date_from is not None:
+        conditions.append(pds.field('date') >= pa.scalar(pd.Timestamp(date_from), pa.timestamp('ns')))
+    if date_to is not None:
+        end = pd.Timestamp(date_to) + pd.Timedelta(days=1)
+        conditions.append(pds.field('date') < pa.scalar(end, pa.timestamp('ns')))
+
+    if states:
+        conditions.append(pds.field('state').isin(list(states)))
+
+    if district:
+        conditions.append(pc.match_substring(pds.field('district'), district.strip(), ignore_case=True))
+
+    if pincode_prefix:
+        # Prefix as an integer range, e.g. '11' -> [110000, 120000)
+        low, high = prefix_bounds(pincode_prefix)
+        conditions.append(pds.field('pincode') >= low)
+        conditions.append(pds.field('pincode') < high)
+
+    for col, minimum in (min_counts or {}).items():
+        if minimum:
+            conditions.append(pds.field(col) >= minimum)
+
+    if not conditions:
+        return None
+
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression & condition
+    return expression
+
+
+# ================================================================================
+# QUERIES
+# ================================================================================
+
+def prefix_row_groups(dataset, pincode_prefix):
+    """
+    Row groups of the store holding rows under a pincode prefix.
+
+    Uses the persisted pincode index: the prefix's row ranges are mapped to
+    the row groups they overlap.
+
+    Returns:
+        np.ndarray or None: Sorted row group ids, or None if the index is
+                            missing or older than the store
+    """
+    path = index_path(dataset)
+    if not os.path.exists(path) or os.path.getmtime(path) < os.path.getmtime(store_path(dataset)):
+        return None
+
+    # Prefix range at index resolution, e.g. '5' -> [500, 600), '5601' -> [560, 561)
+    low, high = prefix_bounds(pincode_prefix)
+    scale = 10 ** (PINCODE_DIGITS - INDEX_PREFIX_DIGITS)
+    ranges = pd.read_parquet(path, filters=[('prefix', '>=', low // scale), ('prefix', '<', -(-high // scale))])
+
+    metadata = pq.ParquetFile(store_path(dataset)).metadata
+    group_stops = np.cumsum([metadata.row_group(i).num_rows for i in range(metadata.num_row_groups)])
+    first = np.searchsorted(group_stops, ranges['start'].to_numpy(), side='right')
+    last = np.searchsorted(group_stops, ranges['stop'].to_numpy() - 1, side='right')
+
+    # Mark every group between first and last of each range
+    marks = np.zeros(metadata.num_row_groups + 1, dtype=np.int64)
+    np.add.at(marks, first, 1)
+    np.add.at(marks, last + 1, -1)
+    return np.flatnonzero(np.cumsum(marks)[:-1] > 0)
+
+
+def _open(dataset, pincode_prefix=None):
+    """Store as a dataset, restricted to a pincode prefix's row groups when indexed."""
+    dset = pds.dataset(store_path(dataset), format='parquet')
+    groups = prefix_row_groups(dataset, pincode_prefix) if pincode_prefix else None
+    if groups is None:
+        return dset
+    fragments = [fragment.subset(row_group_ids=groups.tolist()) for fragment in dset.get_fragments()]
+    return pds.FileSystemDataset(fragments, dset.schema, dset.format, dset.filesystem)
+
+
+def count_matches(dataset, filter_expr=None, pincode_prefix=None):
+    """
+    Count matching rows and the row groups that had to be read.
+
+    Args:
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        filter_expr: Output of build_filter()
+        pincode_prefix: The prefix passed to build_filter(), if any; limits
+                        the scan to the row groups the pincode index lists
+
+    Returns:
+        tuple: (matching rows, row groups scanned, total row groups)
+    """
+    dset = _open(dataset, pincode_prefix)
+    scanned = 0
+    for fragment in dset.get_fragments():
+        scanned += len(fragment.split_by_row_group(filter_expr)) if filter_expr is not None \
+            else fragment.num_row_groups
+    total = pq.ParquetFile(store_path(dataset)).metadata.num_row_groups
+    return dset.count_rows(filter=filter_expr), scanned, total
+
+
+def query_page(dataset, filter_expr=None, page=0, page_size=100, sort_by=None, ascending=True,
+               pincode_prefix=None):
+    """
+    Materialize one page of matching rows.
+
+    Without sort_by, rows come in storage order and batches are streamed
+    until the page is filled. With sort_by, a top-k buffer of
+    (page + 1) * page_size rows is kept while streaming, so memory is
+    bounded by the page depth rather than the dataset size.
+
+    Args:
+        dataset: 'enrolment', 'demographic' or 'biometric'
+        filter_expr: Output of build_filter()
+        page: Zero-based page number
+        page_size: Rows per page
+        sort_by: Column to sort by (None = storage order)
+        ascending: Sort direction
+        pincode_prefix: The prefix passed to build_filter(), if any
+
+    Returns:
+        pd.DataFrame: The requested page
+    """
+    scanner = _open(dataset, pincode_prefix).scanner(filter=filter_expr)
+    offset = page * page_size
+
+    if sort_by is None:
+        rows, skipped = [], 0
+        for batch in scanner.to_batches():
+            if skipped + batch.num_rows <= offset:
+                skipped += batch.num_rows
+                continue
+            start = max(offset - skipped, 0)
+            rows.append(batch.slice(start, page_size - sum(r.num_rows for r in rows)))
+            skipped += batch.num_rows
+            if sum(r.num_rows for r in rows) >= page_size:
+                break
+        table = pa.Table.from_batches(rows, schema=scanner.projected_schema)
+        return table.to_pandas()
+
+    order = 'ascending' if ascending else 'descending'
+    sort_keys = [(sort_by, order)] + [(key, 'ascending') for key in STORE_SORT_KEYS if key != sort_by]
+    k = offset + page_size
+
+    best = None
+    for batch in scanner.to_batches():
+        if batch.num_rows == 0:
+            continue
+        candidates = pa.Table.from_batches([batch]) if best is None else \
+            pa.concat_tables([best, pa.Table.from_batches([batch])])
+        if candidates.num_rows > k:
+            candidates = candidates.take(pc.select_k_unstable(candidates, k=k, sort_keys=sort_keys))
+        best = candidates
+
+    if best is None:
+        return scanner.projected_schema.empty_table().to_pandas()
+
+    best = best.take(pc.sort_indices(best, sort_keys=sort_keys))
+    return best.slice(offset, page_size).to_pandas()
+
+
+# ================================================================================
+# MAIN EXECUTION
+# ================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build columnar stores for the Raw Data browser")
+    parser.add_argument("datasets", nargs="*", default=list(DATASET_VALUE_COLUMNS),
+                        help="datasets to convert (default: all)")
+    args = parser.parse_args()
+    for name in args.datasets:
+        build_columnar_store(name)
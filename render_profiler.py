@@ -0,0 +1,236 @@
+"""
+================================================================================
+RENDER PROFILER - PAGE RENDER TIMINGS AND MEMORY FOR THE DASHBOARD
+================================================================================
+
+Opt-in instrumentation for streamlit_app.py. When enabled, every page render
+is broken down into stages:
+  - load:      reading the page's datasets (cache hits are near zero)
+  - filter:    applying the sidebar state filter
+  - build:     data preparation (groupbys, merges) and figure creation for
+               each chart/table, i.e. the time since the previous element
+  - serialize: handing the figure/table to Streamlit (JSON/Arrow encoding)
+plus the total render time and the peak traced memory of the render.
+
+Samples are appended to a CSV log; summarize_render_log() (or running this
+module) reports p50/p95 latencies per page and stage.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import time
+import uuid
+import argparse
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+PROFILE_LOG = os.path.join(OUTPUT_DIR, "render_profile.csv")
+
+# Environment variable that turns profiling on for every session
+PROFILE_ENV_VAR = "UIDAI_PROFILE_RENDERS"
+
+LOG_COLUMNS = ['timestamp', 'render_id', 'page', 'stage', 'label', 'seconds', 'peak_memory_mb']
+
+STAGES = ['load', 'filter', 'build', 'serialize', 'total']
+
+
+def profiling_enabled_by_default():
+    """True if the environment variable asks for profiling."""
+    return os.environ.get(PROFILE_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+# ================================================================================
+# PROFILER
+# ================================================================================
+
+class RenderProfiler:
+    """
+    Collects stage timings for one page render.
+
+    A disabled profiler only passes calls through, so the dashboard can use
+    the same code path whether profiling is on or off.
+    """
+
+    def __init__(self, page, enabled=False, trace_memory=True):
+        self.page = page
+        self.enabled = enabled
+        self.render_id = uuid.uuid4().hex[:12]
+        self.samples = []
+        self._elements = 0
+        self.peak_memory_mb = None
+        self.total_seconds = None
+
+        self._started_tracing = False
+        if enabled and trace_memory:
+            # tracemalloc is process-wide: with concurrent profiled sessions
+            # the peak covers all of them
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+
+        self._start = time.perf_counter()
+        self._last = self._start
+
+    @contextmanager
+    def stage(self, name, label=''):
+        """Time a block as one sample of the given stage."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.samples.append((name, label, end - start))
+            self._last = end
+
+    def next_label(self, kind, title=None):
+        """Unique label for the next chart/table of this render."""
+        self._elements += 1
+        return f"{kind} {self._elements}" + (f": {title}" if title else "")
+
+    def render(self, label, render_fn, *args, **kwargs):
+        """
+        Call a Streamlit element function, recording its build and serialize time.
+
+        The build sample is the time since the previous recorded sample (data
+        preparation and figure creation for this element).
+        """
+        if not self.enabled:
+            return render_fn(*args, **kwargs)
+        self.samples.append(('build', label, time.perf_counter() - self._last))
+        with self.stage('serialize', label):
+            return render_fn(*args, **kwargs)
+
+    def finish(self, log_path=PROFILE_LOG):
+        """
+        Close the render: total time, peak memory and the log append.
+
+        Returns:
+            pd.DataFrame: Samples of this render (empty if disabled)
+        """
+        if not self.enabled:
+            return pd.DataFrame(columns=LOG_COLUMNS)
+
+        self.total_seconds = time.perf_counter() - self._start
+        if tracemalloc.is_tracing():
+            self.peak_memory_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            if self._started_tracing:
+                tracemalloc.stop()
+
+        samples = pd.DataFrame(self.samples + [('total', '', self.total_seconds)],
+                               columns=['stage', 'label', 'seconds'])
+        samples.insert(0, 'page', self.page)
+        samples.insert(0, 'render_id', self.render_id)
+        samples.insert(0, 'timestamp', datetime.now().isoformat(timespec='seconds'))
+        samples['peak_memory_mb'] = None
+        samples.loc[samples['stage'] == 'total', 'peak_memory_mb'] = self.peak_memory_mb
+
+        if log_path:
+            os.makedirs(os.path.dirname(log_path), exist_ok=True)
+            samples.to_csv(log_path, mode='a', header=not os.path.exists(log_path), index=False)
+
+        return samples
+
+    def breakdown(self):
+        """
+        Seconds per stage for this render (build/serialize summed over elements).
+
+        Returns:
+            pd.DataFrame: stage, seconds, share of the total render
+        """
+        samples = pd.DataFrame(self.samples, columns=['stage', 'label', 'seconds'])
+        per_stage = samples.groupby('stage')['seconds'].sum().reindex(STAGES[:-1], fill_value=0.0)
+        result = per_stage.reset_index()
+        total = self.total_seconds or result['seconds'].sum()
+        result['share'] = result['seconds'] / total if total > 0 else 0.0
+        return result
+
+    def slowest_elements(self, n=5):
+        """Elements with the largest build + serialize time."""
+        samples = pd.DataFrame(self.samples, columns=['stage', 'label', 'seconds'])
+        elements = samples[samples['stage'].isin(['build', 'serialize'])]
+        if elements.empty:
+            return pd.DataFrame(columns=['label', 'build', 'serialize', 'total'])
+        per_element = elements.pivot_table(index='label', columns='stage', values='seconds',
+                                           aggfunc='sum', fill_value=0.0)
+        per_element = per_element.reindex(columns=['build', 'serialize'], fill_value=0.0)
+        per_element['total'] = per_element.sum(axis=1)
+        per_element.columns.name = None
+        return per_element.nlargest(n, 'total').reset_index()
+
+
+# ================================================================================
+# LOG ANALYSIS
+# ================================================================================
+
+def load_render_log(path=PROFILE_LOG):
+    """Load the render log (empty if nothing was profiled yet)."""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=LOG_COLUMNS)
+    return pd.read_csv(path, keep_default_na=False, na_values=[''])
+
+
+def summarize_render_log(log=None, page=None):
+    """
+    p50/p95 latency per page and stage across logged renders.
+
+    Element samples are summed per render first, so 'serialize' is the
+    total serialization time of a render, not of a single chart.
+
+    Args:
+        log: Output of load_render_log() (loaded if omitted)
+        page: Restrict to one page
+
+    Returns:
+        pd.DataFrame: page, stage, renders, p50_s, p95_s, peak_memory_p95_mb
+    """
+    log = load_render_log() if log is None else log
+    if page is not None:
+        log = log[log['page'] == page]
+    if log.empty:
+        return pd.DataFrame(columns=['page', 'stage', 'renders', 'p50_s', 'p95_s', 'peak_memory_p95_mb'])
+
+    per_render = log.groupby(['page', 'render_id', 'stage'], as_index=False)['seconds'].sum()
+    summary = per_render.groupby(['page', 'stage'])['seconds'].agg(
+        renders='size',
+        p50_s=lambda s: s.quantile(0.5),
+        p95_s=lambda s: s.quantile(0.95),
+    ).reset_index()
+
+    memory = log[log['stage'] == 'total'].groupby('page')['peak_memory_mb'].quantile(0.95)
+    summary['peak_memory_p95_mb'] = summary['page'].map(memory).where(summary['stage'] == 'total')
+
+    summary['stage'] = pd.Categorical(summary['stage'], categories=STAGES, ordered=True)
+    return summary.sort_values(['page', 'stage']).reset_index(drop=True)
+
+
+# ================================================================================
+# MAIN EXECUTION
+# ================================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Summarize dashboard render timings")
+    parser.add_argument("--log", default=PROFILE_LOG, help="render log to read")
+    parser.add_argument("--page", default=None, help="only this page")
+    args = parser.parse_args()
+
+    summary = summarize_render_log(load_render_log(args.log), page=args.page)
+    if summary.empty:
+        print(f"[INFO] No profiled renders in {args.log}")
+    else:
+        print(summary.round(4).to_string(index=False))
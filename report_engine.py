@@ -0,0 +1,247 @@
+"""
+================================================================================
+REPORT ENGINE - SHARED GROUPBY RESULTS FOR THE ANALYSIS REPORTS
+================================================================================
+
+The aadhaar_*_analysis reports are made of sections that all aggregate the
+same record-level frame by the same few keys (date, month, state, district,
+...). Instead of every section running its own groupby, the sections declare
+the aggregations they need up front; the engine merges the requests per
+grouping key and runs ONE groupby per distinct key. Every section then reads
+its slice of the shared result.
+
+Results are shaped exactly like the pandas call they replace:
+  engine.agg(keys, spec)   ~ df.groupby(keys).agg(spec)
+  engine.sum(keys, cols)   ~ df.groupby(keys)[cols].sum()
+
+Derived keys (calendar month, weekday, early/late period, ...) are registered
+as Series and computed once, so they do not have to be added to the frame.
+
+When the aggregate service is configured (UIDAI_AGGREGATE_SERVICE), sums,
+counts and means by date, month, state and district are read from its warm
+cubes instead; the engine only runs the groupbys the service cannot answer.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import pandas as pd
+
+from aggregate_client import service_url, query as query_service
+from aggregation_layer import DATASET_COUNT_COLUMNS
+
+# Keys the aggregate service's /totals can group by ('month' = calendar month of date)
+SERVICE_KEYS = ('date', 'month', 'state', 'district')
+
+# Functions answered exactly from the service's per-group total and record count
+SERVICE_FUNCTIONS = ('sum', 'count', 'mean')
+
+# ================================================================================
+# HELPERS
+# ================================================================================
+
+def _as_keys(keys):
+    """Grouping keys as a tuple of names."""
+    return (keys,) if isinstance(keys, str) else tuple(keys)
+
+
+def _as_funcs(funcs):
+    """Aggregation functions as a list of names."""
+    return [funcs] if isinstance(funcs, str) else list(funcs)
+
+
+# ================================================================================
+# ENGINE
+# ================================================================================
+
+class ReportEngine:
+    """
+    Collects aggregation requests and answers them from one groupby per key.
+
+    Typical use:
+        engine = ReportEngine(df)
+        engine.add_key('month', df['date'].dt.to_period('M'))
+        engine.request_all(AGGREGATIONS)
+        engine.run()
+        monthly = engine.sum('month', 'total_enrolment')
+    """
+
+    def __init__(self, df):
+        self.df = df
+        self._derived = {}
+        self._requests = {}
+        self._results = {}
+        self.groupby_passes = 0
+
+    def add_key(self, name, values):
+        """
+        Register a derived grouping key.
+
+        Args:
+            name: Key name used in requests
+            values: Series aligned with the frame; its own name becomes the
+                    index level name of the results (as with df.groupby(series))
+        """
+        self._derived[name] = values
+
+    def request(self, keys, spec):
+        """
+        Declare an aggregation needed by a report section.
+
+        Args:
+            keys: Column / derived key name, or a list of them
+            spec: {column: function name or list of function names}
+        """
+        pending = self._requests.setdefault(_as_keys(keys), {})
+        for column, funcs in spec.items():
+            listed = pending.setdefault(column, [])
+            listed.extend(f for f in _as_funcs(funcs) if f not in listed)
+
+    def request_all(self, requests):
+        """Declare a list of (keys, spec) aggregations."""
+        for keys, spec in requests:
+            self.request(keys, spec)
+
+    def run(self):
+        """Compute every pending request, one groupby per distinct key."""
+        for keys in list(self._requests):
+            self._compute(keys)
+        return self
+
+    def _compute(self, keys):
+        """Run the merged request of one key and add it to the shared results."""
+        cached = self._results.get(keys)
+        done = set() if cached is None else set(cached.columns)
+        missing = {}
+        for column, funcs in self._requests.pop(keys, {}).items():
+            funcs = [f for f in funcs if (column, f) not in done]
+            if funcs:
+                missing[column] = funcs
+        if not missing:
+            return
+
+        by = [self._derived[k] if k in self._derived else k for k in keys]
+        result = self.df.groupby(by, sort=True).agg(missing)
+        self.groupby_passes += 1
+
+        self._results[keys] = result if cached is None else pd.concat([cached, result], axis=1)
+
+    def _level_name(self, key):
+        """Index level name of a key in the results (a derived key's Series name)."""
+        return self._derived[key].name if key in self._derived else key
+
+    def add_result(self, keys, result):
+        """
+        Add precomputed aggregates of a key; run() then skips those columns.
+
+        Args:
+            keys: Grouping key(s)
+            result: Frame shaped like df.groupby(keys).agg(spec), with
+                    (column, function) columns
+        """
+        keys = _as_keys(keys)
+        cached = self._results.get(keys)
+        self._results[keys] = result if cached is None else pd.concat([cached, result], axis=1)
+
+    def answer_from_service(self, dataset, value_col):
+        """
+        Answer the pending requests the aggregate service can serve.
+
+        Sums, counts and means of the dataset's total (value_col) and age
+        bucket columns, by any of SERVICE_KEYS, are read from /totals; other
+        keys and functions (distinct counts, spreads, ...) are left for run().
+        Nothing is added when the service is not configured or a query fails,
+        so run() then computes every request from the frame.
+
+        Args:
+            dataset: Service dataset name ('enrolment', 'demographic', 'biometric')
+            value_col: Frame column holding the dataset's total
+
+        Returns:
+            int: Number of keys answered by the service
+        """
+        if not service_url():
+            return 0
+
+        served = {value_col, *DATASET_COUNT_COLUMNS[dataset]}
+        answers = {}
+        for keys, spec in self._requests.items():
+            columns = [(column, f) for column, funcs in spec.items() for f in funcs
+                       if f in SERVICE_FUNCTIONS and (f == 'count' or column in served)]
+            if columns and all(key in SERVICE_KEYS for key in keys):
+                answers[keys] = columns
+
+        try:
+            results = {keys: self._service_result(dataset, value_col, keys, columns)
+                       for keys, columns in answers.items()}
+        except (ConnectionError, ValueError) as e:
+            print(f"⚠ Aggregate service query failed ({e}); computing every aggregation locally")
+            return 0
+
+        for keys, result in results.items():
+            self.add_result(keys, result)
+        print(f"✓ {len(results)} aggregation key(s) from the aggregate service")
+        return len(results)
+
+    def _service_result(self, dataset, value_col, keys, columns):
+        """One key's (column, function) aggregates from the service's /totals."""
+        totals = query_service('totals', dataset=dataset, by=list(keys))
+        if 'month' in totals.columns:
+            totals['month'] = pd.PeriodIndex(totals['month'], freq='M')
+        totals = totals.set_index(list(keys)).rename_axis([self._level_name(k) for k in keys])
+
+        values = {}
+        for column, func in columns:
+            source = 'total' if column == value_col else column
+            if func == 'count':
+                values[(column, func)] = totals['records']
+            elif func == 'sum':
+                values[(column, func)] = totals[source]
+            else:
+                values[(column, func)] = totals[source] / totals['records']
+        return pd.DataFrame(values)
+
+    def agg(self, keys, spec, select=None):
+        """
+        Aggregated frame shaped like df.groupby(keys).agg(spec).
+
+        Anything not requested before run() is computed on demand (one more
+        groupby for that key).
+
+        Args:
+            keys: Grouping key(s)
+            spec: {column: function name or list of function names}
+            select: Value of the first key to keep; that index level is dropped
+                    (e.g. select='early' on ['period', 'state'])
+
+        Returns:
+            pd.DataFrame: Copy of the requested columns (flat column names if
+                          every function in spec is a single name)
+        """
+        keys = _as_keys(keys)
+        self.request(keys, spec)
+        self._compute(keys)
+
+        columns = [(c, f) for c, funcs in spec.items() for f in _as_funcs(funcs)]
+        result = self._results[keys][columns].copy()
+        if all(isinstance(funcs, str) for funcs in spec.values()):
+            result.columns = list(spec)
+
+        if select is not None:
+            if select in result.index.get_level_values(0):
+                result = result.xs(select, level=0)
+            else:
+                result = result.iloc[:0].droplevel(0)
+        return result
+
+    def sum(self, keys, columns, select=None):
+        """
+        Group sums shaped like df.groupby(keys)[columns].sum().
+
+        Returns:
+            pd.Series for a single column name, pd.DataFrame for a list
+        """
+        if isinstance(columns, str):
+            return self.agg(keys, {columns: 'sum'}, select=select)[columns]
+        return self.agg(keys, {c: 'sum' for c in columns}, select=select)
@@ -0,0 +1,295 @@
+"""
+================================================================================
+SQL BACKEND - OUT-OF-CORE AGGREGATION WITH AN EMBEDDED SQL ENGINE
+================================================================================
+
+Runs the core aggregations of the analysis (daily/monthly/weekly totals,
+district statistics, re-enrolment gaps) inside an in-process DuckDB database
+instead of pandas, so the full history does not have to fit in RAM.
+
+Each consolidated CSV is cleaned with the same rules as
+uidai_comprehensive_analysis._clean_dataframe (day-first dates, stripped and
+title-cased names, 6-digit pincodes, numeric counts, exact duplicates
+dropped) and stored as a columnar table. Only the aggregated results are
+returned to pandas.
+
+The engine is given a memory limit; hash aggregations, DISTINCT and sorts
+that do not fit spill to the temp directory instead of failing.
+
+DuckDB is optional (pip install duckdb); nothing else in the repo needs it.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import pandas as pd
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from aggregation_layer import DATASET_COUNT_COLUMNS
+from district_reconciliation import load_district_mapping
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+FILTERED_DATA_DIR = os.path.join(BASE_DIR, "filtered_data")
+
+# Engine memory cap; anything larger spills to TEMP_DIR
+MEMORY_LIMIT = "2GB"
+TEMP_DIR = os.path.join(BASE_DIR, ".duckdb_tmp")
+
+# Worker threads (None = all cores)
+THREADS = None
+
+DATASETS = ['demographic', 'enrolment', 'biometric']
+
+# Grouping keys accepted by totals()
+KEY_EXPRESSIONS = {
+    'date': "date",
+    'state': "state",
+    'district': "district",
+    'pincode': "pincode",
+    'month': "strftime(date, '%Y-%m')",
+    'year': "year(date)",
+    'week': "weekofyear(date)",
+}
+
+
+# ================================================================================
+# CONNECTION AND LOADING
+# ================================================================================
+
+def _check_dataset(dataset):
+    if dataset not in DATASET_COUNT_COLUMNS:
+        raise ValueError(f"Unknown dataset {dataset!r}; expected one of {list(DATASET_COUNT_COLUMNS)}")
+
+
+def _clean_name(value):
+    """Name as cleaned by the pandas loader (astype(str).str.strip().str.title())."""
+    return 'Nan' if pd.isna(value) else str(value).strip().title()
+
+
+def _to_timestamps(df):
+    """DATE columns as datetime64[ns], like the pandas loaders produce."""
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date']).astype('datetime64[ns]')
+    return df
+
+
+def connect(data_dir=FILTERED_DATA_DIR, datasets=DATASETS, memory_limit=MEMORY_LIMIT,
+            temp_directory=TEMP_DIR, threads=THREADS):
+    """
+    Open an in-process database with the cleaned datasets loaded as tables.
+
+    Args:
+        data_dir: Folder with the consolidated_<dataset>.csv files
+        datasets: Datasets to load (each becomes a table of the same name)
+        memory_limit: Engine memory cap, e.g. '2GB'
+        temp_directory: Spill folder
+        threads: Worker threads (None = all cores)
+
+    Returns:
+        tuple: (connection, {dataset: (raw_rows, clean_rows)})
+    """
+    if duckdb is None:
+        raise ImportError("The SQL backend needs duckdb (pip install duckdb)")
+
+    os.makedirs(temp_directory, exist_ok=True)
+    config = {
+        'memory_limit': memory_limit,
+        'temp_directory': temp_directory,
+        'preserve_insertion_order': False,
+    }
+    if threads:
+        config['threads'] = threads
+    con = duckdb.connect(database=':memory:', config=config)
+
+    row_counts = {}
+    for dataset in datasets:
+        path = os.path.join(data_dir, f"consolidated_{dataset}.csv")
+        row_counts[dataset] = load_dataset(con, dataset, path)
+    return con, row_counts
+
+
+def load_dataset(con, dataset, path):
+    """
+    Clean a consolidated CSV into a table named after the dataset.
+
+    State/district names are cleaned once per distinct raw value in Python
+    (canonical district spelling, then exact str.title() semantics) and
+    joined back.
+
+    Returns:
+        tuple: (raw_rows, clean_rows)
+    """
+    _check_dataset(dataset)
+    source = "read_csv(?, header=true, all_varchar=true)"
+
+    names = con.execute(
+        f"SELECT state, district, COUNT(*) AS raw_rows FROM {source} GROUP BY ALL", [path]
+    ).df()
+    raw_rows = int(names['raw_rows'].sum())
+    names['clean_state'] = [_clean_name(v) for v in names['state']]
+    canonical = load_district_mapping()
+    names['clean_district'] = [_clean_name(canonical.get((s, d), d)) for s, d in zip(names['state'], names['district'])]
+
+    con.register('names_df', names.drop(columns='raw_rows'))
+    con.execute(f"CREATE OR REPLACE TEMP TABLE names_{dataset} AS SELECT * FROM names_df")
+    con.unregister('names_df')
+
+    counts = ",\n".join(
+        f"COALESCE(TRY_CAST(trunc(TRY_CAST({c} AS DOUBLE)) AS BIGINT), 0) AS {c}"
+        for c in DATASET_COUNT_COLUMNS[dataset]
+    )
+    columns = ", ".join(DATASET_COUNT_COLUMNS[dataset])
+    con.execute(f"""
+        CREATE OR REPLACE TABLE {dataset} AS
+        SELECT DISTINCT r.date, n.clean_state AS state, n.clean_district AS district, r.pincode, {columns}
+        FROM (
+            SELECT
+                CAST(try_strptime(date, '%d-%m-%Y') AS DATE) AS date,
+                state,
+                district,
+                CASE WHEN regexp_full_match(trim(pincode), '[0-9]{{6}}')
+                     THEN CAST(trim(pincode) AS INTEGER) END AS pincode,
+                {counts}
+            FROM {source}
+        ) r
+        JOIN names_{dataset} n
+          ON r.state IS NOT DISTINCT FROM n.state
+         AND r.district IS NOT DISTINCT FROM n.district
+        WHERE r.date IS NOT NULL
+          AND r.pincode IS NOT NULL
+          AND n.clean_state NOT IN ('Nan', 'nan', '')
+    """, [path])
+
+    clean_rows = con.execute(f"SELECT COUNT(*) FROM {dataset}").fetchone()[0]
+    return raw_rows, clean_rows
+
+
+# ================================================================================
+# AGGREGATIONS
+# ================================================================================
+
+def dataset_summary(con, dataset):
+    """
+    Row count, date range and distinct states/districts/pincodes of a dataset.
+
+    Returns:
+        dict: rows, start, end, states, districts, pincodes
+    """
+    _check_dataset(dataset)
+    row = con.execute(f"""
+        SELECT COUNT(*), MIN(date), MAX(date),
+               COUNT(DISTINCT state), COUNT(DISTINCT district), COUNT(DISTINCT pincode)
+        FROM {dataset}
+    """).fetchone()
+    return dict(zip(['rows', 'start', 'end', 'states', 'districts', 'pincodes'], row))
+
+
+def totals(con, dataset, by=()):
+    """
+    Sums of the dataset's count columns, like df.groupby(by)[columns].sum().
+
+    Args:
+        con: Connection from connect()
+        dataset: Dataset name
+        by: Grouping keys from KEY_EXPRESSIONS, e.g. ['state', 'date'] for
+            daily totals, ['state', 'month'] or ['state', 'year', 'week']
+
+    Returns:
+        pd.DataFrame: Keys and count columns, sorted by the keys (a single
+                      row when by is empty)
+    """
+    _check_dataset(dataset)
+    unknown = [k for k in by if k not in KEY_EXPRESSIONS]
+    if unknown:
+        raise ValueError(f"Unknown grouping keys {unknown}; expected some of {list(KEY_EXPRESSIONS)}")
+
+    select = [f"{KEY_EXPRESSIONS[k]} AS {k}" for k in by]
+    select += [f"CAST(SUM({c}) AS BIGINT) AS {c}" for c in DATASET_COUNT_COLUMNS[dataset]]
+    query = f"SELECT {', '.join(select)} FROM {dataset}"
+    if by:
+        query += f" GROUP BY {', '.join(by)} ORDER BY {', '.join(by)}"
+    return _to_timestamps(con.execute(query).df())
+
+
+def districts(con, datasets=DATASETS):
+    """Distinct (state, district) pairs over the given datasets, sorted."""
+    for dataset in datasets:
+        _check_dataset(dataset)
+    union = " UNION ".join(f"SELECT state, district FROM {d}" for d in datasets)
+    return con.execute(f"SELECT * FROM ({union}) ORDER BY state, district").df()
+
+
+def district_stats(con, dataset, rollup=None):
+    """
+    Per-district sums, record counts and distinct pincodes/days.
+
+    Args:
+        con: Connection from connect()
+        dataset: Dataset name
+        rollup: Optional Series indexed by (state, district); districts are
+                grouped by its values (e.g. a tier) instead, with distinct
+                counts computed over the whole group
+
+    Returns:
+        pd.DataFrame: Count column sums, records, pincodes, days; indexed by
+                      (state, district) or by the rollup's name
+    """
+    _check_dataset(dataset)
+    measures = [f"CAST(SUM({c}) AS BIGINT) AS {c}" for c in DATASET_COUNT_COLUMNS[dataset]]
+    measures += ["COUNT(*) AS records", "COUNT(DISTINCT pincode) AS pincodes", "COUNT(DISTINCT date) AS days"]
+
+    if rollup is None:
+        keys = ['state', 'district']
+        query = f"SELECT state, district, {', '.join(measures)} FROM {dataset} GROUP BY ALL ORDER BY ALL"
+        return con.execute(query).df().set_index(keys)
+
+    name = rollup.name
+    con.register('rollup_df', rollup.rename('group_key').reset_index())
+    try:
+        query = f"""
+            SELECT g.group_key AS {name}, {', '.join(measures)}
+            FROM {dataset} t
+            JOIN rollup_df g ON t.state = g.state AND t.district = g.district
+            GROUP BY g.group_key ORDER BY g.group_key
+        """
+        return con.execute(query).df().set_index(name)
+    finally:
+        con.unregister('rollup_df')
+
+
+def revisit_counts(con, dataset, columns, window_days):
+    """
+    Location-days with a positive count, and how many of them follow the
+    previous positive day at the same (state, district, pincode) within
+    window_days.
+
+    Returns:
+        dict: column -> (positive_days, revisits)
+    """
+    _check_dataset(dataset)
+    counts = {}
+    for col in columns:
+        counts[col] = con.execute(f"""
+            WITH located AS (
+                SELECT state, district, pincode, date
+                FROM {dataset}
+                GROUP BY ALL
+                HAVING SUM({col}) > 0
+            ), gaps AS (
+                SELECT date - LAG(date) OVER (PARTITION BY state, district, pincode ORDER BY date) AS gap
+                FROM located
+            )
+            SELECT COUNT(*), COUNT(*) FILTER (WHERE gap <= ?)
+            FROM gaps
+        """, [window_days]).fetchone()
+    return counts
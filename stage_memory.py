@@ -0,0 +1,356 @@
+"""
+================================================================================
+STAGE MEMORY - PER-STAGE MEMORY PROFILING AND MEMORY BUDGETS
+================================================================================
+
+Hooks for the batch analyses (uidai_comprehensive_analysis.main and the
+digital infrastructure readiness indices). Every stage run inside
+StageMemoryMonitor.stage() records:
+  - wall time,
+  - peak RSS during the stage (Linux: the kernel high-water mark is reset
+    at stage start) and the RSS it started from,
+  - with tracing on: the peak of traced allocations above the stage start
+    (tracemalloc), the number of deep DataFrame copies and the largest
+    frames produced by copy/merge/concat/read_csv/... with the repo line
+    that produced them.
+
+Samples are appended to a CSV log. With a memory budget, exceeds_budget()
+estimates a stage's peak before it runs (its peak-to-input ratio from the
+log, or DEFAULT_PEAK_RATIO) and tells the caller to switch that stage to
+chunked / out-of-core execution when the estimate does not fit.
+
+Author: Team Bharat Bytes
+UIDAI Data Hackathon 2026
+================================================================================
+"""
+
+import os
+import sys
+import time
+import heapq
+import functools
+import itertools
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+import pandas as pd
+
+# ================================================================================
+# CONFIGURATION
+# ================================================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+OUTPUT_DIR = os.path.join(BASE_DIR, "outputs")
+MEMORY_LOG = os.path.join(OUTPUT_DIR, "stage_memory_profile.csv")
+
+LOG_COLUMNS = ['timestamp', 'run', 'stage', 'label', 'mode', 'seconds', 'input_mb',
+               'rss_start_mb', 'rss_peak_mb', 'traced_peak_mb', 'copies', 'largest_frames']
+
+# Assumed stage peak per MB of input until a profiled run has been logged
+DEFAULT_PEAK_RATIO = 3.0
+
+# Largest frames kept per stage
+TOP_FRAMES = 5
+
+BYTES_PER_MB = 2 ** 20
+
+
+# ================================================================================
+# PROCESS MEMORY
+# ================================================================================
+
+def current_rss_mb():
+    """Resident set size of this process in MB (Linux), None elsewhere."""
+    try:
+        with open('/proc/self/statm') as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf('SC_PAGE_SIZE') / BYTES_PER_MB
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _reset_peak_rss():
+    """Reset the kernel's peak RSS counter (Linux 4.0+); False where unsupported."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb():
+    """Peak RSS in MB since the last reset (Linux VmHWM), None elsewhere."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def frame_mb(*frames):
+    """Shallow memory of DataFrames in MB (object columns count pointers only)."""
+    total = sum(df.memory_usage(index=True, deep=False).sum() for df in frames if df is not None)
+    return total / BYTES_PER_MB
+
+
+# ================================================================================
+# FRAME TRACKING
+# ================================================================================
+
+# pandas entry points whose DataFrame results are recorded while tracing
+TRACKED_OPERATIONS = [
+    (pd, 'read_csv'),
+    (pd, 'concat'),
+    (pd, 'merge'),
+    (pd.DataFrame, 'copy'),
+    (pd.DataFrame, 'merge'),
+    (pd.DataFrame, 'drop_duplicates'),
+    (pd.DataFrame, 'reset_index'),
+    (pd.DataFrame, '__getitem__'),
+]
+
+
+def _call_site():
+    """First stack frame in a repo module outside this file, as 'file:function:line'."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        path = frame.f_code.co_filename
+        if path.startswith(BASE_DIR) and os.path.basename(path) != "stage_memory.py":
+            return f"{os.path.basename(path)}:{frame.f_code.co_name}:{frame.f_lineno}"
+        frame = frame.f_back
+    return "?"
+
+
+class _FrameTracker:
+    """Counts deep copies and keeps the largest DataFrames produced while installed."""
+
+    def __init__(self, top=TOP_FRAMES):
+        self.top = top
+        self.copies = 0
+        self.largest = []
+        self._originals = []
+        self._counter = itertools.count()
+        self._busy = False
+
+    def install(self):
+        for owner, name in TRACKED_OPERATIONS:
+            original = getattr(owner, name)
+            self._originals.append((owner, name, original))
+            setattr(owner, name, self._wrap(original, name))
+
+    def uninstall(self):
+        for owner, name, original in reversed(self._originals):
+            setattr(owner, name, original)
+        self._originals = []
+
+    def _wrap(self, func, op):
+        tracker = self
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if isinstance(result, pd.DataFrame) and not tracker._busy:
+                if op == 'copy':
+                    if not kwargs.get('deep', args[1] if len(args) > 1 else True):
+                        return result
+                    tracker.copies += 1
+                tracker._record(op, result)
+            return result
+        return wrapper
+
+    def _record(self, op, df):
+        # Cheap upper bound first: most frames (per-group slices) are far too small to rank
+        rows, cols = df.shape
+        if len(self.largest) == self.top and rows * (cols + 1) * 16 <= self.largest[0][0]:
+            return
+        self._busy = True
+        try:
+            size = df.memory_usage(index=True, deep=False).sum()
+            if len(self.largest) < self.top or size > self.largest[0][0]:
+                entry = (size, next(self._counter), op, df.shape, _call_site())
+                if len(self.largest) < self.top:
+                    heapq.heappush(self.largest, entry)
+                else:
+                    heapq.heapreplace(self.largest, entry)
+        finally:
+            self._busy = False
+
+    def summary(self):
+        """Largest frames as 'op rows x cols MB @ site', biggest first."""
+        return "; ".join(
+            f"{op} {shape[0]:,}x{shape[1]} {size / BYTES_PER_MB:.1f}MB @ {site}"
+            for size, _, op, shape, site in sorted(self.largest, reverse=True)
+        )
+
+
+# ================================================================================
+# MONITOR
+# ================================================================================
+
+class StageMemoryMonitor:
+    """
+    Records memory per stage and enforces an optional memory budget.
+
+    A disabled monitor only passes calls through, so the analyses use the
+    same code path whether monitoring is on or off.
+    """
+
+    def __init__(self, run, enabled=False, budget_mb=None, trace=True, log_path=MEMORY_LOG):
+        """
+        Args:
+            run: Name of the analysis (groups samples in the log)
+            enabled: Record stage samples
+            budget_mb: Memory budget in MB (enables monitoring)
+            trace: Also trace allocations, copies and frames (slower)
+            log_path: CSV log to append samples to (None: no log)
+        """
+        self.run = run
+        self.budget_mb = budget_mb
+        self.enabled = enabled or budget_mb is not None
+        self.trace = enabled and trace
+        self.log_path = log_path
+        self.samples = []
+        self._started_tracing = False
+        self._history = None
+
+    @contextmanager
+    def stage(self, name, label='', input_mb=None, mode='in-memory'):
+        """
+        Record one stage (stages must not be nested).
+
+        Args:
+            name: Stage name (load, clean, lag, ...)
+            label: Detail, e.g. the dataset
+            input_mb: Size of the stage's input, used for budget estimates
+            mode: 'in-memory', 'chunked', 'out-of-core', 'lazy' or 'service'
+        """
+        if not self.enabled:
+            yield
+            return
+
+        tracker = None
+        if self.trace:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            tracemalloc.reset_peak()
+            traced_start = tracemalloc.get_traced_memory()[0]
+            tracker = _FrameTracker()
+            tracker.install()
+
+        rss_start = current_rss_mb()
+        _reset_peak_rss()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            sample = {
+                'timestamp': datetime.now().isoformat(timespec='seconds'),
+                'run': self.run, 'stage': name, 'label': label, 'mode': mode,
+                'seconds': round(seconds, 3),
+                'input_mb': None if input_mb is None else round(input_mb, 2),
+                'rss_start_mb': None if rss_start is None else round(rss_start, 1),
+                'rss_peak_mb': None, 'traced_peak_mb': None, 'copies': None, 'largest_frames': '',
+            }
+            rss_peak = peak_rss_mb()
+            if rss_peak is not None:
+                sample['rss_peak_mb'] = round(rss_peak, 1)
+            if tracker is not None:
+                tracker.uninstall()
+                sample['traced_peak_mb'] = round((tracemalloc.get_traced_memory()[1] - traced_start) / BYTES_PER_MB, 1)
+                sample['copies'] = tracker.copies
+                sample['largest_frames'] = tracker.summary()
+            self.samples.append(sample)
+
+    # --------------------------------------------------------------------------
+    # BUDGET
+    # --------------------------------------------------------------------------
+
+    def _peak_ratio(self, name):
+        """Peak MB per input MB of a stage from its latest logged in-memory run."""
+        if self._history is None:
+            logged = pd.read_csv(self.log_path) if self.log_path and os.path.exists(self.log_path) else None
+            self._history = pd.DataFrame(columns=LOG_COLUMNS) if logged is None else logged
+
+        history = pd.concat([self._history, pd.DataFrame(self.samples, columns=LOG_COLUMNS)], ignore_index=True)
+        history = history[(history['run'] == self.run) & (history['stage'] == name)
+                          & (history['mode'] == 'in-memory') & (history['input_mb'] > 0)]
+        if history.empty:
+            return DEFAULT_PEAK_RATIO
+
+        latest = history[history['timestamp'] == history['timestamp'].max()]
+        growth = (latest['rss_peak_mb'] - latest['rss_start_mb']).fillna(latest['traced_peak_mb'])
+        ratios = (growth / latest['input_mb']).dropna()
+        return float(ratios.max()) if not ratios.empty else DEFAULT_PEAK_RATIO
+
+    def estimate_mb(self, name, input_mb):
+        """Estimated memory a stage adds at its peak for the given input size."""
+        return self._peak_ratio(name) * input_mb
+
+    def exceeds_budget(self, name, input_mb):
+        """
+        True if running a stage in memory is expected to exceed the budget.
+
+        Args:
+            name: Stage name
+            input_mb: Size of the stage's input in MB
+
+        Returns:
+            bool: False without a budget
+        """
+        if self.budget_mb is None:
+            return False
+        estimate = self.estimate_mb(name, input_mb)
+        current = current_rss_mb() or 0.0
+        if current + estimate <= self.budget_mb:
+            return False
+        print(f"[INFO] {name}: estimated peak {current + estimate:,.0f} MB "
+              f"({current:,.0f} MB in use + {estimate:,.0f} MB) exceeds the "
+              f"{self.budget_mb:,.0f} MB budget; switching to chunked/out-of-core execution")
+        return True
+
+    # --------------------------------------------------------------------------
+    # REPORTING
+    # --------------------------------------------------------------------------
+
+    def finish(self):
+        """
+        Stop tracing, append the samples to the log and return them.
+
+        Returns:
+            pd.DataFrame: Samples of this run (empty if disabled)
+        """
+        if self._started_tracing and tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._started_tracing = False
+
+        samples = pd.DataFrame(self.samples, columns=LOG_COLUMNS)
+        if self.enabled and self.log_path and not samples.empty:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            samples.to_csv(self.log_path, mode='a', header=not os.path.exists(self.log_path), index=False)
+        return samples
+
+    def print_report(self, samples=None):
+        """Print the per-stage table and the largest frames of each stage."""
+        if samples is None:
+            samples = pd.DataFrame(self.samples, columns=LOG_COLUMNS)
+        if samples.empty:
+            return
+
+        print("\n[INFO] Memory by stage (MB; RSS peak is the process peak during the stage)")
+        table = samples[['stage', 'label', 'mode', 'seconds', 'input_mb', 'rss_start_mb',
+                         'rss_peak_mb', 'traced_peak_mb', 'copies']]
+        print(table.fillna('-').to_string(index=False))
+
+        for _, row in samples[samples['largest_frames'].fillna('') != ''].iterrows():
+            print(f"\n  {row['stage']} {row['label']}".rstrip() + " - largest frames:")
+            for entry in row['largest_frames'].split("; "):
+                print(f"    {entry}")
+        if self.log_path:
+            print(f"\n[SAVED] {self.log_path}")
@@ -13,9 +13,37 @@ from datetime import datetime, timedelta
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
+from policy_shock_analysis import (
+    shock_windows, youth_adult_columns, classify_shock, scan_policy_shocks
+)
+from aggregation_layer import (
+    DATASET_COUNT_COLUMNS, DATASET_VALUE_COLUMNS, build_daily_district_sketches, count_distinct,
+    distinct_pincodes_by
+)
+from raw_data_store import (
+    store_is_current, store_path, build_columnar_store, store_info, build_filter, count_matches, query_page
+)
+from chart_downsampling import time_series_trace
+from eumi_calculation import compute_district_eumi
+from district_reconciliation import apply_district_mapping
+from digital_infrastructure_readiness import load_saved_indices
+from data_quality import (
+    read_quality_report, load_quality_report, report_path as quality_report_path, IQR_MULTIPLIER
+)
+from aggregate_client import service_url, query as query_service
+from render_profiler import RenderProfiler, profiling_enabled_by_default, summarize_render_log
+from anomaly_detection import (
+    detect_all_anomalies, top_anomalous_districts, top_anomalous_dates, load_alerts,
+    ROBUST_Z_THRESHOLD
+)
 import warnings
 warnings.filterwarnings('ignore')
 
+# Datasets are cached once per process and shared by all sessions; with
+# copy-on-write, column selections and slices of the shared frames are views,
+# and any write made by a page copies only what it modifies
+pd.set_option('mode.copy_on_write', True)
+
 # ================================================================================
 # STATE AND UNION TERRITORY DEFINITIONS
 # ================================================================================
@@ -375,68 +403,181 @@ st.markdown("""
 # DATA LOADING
 # ================================================================================
 
-@st.cache_data(ttl=3600)
-def load_all_data():
-    """Load all three datasets"""
+# Datasets each page reads, with the columns it needs (None = all columns).
+# The dataset's age-bucket columns are always loaded since its total is derived
+# from them. Pages not listed here (Overview, Predictive, Digital Infrastructure
+# Readiness) read no dataset, so nothing is parsed until a data page is opened.
+ALL_DATASETS = {'enrolment': None, 'demographic': None, 'biometric': None}
+PAGE_DATASETS = {
+    "Executive Summary": {'enrolment': None},
+    "Detailed Analysis": ALL_DATASETS,
+    "Data Explorer": ALL_DATASETS,
+    "EUMI Analysis": {'enrolment': None, 'biometric': ('state', 'district')},
+    "Policy Shock Analyzer": {'enrolment': None, 'biometric': None},
+}
+
+# Pages answered by the aggregate service (aggregate_service.py) when it is
+# configured and reachable; they then load no datasets in this process. If the
+# service does not answer, they load the datasets and compute locally.
+SERVICE_PAGES = set(PAGE_DATASETS) | {"Digital Infrastructure Readiness"} if service_url() else set()
+
+RAW_DATA_FOLDERS = {
+    'enrolment': "api_data_aadhar_enrolment",
+    'demographic': "api_data_aadhar_demographic",
+    'biometric': "api_data_aadhar_biometric",
+}
+
+@st.cache_resource(ttl=3600)
+def load_dataset(name, columns=None):
+    """
+    Load one dataset (optionally only some columns), parsed on first access.
+    
+    The frame is held once per process and shared read-only by every session.
+    Rows are grouped by state (stable sort) so state filters are slices.
+    """
     base_dir = os.path.dirname(os.path.abspath(__file__))
-    datasets = {}
-    
-    filtered_dir = os.path.join(base_dir, "filtered_data")
-    
-    if os.path.exists(filtered_dir):
-        enrol_file = os.path.join(filtered_dir, "consolidated_enrolment.csv")
-        demo_file = os.path.join(filtered_dir, "consolidated_demographic.csv")
-        bio_file = os.path.join(filtered_dir, "consolidated_biometric.csv")
-        
-        if os.path.exists(enrol_file):
-            df = pd.read_csv(enrol_file)
-            df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-            df['total_enrolment'] = df['age_0_5'] + df['age_5_17'] + df['age_18_greater']
-            datasets['enrolment'] = df
-        
-        if os.path.exists(demo_file):
-            df = pd.read_csv(demo_file)
-            df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-            df['total_demo'] = df['demo_age_5_17'] + df['demo_age_17_']
-            datasets['demographic'] = df
-        
-        if os.path.exists(bio_file):
-            df = pd.read_csv(bio_file)
-            df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-            df['total_bio'] = df['bio_age_5_17'] + df['bio_age_17_']
-            datasets['biometric'] = df
+    count_cols = DATASET_COUNT_COLUMNS[name]
+    usecols = None if columns is None else list(dict.fromkeys(list(columns) + count_cols))
+    
+    consolidated = os.path.join(base_dir, "filtered_data", f"consolidated_{name}.csv")
+    raw_dir = os.path.join(base_dir, RAW_DATA_FOLDERS[name])
+    
+    if os.path.exists(consolidated):
+        df = pd.read_csv(consolidated, usecols=usecols)
+    elif os.path.exists(raw_dir):
+        dfs = [pd.read_csv(os.path.join(raw_dir, f), usecols=usecols)
+               for f in sorted(os.listdir(raw_dir)) if f.endswith('.csv')]
+        if not dfs:
+            return pd.DataFrame()
+        df = pd.concat(dfs, ignore_index=True)
     else:
-        for folder, name, cols in [
-            ("api_data_aadhar_enrolment", "enrolment", ['age_0_5', 'age_5_17', 'age_18_greater']),
-            ("api_data_aadhar_demographic", "demographic", ['demo_age_5_17', 'demo_age_17_']),
-            ("api_data_aadhar_biometric", "biometric", ['bio_age_5_17', 'bio_age_17_'])
-        ]:
-            data_dir = os.path.join(base_dir, folder)
-            if os.path.exists(data_dir):
-                dfs = []
-                for f in sorted(os.listdir(data_dir)):
-                    if f.endswith('.csv'):
-                        dfs.append(pd.read_csv(os.path.join(data_dir, f)))
-                if dfs:
-                    df = pd.concat(dfs, ignore_index=True)
-                    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
-                    if name == 'enrolment':
-                        df['total_enrolment'] = df['age_0_5'] + df['age_5_17'] + df['age_18_greater']
-                    elif name == 'demographic':
-                        df['total_demo'] = df['demo_age_5_17'] + df['demo_age_17_']
-                    else:
-                        df['total_bio'] = df['bio_age_5_17'] + df['bio_age_17_']
-                    datasets[name] = df
-    
+        return pd.DataFrame()
+    
+    df = apply_district_mapping(df)
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    df[DATASET_VALUE_COLUMNS[name]] = df[count_cols].sum(axis=1)
+    if 'state' in df.columns:
+        df = df.sort_values('state', kind='stable', ignore_index=True)
+    return df
+
+@st.cache_resource(ttl=3600)
+def state_bounds(name, columns=None):
+    """Row range [start, stop) of every state in a shared dataset frame"""
+    states = load_dataset(name, columns)['state'].to_numpy()
+    starts = np.flatnonzero(np.r_[True, states[1:] != states[:-1]])
+    stops = np.r_[starts[1:], len(states)]
+    return {states[start]: (start, stop) for start, stop in zip(starts, stops)}
+
+@st.cache_data(ttl=60)
+def service_datasets():
+    """Datasets held by the aggregate service (None if it does not answer; re-checked every minute)"""
+    try:
+        return tuple(query_service('health', timeout=5)['dataset'])
+    except (ConnectionError, ValueError):
+        return None
+
+def page_uses_service(page):
+    """True if the page is answered by the aggregate service (configured and reachable)"""
+    return page in SERVICE_PAGES and service_datasets() is not None
+
+@st.cache_data(ttl=300)
+def cached_service_query(endpoint, **params):
+    """Aggregate service query result, cached per endpoint and parameters"""
+    return query_service(endpoint, **params)
+
+def service_query(endpoint, **params):
+    """
+    Query the aggregate service for the current page.
+    
+    If the service stopped answering, the page is re-run on the local
+    datasets (the reachability check is cleared first).
+    """
+    try:
+        return cached_service_query(endpoint, **params)
+    except ConnectionError:
+        service_datasets.clear()
+        st.rerun()
+    except ValueError as e:
+        st.error(f"Aggregate service query failed: {e}")
+        st.stop()
+
+@st.cache_data(ttl=3600)
+def load_sample(name, rows=200):
+    """First rows of a consolidated dataset (raw data sample when no dataset is loaded)"""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "filtered_data", f"consolidated_{name}.csv")
+    return pd.read_csv(path, nrows=rows) if os.path.exists(path) else pd.DataFrame()
+
+def load_page_data(page):
+    """Load the datasets declared for a page (each one cached after its first load)"""
+    datasets = {}
+    if page_uses_service(page):
+        return datasets
+    for name, columns in PAGE_DATASETS.get(page, {}).items():
+        df = load_dataset(name, columns)
+        if not df.empty:
+            datasets[name] = df
     return datasets
 
-with st.spinner('Loading datasets...'):
-    data = load_all_data()
-    df_enrol = data.get('enrolment', pd.DataFrame())
-    df_demo = data.get('demographic', pd.DataFrame())
-    df_bio = data.get('biometric', pd.DataFrame())
+def select_states(page, datasets, states):
+    """
+    Per-session state filter over the shared page datasets.
+    
+    Each state is a contiguous block of its shared frame, so a single state
+    is a zero-copy slice; several states copy only their own rows.
+    """
+    views = {}
+    for name, df in datasets.items():
+        bounds = state_bounds(name, PAGE_DATASETS[page][name])
+        blocks = [df.iloc[start:stop] for start, stop in sorted(bounds[s] for s in states if s in bounds)]
+        if not blocks:
+            views[name] = df.iloc[:0]
+        else:
+            views[name] = blocks[0] if len(blocks) == 1 else pd.concat(blocks)
+    return views
+
+@st.cache_data(ttl=3600)
+def load_state_list():
+    """States for the sidebar filter, read from the state column only"""
+    if store_is_current('enrolment'):
+        states = pd.read_parquet(store_path('enrolment'), columns=['state'])['state']
+    else:
+        states = load_dataset('enrolment', ('state',)).get('state', pd.Series(dtype=object))
+    return sorted(states.dropna().unique().tolist())
+
+@st.cache_resource(ttl=3600)
+def get_district_anomalies(_datasets):
+    """Flag anomalous district-days in all datasets (computed once on unfiltered data)"""
+    return detect_all_anomalies(_datasets)
+
+def frame_fingerprint(df):
+    """Cache key part for an unhashed frame argument: its columns and row count"""
+    return tuple(df.columns), len(df)
+
+@st.cache_resource(ttl=3600)
+def get_distinct_sketches(name, fingerprint, _df):
+    """
+    Daily district cube with pincode sketches for distinct counts (built once on unfiltered data).
+    
+    The frame itself is not hashed; fingerprint (frame_fingerprint(_df)) keeps
+    frames of the same dataset loaded with different columns apart.
+    """
+    return build_daily_district_sketches(_df, DATASET_VALUE_COLUMNS[name])
+
+@st.cache_resource(ttl=3600)
+def get_quality_report(name, stamp):
+    """Saved data quality report of a dataset (stamp changes when the report is rewritten)"""
+    return read_quality_report(name)
 
-all_states = sorted(df_enrol['state'].unique().tolist()) if not df_enrol.empty else []
+def quality_report_stamp(name):
+    """Modification time of a dataset's quality report (None if not built)"""
+    path = quality_report_path(name)
+    return os.path.getmtime(path) if os.path.exists(path) else None
+
+@st.cache_data(ttl=60)
+def get_stream_alerts():
+    """Alerts appended by the streaming detector (re-read every minute)"""
+    return load_alerts()
 
 # ================================================================================
 # SIDEBAR
@@ -508,6 +649,18 @@ with st.sidebar:
     
     page = st.session_state.current_page
     
+    # Opt-in render profiling (toggle at the bottom of the sidebar)
+    profiler = RenderProfiler(page, enabled=st.session_state.get('profile_renders', profiling_enabled_by_default()))
+    
+    use_service = page_uses_service(page)
+    
+    with st.spinner('Loading datasets...'), profiler.stage('load'):
+        all_states = load_state_list()
+        data = load_page_data(page)
+        df_enrol = data.get('enrolment', pd.DataFrame())
+        df_demo = data.get('demographic', pd.DataFrame())
+        df_bio = data.get('biometric', pd.DataFrame())
+    
     st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
     
     st.markdown('<p style="color: #6c757d; font-size: 0.7rem; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 0.5rem;">🎯 FILTERS</p>', unsafe_allow_html=True)
@@ -520,31 +673,40 @@ with st.sidebar:
     )
     
     if selected_states:
-        if not df_enrol.empty:
-            df_enrol = df_enrol[df_enrol['state'].isin(selected_states)]
-        if not df_demo.empty:
-            df_demo = df_demo[df_demo['state'].isin(selected_states)]
-        if not df_bio.empty:
-            df_bio = df_bio[df_bio['state'].isin(selected_states)]
+        with profiler.stage('filter'):
+            views = select_states(page, data, selected_states)
+        df_enrol = views.get('enrolment', df_enrol)
+        df_demo = views.get('demographic', df_demo)
+        df_bio = views.get('biometric', df_bio)
     
     st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
     
     st.markdown('<p style="color: #6c757d; font-size: 0.7rem; text-transform: uppercase; letter-spacing: 1px; margin-bottom: 0.5rem;">📋 QUICK STATS</p>', unsafe_allow_html=True)
     
-    if not df_enrol.empty:
+    enrol_distinct = None
+    if use_service and 'enrolment' in service_datasets():
+        enrol_records = service_query('totals', dataset='enrolment', by='state', states=selected_states)['records'].sum()
+        enrol_distinct = service_query('distinct', dataset='enrolment', states=selected_states).iloc[0]
+    elif not df_enrol.empty:
+        enrol_cube, enrol_sketches = get_distinct_sketches('enrolment', frame_fingerprint(data['enrolment']), data['enrolment'])
+        state_mask = enrol_cube['state'].isin(selected_states).to_numpy() if selected_states else None
+        enrol_distinct = count_distinct(enrol_cube, enrol_sketches, state_mask)
+        enrol_records = len(df_enrol)
+    
+    if enrol_distinct is not None:
         st.markdown(f"""
         <div class="glass-card" style="padding: 1rem;">
             <div style="display: flex; justify-content: space-between; margin-bottom: 0.75rem;">
                 <span style="color: #6c757d; font-size: 0.75rem;">Records</span>
-                <span style="color: #1a1a2e; font-weight: 600;">{len(df_enrol):,}</span>
+                <span style="color: #1a1a2e; font-weight: 600;">{enrol_records:,}</span>
             </div>
             <div style="display: flex; justify-content: space-between; margin-bottom: 0.75rem;">
                 <span style="color: #6c757d; font-size: 0.75rem;">States</span>
-                <span style="color: #1a1a2e; font-weight: 600;">{df_enrol['state'].nunique()}</span>
+                <span style="color: #1a1a2e; font-weight: 600;">{enrol_distinct['states']}</span>
             </div>
             <div style="display: flex; justify-content: space-between;">
                 <span style="color: #6c757d; font-size: 0.75rem;">Districts</span>
-                <span style="color: #1a1a2e; font-weight: 600;">{df_enrol['district'].nunique()}</span>
+                <span style="color: #1a1a2e; font-weight: 600;">{enrol_distinct['districts']}</span>
             </div>
         </div>
         """, unsafe_allow_html=True)
@@ -552,6 +714,51 @@ with st.sidebar:
 # ================================================================================
 # HELPER FUNCTION
 # ================================================================================
+def show_chart(fig, **kwargs):
+    """st.plotly_chart, recorded as a chart element when render profiling is on"""
+    title = fig.layout.title.text if fig.layout.title else None
+    return profiler.render(profiler.next_label('chart', title), st.plotly_chart, fig, **kwargs)
+
+def show_table(data, **kwargs):
+    """st.dataframe, recorded as a table element when render profiling is on"""
+    return profiler.render(profiler.next_label('table'), st.dataframe, data, **kwargs)
+
+def dataset_frame(name):
+    """Loaded (state-filtered) frame of a dataset"""
+    return {'enrolment': df_enrol, 'demographic': df_demo, 'biometric': df_bio}[name]
+
+def has_data(name):
+    """True if the dataset is available to the page (held by the service or loaded)"""
+    if use_service:
+        return name in service_datasets()
+    return not dataset_frame(name).empty
+
+def service_totals(name, by):
+    """Service /totals of a dataset under the state filter, total renamed to the dataset's value column"""
+    return service_query('totals', dataset=name, by=by, states=selected_states).rename(
+        columns={'total': DATASET_VALUE_COLUMNS[name]})
+
+def dataset_daily_totals(name):
+    """Daily totals of a dataset (date, value column), sorted by date"""
+    value_col = DATASET_VALUE_COLUMNS[name]
+    if use_service:
+        return service_totals(name, 'date')[['date', value_col]].sort_values('date', ignore_index=True)
+    return dataset_frame(name).groupby('date')[value_col].sum().reset_index().sort_values('date')
+
+def dataset_state_totals(name):
+    """Totals of a dataset by state (state, value column)"""
+    value_col = DATASET_VALUE_COLUMNS[name]
+    if use_service:
+        return service_totals(name, 'state')[['state', value_col]]
+    return dataset_frame(name).groupby('state')[value_col].sum().reset_index()
+
+def dataset_count_totals(name):
+    """Sums of a dataset's value column and age bucket columns"""
+    columns = [DATASET_VALUE_COLUMNS[name]] + DATASET_COUNT_COLUMNS[name]
+    if use_service:
+        return service_totals(name, 'state')[columns].sum()
+    return dataset_frame(name)[columns].sum()
+
 def show_filter_indicator():
     if selected_states:
         states_text = ", ".join(selected_states[:3])
@@ -726,16 +933,17 @@ elif page == "Executive Summary":
     
     show_filter_indicator()
     
-    if not df_enrol.empty:
-        total_enrol = df_enrol['total_enrolment'].sum()
+    if has_data('enrolment'):
+        enrol_by_state = dataset_state_totals('enrolment')
+        total_enrol = enrol_by_state['total_enrolment'].sum()
         
         # Count states and union territories separately
-        all_regions = df_enrol['state'].unique()
+        all_regions = enrol_by_state['state'].unique()
         states_count = sum(1 for region in all_regions if region in STATES_LIST)
         uts_count = sum(1 for region in all_regions if region in UNION_TERRITORIES_LIST)
         
-        total_districts = df_enrol['district'].nunique()
-        avg_daily = df_enrol.groupby('date')['total_enrolment'].sum().mean()
+        total_districts = enrol_distinct['districts']
+        avg_daily = dataset_daily_totals('enrolment')['total_enrolment'].mean()
         
         col1, col2, col3, col4 = st.columns(4)
         
@@ -782,9 +990,10 @@ elif page == "Executive Summary":
     col1, col2 = st.columns(2)
     
     with col1:
-        if not df_enrol.empty:
-            age_0_5 = df_enrol['age_0_5'].sum()
-            total = df_enrol['total_enrolment'].sum()
+        if has_data('enrolment'):
+            enrol_counts = dataset_count_totals('enrolment')
+            age_0_5 = enrol_counts['age_0_5']
+            total = enrol_counts['total_enrolment']
             pct = age_0_5 / total * 100 if total > 0 else 0
             
             st.markdown(f"""
@@ -833,8 +1042,8 @@ elif page == "Executive Summary":
     
     st.markdown('<p class="section-header">📈 Enrolment Trends</p>', unsafe_allow_html=True)
     
-    if not df_enrol.empty:
-        daily = df_enrol.groupby('date')['total_enrolment'].sum().reset_index()
+    if has_data('enrolment'):
+        daily = dataset_daily_totals('enrolment')
         daily['rolling_7d'] = daily['total_enrolment'].rolling(7, min_periods=1).mean()
         
         fig = go.Figure()
@@ -861,7 +1070,7 @@ elif page == "Executive Summary":
             hovermode='x unified'
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig, use_container_width=True)
 
 # ================================================================================
 # PAGE: DETAILED ANALYSIS (Combined: Biometric, Demographics, Enrolment)
@@ -887,9 +1096,9 @@ elif page == "Detailed Analysis":
             (fingerprint/iris scans). The gap between them indicates the backlog of pending biometric verifications.
             """)
         
-        if not df_demo.empty and not df_bio.empty:
-            demo_daily = df_demo.groupby('date')['total_demo'].sum().reset_index().sort_values('date')
-            bio_daily = df_bio.groupby('date')['total_bio'].sum().reset_index().sort_values('date')
+        if has_data('demographic') and has_data('biometric'):
+            demo_daily = dataset_daily_totals('demographic')
+            bio_daily = dataset_daily_totals('biometric')
             
             demo_daily['cum'] = demo_daily['total_demo'].cumsum()
             bio_daily['cum'] = bio_daily['total_bio'].cumsum()
@@ -958,12 +1167,12 @@ elif page == "Detailed Analysis":
             st.markdown('<p class="section-header">Cumulative Comparison Over Time</p>', unsafe_allow_html=True)
             
             fig = go.Figure()
-            fig.add_trace(go.Scatter(x=demo_daily['date'], y=demo_daily['cum'], mode='lines',
-                                      name='Demographic', line=dict(color='#3b82f6', width=3),
-                                      fill='tozeroy', fillcolor='rgba(59, 130, 246, 0.1)'))
-            fig.add_trace(go.Scatter(x=bio_daily['date'], y=bio_daily['cum'], mode='lines',
-                                      name='Biometric', line=dict(color='#10b981', width=3),
-                                      fill='tozeroy', fillcolor='rgba(16, 185, 129, 0.1)'))
+            fig.add_trace(time_series_trace(demo_daily['date'], demo_daily['cum'], method='lttb', mode='lines',
+                                            name='Demographic', line=dict(color='#3b82f6', width=3),
+                                            fill='tozeroy', fillcolor='rgba(59, 130, 246, 0.1)'))
+            fig.add_trace(time_series_trace(bio_daily['date'], bio_daily['cum'], method='lttb', mode='lines',
+                                            name='Biometric', line=dict(color='#10b981', width=3),
+                                            fill='tozeroy', fillcolor='rgba(16, 185, 129, 0.1)'))
             
             fig.update_layout(
                 paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
@@ -972,12 +1181,12 @@ elif page == "Detailed Analysis":
                 yaxis=dict(title='Cumulative Count', showgrid=True, gridcolor='rgba(0,0,0,0.05)'),
                 hovermode='x unified'
             )
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, use_container_width=True)
             
             st.markdown('<p class="section-header">State-wise Comparison</p>', unsafe_allow_html=True)
             
-            state_demo = df_demo.groupby('state')['total_demo'].sum()
-            state_bio = df_bio.groupby('state')['total_bio'].sum()
+            state_demo = dataset_state_totals('demographic').set_index('state')['total_demo']
+            state_bio = dataset_state_totals('biometric').set_index('state')['total_bio']
             comparison = pd.DataFrame({'Demographic': state_demo, 'Biometric': state_bio}).fillna(0)
             comparison['Ratio'] = comparison['Biometric'] / comparison['Demographic'].replace(0, 1)
             comparison = comparison.sort_values('Demographic', ascending=False)
@@ -1002,7 +1211,7 @@ elif page == "Detailed Analysis":
             fig_state.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
                                     height=350, xaxis_tickangle=-45,
                                     legend=dict(orientation="h", yanchor="bottom", y=1.02))
-            st.plotly_chart(fig_state, use_container_width=True)
+            show_chart(fig_state, use_container_width=True)
         else:
             st.info("Biometric or Demographic data not available")
     
@@ -1015,10 +1224,18 @@ elif page == "Detailed Analysis":
             The Pareto (80/20) analysis reveals how concentrated enrolments are among top states.
             """)
         
-        if not df_enrol.empty:
-            state_totals = df_enrol.groupby('state').agg({
-                'total_enrolment': 'sum', 'district': 'nunique', 'pincode': 'nunique'
-            }).reset_index()
+        if has_data('enrolment'):
+            # Distinct districts are exact from the cube keys, pincodes come from merged sketches
+            if use_service:
+                state_totals = service_totals('enrolment', 'state')[['state', 'total_enrolment']]
+                state_pincodes = service_query('distinct', dataset='enrolment', by='state', states=selected_states)
+            else:
+                state_cube = enrol_cube[state_mask] if state_mask is not None else enrol_cube
+                state_totals = state_cube.groupby('state').agg(
+                    Enrolments=('total', 'sum'), Districts=('district_code', 'nunique')
+                ).reset_index()
+                state_pincodes = distinct_pincodes_by(enrol_cube, enrol_sketches, by=['state'], mask=state_mask)
+            state_totals = state_totals.merge(state_pincodes, on='state', how='left')
             state_totals.columns = ['State', 'Enrolments', 'Districts', 'Pincodes']
             state_totals = state_totals.sort_values('Enrolments', ascending=False)
             
@@ -1076,7 +1293,7 @@ elif page == "Detailed Analysis":
                          color='Enrolments', color_continuous_scale='Blues')
             fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)',
                               height=350, xaxis_tickangle=-45, coloraxis_showscale=False)
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, use_container_width=True)
             
             st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
             
@@ -1103,7 +1320,7 @@ elif page == "Detailed Analysis":
                 fig_p.add_hline(y=80, line_dash="dash", line_color="rgba(239, 68, 68, 0.5)",
                                annotation_text="80%", secondary_y=True)
                 fig_p.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=350, xaxis_tickangle=-45)
-                st.plotly_chart(fig_p, use_container_width=True)
+                show_chart(fig_p, use_container_width=True)
             
             with col2:
                 states_80 = len(sorted_df[sorted_df['CumPct'] <= 80])
@@ -1140,10 +1357,11 @@ elif page == "Detailed Analysis":
             - **18+ years**: 1x effort (stable biometrics)
             """)
         
-        if not df_enrol.empty:
-            age_0_5 = df_enrol['age_0_5'].sum()
-            age_5_17 = df_enrol['age_5_17'].sum()
-            age_18 = df_enrol['age_18_greater'].sum()
+        if has_data('enrolment'):
+            enrol_counts = dataset_count_totals('enrolment')
+            age_0_5 = enrol_counts['age_0_5']
+            age_5_17 = enrol_counts['age_5_17']
+            age_18 = enrol_counts['age_18_greater']
             total = age_0_5 + age_5_17 + age_18
             
             effort_0_5 = age_0_5 * 4.0
@@ -1226,7 +1444,7 @@ elif page == "Detailed Analysis":
                     showlegend=True, legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
                     annotations=[dict(text=f'{total/1e6:.1f}M', x=0.5, y=0.5, font_size=22, font_color='#1a1a2e', showarrow=False)]
                 )
-                st.plotly_chart(fig_pie, use_container_width=True)
+                show_chart(fig_pie, use_container_width=True)
             
             with col2:
                 st.markdown('<p class="section-header">Effort Distribution</p>', unsafe_allow_html=True)
@@ -1251,7 +1469,7 @@ elif page == "Detailed Analysis":
                     yaxis=dict(title='Effort Share (%)', showgrid=True, gridcolor='rgba(0,0,0,0.05)'),
                     bargap=0.4
                 )
-                st.plotly_chart(fig_effort, use_container_width=True)
+                show_chart(fig_effort, use_container_width=True)
         else:
             st.info("Enrolment data not available")
 
@@ -1358,10 +1576,10 @@ elif page == "Predictive":
                  color='Importance', color_continuous_scale='Blues')
     fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', 
                       height=350, coloraxis_showscale=False)
-    st.plotly_chart(fig, use_container_width=True)
+    show_chart(fig, use_container_width=True)
     
     st.markdown('<p class="section-header">📋 Feature Descriptions</p>', unsafe_allow_html=True)
-    st.dataframe(importance, hide_index=True, use_container_width=True)
+    show_table(importance, hide_index=True, use_container_width=True)
 
 # ================================================================================
 # PAGE: DATA EXPLORER
@@ -1380,8 +1598,8 @@ elif page == "Data Explorer":
     with tab1:
         st.markdown('<p class="section-header">📊 Statistical Overview</p>', unsafe_allow_html=True)
         
-        if not df_enrol.empty:
-            daily_totals = df_enrol.groupby('date')['total_enrolment'].sum()
+        if has_data('enrolment'):
+            daily_totals = dataset_daily_totals('enrolment')['total_enrolment']
             
             col1, col2, col3, col4 = st.columns(4)
             col1.metric("Daily Mean", f"{daily_totals.mean()/1e3:.1f}K")
@@ -1399,7 +1617,53 @@ elif page == "Data Explorer":
             fig.add_vline(x=daily_totals.mean(), line_dash="dash", line_color="#f59e0b", annotation_text="Mean")
             fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=300,
                               xaxis_title='Daily Enrolments', yaxis_title='Frequency')
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, use_container_width=True)
+        
+        st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
+        
+        # Data quality from the saved single-pass report (no rescan of the records)
+        st.markdown('<p class="section-header">🧪 Data Quality</p>', unsafe_allow_html=True)
+        
+        quality_dataset = st.radio("Dataset", ["Enrolment", "Demographic", "Biometric"],
+                                   horizontal=True, key="quality_dataset")
+        quality_key = quality_dataset.lower()
+        quality = get_quality_report(quality_key, quality_report_stamp(quality_key))
+        
+        if quality is None or not quality.is_current():
+            st.info("The data quality report for this dataset has not been built yet (or is older than the CSV). "
+                    "Build it to see duplicates, missing values, zero records and outliers per month.")
+            if st.button("Build Quality Report", key="build_quality_report"):
+                with st.spinner(f"Profiling {quality_dataset} data..."):
+                    load_quality_report(quality_key)
+                st.rerun()
+        else:
+            totals = quality.totals()
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Records", f"{quality.rows:,}")
+            col2.metric("Exact Duplicates", f"{totals['duplicates']:,}")
+            col3.metric("Zero-Activity Records", f"{totals['zero_rows']:,}")
+            col4.metric("Missing Values", f"{int(quality.missing().sum()):,}")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown(f"**Extreme Outliers (> Q3 + {IQR_MULTIPLIER}×IQR)**")
+                outlier_rows = []
+                for col in quality.count_columns:
+                    upper_bound, outlier_count = quality.iqr_outliers(col)
+                    outlier_rows.append({'Column': col, 'Q1': quality.quantile(col, 0.25),
+                                         'Q3': quality.quantile(col, 0.75), 'Upper Fence': upper_bound,
+                                         'Outliers': outlier_count})
+                show_table(pd.DataFrame(outlier_rows).round(1), use_container_width=True, hide_index=True)
+            
+            with col2:
+                st.markdown("**By Month**")
+                by_month = quality.partitions.copy()
+                by_month['missing'] = quality.missing_by_partition.sum(axis=1)
+                by_month['active_pct'] = (by_month['active_rows'] / by_month['rows'] * 100).round(1)
+                by_month = by_month[['rows', 'duplicates', 'zero_rows', 'missing', 'active_pct']].reset_index()
+                by_month.columns = ['Month', 'Records', 'Duplicates', 'Zero Records', 'Missing', 'Active %']
+                show_table(by_month, use_container_width=True, hide_index=True)
     
     with tab2:
         st.markdown('<p class="section-header">🔴 Anomaly Detection</p>', unsafe_allow_html=True)
@@ -1414,8 +1678,8 @@ elif page == "Data Explorer":
         </div>
         """, unsafe_allow_html=True)
         
-        if not df_enrol.empty:
-            daily = df_enrol.groupby('date')['total_enrolment'].sum().reset_index()
+        if has_data('enrolment'):
+            daily = dataset_daily_totals('enrolment')
             q1, q3 = daily['total_enrolment'].quantile([0.25, 0.75])
             iqr = q3 - q1
             upper, lower = q3 + 1.5 * iqr, max(0, q1 - 1.5 * iqr)
@@ -1427,30 +1691,106 @@ elif page == "Data Explorer":
             
             with col1:
                 fig = go.Figure()
-                fig.add_trace(go.Scatter(x=daily['date'], y=daily['total_enrolment'], mode='lines',
-                                         name='Daily Volume', line=dict(color='#2563eb')))
-                fig.add_trace(go.Scatter(x=anomalies['date'], y=anomalies['total_enrolment'], mode='markers',
-                                         name='Anomalies', marker=dict(color='#ef4444', size=10, symbol='x')))
+                # Min/max buckets keep every spike and drop visible after downsampling
+                fig.add_trace(time_series_trace(daily['date'], daily['total_enrolment'], method='minmax', mode='lines',
+                                                name='Daily Volume', line=dict(color='#2563eb')))
+                fig.add_trace(time_series_trace(anomalies['date'], anomalies['total_enrolment'], max_points=None,
+                                                mode='markers', name='Anomalies',
+                                                marker=dict(color='#ef4444', size=10, symbol='x')))
                 fig.add_hline(y=upper, line_dash="dash", line_color="rgba(239, 68, 68, 0.5)", annotation_text="Upper")
                 if lower > 0:
                     fig.add_hline(y=lower, line_dash="dash", line_color="rgba(34, 197, 94, 0.5)", annotation_text="Lower")
                 fig.update_layout(paper_bgcolor='rgba(0,0,0,0)', plot_bgcolor='rgba(0,0,0,0)', height=350)
-                st.plotly_chart(fig, use_container_width=True)
+                show_chart(fig, use_container_width=True)
             
             with col2:
                 st.metric("Anomalies Found", f"{len(anomalies)} of {len(daily)} days")
                 st.metric("Upper Threshold", f"{upper/1e3:.1f}K")
                 st.metric("Lower Threshold", f"{lower/1e3:.1f}K")
+        
+        # District-level anomalies across all datasets
+        st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
+        st.markdown('<p class="section-header">📍 District-Level Anomalies</p>', unsafe_allow_html=True)
+        st.caption(f"Every district-day is scored against that district's own history (robust z-score, |z| > {ROBUST_Z_THRESHOLD}). Non-reporting days within a district's active period count as zero, so local outages appear as drops.")
+        
+        with st.spinner('Scoring district-days...'):
+            district_anomalies = service_query('anomalies') if use_service else get_district_anomalies(data)
+        
+        anomaly_dataset = st.radio("Dataset", ["Enrolment", "Demographic", "Biometric"],
+                                   horizontal=True, key="anomaly_dataset")
+        dataset_anomalies = district_anomalies[district_anomalies['dataset'] == anomaly_dataset.lower()]
+        if selected_states:
+            dataset_anomalies = dataset_anomalies[dataset_anomalies['state'].isin(selected_states)]
+        
+        if dataset_anomalies.empty:
+            st.info("No district-level anomalies found for the current selection.")
+        else:
+            col1, col2, col3, col4 = st.columns(4)
+            col1.metric("Anomalous District-Days", f"{len(dataset_anomalies):,}")
+            col2.metric("Districts Affected", f"{dataset_anomalies[['state', 'district']].drop_duplicates().shape[0]:,}")
+            col3.metric("Spikes", f"{(dataset_anomalies['direction'] == 'Spike').sum():,}")
+            col4.metric("Drops", f"{(dataset_anomalies['direction'] == 'Drop').sum():,}")
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.markdown("**Top Anomalous Districts**")
+                top_districts = top_anomalous_districts(dataset_anomalies)
+                top_districts.columns = ['State', 'District', 'Anomalous Days', 'Spikes', 'Drops', 'Max |z|']
+                show_table(top_districts.round(1), use_container_width=True, hide_index=True)
+            
+            with col2:
+                st.markdown("**Top Anomalous Dates**")
+                top_dates = top_anomalous_dates(dataset_anomalies)
+                top_dates['date'] = top_dates['date'].dt.strftime('%d %b %Y')
+                top_dates.columns = ['Date', 'Districts', 'Spikes', 'Drops']
+                show_table(top_dates, use_container_width=True, hide_index=True)
+            
+            with st.expander("View all anomalous district-days"):
+                detail = dataset_anomalies.drop(columns='dataset').sort_values('robust_z', key=np.abs, ascending=False)
+                show_table(detail.head(1000).round(2), use_container_width=True, hide_index=True)
+        
+        # Alerts from the streaming detector (daily drops)
+        stream_alerts = get_stream_alerts()
+        if selected_states:
+            stream_alerts = stream_alerts[stream_alerts['state'].isin(selected_states)]
+        
+        st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
+        st.markdown('<p class="section-header">🚨 Live Alerts (Daily Feed)</p>', unsafe_allow_html=True)
+        
+        if stream_alerts.empty:
+            st.info("No streaming alerts yet. Ingest daily drops with `python anomaly_detection.py <file.csv> --dataset <name>`.")
+        else:
+            latest_date = stream_alerts['date'].max()
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Total Alerts", f"{len(stream_alerts):,}")
+            col2.metric("Latest Feed Date", latest_date.strftime('%d %b %Y'))
+            col3.metric("Alerts on Latest Date", f"{(stream_alerts['date'] == latest_date).sum():,}")
+            
+            recent = stream_alerts.sort_values(['date', 'ewma_z'], ascending=[False, False]).head(200).copy()
+            recent['date'] = recent['date'].dt.strftime('%d %b %Y')
+            recent.columns = ['Dataset', 'State', 'District', 'Date', 'Value', 'Expected (EWMA)',
+                              'EWMA z-score', 'Direction', 'Detected At']
+            show_table(recent.round(2), use_container_width=True, hide_index=True)
     
     with tab3:
         st.markdown('<p class="section-header">📈 District Performance</p>', unsafe_allow_html=True)
         
-        if not df_enrol.empty:
-            district_stats = df_enrol.groupby(['state', 'district']).agg({
-                'total_enrolment': ['sum', 'mean', 'std', 'count'],
-                'pincode': 'nunique'
-            }).reset_index()
-            district_stats.columns = ['State', 'District', 'Total', 'Daily Avg', 'Std Dev', 'Records', 'Pincodes']
+        if has_data('enrolment'):
+            if use_service:
+                district_stats = service_totals('enrolment', 'state,district')[['state', 'district', 'total_enrolment', 'records']]
+                district_stats.columns = ['State', 'District', 'Total', 'Records']
+                district_stats['Daily Avg'] = district_stats['Total'] / district_stats['Records']
+                district_pincodes = service_query('distinct', dataset='enrolment', by='state,district',
+                                                  states=selected_states)[['state', 'district', 'pincodes']]
+            else:
+                district_stats = df_enrol.groupby(['state', 'district']).agg({
+                    'total_enrolment': ['sum', 'mean', 'std', 'count']
+                }).reset_index()
+                district_stats.columns = ['State', 'District', 'Total', 'Daily Avg', 'Std Dev', 'Records']
+                district_pincodes = distinct_pincodes_by(enrol_cube, enrol_sketches, mask=state_mask)
+            district_pincodes.columns = ['State', 'District', 'Pincodes']
+            district_stats = district_stats.merge(district_pincodes, on=['State', 'District'], how='left')
             district_stats['Efficiency'] = district_stats['Total'] / district_stats['Pincodes']
             district_stats = district_stats.sort_values('Total', ascending=False)
             
@@ -1461,26 +1801,96 @@ elif page == "Data Explorer":
                 top_10 = district_stats.head(10)[['State', 'District', 'Total', 'Efficiency']].copy()
                 top_10['Total'] = top_10['Total'].apply(lambda x: f"{x/1e3:.1f}K")
                 top_10['Efficiency'] = top_10['Efficiency'].apply(lambda x: f"{x:.0f}")
-                st.dataframe(top_10, use_container_width=True, hide_index=True)
+                show_table(top_10, use_container_width=True, hide_index=True)
             
             with col2:
                 st.markdown("**Top 10 by Efficiency (per Pincode)**")
                 efficient = district_stats.nlargest(10, 'Efficiency')[['State', 'District', 'Total', 'Efficiency']].copy()
                 efficient['Total'] = efficient['Total'].apply(lambda x: f"{x/1e3:.1f}K")
                 efficient['Efficiency'] = efficient['Efficiency'].apply(lambda x: f"{x:.0f}")
-                st.dataframe(efficient, use_container_width=True, hide_index=True)
+                show_table(efficient, use_container_width=True, hide_index=True)
     
     with tab4:
-        st.markdown('<p class="section-header">📋 Raw Data Sample</p>', unsafe_allow_html=True)
+        st.markdown('<p class="section-header">📋 Raw Data Browser</p>', unsafe_allow_html=True)
         
         dataset = st.selectbox("Select Dataset", ["Enrolment", "Demographic", "Biometric"])
-        
-        if dataset == "Enrolment" and not df_enrol.empty:
-            st.dataframe(df_enrol.head(200), use_container_width=True)
-        elif dataset == "Demographic" and not df_demo.empty:
-            st.dataframe(df_demo.head(200), use_container_width=True)
-        elif dataset == "Biometric" and not df_bio.empty:
-            st.dataframe(df_bio.head(200), use_container_width=True)
+        dataset_key = dataset.lower()
+        
+        if not store_is_current(dataset_key):
+            st.info("The columnar store for this dataset has not been built yet (or is older than the CSV). "
+                    "Build it to browse, filter and sort all records page by page. Showing a 200-row sample meanwhile.")
+            if st.button("Build Columnar Store", key="build_raw_store"):
+                with st.spinner(f"Converting {dataset} data..."):
+                    build_columnar_store(dataset_key)
+                st.rerun()
+            
+            sample_df = load_sample(dataset_key) if use_service else dataset_frame(dataset_key)
+            if not sample_df.empty:
+                show_table(sample_df.head(200), use_container_width=True)
+        else:
+            info = store_info(dataset_key)
+            count_cols = DATASET_COUNT_COLUMNS[dataset_key] + [DATASET_VALUE_COLUMNS[dataset_key]]
+            
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                min_date = info['min_date'].date() if info['min_date'] is not None else None
+                max_date = info['max_date'].date() if info['max_date'] is not None else None
+                date_range = st.date_input("Date Range", value=(min_date, max_date) if min_date else (),
+                                           min_value=min_date, max_value=max_date, key="raw_date_range")
+            with col2:
+                district_query = st.text_input("District contains", key="raw_district")
+            with col3:
+                pincode_prefix = st.text_input("Pincode prefix", max_chars=6, key="raw_pincode",
+                                               help="Leading digits, e.g. 11 for 110000-119999")
+            
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                threshold_col = st.selectbox("Count column", count_cols, index=len(count_cols) - 1, key="raw_threshold_col")
+            with col2:
+                threshold_min = st.number_input("Minimum count", min_value=0, value=0, step=1, key="raw_threshold_min")
+            with col3:
+                sort_by = st.selectbox("Sort by", ["(storage order)"] + info['columns'], key="raw_sort_by")
+            with col4:
+                sort_desc = st.checkbox("Descending", value=True, key="raw_sort_desc")
+            
+            try:
+                date_from, date_to = (date_range if len(date_range) == 2 else (None, None))
+                filter_expr = build_filter(
+                    date_from=date_from, date_to=date_to, states=selected_states,
+                    district=district_query, pincode_prefix=pincode_prefix,
+                    min_counts={threshold_col: threshold_min}
+                )
+            except ValueError as e:
+                st.error(str(e))
+                filter_expr, pincode_prefix = None, None
+            
+            matches, scanned_groups, total_groups = count_matches(dataset_key, filter_expr, pincode_prefix)
+            
+            col1, col2 = st.columns([1, 3])
+            with col1:
+                page_size = st.selectbox("Rows per page", [50, 100, 250, 500], index=1, key="raw_page_size")
+                n_pages = max(1, -(-matches // page_size))
+                page_number = st.number_input(f"Page (of {n_pages:,})", min_value=1, max_value=n_pages,
+                                              value=1, step=1, key="raw_page")
+            with col2:
+                st.markdown(f"""
+                <div class="insight-card">
+                    <p class="insight-text">
+                        <strong>{matches:,}</strong> of {info['rows']:,} records match.
+                        Row groups read: <strong>{scanned_groups}</strong> of {total_groups}
+                        (others skipped using the pincode index and min/max statistics).
+                    </p>
+                </div>
+                """, unsafe_allow_html=True)
+            
+            page_df = query_page(
+                dataset_key, filter_expr, page=page_number - 1, page_size=page_size,
+                sort_by=None if sort_by == "(storage order)" else sort_by, ascending=not sort_desc,
+                pincode_prefix=pincode_prefix
+            )
+            first_row = (page_number - 1) * page_size + 1 if matches else 0
+            st.caption(f"Showing rows {first_row:,}–{first_row + len(page_df) - 1 if matches else 0:,} of {matches:,}")
+            show_table(page_df, use_container_width=True, hide_index=True)
 
 # ================================================================================
 # PAGE: EUMI ANALYSIS
@@ -1507,59 +1917,21 @@ elif page == "EUMI Analysis":
         try:
             if enrol_df.empty:
                 return None
-                
-            # Aggregate enrollment at district level
-            df_enrol_agg = enrol_df.groupby('district').agg({
-                'total_enrolment': 'sum',
-                'state': 'first'
-            }).reset_index()
-            
-            # Aggregate biometric at district level
-            df_bio_agg = bio_df.groupby('district').agg({
-                'total_bio': 'sum',
-                'state': 'first'
-            }).reset_index() if not bio_df.empty else pd.DataFrame()
-            
-            if df_bio_agg.empty:
+            
+            if bio_df.empty:
                 st.warning("Biometric data not available for selected filter. Cannot compute EUMI.")
                 return None
             
-            # Merge datasets on district
-            merged_df = pd.merge(df_enrol_agg, df_bio_agg[['district', 'total_bio']], on='district', how='outer')
-            merged_df['state'] = merged_df['state'].fillna(df_enrol_agg['state'].iloc[0] if not df_enrol_agg.empty else 'Unknown')
-            merged_df['total_enrolment'] = merged_df['total_enrolment'].fillna(0)
-            merged_df['total_bio'] = merged_df['total_bio'].fillna(0)
-            
-            # Compute shares
-            total_enrol = merged_df['total_enrolment'].sum()
-            total_bio = merged_df['total_bio'].sum()
-            
-            merged_df['enroll_share'] = merged_df['total_enrolment'] / total_enrol if total_enrol > 0 else 0
-            merged_df['usage_share'] = merged_df['total_bio'] / total_bio if total_bio > 0 else 0
-            
-            # Compute EUMI with safeguard against division by zero
-            merged_df['EUMI'] = np.where(
-                merged_df['enroll_share'] > 0, 
-                merged_df['usage_share'] / merged_df['enroll_share'],
-                np.nan
-            )
-            
-            # Categorize districts based on EUMI
-            conditions = [
-                (merged_df['EUMI'] < 0.8),
-                (merged_df['EUMI'] >= 0.8) & (merged_df['EUMI'] <= 1.2),
-                (merged_df['EUMI'] > 1.2)
-            ]
-            choices = ["Over-enrolled, under-used", "Balanced", "Under-enrolled, high-usage"]
-            merged_df['category'] = np.select(conditions, choices, default="Unknown")
-            
-            return merged_df
+            return compute_district_eumi(enrol_df, bio_df)
         except Exception as e:
             st.error(f"Error computing EUMI: {str(e)}")
             return None
     
-    # Pass the filtered dataframes to compute EUMI
-    eumi_data = compute_eumi_data(df_enrol, df_bio)
+    # Pass the filtered dataframes to compute EUMI (or ask the aggregate service, when configured)
+    if use_service:
+        eumi_data = service_query('eumi', states=selected_states)
+    else:
+        eumi_data = compute_eumi_data(df_enrol, df_bio)
     
     if eumi_data is not None and not eumi_data.empty:
         # Modern KPI Cards with Professional Styling
@@ -1750,7 +2122,7 @@ elif page == "EUMI Analysis":
             fig.update_xaxes(gridcolor='rgba(200, 200, 200, 0.2)', showgrid=True)
             fig.update_yaxes(gridcolor='rgba(200, 200, 200, 0.2)', showgrid=True)
             
-            st.plotly_chart(fig, use_container_width=True)
+            show_chart(fig, use_container_width=True)
         
         with tab2:
             st.markdown("""
@@ -1796,7 +2168,7 @@ elif page == "EUMI Analysis":
                 over_used['Enrollments'] = over_used['Enrollments'].apply(lambda x: f"{int(x):,}")
                 over_used['EUMI'] = over_used['EUMI'].apply(lambda x: f"{x:.2f}")
                 
-                st.dataframe(
+                show_table(
                     over_used,
                     use_container_width=True,
                     hide_index=True,
@@ -1838,7 +2210,7 @@ elif page == "EUMI Analysis":
                 under_used['Biometric Usage'] = under_used['Biometric Usage'].apply(lambda x: f"{int(x):,}")
                 under_used['EUMI'] = under_used['EUMI'].apply(lambda x: f"{x:.2f}")
                 
-                st.dataframe(
+                show_table(
                     under_used,
                     use_container_width=True,
                     hide_index=True,
@@ -1873,7 +2245,7 @@ elif page == "EUMI Analysis":
             display_df['Usage Share'] = display_df['Usage Share'].apply(lambda x: f"{x*100:.2f}%")
             display_df['EUMI'] = display_df['EUMI'].apply(lambda x: f"{x:.3f}" if pd.notna(x) else "N/A")
             
-            st.dataframe(
+            show_table(
                 display_df,
                 use_container_width=True,
                 hide_index=True,
@@ -1950,15 +2322,23 @@ elif page == "Policy Shock Analyzer":
         4. Use the tabs to explore detailed visualizations
         """)
     
-    def detect_shock_months(enrol_df, threshold_sigma=1.5):
+    def monthly_enrolment():
+        """Monthly enrollment totals (month as a Period, total_enrolment)"""
+        if use_service:
+            monthly = service_totals('enrolment', 'month')[['month', 'total_enrolment']]
+            monthly['month'] = pd.PeriodIndex(monthly['month'], freq='M')
+            return monthly
+        
+        # Aggregate to monthly (grouping by a derived key, without copying the frame)
+        month = pd.to_datetime(df_enrol['date']).dt.to_period('M').rename('month')
+        return df_enrol.groupby(month)['total_enrolment'].sum().reset_index()
+    
+    def detect_shock_months(threshold_sigma=1.5):
         """Detect months where enrollment > mean + threshold*std"""
-        if enrol_df.empty or 'date' not in enrol_df.columns:
+        if not has_data('enrolment'):
             return pd.DataFrame(), pd.DataFrame()
         
-        # Aggregate to monthly
-        enrol_df = enrol_df.copy()
-        enrol_df['month'] = pd.to_datetime(enrol_df['date']).dt.to_period('M')
-        monthly = enrol_df.groupby('month')['total_enrolment'].sum().reset_index()
+        monthly = monthly_enrolment()
         
         if len(monthly) < 2:
             return pd.DataFrame(), monthly
@@ -1986,28 +2366,57 @@ elif page == "Policy Shock Analyzer":
         
         return shock_months, monthly
     
-    def compute_impact_metrics(shock_month, enrol_df, bio_df):
+    def window_sums(shock_month):
+        """
+        Biometric sums of the pre/post windows around a shock month.
+        
+        Returns (pre, post, pre_bio, post_bio): pre/post hold the window's
+        total, records, districts and age bucket sums; pre_bio/post_bio are
+        the window's biometric rows (daily totals from the aggregate service).
+        """
+        # Pre/post windows shared with the batch scanner
+        pre_start, pre_end, post_start, post_end = shock_windows(shock_month)
+        
+        if use_service:
+            windows = service_query('windows', dataset='biometric', month=str(shock_month), states=selected_states).iloc[0]
+            pre, post = (windows.filter(regex=f'^{label}_').rename(lambda col: col.split('_', 1)[1])
+                         for label in ('pre', 'post'))
+            bio_daily = dataset_daily_totals('biometric')
+            pre_bio = bio_daily[(bio_daily['date'] >= pre_start) & (bio_daily['date'] < pre_end)]
+            post_bio = bio_daily[(bio_daily['date'] >= post_start) & (bio_daily['date'] < post_end)]
+            return pre, post, pre_bio, post_bio
+        
+        # Filter biometric data
+        bio_dates = pd.to_datetime(df_bio['date'])
+        
+        pre_bio = df_bio[(bio_dates >= pre_start) & (bio_dates < pre_end)]
+        post_bio = df_bio[(bio_dates >= post_start) & (bio_dates < post_end)]
+        
+        age_cols = list(youth_adult_columns(df_bio) or [])
+        pre, post = (pd.Series({'total': part['total_bio'].sum(), 'records': len(part), **part[age_cols].sum()})
+                     for part in (pre_bio, post_bio))
+        
+        # District Expansion Rate (distinct districts read from the biometric cube keys)
+        if 'biometric' in data:
+            bio_cube, bio_registers = get_distinct_sketches('biometric', frame_fingerprint(data['biometric']), data['biometric'])
+            cube_dates = bio_cube['date'].to_numpy()
+            in_states = bio_cube['state'].isin(selected_states).to_numpy() if selected_states else True
+            pre_mask = in_states & (cube_dates >= np.datetime64(pre_start)) & (cube_dates < np.datetime64(pre_end))
+            post_mask = in_states & (cube_dates >= np.datetime64(post_start)) & (cube_dates < np.datetime64(post_end))
+            pre['districts'] = count_distinct(bio_cube, bio_registers, pre_mask)['districts']
+            post['districts'] = count_distinct(bio_cube, bio_registers, post_mask)['districts']
+        else:
+            pre['districts'], post['districts'] = 0, 0
+        return pre, post, pre_bio, post_bio
+    
+    def compute_impact_metrics(shock_month):
         """Compute pre/post impact metrics for a shock month"""
         try:
-            # Convert period to datetime for filtering
-            shock_start = shock_month.to_timestamp()
-            shock_end = shock_start + pd.DateOffset(months=1)
-            
-            pre_start = shock_start - pd.DateOffset(days=30)
-            pre_end = shock_start
-            post_start = shock_end
-            post_end = shock_end + pd.DateOffset(days=30)
-            
-            # Filter biometric data
-            bio_df = bio_df.copy()
-            bio_df['date'] = pd.to_datetime(bio_df['date'])
-            
-            pre_bio = bio_df[(bio_df['date'] >= pre_start) & (bio_df['date'] < pre_end)]
-            post_bio = bio_df[(bio_df['date'] >= post_start) & (bio_df['date'] < post_end)]
+            pre, post, pre_bio, post_bio = window_sums(shock_month)
             
             # Biometric Persistence Ratio
-            pre_avg_bio = pre_bio['total_bio'].mean() if not pre_bio.empty else 0
-            post_avg_bio = post_bio['total_bio'].mean() if not post_bio.empty else 0
+            pre_avg_bio = pre['total'] / pre['records'] if pre['records'] > 0 else 0
+            post_avg_bio = post['total'] / post['records'] if post['records'] > 0 else 0
             persistence_ratio = post_avg_bio / pre_avg_bio if pre_avg_bio > 0 else 0
             
             # Youth Adoption Change (using age columns if available)
@@ -2016,11 +2425,13 @@ elif page == "Policy Shock Analyzer":
             pre_adult_total = 0
             post_adult_total = 0
             
-            if 'age_5_17' in bio_df.columns and 'age_18_greater' in bio_df.columns:
-                pre_youth_total = pre_bio['age_5_17'].sum() if not pre_bio.empty else 0
-                post_youth_total = post_bio['age_5_17'].sum() if not post_bio.empty else 0
-                pre_adult_total = pre_bio['age_18_greater'].sum() if not pre_bio.empty else 0
-                post_adult_total = post_bio['age_18_greater'].sum() if not post_bio.empty else 0
+            age_cols = youth_adult_columns(pre.to_frame().T)
+            if age_cols is not None:
+                youth_col, adult_col = age_cols
+                pre_youth_total = pre[youth_col]
+                post_youth_total = post[youth_col]
+                pre_adult_total = pre[adult_col]
+                post_adult_total = post[adult_col]
             
             pre_total = pre_youth_total + pre_adult_total
             post_total = post_youth_total + post_adult_total
@@ -2030,27 +2441,13 @@ elif page == "Policy Shock Analyzer":
             youth_adoption_change = (post_youth_share - pre_youth_share) * 100
             
             # District Expansion Rate
-            pre_districts = pre_bio['district'].nunique() if not pre_bio.empty and 'district' in pre_bio.columns else 0
-            post_districts = post_bio['district'].nunique() if not post_bio.empty and 'district' in post_bio.columns else 0
+            pre_districts, post_districts = int(pre['districts']), int(post['districts'])
             district_expansion = (post_districts - pre_districts) / pre_districts if pre_districts > 0 else 0
             
             # Shock Classification
-            if persistence_ratio < 1.1 and abs(youth_adoption_change) < 5 and district_expansion < 0.1:
-                classification = "Enrollment-Only Shock"
-                classification_color = "#f59e0b"
-                interpretation = "Enrollment spike without lasting usage impact. The policy drive increased registrations but did not result in sustained Aadhaar usage patterns."
-            elif persistence_ratio >= 1.2 or youth_adoption_change >= 5:
-                classification = "Behavioral Adoption Shock"
-                classification_color = "#22c55e"
-                interpretation = "Policy drive resulted in sustained Aadhaar usage, especially among youth. This indicates successful behavioral change and adoption."
-            elif district_expansion >= 0.1:
-                classification = "Structural Expansion Shock"
-                classification_color = "#3b82f6"
-                interpretation = "Policy drive expanded Aadhaar usage to new districts. This shows successful geographic penetration of Aadhaar services."
-            else:
-                classification = "Mixed Impact"
-                classification_color = "#6c757d"
-                interpretation = "The policy shock had mixed effects across different metrics."
+            classification, classification_color, interpretation = classify_shock(
+                persistence_ratio, youth_adoption_change, district_expansion
+            )
             
             return {
                 'persistence_ratio': persistence_ratio,
@@ -2073,7 +2470,7 @@ elif page == "Policy Shock Analyzer":
             return None
     
     # Detect shock months
-    shock_months, all_monthly = detect_shock_months(df_enrol)
+    shock_months, all_monthly = detect_shock_months()
     
     if shock_months.empty:
         st.info("Insufficient monthly data available for shock analysis.")
@@ -2146,7 +2543,7 @@ elif page == "Policy Shock Analyzer":
             st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
             
             # Compute impact metrics
-            metrics = compute_impact_metrics(selected_period, df_enrol, df_bio)
+            metrics = compute_impact_metrics(selected_period)
             
             # Check if we have meaningful data and warn user if not
             has_meaningful_data = metrics and metrics['persistence_ratio'] > 0 and metrics['pre_districts'] > 0
@@ -2286,14 +2683,14 @@ elif page == "Policy Shock Analyzer":
                         post_daily['period'] = 'Post-Shock (30 days after)'
                         
                         fig = go.Figure()
-                        fig.add_trace(go.Scatter(
-                            x=pre_daily['date'], y=pre_daily['total_bio'],
+                        fig.add_trace(time_series_trace(
+                            pre_daily['date'], pre_daily['total_bio'], method='lttb',
                             mode='lines+markers', name='Pre-Shock',
                             line=dict(color='#6c757d', width=2),
                             marker=dict(size=4)
                         ))
-                        fig.add_trace(go.Scatter(
-                            x=post_daily['date'], y=post_daily['total_bio'],
+                        fig.add_trace(time_series_trace(
+                            post_daily['date'], post_daily['total_bio'], method='lttb',
                             mode='lines+markers', name='Post-Shock',
                             line=dict(color='#22c55e', width=2),
                             marker=dict(size=4)
@@ -2311,7 +2708,7 @@ elif page == "Policy Shock Analyzer":
                             legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5),
                             yaxis=dict(title='Daily Biometric Usage', showgrid=True, gridcolor='rgba(0,0,0,0.05)')
                         )
-                        st.plotly_chart(fig, use_container_width=True)
+                        show_chart(fig, use_container_width=True)
                         
                         # Dynamic inference for Usage Trend
                         pre_avg = metrics['pre_avg_bio']
@@ -2383,7 +2780,7 @@ elif page == "Policy Shock Analyzer":
                         yaxis=dict(title='Share (%)', showgrid=True, gridcolor='rgba(0,0,0,0.05)'),
                         legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="center", x=0.5)
                     )
-                    st.plotly_chart(fig_age, use_container_width=True)
+                    show_chart(fig_age, use_container_width=True)
                     
                     # Dynamic inference for Age Comparison
                     youth_change = metrics['youth_adoption_change']
@@ -2517,6 +2914,43 @@ elif page == "Policy Shock Analyzer":
                     </p>
                 </div>
                 """, unsafe_allow_html=True)
+        
+        # Batch scan across all months and all states/districts
+        st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
+        st.markdown('<p class="section-header">🔎 Batch Shock Scan (All Months)</p>', unsafe_allow_html=True)
+        st.caption("Scores every (month, state) pair - or every (month, district) pair - with the same 30-day pre/post windows, ranked by enrollment z-score.")
+        
+        scan_col1, scan_col2 = st.columns([1, 3])
+        with scan_col1:
+            scan_level = st.radio("Scan Level", ["State", "District"], horizontal=True, key="shock_scan_level")
+            run_scan = st.button("Run Batch Scan", key="shock_scan_run")
+        
+        scan_key = (scan_level, tuple(sorted(selected_states)) if selected_states else ())
+        if run_scan:
+            with st.spinner("Scanning all months..."):
+                if use_service:
+                    # Daily district cubes; the biometric records weight its per-record averages
+                    scan_enrol = service_totals('enrolment', 'state,district,date')
+                    scan_bio = service_totals('biometric', 'state,district,date')
+                else:
+                    scan_enrol, scan_bio = df_enrol, df_bio
+                st.session_state.shock_scan = (scan_key, scan_policy_shocks(scan_enrol, scan_bio, level=scan_level.lower()))
+        
+        if 'shock_scan' in st.session_state and st.session_state.shock_scan[0] == scan_key:
+            scan_df = st.session_state.shock_scan[1]
+            with scan_col2:
+                if scan_df.empty:
+                    st.info("Insufficient data for a batch scan.")
+                else:
+                    anomalies_only = st.checkbox("Show anomalies only (> 1.5σ)", value=False, key="shock_scan_anomalies")
+                    display_scan = scan_df[scan_df['is_anomaly']] if anomalies_only else scan_df
+                    show_table(display_scan.head(500).round(2), use_container_width=True, height=400)
+                    st.download_button(
+                        "⬇️ Download Ranked Table (CSV)",
+                        data=scan_df.to_csv(index=False).encode('utf-8'),
+                        file_name=f"policy_shock_scan_{scan_level.lower()}.csv",
+                        mime="text/csv"
+                    )
 
 # ================================================================================
 # PAGE: DIGITAL INFRASTRUCTURE READINESS (PS-3)
@@ -2551,17 +2985,30 @@ elif page == "Digital Infrastructure Readiness":
     indices_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "outputs", "digital_infrastructure_indices.csv")
     typology_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "outputs", "digital_infrastructure_typology.csv")
     
-    if not os.path.exists(indices_file) or not os.path.exists(typology_file):
+    # Indices held by the aggregate service (None if not configured or it has none)
+    service_indices = None
+    if use_service:
+        try:
+            service_indices = cached_service_query('indices', states=selected_states)
+        except (ConnectionError, ValueError):
+            service_indices = None
+    
+    if service_indices is None and (not os.path.exists(indices_file) or not os.path.exists(typology_file)):
         st.warning("⚠️ PS-3 output files not found. Please run `python digital_infrastructure_readiness.py` first.")
     else:
-        # Load data
-        df_indices = pd.read_csv(indices_file)
-        df_typology = pd.read_csv(typology_file)
-        
-        # Apply state filter if selected
-        if selected_states:
-            df_indices = df_indices[df_indices['state'].isin(selected_states)]
-            df_typology = df_typology[df_typology['state'].isin(selected_states)]
+        if service_indices is not None:
+            # Served indices are already reconciled and filtered by state
+            df_indices = service_indices
+            df_typology = df_indices[['state', 'district', 'typology']]
+        else:
+            # Load data (variant district rows of older files folded into their canonical district)
+            df_indices = load_saved_indices(indices_file, typology_file)
+            df_typology = df_indices[['state', 'district', 'typology']]
+            
+            # Apply state filter if selected
+            if selected_states:
+                df_indices = df_indices[df_indices['state'].isin(selected_states)]
+                df_typology = df_typology[df_typology['state'].isin(selected_states)]
         
         # Summary KPIs
         st.markdown('<p class="section-header">📈 Index Summary</p>', unsafe_allow_html=True)
@@ -2615,7 +3062,7 @@ elif page == "Digital Infrastructure Readiness":
         display_cols = ['state', 'district', 'ISI', 'RCS', 'ABS']
         df_display = df_indices[display_cols].sort_values('ISI', ascending=False)
         
-        st.dataframe(df_display, use_container_width=True, hide_index=True)
+        show_table(df_display, use_container_width=True, hide_index=True)
         
         st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
         
@@ -2656,7 +3103,7 @@ elif page == "Digital Infrastructure Readiness":
             )
         )
         
-        st.plotly_chart(fig, use_container_width=True)
+        show_chart(fig, use_container_width=True)
         
         st.markdown("""
         <div class="insight-card insight-card-warning">
@@ -2682,7 +3129,7 @@ elif page == "Digital Infrastructure Readiness":
         
         with col1:
             st.markdown("**📊 Category Counts**")
-            st.dataframe(
+            show_table(
                 typology_counts,
                 use_container_width=True,
                 hide_index=True
@@ -2698,7 +3145,7 @@ elif page == "Digital Infrastructure Readiness":
         # Full typology table
         st.markdown('<p class="section-header">📋 Complete District Classification</p>', unsafe_allow_html=True)
         
-        st.dataframe(
+        show_table(
             df_typology.sort_values(['typology', 'state', 'district']),
             use_container_width=True,
             hide_index=True,
@@ -2720,3 +3167,41 @@ st.markdown("""
     </p>
 </div>
 """, unsafe_allow_html=True)
+
+# ================================================================================
+# RENDER PROFILE
+# ================================================================================
+
+with st.sidebar:
+    st.markdown('<div class="gradient-divider"></div>', unsafe_allow_html=True)
+    st.checkbox("⏱️ Profile page renders", value=profiling_enabled_by_default(), key='profile_renders',
+                help="Time data loading, filtering, chart building and serialization on every render "
+                     "and log the samples to outputs/render_profile.csv")
+    
+    if profiler.enabled:
+        profiler.finish()
+        
+        with st.expander("Render Profile", expanded=True):
+            col1, col2 = st.columns(2)
+            col1.metric("Render", f"{profiler.total_seconds * 1000:.0f} ms")
+            if profiler.peak_memory_mb is not None:
+                col2.metric("Peak Memory", f"{profiler.peak_memory_mb:.0f} MB")
+            
+            breakdown = profiler.breakdown()
+            breakdown['ms'] = (breakdown['seconds'] * 1000).round(1)
+            breakdown['share'] = (breakdown['share'] * 100).round(1).astype(str) + '%'
+            st.dataframe(breakdown[['stage', 'ms', 'share']], use_container_width=True, hide_index=True)
+            
+            slowest = profiler.slowest_elements()
+            if not slowest.empty:
+                st.caption("Slowest elements (ms)")
+                slowest[['build', 'serialize', 'total']] = (slowest[['build', 'serialize', 'total']] * 1000).round(1)
+                st.dataframe(slowest, use_container_width=True, hide_index=True)
+            
+            history = summarize_render_log(page=page)
+            if not history.empty:
+                st.caption(f"This page over {int(history['renders'].max())} logged renders (ms)")
+                history = history[['stage', 'p50_s', 'p95_s']]
+                history[['p50_s', 'p95_s']] = (history[['p50_s', 'p95_s']] * 1000).round(1)
+                st.dataframe(history.rename(columns={'p50_s': 'p50', 'p95_s': 'p95'}),
+                             use_container_width=True, hide_index=True)
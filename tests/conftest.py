@@ -0,0 +1,84 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# The analysis modules are top-level scripts in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import district_reconciliation  # noqa: E402
+from aggregation_layer import DATASET_COUNT_COLUMNS  # noqa: E402
+
+STATES = ['Assam', 'Bihar', 'Goa', 'Kerala', 'Punjab']
+
+
+@pytest.fixture
+def make_records():
+    """
+    Factory for synthetic record-level frames: state, district, date, and
+    uniform integer count columns ({name: (low, high)}), optionally pincodes.
+    """
+    def make(n, seed=0, states=4, districts=12, start='2025-03-01', days=60, counts=None, pincodes=None):
+        rng = np.random.default_rng(seed)
+        df = pd.DataFrame({
+            'state': rng.choice(STATES[:states], n),
+            'district': rng.choice([f"D{i}" for i in range(districts)], n),
+            'date': pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, n), unit='D'),
+        })
+        if pincodes is not None:
+            df['pincode'] = rng.integers(*pincodes, n)
+        for name, (low, high) in (counts or {'a': (0, 50), 'b': (0, 50)}).items():
+            df[name] = rng.integers(low, high, n)
+        return df
+    return make
+
+
+@pytest.fixture
+def make_raw(make_records):
+    """
+    Factory for consolidated-CSV style frames of a dataset, as text with the
+    usual defects: mixed case and padded names, missing states, invalid
+    dates, pincodes and counts, fractional counts and duplicate rows. The
+    district spelling 'D 7' stands for D7 in Goa (see raw_mapping).
+    """
+    def make(dataset, n, seed=0):
+        rng = np.random.default_rng(seed + 1)
+        columns = DATASET_COUNT_COLUMNS[dataset]
+        df = make_records(n, seed=seed, states=5, districts=8, counts={c: (0, 30) for c in columns},
+                          pincodes=(100000, 100400))
+        df['date'] = df['date'].dt.strftime('%d-%m-%Y')
+        df = df.astype(object)
+        df.loc[rng.random(n) < 0.02, 'date'] = '31-02-2025'
+
+        styles = rng.integers(0, 3, n)
+        for col in ['state', 'district']:
+            df[col] = np.select([styles == 1, styles == 2],
+                                [df[col].str.upper(), ' ' + df[col].str.lower() + ' '], df[col])
+        df.loc[rng.random(n) < 0.02, 'state'] = np.nan
+        df.loc[(df['state'] == 'Goa') & (df['district'] == 'D7') & (rng.random(n) < 0.5), 'district'] = 'D 7'
+
+        df['pincode'] = df['pincode'].astype(str)
+        bad = rng.random(n)
+        df.loc[bad < 0.02, 'pincode'] = '12345'
+        df.loc[(bad >= 0.02) & (bad < 0.04), 'pincode'] = ' ' + df['pincode'] + ' '
+        df.loc[(bad >= 0.04) & (bad < 0.05), 'pincode'] = 'unknown'
+
+        for col in columns:
+            defect = rng.random(n)
+            df.loc[defect < 0.01, col] = ''
+            df.loc[(defect >= 0.01) & (defect < 0.02), col] = 'x'
+            df.loc[(defect >= 0.02) & (defect < 0.04), col] = df[col].astype(str) + '.7'
+
+        duplicates = df.sample(frac=0.05, random_state=seed)
+        return pd.concat([df, duplicates]).sample(frac=1, random_state=seed).reset_index(drop=True)
+    return make
+
+
+@pytest.fixture
+def raw_mapping(monkeypatch):
+    """The persisted district mapping, replaced by the variants make_raw() uses."""
+    mapping = {('Goa', 'D 7'): 'D7'}
+    monkeypatch.setattr(district_reconciliation, 'load_district_mapping', lambda *args, **kwargs: mapping)
+    return mapping
@@ -0,0 +1,140 @@
+import threading
+from http.server import ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import aggregate_service
+from aggregate_client import SERVICE_URL_ENV, query
+from aggregate_service import _make_handler, load_service_state, query_distinct, query_totals, query_windows
+from aggregation_layer import DATASET_COUNT_COLUMNS, DATASET_VALUE_COLUMNS
+from digital_infrastructure_readiness import (
+    build_monthly_district_aggregate, build_monthly_district_aggregate_service
+)
+from policy_shock_analysis import scan_policy_shocks, shock_windows
+from report_engine import ReportEngine
+
+
+@pytest.fixture
+def datasets(make_records, tmp_path, monkeypatch, raw_mapping):
+    frames = {}
+    for seed, (name, columns) in enumerate(DATASET_COUNT_COLUMNS.items()):
+        df = make_records(6000, seed=seed, districts=10, days=150, counts={c: (0, 30) for c in columns},
+                          pincodes=(100000, 100400))
+        df.assign(date=df['date'].dt.strftime('%d-%m-%Y')).to_csv(tmp_path / f"consolidated_{name}.csv", index=False)
+        frames[name] = df.assign(**{DATASET_VALUE_COLUMNS[name]: df[columns].sum(axis=1)})
+
+    monkeypatch.setattr(aggregate_service, 'INDICES_FILE', str(tmp_path / "missing_indices.csv"))
+    return frames
+
+
+@pytest.fixture
+def state(datasets, tmp_path):
+    return load_service_state(str(tmp_path))
+
+
+@pytest.fixture
+def service(state, monkeypatch):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _make_handler(state))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setenv(SERVICE_URL_ENV, f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.mark.parametrize("by", ['state', 'state,district', 'date', 'month'])
+@pytest.mark.parametrize("name", list(DATASET_COUNT_COLUMNS))
+def test_totals_match_record_groupby(datasets, state, name, by):
+    df = datasets[name]
+    value_col = DATASET_VALUE_COLUMNS[name]
+    keys = [df['date'].dt.to_period('M').astype(str).rename('month') if dim == 'month' else dim
+            for dim in by.split(',')]
+    expected = df.groupby(keys).agg(
+        total=(value_col, 'sum'), records=(value_col, 'size'), **{c: (c, 'sum') for c in DATASET_COUNT_COLUMNS[name]}
+    ).reset_index()
+
+    result = query_totals(state, dataset=name, by=by)
+    pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+
+def test_windows_match_record_windows(datasets, state):
+    df = datasets['biometric']
+    pre_start, pre_end, post_start, post_end = shock_windows(pd.Period('2025-05', freq='M'))
+    row = query_windows(state, dataset='biometric', month='2025-05', states='Assam,Goa').iloc[0]
+
+    df = df[df['state'].isin(['Assam', 'Goa'])]
+    for label, lo, hi in (('pre', pre_start, pre_end), ('post', post_start, post_end)):
+        part = df[(df['date'] >= lo) & (df['date'] < hi)]
+        assert row[f'{label}_total'] == part['total_bio'].sum()
+        assert row[f'{label}_records'] == len(part)
+        assert row[f'{label}_districts'] == part['district'].nunique()
+        assert row[f'{label}_bio_age_5_17'] == part['bio_age_5_17'].sum()
+
+
+def test_distinct_districts_are_exact(datasets, state):
+    df = datasets['enrolment']
+    result = query_distinct(state, dataset='enrolment', by='state').set_index('state')
+
+    pd.testing.assert_series_equal(result['districts'], df.groupby('state')['district'].nunique(),
+                                   check_names=False, check_dtype=False)
+    assert query_distinct(state, dataset='enrolment').iloc[0]['states'] == df['state'].nunique()
+
+
+REQUESTS = [
+    ('state', {'total_enrolment': ['sum', 'mean'], 'age_0_5': 'sum'}),
+    (['state', 'district'], {'total_enrolment': ['sum', 'count']}),
+    ('date', {'total_enrolment': 'sum'}),
+    ('month', {'total_enrolment': 'sum', 'age_5_17': 'sum', 'pincode': 'nunique'}),
+    ('weekday', {'total_enrolment': 'mean'}),
+]
+
+
+def run_engine(df):
+    engine = ReportEngine(df)
+    engine.add_key('month', df['date'].dt.to_period('M'))
+    engine.add_key('weekday', df['date'].dt.day_name().rename('weekday'))
+    engine.request_all(REQUESTS)
+    served = engine.answer_from_service('enrolment', 'total_enrolment')
+    return engine.run(), served
+
+
+def test_report_engine_answers_from_service(datasets, service, monkeypatch):
+    served_engine, served = run_engine(datasets['enrolment'])
+    monkeypatch.delenv(SERVICE_URL_ENV)
+    local, _ = run_engine(datasets['enrolment'])
+
+    assert served == 4
+    # Only the distinct pincodes by month and the weekday means are left to pandas
+    assert served_engine.groupby_passes == 2 < local.groupby_passes
+    for keys, spec in REQUESTS:
+        pd.testing.assert_frame_equal(served_engine.agg(keys, spec), local.agg(keys, spec), check_dtype=False)
+
+
+def test_report_engine_falls_back_when_service_unreachable(datasets, monkeypatch):
+    monkeypatch.setenv(SERVICE_URL_ENV, "http://127.0.0.1:9")
+    engine, served = run_engine(datasets['enrolment'])
+
+    assert served == 0
+    assert engine.groupby_passes == len(REQUESTS)
+
+
+def test_readiness_monthly_aggregate_from_service(datasets, service):
+    df = datasets['biometric'].assign(year_month=datasets['biometric']['date'].dt.to_period('M'))
+    local = build_monthly_district_aggregate(df)
+    served = build_monthly_district_aggregate_service()
+
+    pd.testing.assert_frame_equal(served[local.columns], local, check_dtype=False)
+
+
+@pytest.mark.parametrize("level", ['state', 'district'])
+def test_policy_shock_scan_on_service_cubes(datasets, service, level):
+    cubes = {name: query('totals', dataset=name, by='state,district,date').rename(
+        columns={'total': DATASET_VALUE_COLUMNS[name]}) for name in ('enrolment', 'biometric')}
+
+    expected = scan_policy_shocks(datasets['enrolment'], datasets['biometric'], level=level)
+    result = scan_policy_shocks(cubes['enrolment'], cubes['biometric'], level=level)
+
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+    assert np.isfinite(result['persistence_ratio']).any()
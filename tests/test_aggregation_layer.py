@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregation_layer import (
+    build_daily_district_sketches, count_distinct, distinct_pincodes_by, hll_estimate, hll_merge, hll_sketches,
+)
+
+
+@pytest.fixture
+def records(make_records):
+    return make_records(40000, seed=11, states=5, districts=30, days=90,
+                        counts={'total': (1, 20)}, pincodes=(100000, 104000))
+
+
+def test_cube_matches_groupby(records):
+    daily, registers = build_daily_district_sketches(records, 'total')
+    grouped = records.groupby(['state', 'district', 'date'])
+    expected = grouped['total'].agg(total='sum', records='size').reset_index()
+
+    pd.testing.assert_frame_equal(daily[['state', 'district', 'date', 'total', 'records']], expected)
+    assert registers.shape == (len(daily), 256)
+
+
+def test_merged_sketch_equals_sketch_of_union():
+    values = np.arange(5000)
+    groups = values % 7
+    per_group = hll_sketches(groups, values, 7)
+    whole = hll_sketches(np.zeros(len(values)), values, 1)[0]
+
+    np.testing.assert_array_equal(hll_merge(per_group), whole)
+    np.testing.assert_array_equal(hll_merge(per_group, groups[:7] % 2, 2).max(axis=0), whole)
+
+
+def test_numeric_strings_hash_like_numbers():
+    np.testing.assert_array_equal(hll_sketches([0, 0], ['110001', '560001'], 1),
+                                  hll_sketches([0, 0], [110001, 560001], 1))
+
+
+def test_distinct_counts_close_to_nunique(records):
+    daily, registers = build_daily_district_sketches(records, 'total')
+
+    for states in (None, ['Goa'], ['Assam', 'Kerala']):
+        subset = records if states is None else records[records['state'].isin(states)]
+        mask = None if states is None else daily['state'].isin(states).to_numpy()
+        counts = count_distinct(daily, registers, mask)
+
+        assert counts['states'] == subset['state'].nunique()
+        assert counts['districts'] == subset['district'].nunique()
+        # 256 registers: ~6.5% standard error, allow three of them
+        assert counts['pincodes'] == pytest.approx(subset['pincode'].nunique(), rel=0.2)
+
+
+def test_distinct_pincodes_by_close_to_groupby_nunique(records):
+    daily, registers = build_daily_district_sketches(records, 'total')
+    window = (daily['date'] < pd.Timestamp('2025-04-01')).to_numpy()
+
+    estimated = distinct_pincodes_by(daily, registers, ('state', 'district'), window)
+    subset = records[records['date'] < pd.Timestamp('2025-04-01')]
+    exact = subset.groupby(['state', 'district'])['pincode'].nunique().reset_index()
+
+    pd.testing.assert_frame_equal(estimated[['state', 'district']], exact[['state', 'district']])
+    # ~90 pincodes per district: linear-counting range, ~5% standard error
+    error = (estimated['pincodes'] - exact['pincode']).abs() / exact['pincode']
+    assert error.mean() < 0.05 and error.max() < 0.2
+    assert hll_estimate(np.zeros(256, dtype=np.uint8)) == 0
@@ -0,0 +1,123 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from aggregation_layer import build_daily_district_aggregate
+from anomaly_detection import (
+    EWMA_ALPHA, MAD_SCALE, MIN_ACTIVE_DAYS, STATE_COLUMNS, ingest_daily_drop, score_district_days,
+    top_anomalous_dates,
+)
+
+
+@pytest.fixture
+def daily(make_records):
+    records = make_records(30000, seed=5, districts=8, counts={'total': (1, 10)})
+    # A spike and an outage (a reporting district missing for a day)
+    records.loc[len(records)] = ['Goa', 'D3', pd.Timestamp('2025-04-10'), 5000]
+    records = records[~((records['state'] == 'Kerala') & (records['district'] == 'D5')
+                        & (records['date'] == pd.Timestamp('2025-04-02')))]
+    return build_daily_district_aggregate(records, 'total')
+
+
+def reference_scores(daily, threshold=3.5):
+    """Per-district loop: zero-fill inside the district's span, then median/MAD scoring."""
+    dates = pd.DatetimeIndex(np.sort(daily['date'].unique()))
+    rows = []
+    for (state, district), group in daily.groupby(['state', 'district']):
+        series = group.set_index('date')['total'].astype(float)
+        span = dates[(dates >= series.index.min()) & (dates <= series.index.max())]
+        if len(span) < MIN_ACTIVE_DAYS:
+            continue
+        values = series.reindex(span, fill_value=0.0)
+        median = values.median()
+        deviation = (values - median).abs()
+        scale = MAD_SCALE * deviation.median()
+        if not scale > 0:
+            scale = (values.quantile(0.75) - values.quantile(0.25)) / 1.349
+        if not scale > 0:
+            scale = 1.2533 * deviation.mean()
+        z = (values - median) / scale
+        for date, value in z[z.abs() > threshold].items():
+            rows.append((state, district, date, value))
+    return pd.DataFrame(rows, columns=['state', 'district', 'date', 'robust_z'])
+
+
+def test_scores_match_per_district_loop(daily):
+    anomalies = score_district_days(daily)
+    expected = reference_scores(daily)
+
+    key = ['state', 'district', 'date']
+    got = anomalies.sort_values(key).reset_index(drop=True)
+    want = expected.sort_values(key).reset_index(drop=True)
+    pd.testing.assert_frame_equal(got[key], want[key])
+    np.testing.assert_allclose(got['robust_z'], want['robust_z'])
+
+    flagged = set(zip(got['state'], got['district'], got['date'], got['direction']))
+    assert ('Goa', 'D3', pd.Timestamp('2025-04-10'), 'Spike') in flagged
+    assert ('Kerala', 'D5', pd.Timestamp('2025-04-02'), 'Drop') in flagged
+
+
+def test_top_dates_count_each_district_once():
+    day = pd.Timestamp('2025-04-10')
+    anomalies = pd.DataFrame({
+        'dataset': ['enrolment', 'biometric', 'demographic', 'enrolment', 'enrolment'],
+        'state': ['Goa', 'Goa', 'Goa', 'Goa', 'Assam'],
+        'district': ['D1', 'D1', 'D1', 'D2', 'D1'],
+        'date': [day, day, day, day, day + pd.Timedelta(days=1)],
+        'direction': ['Spike', 'Spike', 'Drop', 'Drop', 'Drop'],
+    })
+    summary = top_anomalous_dates(anomalies)
+
+    first = summary[summary['date'] == day].iloc[0]
+    assert (first['districts'], first['spikes'], first['drops']) == (2, 1, 2)
+    assert summary['districts'].tolist() == [2, 1]
+
+
+@pytest.fixture
+def stream_records(make_records):
+    # Every district reports every day
+    records = make_records(20000, seed=9, states=2, districts=5, days=30, counts={'total_enrolment': (1, 10)})
+    assert records.groupby(['state', 'district'])['date'].nunique().eq(30).all()
+    return records
+
+
+def ingest(records, state=None):
+    return ingest_daily_drop(records, 'enrolment', pd.DataFrame(columns=STATE_COLUMNS) if state is None else state)
+
+
+def test_stream_mean_matches_pandas_ewm(stream_records):
+    state, _ = ingest(stream_records)
+
+    totals = stream_records.groupby(['state', 'district', 'date'])['total_enrolment'].sum()
+    expected = totals.groupby(level=['state', 'district']).apply(
+        lambda series: series.ewm(alpha=EWMA_ALPHA, adjust=False).mean().iloc[-1])
+    np.testing.assert_allclose(state.set_index(['state', 'district'])['ewma_mean'], expected)
+    assert (state['n_days'] == 30).all()
+
+    # Day by day gives the same state, and re-ingesting is a no-op
+    dates = np.sort(stream_records['date'].unique())
+    daily_state, _ = ingest(stream_records[stream_records['date'] == dates[0]])
+    for date in dates[1:]:
+        daily_state, _ = ingest(stream_records[stream_records['date'] == date], daily_state)
+    pd.testing.assert_frame_equal(daily_state, state)
+    again, alerts = ingest(stream_records, state)
+    pd.testing.assert_frame_equal(again, state)
+    assert alerts.empty
+
+
+def test_stream_flags_outage_and_ingests_late_rows(stream_records):
+    last = stream_records['date'].max()
+    missing = (stream_records['state'] == 'Assam') & (stream_records['district'] == 'D2') \
+        & (stream_records['date'] == last)
+    state, _ = ingest(stream_records[stream_records['date'] < last])
+    state, alerts = ingest(stream_records[(stream_records['date'] == last) & ~missing], state)
+
+    outage = alerts[(alerts['state'] == 'Assam') & (alerts['district'] == 'D2')]
+    assert outage[['date', 'value', 'direction']].values.tolist() == [[last, 0.0, 'Drop']]
+    district = state.set_index(['state', 'district']).loc[('Assam', 'D2')]
+    assert district['n_days'] == 30 and district['last_date'] < last
+
+    # The district's late rows are still ingested (its own watermark is older)
+    state, _ = ingest(stream_records[missing], state)
+    district = state.set_index(['state', 'district']).loc[('Assam', 'D2')]
+    assert district['n_days'] == 31 and district['last_date'] == last
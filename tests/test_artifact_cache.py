@@ -0,0 +1,58 @@
+import inspect
+
+import pytest
+
+import artifact_cache
+import pipeline_runner
+import uidai_comprehensive_analysis as comprehensive
+from artifact_cache import ArtifactCache, code_digest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ArtifactCache(str(tmp_path / "cache"), base_dir=str(tmp_path))
+
+
+def stage_keys(cache):
+    return {stage.name: pipeline_runner.stage_key(cache, stage) for stage in pipeline_runner.PIPELINE_STAGES}
+
+
+def edit_source(monkeypatch, func):
+    # Pretend the source of one function was edited
+    getsource = inspect.getsource
+    monkeypatch.setattr(artifact_cache.inspect, 'getsource',
+                        lambda obj: getsource(obj) + ("\n# edited" if obj is func else ""))
+
+
+def test_code_digest_follows_imported_repo_functions(monkeypatch):
+    before = code_digest(pipeline_runner._load_datasets)
+    edit_source(monkeypatch, comprehensive.apply_district_mapping)
+    assert code_digest(pipeline_runner._load_datasets) != before
+
+
+def test_editing_cleaning_helper_invalidates_consumers(monkeypatch, cache):
+    before = stage_keys(cache)
+    edit_source(monkeypatch, comprehensive._clean_parts)
+    after = stage_keys(cache)
+
+    changed = {name for name in before if before[name] != after[name]}
+    assert changed == {'load', 'lag', 'cohort', 'tier', 'backlog'}
+
+
+def test_unrelated_edit_keeps_keys(monkeypatch, cache):
+    before = stage_keys(cache)
+    edit_source(monkeypatch, comprehensive.compute_geographic_efficiency)
+    after = stage_keys(cache)
+
+    changed = {name for name in before if before[name] != after[name]}
+    assert changed == {'tier'}
+
+
+def test_stage_key_tracks_input_content(tmp_path, cache):
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n")
+    first = cache.stage_key('stage', ['data.csv'], 'code', {'X': 1})
+    assert cache.stage_key('stage', ['data.csv'], 'code', {'X': 1}) == first
+    assert cache.stage_key('stage', ['data.csv'], 'code', {'X': 2}) != first
+
+    (tmp_path / "data.csv").write_text("a,b\n1,2\n3,4\n")
+    assert cache.stage_key('stage', ['data.csv'], 'code', {'X': 1}) != first
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from chart_downsampling import downsample, downsample_lttb, downsample_mean, downsample_minmax
+
+
+def reference_lttb(x, y, n_out):
+    # Point-by-point LTTB over the same equal-count buckets of the inner points
+    n = len(y)
+    inner = n - 2
+    buckets = [(1 + b * inner // (n_out - 2), 1 + (b + 1) * inner // (n_out - 2)) for b in range(n_out - 2)]
+
+    selected = [0]
+    for b, (lo, hi) in enumerate(buckets):
+        if b + 1 < len(buckets):
+            nlo, nhi = buckets[b + 1]
+            cx, cy = sum(x[nlo:nhi]) / (nhi - nlo), sum(y[nlo:nhi]) / (nhi - nlo)
+        else:
+            cx, cy = x[-1], y[-1]
+        ax, ay = x[selected[-1]], y[selected[-1]]
+        areas = [abs((ax - cx) * (y[i] - ay) - (ax - x[i]) * (cy - ay)) / 2 for i in range(lo, hi)]
+        selected.append(lo + areas.index(max(areas)))
+    return selected + [n - 1]
+
+
+def series(n, seed):
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n))
+    y = np.cumsum(rng.normal(0, 1, n)) + 20 * (rng.random(n) < 0.01)
+    return x, y
+
+
+@pytest.mark.parametrize("n, n_out", [(10, 3), (11, 5), (500, 37), (1000, 100), (2503, 1000)])
+def test_lttb_matches_reference(n, n_out):
+    x, y = series(n, seed=n)
+
+    assert downsample_lttb(x, y, n_out).tolist() == reference_lttb(x.tolist(), y.tolist(), n_out)
+
+
+def test_lttb_on_datetimes_matches_numeric_axis():
+    x, y = series(800, seed=3)
+    dates = pd.Timestamp('2025-01-01') + pd.to_timedelta(np.round(x * 86400), unit='s')
+    seconds = (dates - dates[0]).total_seconds().to_numpy()
+
+    assert downsample_lttb(dates.to_numpy(), y, 120).tolist() == reference_lttb(seconds.tolist(), y.tolist(), 120)
+
+
+def test_lttb_keeps_ends_and_order():
+    x, y = series(5000, seed=4)
+    keep = downsample_lttb(x, y, 250)
+
+    assert len(keep) == 250 and keep[0] == 0 and keep[-1] == 4999
+    assert (np.diff(keep) > 0).all()
+
+
+def test_minmax_keeps_bucket_extremes():
+    x, y = series(1003, seed=5)
+    keep = downsample_minmax(y, 40)
+    edges = np.linspace(0, len(y), 41).astype(int)
+
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        assert lo + y[lo:hi].argmin() in keep and lo + y[lo:hi].argmax() in keep
+    assert len(keep) <= 80
+
+
+def test_mean_matches_groupby():
+    x, y = series(1000, seed=6)
+    y[::17] = np.nan
+    x_mean, y_mean = downsample_mean(x, y, 64)
+    bucket = np.repeat(np.arange(64), np.diff(np.linspace(0, 1000, 65).astype(int)))
+    grouped = pd.DataFrame({'x': x, 'y': y, 'bucket': bucket}).groupby('bucket').mean()
+
+    np.testing.assert_allclose(x_mean, grouped['x'])
+    np.testing.assert_allclose(y_mean, grouped['y'])
+
+
+@pytest.mark.parametrize("method", ['minmax', 'mean', 'lttb'])
+def test_downsample_respects_point_budget(method):
+    x, y = series(3000, seed=7)
+
+    small_x, small_y = downsample(x, y, 300, method)
+    assert len(small_x) == len(small_y) <= 300
+    assert downsample(x[:200], y[:200], 300, method)[1].tolist() == y[:200].tolist()
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import district_reconciliation
+from digital_infrastructure_readiness import (
+    build_index_state, build_monthly_district_aggregate, combine_indices, compute_age_balance_score,
+    compute_indices_from_state, compute_infrastructure_stress_index, compute_reporting_consistency_score,
+    fold_into_state, get_district_keys, load_saved_indices,
+)
+
+
+@pytest.fixture
+def records(make_records):
+    df = make_records(20000, seed=3, states=3, districts=15, start='2025-01-01', days=181,
+                      counts={'bio_age_5_17': (0, 30), 'bio_age_17_': (0, 60)})
+    # A district that only appears in the later months
+    df.loc[df['date'] < pd.Timestamp('2025-04-01'), 'district'] = \
+        df['district'].where(df['district'] != 'D14', 'D0')
+    df['total_bio'] = df['bio_age_5_17'] + df['bio_age_17_']
+    df['year_month'] = df['date'].dt.to_period('M')
+    return df
+
+
+def folded_state(records, split='2025-04-01'):
+    early = records[records['date'] < pd.Timestamp(split)]
+    late = records[records['date'] >= pd.Timestamp(split)]
+    state, meta = build_index_state(build_monthly_district_aggregate(early))
+    return fold_into_state(state, meta, build_monthly_district_aggregate(late))
+
+
+def test_folded_statistics_match_groupby(records):
+    state, meta = folded_state(records)
+
+    monthly = records.groupby(['state', 'district', 'year_month'])['total_bio'].sum()
+    volume = monthly.groupby(level=['state', 'district'])
+    expected = pd.DataFrame({
+        'n_months': volume.count(),
+        'mean_volume': volume.mean(),
+        'var_volume': volume.var(),
+        'max_volume': volume.max(),
+        'months_with_data': (monthly > 0).groupby(level=['state', 'district']).sum(),
+    }).reset_index()
+
+    assert state[['state', 'district']].equals(expected[['state', 'district']])
+    np.testing.assert_array_equal(state['n_months'], expected['n_months'])
+    np.testing.assert_array_equal(state['months_with_data'], expected['months_with_data'])
+    np.testing.assert_allclose(state['mean_volume'], expected['mean_volume'], rtol=1e-12)
+    np.testing.assert_allclose(state['m2_volume'] / (state['n_months'] - 1), expected['var_volume'], rtol=1e-10)
+    np.testing.assert_array_equal(state['max_volume'], expected['max_volume'])
+
+    totals = records.groupby(['state', 'district'])[['bio_age_5_17', 'bio_age_17_']].sum().reset_index()
+    np.testing.assert_array_equal(state['total_5_17'], totals['bio_age_5_17'])
+    np.testing.assert_array_equal(state['total_17_plus'], totals['bio_age_17_'])
+    assert meta['months'] == [f"2025-{m:02d}" for m in range(1, 7)]
+
+
+def test_refreshed_indices_match_full_rebuild(records):
+    state, meta = folded_state(records)
+    refreshed = compute_indices_from_state(state, meta)
+
+    monthly = build_monthly_district_aggregate(records)
+    full = combine_indices(get_district_keys(monthly), compute_infrastructure_stress_index(monthly),
+                           compute_reporting_consistency_score(monthly), compute_age_balance_score(monthly))
+
+    pd.testing.assert_frame_equal(refreshed[full.columns], full, check_dtype=False, rtol=1e-10)
+
+
+def test_overlapping_refresh_is_rejected(records):
+    state, meta = build_index_state(build_monthly_district_aggregate(records))
+    with pytest.raises(ValueError, match="full rebuild"):
+        fold_into_state(state, meta, build_monthly_district_aggregate(records.tail(100)))
+
+
+def test_saved_variant_rows_fold_into_canonical_district(tmp_path, monkeypatch):
+    # Indices written before reconciliation, with a phantom variant district
+    indices = pd.DataFrame({
+        'state': ['A&N', 'A&N', 'A&N'], 'district': ['Andamans', 'Nicobar', 'Nicobars'],
+        'ISI': [0.17, 0.22, 0.0], 'months_with_data': [9, 9, 2],
+    })
+    indices.to_csv(tmp_path / "indices.csv", index=False)
+    indices[['state', 'district']].assign(typology=['x', 'y', 'z']).to_csv(tmp_path / "typology.csv", index=False)
+    monkeypatch.setattr(district_reconciliation, 'load_district_mapping',
+                        lambda *args, **kwargs: {('A&N', 'Nicobars'): 'Nicobar'})
+
+    saved = load_saved_indices(str(tmp_path / "indices.csv"), str(tmp_path / "typology.csv"))
+
+    assert saved[['district', 'ISI', 'typology']].values.tolist() == [['Andamans', 0.17, 'x'], ['Nicobar', 0.22, 'y']]
+    assert load_saved_indices(str(tmp_path / "missing.csv")).empty
@@ -0,0 +1,82 @@
+import pandas as pd
+
+import district_reconciliation
+from district_reconciliation import (
+    apply_district_mapping, collect_district_names, load_district_mapping, reconcile_districts
+)
+
+
+def names_frame(rows):
+    return pd.DataFrame(rows, columns=['state', 'district', 'records', 'datasets'])
+
+
+def canonical(mapping):
+    return dict(zip(mapping['district'], mapping['canonical_district']))
+
+
+def test_qualifier_words_keep_districts_apart():
+    names = names_frame([
+        ('Meghalaya', 'East Khasi Hills', 505, 3),
+        ('Meghalaya', 'Eastern West Khasi Hills', 459, 3),
+        ('Meghalaya', 'West Khasi Hills', 514, 3),
+        ('Meghalaya', 'South West Khasi Hills', 516, 3),
+        ('West Bengal', 'North 24 Parganas', 400, 3),
+        ('West Bengal', 'South 24 Parganas', 500, 3),
+        ('West Bengal', 'South 24 Pargana', 50, 1),
+    ])
+    mapping = canonical(reconcile_districts(names))
+    assert mapping == {'South 24 Pargana': 'South 24 Parganas'}
+
+
+def test_digits_keep_districts_apart():
+    names = names_frame([('Delhi', 'Zone 1', 10, 3), ('Delhi', 'Zone 2', 10, 3)])
+    assert reconcile_districts(names).empty
+
+
+def test_canonical_prefers_proper_spelling():
+    names = names_frame([
+        ('Odisha', 'JAJPUR', 900, 3),
+        ('Odisha', 'Jajpur', 100, 1),
+        ('Odisha', 'Khordha  *', 900, 3),
+        ('Odisha', 'Khordha', 100, 1),
+        ('West Bengal', 'South 24 parganas', 900, 3),
+        ('West Bengal', 'South 24 Parganas', 100, 1),
+    ])
+    mapping = canonical(reconcile_districts(names))
+    assert mapping == {'JAJPUR': 'Jajpur', 'Khordha  *': 'Khordha', 'South 24 parganas': 'South 24 Parganas'}
+
+
+def test_mapping_matches_pandas_groupby(tmp_path):
+    rows = pd.DataFrame({
+        'state': ['Karnataka'] * 5 + ['Odisha'] * 4,
+        'district': ['Gadag *', 'Gadag', 'Gadag', 'yadgir', 'Yadgir', 'ANUGUL', 'Anugul', 'Anugul  *', 'Jajpur'],
+        'count': [1, 2, 3, 4, 5, 6, 7, 8, 9],
+    })
+    for dataset in ['enrolment', 'demographic', 'biometric']:
+        rows.to_csv(tmp_path / f"consolidated_{dataset}.csv", index=False)
+
+    names = collect_district_names(str(tmp_path))
+    expected_names = rows.groupby(['state', 'district']).size().mul(3).rename('records').reset_index()
+    pd.testing.assert_frame_equal(names[['state', 'district', 'records']], expected_names, check_dtype=False)
+
+    mapping = reconcile_districts(names)
+    lookup = dict(zip(zip(mapping['state'], mapping['district']), mapping['canonical_district']))
+    mapped = apply_district_mapping(rows.copy(), lookup)
+
+    expected = rows['district'].str.replace(r'\s*\*$', '', regex=True).str.title()
+    assert mapped['district'].tolist() == expected.tolist()
+    pd.testing.assert_series_equal(mapped.groupby(['state', 'district'])['count'].sum(),
+                                   rows.assign(district=expected).groupby(['state', 'district'])['count'].sum())
+
+
+def test_missing_mapping_is_built_from_the_datasets(tmp_path, monkeypatch):
+    data_dir, path = tmp_path / "filtered_data", tmp_path / "outputs" / "district_name_mapping.csv"
+    data_dir.mkdir()
+    pd.DataFrame({'state': ['Andaman & Nicobar Islands'] * 3, 'district': ['Nicobar', 'Nicobar', 'Nicobars']}) \
+        .to_csv(data_dir / "consolidated_biometric.csv", index=False)
+    monkeypatch.setattr(district_reconciliation, 'FILTERED_DATA_DIR', str(data_dir))
+    monkeypatch.setattr(district_reconciliation, 'MAPPING_FILE', str(path))
+
+    assert load_district_mapping(str(path)) == {('Andaman & Nicobar Islands', 'Nicobars'): 'Nicobar'}
+    assert path.exists()
+    assert load_district_mapping(str(tmp_path / "elsewhere.csv")) == {}
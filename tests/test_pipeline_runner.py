@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from pipeline_runner import attach_frame, close_handles, release_frame, share_frame
+
+
+@pytest.fixture
+def shared(make_records):
+    df = make_records(500, seed=2, pincodes=(110000, 860000)).set_index(np.arange(1000, 1500))
+    df.loc[df.index[::37], 'district'] = np.nan
+    spec = share_frame(df)
+    handles = []
+    yield df, attach_frame(spec, handles), handles
+    close_handles(handles)
+    release_frame(spec)
+
+
+def test_attached_frame_equals_published_frame(shared):
+    df, attached, _ = shared
+
+    pd.testing.assert_frame_equal(attached.astype({'state': object, 'district': object}), df, check_index_type=False)
+    assert attached['district'].isna().sum() == df['district'].isna().sum()
+
+
+def test_attached_columns_are_read_only_views_of_the_blocks(shared):
+    _, attached, handles = shared
+    buffers = [np.frombuffer(block.buf, dtype=np.uint8) for block in handles]
+
+    for values in [attached['a'].to_numpy(), attached['date'].to_numpy(), attached['state'].cat.codes.to_numpy()]:
+        assert any(np.shares_memory(values, buffer) for buffer in buffers)
+        assert not values.flags.writeable
+    del buffers
+
+
+def test_text_columns_group_like_strings(shared):
+    df, attached, _ = shared
+
+    grouped = attached.groupby(['state', 'district'], observed=True)['a'].sum()
+    expected = df.groupby(['state', 'district'])['a'].sum()
+    assert grouped.index.tolist() == expected.index.tolist()
+    assert grouped.tolist() == expected.tolist()
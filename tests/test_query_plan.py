@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from query_plan import AggregatePlan, RECORDS
+
+
+@pytest.fixture
+def records(make_records):
+    return make_records(5000, seed=7)
+
+
+def expected(df, keys, sums=(), size=False):
+    grouped = df.groupby(keys, sort=True)
+    result = grouped[list(sums)].sum()
+    if size:
+        result[RECORDS] = grouped.size()
+    return result.reset_index()
+
+
+def test_requests_on_same_keys_are_merged(records):
+    plan = AggregatePlan()
+    first = plan.aggregate('d', ['state', 'date'], sums=['a'])
+    second = plan.aggregate('d', ['date', 'state'], sums=['b'], size=True)
+    assert first.node == second.node
+
+    results = plan.execute({'d': records})
+    assert plan.scan_passes == 1 and plan.rollups == 0
+    pd.testing.assert_frame_equal(results[first], expected(records, ['state', 'date'], ['a']))
+    pd.testing.assert_frame_equal(results[second], expected(records, ['date', 'state'], ['b'], size=True))
+
+
+def test_coarse_requests_roll_up_from_finer_nodes(records):
+    plan = AggregatePlan()
+    plan.derive('week', ['date'], lambda f: f['date'].dt.isocalendar().week.astype('int64'))
+    daily = plan.aggregate('d', ['state', 'date'], sums=['a'])
+    by_state = plan.aggregate('d', ['state'], sums=['a', 'b'], size=True)
+    weekly = plan.aggregate('d', ['state', 'week'], sums=['b'])
+    total = plan.aggregate('d', [], sums=['a'], size=True)
+
+    # Each node reads from the smallest node covering its grain
+    plan.optimize()
+    assert plan._nodes[by_state.node].source == daily.node
+    assert plan._nodes[weekly.node].source == daily.node
+    assert plan._nodes[total.node].source == by_state.node
+
+    results = plan.execute({'d': lambda: records})
+    assert plan.scan_passes == 1 and plan.rollups == 3
+
+    pd.testing.assert_frame_equal(results[daily], expected(records, ['state', 'date'], ['a']))
+    pd.testing.assert_frame_equal(results[by_state], expected(records, ['state'], ['a', 'b'], size=True))
+    weeks = records.assign(week=records['date'].dt.isocalendar().week.astype('int64'))
+    pd.testing.assert_frame_equal(results[weekly], expected(weeks, ['state', 'week'], ['b']))
+    assert results[total].iloc[0].tolist() == [records['a'].sum(), len(records)]
+
+
+def test_distinct_counts_add_an_implicit_grain_node(records):
+    plan = AggregatePlan()
+    by_state = plan.aggregate('d', ['state'], sums=['a'], nunique={'districts': 'district'})
+
+    plan.optimize()
+    source = plan._nodes[by_state.node].source
+    assert plan._nodes[source].implicit
+    assert set(plan._nodes[source].keys) == {'state', 'district'}
+
+    results = plan.execute({'d': records})
+    grouped = records.groupby('state')
+    want = pd.DataFrame({'a': grouped['a'].sum(), 'districts': grouped['district'].nunique()}).reset_index()
+    pd.testing.assert_frame_equal(results[by_state], want)
+    assert plan.scan_passes == 1 and plan.rollups == 1
@@ -0,0 +1,144 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+
+import raw_data_store
+from raw_data_store import (
+    build_columnar_store, build_filter, count_matches, index_path, prefix_row_groups, query_page, store_path
+)
+
+COUNTS = {'age_0_5': (0, 20), 'age_5_17': (0, 20), 'age_18_greater': (0, 20)}
+
+
+@pytest.fixture
+def records(make_records, tmp_path, monkeypatch):
+    df = make_records(3000, seed=5, counts=COUNTS, pincodes=(110000, 860000))
+    source = tmp_path / "consolidated_enrolment.csv"
+    df.assign(date=df['date'].dt.strftime('%d-%m-%Y')).to_csv(source, index=False)
+
+    monkeypatch.setattr(raw_data_store, 'STORE_DIR', str(tmp_path / "columnar"))
+    build_columnar_store('enrolment', source=str(source), chunk_rows=1000, row_group_rows=100)
+    return df.assign(total_enrolment=df[list(COUNTS)].sum(axis=1))
+
+
+FILTERS = [
+    {},
+    {'date_from': '2025-03-10', 'date_to': '2025-04-05'},
+    {'states': ['Bihar', 'Goa']},
+    {'district': 'd1'},
+    {'pincode_prefix': '56'},
+    {'pincode_prefix': '4'},
+    {'min_counts': {'age_5_17': 15}},
+    {'states': ['Kerala'], 'pincode_prefix': '3', 'date_to': '2025-04-01', 'min_counts': {'total_enrolment': 20}},
+]
+
+
+def expected(df, date_from=None, date_to=None, states=None, district=None, pincode_prefix=None, min_counts=None):
+    mask = pd.Series(True, index=df.index)
+    if date_from:
+        mask &= df['date'] >= pd.Timestamp(date_from)
+    if date_to:
+        mask &= df['date'] <= pd.Timestamp(date_to)
+    if states:
+        mask &= df['state'].isin(states)
+    if district:
+        mask &= df['district'].str.contains(district, case=False)
+    if pincode_prefix:
+        mask &= df['pincode'].astype(str).str.startswith(pincode_prefix)
+    for col, minimum in (min_counts or {}).items():
+        mask &= df[col] >= minimum
+    return df[mask]
+
+
+def ordered(df, sort_by, ascending):
+    keys = [sort_by] + [key for key in raw_data_store.STORE_SORT_KEYS if key != sort_by]
+    return df.sort_values(keys, ascending=[ascending] + [True] * (len(keys) - 1), kind='stable')
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_count_matches_equals_pandas_filter(records, filters):
+    matches, scanned, total = count_matches('enrolment', build_filter(**filters), filters.get('pincode_prefix'))
+    unindexed, _, _ = count_matches('enrolment', build_filter(**filters))
+
+    assert matches == unindexed == len(expected(records, **filters))
+    assert 0 < total and scanned <= total
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+@pytest.mark.parametrize("sort_by, ascending", [('total_enrolment', False), ('pincode', True)])
+def test_sorted_pages_equal_pandas_sort(records, filters, sort_by, ascending):
+    rows = ordered(expected(records, **filters), sort_by, ascending)
+    columns = list(dict.fromkeys(['state', 'district', 'pincode', 'date', sort_by]))
+
+    for page in range(3):
+        result = query_page('enrolment', build_filter(**filters), page=page, page_size=40,
+                            sort_by=sort_by, ascending=ascending, pincode_prefix=filters.get('pincode_prefix'))
+        want = rows.iloc[page * 40:(page + 1) * 40]
+        # Ties beyond the sort keys can come back in any order
+        pd.testing.assert_frame_equal(result[columns].sort_values(columns).reset_index(drop=True),
+                                      want[columns].sort_values(columns).reset_index(drop=True),
+                                      check_dtype=False)
+        assert result[sort_by].tolist() == want[sort_by].tolist()
+
+
+def test_storage_order_pages_cover_every_match_once(records):
+    filters = {'states': ['Assam', 'Punjab'], 'min_counts': {'age_0_5': 5}}
+    matches, _, _ = count_matches('enrolment', build_filter(**filters))
+
+    n_pages = -(-matches // 64)
+    pages = [query_page('enrolment', build_filter(**filters), page=page, page_size=64)
+             for page in range(n_pages + 1)]
+
+    assert [len(p) for p in pages[:n_pages - 1]] == [64] * (n_pages - 1)
+    assert pages[n_pages].empty
+    combined = pd.concat(pages, ignore_index=True)
+    want = expected(records, **filters)
+    assert len(combined) == len(want)
+    assert combined['total_enrolment'].sum() == want['total_enrolment'].sum()
+    assert sorted(combined['pincode']) == sorted(want['pincode'])
+
+
+@pytest.fixture
+def regional(make_records, tmp_path, monkeypatch):
+    # Pincodes follow the state, as in the real data: each state owns one postal zone
+    df = make_records(4000, seed=9, counts=COUNTS)
+    zones = df['state'].map({'Assam': 7, 'Bihar': 8, 'Goa': 4, 'Kerala': 6})
+    df['pincode'] = zones * 100000 + np.random.default_rng(9).integers(0, 100000, len(df))
+    source = tmp_path / "consolidated_enrolment.csv"
+    df.assign(date=df['date'].dt.strftime('%d-%m-%Y')).to_csv(source, index=False)
+
+    monkeypatch.setattr(raw_data_store, 'STORE_DIR', str(tmp_path / "columnar"))
+    build_columnar_store('enrolment', source=str(source), chunk_rows=1500, row_group_rows=100)
+    return df
+
+
+@pytest.mark.parametrize("prefix", ['6', '68', '681', '6812', '7', '99'])
+def test_prefix_row_groups_are_exactly_the_groups_holding_the_prefix(regional, prefix):
+    store = pq.ParquetFile(store_path('enrolment'))
+    holding = [i for i in range(store.metadata.num_row_groups)
+               if store.read_row_group(i, columns=['pincode']).column(0).to_pandas()
+               .astype(str).str.startswith(prefix[:3]).any()]
+
+    assert prefix_row_groups('enrolment', prefix).tolist() == holding
+
+
+@pytest.mark.parametrize("prefix", ['6', '68', '6812'])
+def test_pincode_index_reads_fewer_row_groups(regional, prefix):
+    filter_expr = build_filter(pincode_prefix=prefix)
+    indexed = count_matches('enrolment', filter_expr, prefix)
+    unindexed = count_matches('enrolment', filter_expr)
+
+    assert indexed[0] == unindexed[0] == regional['pincode'].astype(str).str.startswith(prefix).sum()
+    assert indexed[1] < unindexed[1] < indexed[2]
+
+
+def test_stale_pincode_index_is_ignored(regional):
+    stamp = os.path.getmtime(store_path('enrolment'))
+    os.utime(index_path('enrolment'), (stamp - 60, stamp - 60))
+
+    assert prefix_row_groups('enrolment', '68') is None
+    assert count_matches('enrolment', build_filter(pincode_prefix='68'), '68')[0] == \
+        regional['pincode'].astype(str).str.startswith('68').sum()
@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+import uidai_comprehensive_analysis as comprehensive
+
+duckdb = pytest.importorskip("duckdb")
+import sql_backend  # noqa: E402
+
+DATASETS = ['demographic', 'enrolment', 'biometric']
+
+
+@pytest.fixture
+def backends(make_raw, raw_mapping, tmp_path, monkeypatch):
+    monkeypatch.setattr(sql_backend, 'load_district_mapping', lambda *args, **kwargs: raw_mapping)
+    frames = {}
+    for seed, dataset in enumerate(DATASETS):
+        path = tmp_path / f"consolidated_{dataset}.csv"
+        make_raw(dataset, 4000, seed=seed).to_csv(path, index=False)
+        frames[dataset] = comprehensive._clean_dataframe(pd.read_csv(path), dataset)
+
+    con, row_counts = sql_backend.connect(data_dir=str(tmp_path), temp_directory=str(tmp_path / "spill"), threads=2)
+    yield frames, con, row_counts
+    con.close()
+
+
+def assert_same(sql, pandas_result):
+    pd.testing.assert_frame_equal(sql.reset_index(drop=True), pandas_result.reset_index(drop=True), check_dtype=False)
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_cleaning_keeps_the_same_rows(backends, dataset):
+    frames, con, row_counts = backends
+    df = frames[dataset]
+    summary = sql_backend.dataset_summary(con, dataset)
+
+    assert row_counts[dataset][1] == summary['rows'] == len(df)
+    assert (summary['states'], summary['districts'], summary['pincodes']) == \
+        (df['state'].nunique(), df['district'].nunique(), df['pincode'].nunique())
+    assert 'D 7' not in set(df['district'])
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+@pytest.mark.parametrize("keys", [['state', 'date'], ['date', 'state', 'district']])
+def test_totals_match_groupby(backends, dataset, keys):
+    frames, con, _ = backends
+
+    assert_same(sql_backend.totals(con, dataset, keys), comprehensive._group_totals(frames[dataset], dataset, keys))
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+def test_weekly_totals_match_groupby(backends, dataset):
+    frames, con, _ = backends
+    df = frames[dataset]
+
+    assert_same(sql_backend.totals(con, dataset, ['state', 'year', 'week']),
+                comprehensive._group_totals(df, dataset, comprehensive._week_keys(df)))
+    assert sql_backend.totals(con, dataset).iloc[0].tolist() == \
+        df[comprehensive._get_numeric_columns(dataset)].sum().tolist()
+
+
+@pytest.mark.parametrize("dataset", ['enrolment', 'biometric'])
+def test_district_stats_match_pandas(backends, dataset):
+    frames, con, _ = backends
+    df = frames[dataset]
+    tiers = comprehensive._tier_lookup(sql_backend.districts(con, ['enrolment', 'biometric']))
+
+    pd.testing.assert_frame_equal(sql_backend.district_stats(con, dataset),
+                                  comprehensive._district_stats(df, dataset), check_dtype=False)
+    pd.testing.assert_frame_equal(sql_backend.district_stats(con, dataset, tiers),
+                                  comprehensive._district_stats(df, dataset, tiers), check_dtype=False)
+
+
+def test_revisit_counts_match_pandas(backends):
+    frames, con, _ = backends
+    columns = comprehensive._get_numeric_columns('enrolment')
+    counts = sql_backend.revisit_counts(con, 'enrolment', columns, comprehensive.REENROLMENT_WINDOW_DAYS)
+
+    for col in columns:
+        assert counts[col] == comprehensive._reenrolment_counts(frames['enrolment'], col)
@@ -0,0 +1,62 @@
+import pandas as pd
+import pytest
+
+import uidai_comprehensive_analysis as comprehensive
+
+DATASETS = ['demographic', 'enrolment', 'biometric']
+
+
+def reference_clean(df, data_type):
+    # _clean_dataframe() as it was before cleaning per distinct value
+    if df.empty:
+        return df
+    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    df = comprehensive.apply_district_mapping(df)
+    for col in ['state', 'district']:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip().str.title()
+    if 'pincode' in df.columns:
+        df['pincode'] = df['pincode'].astype(str).str.strip()
+        df = df[df['pincode'].str.match(r'^\d{6}$')]
+    for col in comprehensive._get_numeric_columns(data_type):
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+    df = df.dropna(subset=['date', 'state', 'district'])
+    df = df[~df['state'].isin(['Nan', 'nan', ''])]
+    return df.drop_duplicates()
+
+
+def raw_csv(make_raw, path, dataset, n, seed, clean_pincodes=False):
+    df = make_raw(dataset, n, seed=seed)
+    if clean_pincodes:
+        # All-numeric pincodes are read as integers
+        df = df[df['pincode'].str.fullmatch(r'\d{6}')]
+    df.to_csv(path, index=False)
+    return path
+
+
+@pytest.mark.parametrize("dataset", DATASETS)
+@pytest.mark.parametrize("clean_pincodes", [False, True])
+def test_cleaning_matches_row_wise_reference(make_raw, raw_mapping, tmp_path, dataset, clean_pincodes):
+    path = raw_csv(make_raw, tmp_path / "raw.csv", dataset, 3000, seed=4, clean_pincodes=clean_pincodes)
+
+    result = comprehensive._clean_dataframe(pd.read_csv(path), dataset)
+    expected = reference_clean(pd.read_csv(path), dataset)
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert 0 < len(result) < len(pd.read_csv(path))
+
+
+@pytest.mark.parametrize("chunk_bytes", [4096, 50000])
+def test_parallel_chunked_load_matches_reference(make_raw, raw_mapping, tmp_path, monkeypatch, chunk_bytes):
+    paths = {dataset: raw_csv(make_raw, tmp_path / f"consolidated_{dataset}.csv", dataset, 3000, seed=seed)
+             for seed, dataset in enumerate(DATASETS)}
+    monkeypatch.setattr(comprehensive, '_dataset_path', lambda data_type: str(paths[data_type]))
+
+    frames = comprehensive._load_datasets_parallel(DATASETS, workers=2, chunk_bytes=chunk_bytes)
+
+    for dataset, result in zip(DATASETS, frames):
+        expected = reference_clean(pd.read_csv(paths[dataset]), dataset)
+        # Duplicates spanning chunks are dropped too, keeping the first occurrence
+        pd.testing.assert_frame_equal(result, expected)
+    assert len(comprehensive._csv_chunks(paths['enrolment'], chunk_bytes)[1]) > 1
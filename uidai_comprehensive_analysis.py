@@ -14,13 +14,16 @@ Author: UIDAI Data Hackathon Solution
 ================================================================================
 """
 
+import io
 import os
 import sys
+import argparse
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 import warnings
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 
 # Machine Learning imports
 from sklearn.ensemble import RandomForestClassifier
@@ -31,6 +34,22 @@ from sklearn.metrics import accuracy_score, roc_auc_score, classification_report
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+# Out-of-core SQL backend (optional, needs duckdb)
+import sql_backend
+
+# Lazy aggregation plans
+from query_plan import AggregatePlan
+
+# Per-stage memory profiling and memory budget
+from stage_memory import StageMemoryMonitor, frame_mb
+
+# Canonical district spellings (outputs/district_name_mapping.csv)
+from district_reconciliation import apply_district_mapping, load_district_mapping
+from pincode_index import pincode_values
+
+# Warm aggregates of the local aggregate service (used when UIDAI_AGGREGATE_SERVICE is set)
+from aggregate_client import service_url, query as query_service
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore")
 
@@ -125,10 +144,26 @@ OUTPUT_DIR = "outputs"
 # DATA LOADING AND CLEANING
 # ================================================================================
 
-def load_and_clean_data():
+DATA_TYPES = ["demographic", "enrolment", "biometric"]
+
+# Parallel loading: worker processes (None = one per core) and CSV bytes per chunk
+LOAD_WORKERS = None
+LOAD_CHUNK_BYTES = 32 * 2**20
+
+
+def load_and_clean_data(monitor=None, workers=LOAD_WORKERS):
     """
     Load and clean all CSV chunks for demographic, enrolment, and biometric data.
     
+    The three datasets are split into row chunks that are read and cleaned
+    concurrently in worker processes. With a single worker (or core), or
+    when the monitor records memory (samples must be taken in this
+    process), they are loaded one after the other instead.
+    
+    Args:
+        monitor: Optional StageMemoryMonitor recording the load and clean stages
+        workers: Worker processes (None = one per core)
+    
     Returns:
         tuple: (df_demo, df_enrol, df_bio) - Three cleaned DataFrames
     """
@@ -136,30 +171,12 @@ def load_and_clean_data():
     print("SECTION 1: DATA INGESTION & CLEANING")
     print("=" * 80)
     
-    # Define data paths (consolidated files in filtered_data folder)
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    filtered_dir = os.path.join(base_dir, "filtered_data")
-    
-    # Load Demographic Data
-    print("\n📊 Loading DEMOGRAPHIC data...")
-    demo_path = os.path.join(filtered_dir, "consolidated_demographic.csv")
-    df_demo = pd.read_csv(demo_path)
-    df_demo = _clean_dataframe(df_demo, "demographic")
-    print(f"  ✓ Loaded: consolidated_demographic.csv ({df_demo.shape[0]:,} rows)")
-    
-    # Load Enrolment Data
-    print("\n📊 Loading ENROLMENT data...")
-    enrol_path = os.path.join(filtered_dir, "consolidated_enrolment.csv")
-    df_enrol = pd.read_csv(enrol_path)
-    df_enrol = _clean_dataframe(df_enrol, "enrolment")
-    print(f"  ✓ Loaded: consolidated_enrolment.csv ({df_enrol.shape[0]:,} rows)")
-    
-    # Load Biometric Data
-    print("\n📊 Loading BIOMETRIC data...")
-    bio_path = os.path.join(filtered_dir, "consolidated_biometric.csv")
-    df_bio = pd.read_csv(bio_path)
-    df_bio = _clean_dataframe(df_bio, "biometric")
-    print(f"  ✓ Loaded: consolidated_biometric.csv ({df_bio.shape[0]:,} rows)")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or (monitor is not None and monitor.enabled):
+        frames = [_load_dataset(data_type, monitor) for data_type in DATA_TYPES]
+    else:
+        frames = _load_datasets_parallel(DATA_TYPES, workers)
+    df_demo, df_enrol, df_bio = frames
     
     # Print summary statistics
     _print_data_summary(df_demo, df_enrol, df_bio)
@@ -167,6 +184,111 @@ def load_and_clean_data():
     return df_demo, df_enrol, df_bio
 
 
+def _load_dataset(data_type, monitor=None):
+    """
+    Load and clean one consolidated CSV from the filtered_data folder.
+    
+    Args:
+        data_type: Type of data ("demographic", "enrolment", "biometric")
+        monitor: Optional StageMemoryMonitor recording the load and clean stages
+    
+    Returns:
+        pd.DataFrame: Cleaned dataframe
+    """
+    monitor = monitor or StageMemoryMonitor("comprehensive")
+    filename = f"consolidated_{data_type}.csv"
+    path = _dataset_path(data_type)
+    
+    print(f"\n📊 Loading {data_type.upper()} data...")
+    with monitor.stage("load", data_type, input_mb=os.path.getsize(path) / 2**20):
+        df = pd.read_csv(path)
+    with monitor.stage("clean", data_type, input_mb=frame_mb(df)):
+        df = _clean_dataframe(df, data_type)
+    print(f"  ✓ Loaded: {filename} ({df.shape[0]:,} rows)")
+    return df
+
+
+def _dataset_path(data_type):
+    """Path of a consolidated dataset CSV in the filtered_data folder."""
+    base_dir = os.path.dirname(os.path.abspath(__file__))
+    return os.path.join(base_dir, "filtered_data", f"consolidated_{data_type}.csv")
+
+
+def _load_datasets_parallel(data_types, workers=LOAD_WORKERS, chunk_bytes=LOAD_CHUNK_BYTES):
+    """
+    Read and clean several datasets chunk by chunk in a process pool.
+    
+    Every chunk of every dataset is one task, so all datasets are worked on
+    at once. Workers send back compact parts (surviving row positions, text
+    columns as integer codes into their distinct cleaned values); duplicates
+    across chunks are dropped when a dataset's parts are assembled.
+    
+    Args:
+        data_types: Datasets to load, in the order they are returned
+        workers: Worker processes (None = one per core)
+        chunk_bytes: Approximate CSV bytes per chunk
+    
+    Returns:
+        list: Cleaned dataframes, one per data type
+    """
+    # Build the district mapping here if needed, not once per worker
+    load_district_mapping()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        tasks = {}
+        for data_type in data_types:
+            path = _dataset_path(data_type)
+            header, ranges = _csv_chunks(path, chunk_bytes)
+            tasks[data_type] = [pool.submit(_clean_csv_chunk, data_type, path, header, start, stop)
+                                for start, stop in ranges]
+        
+        frames = []
+        for data_type in data_types:
+            print(f"\n📊 Loading {data_type.upper()} data...")
+            parts = [task.result() for task in tasks[data_type]]
+            df = _assemble_parts(parts) if parts else _clean_dataframe(pd.read_csv(_dataset_path(data_type)), data_type)
+            print(f"  ✓ Loaded: consolidated_{data_type}.csv ({df.shape[0]:,} rows, "
+                  f"{len(parts)} chunk{'s' if len(parts) != 1 else ''})")
+            frames.append(df)
+    return frames
+
+
+def _csv_chunks(path, chunk_bytes=LOAD_CHUNK_BYTES):
+    """
+    Header line and line-aligned byte ranges of a CSV, about chunk_bytes each.
+    
+    Lines are split on newlines, so fields must not contain line breaks
+    (the consolidated CSVs have none).
+    
+    Returns:
+        tuple: (header bytes, [(start, stop), ...])
+    """
+    size = os.path.getsize(path)
+    ranges = []
+    with open(path, 'rb') as f:
+        header = f.readline()
+        start = f.tell()
+        while start < size:
+            stop = start + chunk_bytes
+            if stop >= size:
+                stop = size
+            else:
+                # Extend to the end of the line holding the chunk's last byte
+                f.seek(stop - 1)
+                f.readline()
+                stop = f.tell()
+            ranges.append((start, stop))
+            start = stop
+    return header, ranges
+
+
+def _clean_csv_chunk(data_type, path, header, start, stop):
+    """Worker task: read one byte range of a CSV and clean it into parts."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        data = f.read(stop - start)
+    return _clean_parts(pd.read_csv(io.BytesIO(header + data)), data_type)
+
+
 def _clean_dataframe(df, data_type):
     """
     Clean dataframe: parse dates, convert numerics, remove duplicates/junk.
@@ -180,39 +302,114 @@ def _clean_dataframe(df, data_type):
     """
     if df.empty:
         return df
+    return _assemble_parts([_clean_parts(df, data_type)], df.index)
+
+
+def _clean_parts(df, data_type):
+    """
+    Clean a dataframe (or a chunk of one) into compact parts.
     
-    original_rows = len(df)
+    Dates, state/district names and pincodes are cleaned once per distinct
+    value (factorize) and broadcast back through the integer codes. Rows are
+    filtered with one combined mask and exact duplicates are found on the
+    codes instead of the strings.
     
-    # Parse date column (day-first format: DD-MM-YYYY)
-    df['date'] = pd.to_datetime(df['date'], format='%d-%m-%Y', errors='coerce')
+    Args:
+        df: Input dataframe
+        data_type: Type of data ("demographic", "enrolment", "biometric")
     
-    # Standardize text columns (strip spaces, standardize case)
+    Returns:
+        dict: rows (input rows), positions (of the rows kept), columns
+              ({column: values, or (codes, names) for cleaned text columns}),
+              order (column order)
+    """
+    keep = np.ones(len(df), dtype=bool)
+    values = {}  # cleaned column values (all rows)
+    keys = {}    # integer duplicate keys of the cleaned columns
+    
+    # Parse date column (day-first format: DD-MM-YYYY)
+    codes, uniques = pd.factorize(df['date'])
+    parsed = pd.to_datetime(uniques, format='%d-%m-%Y', errors='coerce').to_numpy()
+    values['date'] = np.append(parsed, np.datetime64('NaT', 'ns'))[codes]
+    keys['date'] = values['date'].view('int64')
+    keep &= ~np.isnat(values['date'])
+    
+    # Canonical district spellings, then standardize text columns (strip spaces, standardize case)
+    df = apply_district_mapping(df)
     for col in ['state', 'district']:
         if col in df.columns:
-            df[col] = df[col].astype(str).str.strip().str.title()
+            codes, names = _clean_names(df[col])
+            values[col], keys[col] = (codes, names), codes
+            if col == 'state':
+                # Remove rows with 'nan' or empty state
+                keep &= ~np.isin(names, ['Nan', 'nan', ''])[codes]
     
-    # Convert pincode to string and validate
+    # Pincode as string; remove rows with invalid pincodes (not 6 digits)
     if 'pincode' in df.columns:
-        df['pincode'] = df['pincode'].astype(str).str.strip()
-        # Remove rows with invalid pincodes (not 6 digits)
-        valid_pincode = df['pincode'].str.match(r'^\d{6}$')
-        df = df[valid_pincode]
+        codes, names = _clean_pincodes(df['pincode'])
+        values['pincode'], keys['pincode'] = (codes, names), codes
+        keep &= codes >= 0
     
     # Convert numeric columns and fill missing with 0
-    numeric_cols = _get_numeric_columns(data_type)
-    for col in numeric_cols:
+    for col in _get_numeric_columns(data_type):
         if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(int)
+            column = df[col]
+            if not pd.api.types.is_integer_dtype(column):
+                column = pd.to_numeric(column, errors='coerce').fillna(0)
+            values[col] = keys[col] = column.to_numpy().astype(int)
+    
+    # Drop exact duplicate rows among the rows kept
+    rows = np.flatnonzero(keep)
+    key_frame = pd.DataFrame({
+        col: (keys[col] if col in keys else df[col].to_numpy())[rows] for col in df.columns
+    })
+    rows = rows[~key_frame.duplicated().to_numpy()]
+    
+    columns = {}
+    for col in df.columns:
+        column = values[col] if col in values else df[col].to_numpy()
+        columns[col] = (column[0][rows].astype(np.int32), column[1]) if isinstance(column, tuple) else column[rows]
+    return {'rows': len(df), 'positions': rows, 'columns': columns, 'order': list(df.columns)}
+
+
+def _assemble_parts(parts, index=None):
+    """
+    Build the cleaned frame from the parts of one dataset.
+    
+    Text codes of the parts are mapped onto one set of names, and exact
+    duplicates across parts are dropped (first occurrence kept).
+    
+    Args:
+        parts: Outputs of _clean_parts(), in row order
+        index: Index of the input rows (single part); defaults to row positions
     
-    # Remove rows with missing essential fields
-    essential_cols = ['date', 'state', 'district']
-    df = df.dropna(subset=essential_cols)
+    Returns:
+        pd.DataFrame: Cleaned dataframe
+    """
+    original_rows = sum(part['rows'] for part in parts)
+    offsets = np.cumsum([0] + [part['rows'] for part in parts[:-1]])
+    positions = np.concatenate([part['positions'] + offset for part, offset in zip(parts, offsets)])
+    
+    values, keys = {}, {}
+    for col in parts[0]['order']:
+        pieces = [part['columns'][col] for part in parts]
+        if isinstance(pieces[0], tuple):
+            # One code per distinct name across the parts
+            all_codes, names = pd.factorize(np.concatenate([piece_names for _, piece_names in pieces]))
+            starts = np.cumsum([0] + [len(piece_names) for _, piece_names in pieces[:-1]])
+            codes = np.concatenate([all_codes[start:start + len(piece_names)][piece_codes]
+                                    for (piece_codes, piece_names), start in zip(pieces, starts)])
+            keys[col], values[col] = codes, np.asarray(names, dtype=object)[codes]
+        else:
+            keys[col] = values[col] = np.concatenate(pieces)
     
-    # Remove rows with 'nan' or empty state
-    df = df[~df['state'].isin(['Nan', 'nan', ''])]
+    # Drop exact duplicate rows across parts
+    if len(parts) > 1:
+        unique = ~pd.DataFrame(keys).duplicated().to_numpy()
+        positions = positions[unique]
+        values = {col: column[unique] for col, column in values.items()}
     
-    # Drop exact duplicate rows
-    df = df.drop_duplicates()
+    df = pd.DataFrame(values, index=pd.Index(positions) if index is None else index[positions])
     
     cleaned_rows = len(df)
     removed = original_rows - cleaned_rows
@@ -221,6 +418,49 @@ def _clean_dataframe(df, data_type):
     return df
 
 
+def _clean_names(column):
+    """
+    Stripped, title-cased text of a name column, computed per distinct value.
+    
+    Missing values become 'Nan' (as astype(str).str.title() would give).
+    
+    Returns:
+        tuple: (codes, names) - names[codes] is the cleaned column; values
+               that clean to the same name share a code
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    cleaned = pd.Index(uniques).astype(str).str.strip().str.title()
+    clean_codes, names = pd.factorize(cleaned)
+    return clean_codes[codes], np.asarray(names, dtype=object)
+
+
+def _clean_pincodes(column):
+    """
+    6-digit pincodes as strings, validated per distinct value.
+    
+    Numeric pincodes are checked arithmetically (integers 100000-999999);
+    text pincodes must be exactly six digits after stripping spaces.
+    
+    Returns:
+        tuple: (codes, names) - names[codes] is the cleaned column; code -1
+               marks an invalid pincode
+    """
+    codes, uniques = pd.factorize(column, use_na_sentinel=False)
+    if pd.api.types.is_numeric_dtype(uniques):
+        numbers = pincode_values(uniques)
+        valid = numbers >= 0
+        text = pd.Index(numbers[valid]).astype(str)
+    else:
+        text = pd.Index(uniques).astype(str).str.strip()
+        valid = np.asarray(text.str.fullmatch(r'\d{6}'), dtype=bool)
+        text = text[valid]
+    
+    text_codes, names = pd.factorize(text)
+    clean_codes = np.full(len(uniques), -1, dtype=np.intp)
+    clean_codes[valid] = text_codes
+    return clean_codes[codes], np.asarray(names, dtype=object)
+
+
 def _get_numeric_columns(data_type):
     """Get numeric column names for each data type."""
     if data_type == "demographic":
@@ -232,6 +472,50 @@ def _get_numeric_columns(data_type):
     return []
 
 
+def _group_totals(df, data_type, keys):
+    """
+    Sum a dataset's count columns per group (pandas counterpart of sql_backend.totals()).
+    
+    Args:
+        df: Cleaned dataframe
+        data_type: Type of data ("demographic", "enrolment", "biometric")
+        keys: Column names and/or named Series to group by
+    
+    Returns:
+        pd.DataFrame: Keys and count column sums, sorted by the keys
+    """
+    totals = df.groupby(keys, observed=True)[_get_numeric_columns(data_type)].sum().reset_index()
+    # Text keys of frames attached by the pipeline runner are categoricals;
+    # the grouped rows are few, so they go back to plain strings here
+    categorical = [col for col in totals.columns if isinstance(totals[col].dtype, pd.CategoricalDtype)]
+    return totals.astype({col: object for col in categorical})
+
+
+def load_service_totals():
+    """
+    Daily per-state count sums of every dataset from the aggregate service.
+    
+    The service holds the consolidated records as loaded (district mapping
+    applied, no deduplication or name cleaning), so its totals can differ
+    slightly from those of the cleaned frames.
+    
+    Returns:
+        dict or None: data_type -> state, date and count column sums; None if
+                      the service is not configured or a query failed
+    """
+    if not service_url():
+        return None
+    try:
+        totals = {data_type: query_service('totals', dataset=data_type, by=['state', 'date'])
+                  for data_type in ("demographic", "enrolment", "biometric")}
+    except (ConnectionError, ValueError) as e:
+        print(f"\n  ⚠️ Aggregate service query failed ({e}); aggregating locally")
+        return None
+    print("\n  ✓ Daily state totals from the aggregate service (lag and backlog stages)")
+    return {data_type: daily[['state', 'date'] + _get_numeric_columns(data_type)]
+            for data_type, daily in totals.items()}
+
+
 def _print_data_summary(df_demo, df_enrol, df_bio):
     """Print summary statistics for all datasets."""
     print("\n" + "-" * 80)
@@ -254,6 +538,45 @@ def _print_data_summary(df_demo, df_enrol, df_bio):
             print(f"  Pincodes: {df['pincode'].nunique()}")
 
 
+def load_data_sql(memory_limit=sql_backend.MEMORY_LIMIT):
+    """
+    Load and clean the consolidated CSVs into the SQL backend instead of pandas.
+    Only aggregates are brought into memory afterwards, so the datasets do not
+    have to fit in RAM.
+    
+    Args:
+        memory_limit: SQL engine memory cap (larger work spills to disk)
+    
+    Returns:
+        Connection with demographic, enrolment and biometric tables
+    """
+    print("\n" + "=" * 80)
+    print("SECTION 1: DATA INGESTION & CLEANING (SQL BACKEND)")
+    print("=" * 80)
+    print(f"\n  Engine memory limit: {memory_limit} (spills to {sql_backend.TEMP_DIR})")
+    
+    con, row_counts = sql_backend.connect(memory_limit=memory_limit)
+    for dataset, (raw_rows, clean_rows) in row_counts.items():
+        print(f"\n📊 Loaded {dataset.upper()} data")
+        print(f"  🧹 Cleaned: {raw_rows - clean_rows:,} rows removed, {clean_rows:,} rows remaining")
+    
+    print("\n" + "-" * 80)
+    print("DATA SUMMARY")
+    print("-" * 80)
+    
+    for name, dataset in [("Demographic", "demographic"), ("Enrolment", "enrolment"), ("Biometric", "biometric")]:
+        summary = sql_backend.dataset_summary(con, dataset)
+        if summary['rows']:
+            print(f"\n{name}:")
+            print(f"  Rows: {summary['rows']:,}")
+            print(f"  Date Range: {summary['start']} to {summary['end']}")
+            print(f"  States: {summary['states']}")
+            print(f"  Districts: {summary['districts']}")
+            print(f"  Pincodes: {summary['pincodes']}")
+    
+    return con
+
+
 # ================================================================================
 # INSIGHT 1: BIOMETRIC DEPLOYMENT LAG & BACKLOG
 # ================================================================================
@@ -271,20 +594,44 @@ def compute_biometric_lag(df_demo, df_bio):
         - biometric_lag_national.csv
         - biometric_lag_by_state.csv
     """
+    demo_state_daily = _group_totals(df_demo, "demographic", ['state', 'date'])
+    bio_state_daily = _group_totals(df_bio, "biometric", ['state', 'date'])
+    _report_biometric_lag(demo_state_daily, bio_state_daily, df_demo['state'].unique())
+
+
+def compute_biometric_lag_sql(con):
+    """compute_biometric_lag() on the SQL backend (states reported in alphabetical order)."""
+    demo_state_daily = sql_backend.totals(con, "demographic", ['state', 'date'])
+    bio_state_daily = sql_backend.totals(con, "biometric", ['state', 'date'])
+    _report_biometric_lag(demo_state_daily, bio_state_daily, demo_state_daily['state'].unique())
+
+
+def compute_biometric_lag_service(totals):
+    """compute_biometric_lag() from load_service_totals() (states reported in alphabetical order)."""
+    demo_state_daily = totals["demographic"].copy()
+    _report_biometric_lag(demo_state_daily, totals["biometric"].copy(), demo_state_daily['state'].unique())
+
+
+def _report_biometric_lag(demo_state_daily, bio_state_daily, states):
+    """
+    Biometric lag analysis from daily per-state totals.
+    
+    Args:
+        demo_state_daily: Demographic count sums per (state, date)
+        bio_state_daily: Biometric count sums per (state, date)
+        states: States to report, in output order
+    """
     print("\n" + "=" * 80)
     print("SECTION 2: BIOMETRIC DEPLOYMENT LAG & BACKLOG ANALYSIS")
     print("=" * 80)
     
-    if df_demo.empty or df_bio.empty:
+    if demo_state_daily.empty or bio_state_daily.empty:
         print("  ⚠️ Cannot compute: Missing demographic or biometric data")
         return
     
     # Create total columns
-    df_demo = df_demo.copy()
-    df_bio = df_bio.copy()
-    
-    df_demo['total_demo'] = df_demo['demo_age_5_17'] + df_demo['demo_age_17_']
-    df_bio['total_bio'] = df_bio['bio_age_5_17'] + df_bio['bio_age_17_']
+    demo_state_daily['total_demo'] = demo_state_daily['demo_age_5_17'] + demo_state_daily['demo_age_17_']
+    bio_state_daily['total_bio'] = bio_state_daily['bio_age_5_17'] + bio_state_daily['bio_age_17_']
     
     # -------------------------------------------------------------------------
     # NATIONAL LEVEL ANALYSIS
@@ -292,8 +639,8 @@ def compute_biometric_lag(df_demo, df_bio):
     print("\n📊 National Level Analysis")
     
     # Daily national totals
-    demo_daily = df_demo.groupby('date')['total_demo'].sum().reset_index()
-    bio_daily = df_bio.groupby('date')['total_bio'].sum().reset_index()
+    demo_daily = demo_state_daily.groupby('date')['total_demo'].sum().reset_index()
+    bio_daily = bio_state_daily.groupby('date')['total_bio'].sum().reset_index()
     
     # Find start dates (first date with data > 0)
     demo_start = demo_daily[demo_daily['total_demo'] > 0]['date'].min()
@@ -380,10 +727,10 @@ def compute_biometric_lag(df_demo, df_bio):
     
     state_metrics = []
     
-    for state in df_demo['state'].unique():
+    for state in states:
         # State-level daily totals
-        state_demo = df_demo[df_demo['state'] == state].groupby('date')['total_demo'].sum().reset_index()
-        state_bio = df_bio[df_bio['state'] == state].groupby('date')['total_bio'].sum().reset_index()
+        state_demo = demo_state_daily.loc[demo_state_daily['state'] == state, ['date', 'total_demo']].reset_index(drop=True)
+        state_bio = bio_state_daily.loc[bio_state_daily['state'] == state, ['date', 'total_bio']].reset_index(drop=True)
         
         if state_demo.empty:
             continue
@@ -479,24 +826,75 @@ def compute_age_cohort_efficiency(df_enrol):
     Saves:
         - age_cohort_efficiency.csv
     """
+    age_cols = _get_numeric_columns("enrolment")
+    totals = df_enrol[age_cols].sum()
+    daily_district = _group_totals(df_enrol, "enrolment", ['date', 'state', 'district'])
+    reenrol_counts = {col: _reenrolment_counts(df_enrol, col) for col in age_cols}
+    _report_age_cohort_efficiency(totals, daily_district, reenrol_counts)
+
+
+def compute_age_cohort_efficiency_sql(con):
+    """compute_age_cohort_efficiency() on the SQL backend."""
+    totals = sql_backend.totals(con, "enrolment").iloc[0]
+    daily_district = sql_backend.totals(con, "enrolment", ['date', 'state', 'district'])
+    reenrol_counts = sql_backend.revisit_counts(con, "enrolment", _get_numeric_columns("enrolment"),
+                                                REENROLMENT_WINDOW_DAYS)
+    _report_age_cohort_efficiency(totals, daily_district, reenrol_counts)
+
+
+def _reenrolment_counts(df, age_col):
+    """
+    Count location-days with enrolments and those within the re-enrolment window.
+    
+    Returns:
+        tuple: (total_records, potential_reenrol)
+    """
+    # Heuristic: For each (state, district, pincode), sort by date
+    # If there are multiple enrolments within window days, flag as potential re-enrolment
+    
+    # Group by location
+    grouped = df.groupby(['state', 'district', 'pincode', 'date'], observed=True)[age_col].sum().reset_index()
+    grouped = grouped.sort_values(['state', 'district', 'pincode', 'date'])
+    
+    total_records = len(grouped[grouped[age_col] > 0])
+    potential_reenrol = 0
+    
+    # Check for repeated enrolments within window
+    for (state, district, pincode), group in grouped.groupby(['state', 'district', 'pincode'], observed=True):
+        if len(group) > 1:
+            dates = group[group[age_col] > 0]['date'].values
+            for i in range(1, len(dates)):
+                if (dates[i] - dates[i-1]).astype('timedelta64[D]').astype(int) <= REENROLMENT_WINDOW_DAYS:
+                    potential_reenrol += 1
+    
+    return total_records, potential_reenrol
+
+
+def _report_age_cohort_efficiency(totals, daily_district, reenrol_counts):
+    """
+    Age cohort analysis from enrolment aggregates.
+    
+    Args:
+        totals: Total per age column
+        daily_district: Age column sums per (date, state, district)
+        reenrol_counts: Age column -> (total_records, potential_reenrol)
+    """
     print("\n" + "=" * 80)
     print("SECTION 3: AGE COHORT EFFICIENCY ANALYSIS")
     print("=" * 80)
     
-    if df_enrol.empty:
+    if daily_district.empty:
         print("  ⚠️ Cannot compute: Missing enrolment data")
         return
     
-    df = df_enrol.copy()
-    
     # -------------------------------------------------------------------------
     # VOLUME ANALYSIS
     # -------------------------------------------------------------------------
     print("\n📊 Volume Analysis")
     
-    total_0_5 = df['age_0_5'].sum()
-    total_5_17 = df['age_5_17'].sum()
-    total_18_plus = df['age_18_greater'].sum()
+    total_0_5 = totals['age_0_5']
+    total_5_17 = totals['age_5_17']
+    total_18_plus = totals['age_18_greater']
     total_all = total_0_5 + total_5_17 + total_18_plus
     
     print(f"  Age 0-5:   {total_0_5:>15,} ({total_0_5/total_all*100:.2f}%)")
@@ -524,13 +922,6 @@ def compute_age_cohort_efficiency(df_enrol):
     # -------------------------------------------------------------------------
     print("\n📊 Variance Metrics (by District-Day)")
     
-    # Daily district-level aggregation
-    daily_district = df.groupby(['date', 'state', 'district']).agg({
-        'age_0_5': 'sum',
-        'age_5_17': 'sum',
-        'age_18_greater': 'sum'
-    }).reset_index()
-    
     # Compute coefficient of variation for each age group
     cv_0_5 = daily_district['age_0_5'].std() / daily_district['age_0_5'].mean() if daily_district['age_0_5'].mean() > 0 else 0
     cv_5_17 = daily_district['age_5_17'].std() / daily_district['age_5_17'].mean() if daily_district['age_5_17'].mean() > 0 else 0
@@ -545,27 +936,10 @@ def compute_age_cohort_efficiency(df_enrol):
     # -------------------------------------------------------------------------
     print(f"\n📊 Re-enrolment Rate Estimation (Window: {REENROLMENT_WINDOW_DAYS} days)")
     
-    # Heuristic: For each (state, district, pincode), sort by date
-    # If there are multiple enrolments within window days, flag as potential re-enrolment
-    
     reenrol_rates = {}
     
     for age_col, age_name in [('age_0_5', '0-5'), ('age_5_17', '5-17'), ('age_18_greater', '18+')]:
-        # Group by location
-        grouped = df.groupby(['state', 'district', 'pincode', 'date'])[age_col].sum().reset_index()
-        grouped = grouped.sort_values(['state', 'district', 'pincode', 'date'])
-        
-        total_records = len(grouped[grouped[age_col] > 0])
-        potential_reenrol = 0
-        
-        # Check for repeated enrolments within window
-        for (state, district, pincode), group in grouped.groupby(['state', 'district', 'pincode']):
-            if len(group) > 1:
-                dates = group[group[age_col] > 0]['date'].values
-                for i in range(1, len(dates)):
-                    if (dates[i] - dates[i-1]).astype('timedelta64[D]').astype(int) <= REENROLMENT_WINDOW_DAYS:
-                        potential_reenrol += 1
-        
+        total_records, potential_reenrol = reenrol_counts[age_col]
         reenrol_rate = potential_reenrol / total_records if total_records > 0 else 0
         reenrol_rates[age_name] = reenrol_rate
         print(f"  {age_name}: {reenrol_rate*100:.2f}% estimated re-enrolment rate")
@@ -651,11 +1025,76 @@ def compute_geographic_efficiency(df_demo, df_enrol, df_bio):
     Saves:
         - geographic_tier_efficiency.csv
     """
+    tiers = _tier_lookup(pd.concat([
+        df[['state', 'district']].drop_duplicates() for df in (df_enrol, df_bio)
+    ]))
+    enrol_stats = _district_stats(df_enrol, "enrolment", tiers)
+    bio_stats = _district_stats(df_bio, "biometric", tiers)
+    _report_geographic_efficiency(enrol_stats, bio_stats)
+
+
+def compute_geographic_efficiency_sql(con):
+    """compute_geographic_efficiency() on the SQL backend."""
+    tiers = _tier_lookup(sql_backend.districts(con, ["enrolment", "biometric"]))
+    enrol_stats = sql_backend.district_stats(con, "enrolment", tiers)
+    bio_stats = sql_backend.district_stats(con, "biometric", tiers)
+    _report_geographic_efficiency(enrol_stats, bio_stats)
+
+
+def _tier_lookup(districts):
+    """
+    Tier of each (state, district) pair.
+    
+    Args:
+        districts: DataFrame with state and district columns
+    
+    Returns:
+        pd.Series: Tier named 'tier', indexed by (state, district)
+    """
+    index = pd.MultiIndex.from_frame(districts[['state', 'district']].drop_duplicates())
+    return pd.Series([_assign_tier(state, district) for state, district in index], index=index, name='tier')
+
+
+def _district_stats(df, data_type, rollup=None):
+    """
+    Per-district sums, record counts and distinct pincodes/days.
+    Pandas counterpart of sql_backend.district_stats().
+    
+    Args:
+        df: Cleaned dataframe
+        data_type: Type of data ("demographic", "enrolment", "biometric")
+        rollup: Optional Series indexed by (state, district) to group districts by
+    
+    Returns:
+        pd.DataFrame: Count column sums, records, pincodes, days per group
+    """
+    if rollup is None:
+        keys = ['state', 'district']
+    else:
+        locations = pd.MultiIndex.from_frame(df[['state', 'district']])
+        keys = pd.Series(rollup.reindex(locations).values, index=df.index, name=rollup.name)
+    
+    grouped = df.groupby(keys, observed=True)
+    stats = grouped[_get_numeric_columns(data_type)].sum()
+    stats['records'] = grouped.size()
+    stats['pincodes'] = grouped['pincode'].nunique()
+    stats['days'] = grouped['date'].nunique()
+    return stats
+
+
+def _report_geographic_efficiency(enrol_stats, bio_stats):
+    """
+    Tier comparison from per-tier enrolment and biometric statistics.
+    
+    Args:
+        enrol_stats: Enrolment district stats rolled up by tier
+        bio_stats: Biometric district stats rolled up by tier
+    """
     print("\n" + "=" * 80)
     print("SECTION 4: GEOGRAPHIC EFFICIENCY (TIER-1 vs TIER-2 vs TIER-3)")
     print("=" * 80)
     
-    if df_enrol.empty:
+    if enrol_stats.empty:
         print("  ⚠️ Cannot compute: Missing enrolment data")
         return
     
@@ -664,19 +1103,8 @@ def compute_geographic_efficiency(df_demo, df_enrol, df_bio):
     # -------------------------------------------------------------------------
     print("\n📊 Assigning geographic tiers...")
     
-    df_enrol = df_enrol.copy()
-    df_enrol['tier'] = df_enrol.apply(lambda x: _assign_tier(x['state'], x['district']), axis=1)
-    
-    if not df_demo.empty:
-        df_demo = df_demo.copy()
-        df_demo['tier'] = df_demo.apply(lambda x: _assign_tier(x['state'], x['district']), axis=1)
-    
-    if not df_bio.empty:
-        df_bio = df_bio.copy()
-        df_bio['tier'] = df_bio.apply(lambda x: _assign_tier(x['state'], x['district']), axis=1)
-    
     # Print tier distribution
-    tier_counts = df_enrol['tier'].value_counts()
+    tier_counts = enrol_stats['records']
     print(f"  Tier-1 records: {tier_counts.get('Tier-1', 0):,}")
     print(f"  Tier-2 records: {tier_counts.get('Tier-2', 0):,}")
     print(f"  Tier-3 records: {tier_counts.get('Tier-3', 0):,}")
@@ -689,15 +1117,14 @@ def compute_geographic_efficiency(df_demo, df_enrol, df_bio):
     tier_results = []
     
     for tier in ['Tier-1', 'Tier-2', 'Tier-3']:
-        tier_enrol = df_enrol[df_enrol['tier'] == tier]
-        
-        if tier_enrol.empty:
+        if tier not in enrol_stats.index:
             continue
+        tier_enrol = enrol_stats.loc[tier]
         
         # Total enrolment volume by age group
-        enrol_0_5 = tier_enrol['age_0_5'].sum()
-        enrol_5_17 = tier_enrol['age_5_17'].sum()
-        enrol_18_plus = tier_enrol['age_18_greater'].sum()
+        enrol_0_5 = tier_enrol['age_0_5']
+        enrol_5_17 = tier_enrol['age_5_17']
+        enrol_18_plus = tier_enrol['age_18_greater']
         total_enrol = enrol_0_5 + enrol_5_17 + enrol_18_plus
         
         # Effort units
@@ -706,18 +1133,17 @@ def compute_geographic_efficiency(df_demo, df_enrol, df_bio):
                        enrol_18_plus * EFFORT_WEIGHT_18_PLUS)
         
         # Number of unique pincodes (proxy for centers)
-        num_pincodes = tier_enrol['pincode'].nunique()
+        num_pincodes = tier_enrol['pincodes']
         
         # Number of days in data
-        num_days = tier_enrol['date'].nunique()
+        num_days = tier_enrol['days']
         
         # Average daily per center
         avg_daily_per_center = total_enrol / (num_days * num_pincodes) if num_days > 0 and num_pincodes > 0 else 0
         
         # Biometric metrics
-        if not df_bio.empty:
-            tier_bio = df_bio[df_bio['tier'] == tier]
-            total_bio = tier_bio['bio_age_5_17'].sum() + tier_bio['bio_age_17_'].sum() if not tier_bio.empty else 0
+        if tier in bio_stats.index:
+            total_bio = bio_stats.loc[tier, 'bio_age_5_17'] + bio_stats.loc[tier, 'bio_age_17_']
         else:
             total_bio = 0
         
@@ -787,11 +1213,46 @@ def build_backlog_prediction_model(df_demo, df_bio, df_enrol):
         - backlog_prediction_features.csv
         - backlog_model_feature_importance.csv
     """
+    demo_weekly = _group_totals(df_demo, "demographic", _week_keys(df_demo))
+    bio_weekly = _group_totals(df_bio, "biometric", _week_keys(df_bio))
+    enrol_weekly = _group_totals(df_enrol, "enrolment", _week_keys(df_enrol))
+    _report_backlog_model(demo_weekly, bio_weekly, enrol_weekly)
+
+
+def build_backlog_prediction_model_sql(con):
+    """build_backlog_prediction_model() on the SQL backend."""
+    keys = ['state', 'year', 'week']
+    demo_weekly = sql_backend.totals(con, "demographic", keys)
+    bio_weekly = sql_backend.totals(con, "biometric", keys)
+    enrol_weekly = sql_backend.totals(con, "enrolment", keys)
+    _report_backlog_model(demo_weekly, bio_weekly, enrol_weekly)
+
+
+def build_backlog_prediction_model_service(totals):
+    """build_backlog_prediction_model() from load_service_totals()."""
+    weekly = {data_type: _group_totals(daily, data_type, _week_keys(daily)) for data_type, daily in totals.items()}
+    _report_backlog_model(weekly["demographic"], weekly["biometric"], weekly["enrolment"])
+
+
+def _week_keys(df):
+    """Grouping keys (state, calendar year, ISO week) of the weekly features."""
+    return [df['state'], df['date'].dt.year.rename('year'), df['date'].dt.isocalendar().week]
+
+
+def _report_backlog_model(demo_weekly, bio_weekly, enrol_weekly):
+    """
+    Backlog risk model from weekly per-state totals.
+    
+    Args:
+        demo_weekly: Demographic count sums per (state, year, week)
+        bio_weekly: Biometric count sums per (state, year, week)
+        enrol_weekly: Enrolment count sums per (state, year, week)
+    """
     print("\n" + "=" * 80)
     print("SECTION 5: PREDICTIVE MODEL - BACKLOG RISK PREDICTION")
     print("=" * 80)
     
-    if df_demo.empty or df_bio.empty:
+    if demo_weekly.empty or bio_weekly.empty:
         print("  ⚠️ Cannot compute: Missing demographic or biometric data")
         return
     
@@ -800,52 +1261,17 @@ def build_backlog_prediction_model(df_demo, df_bio, df_enrol):
     # -------------------------------------------------------------------------
     print("\n📊 Preparing weekly aggregated features...")
     
-    df_demo = df_demo.copy()
-    df_bio = df_bio.copy()
-    df_enrol = df_enrol.copy()
-    
     # Add totals
-    df_demo['total_demo'] = df_demo['demo_age_5_17'] + df_demo['demo_age_17_']
-    df_bio['total_bio'] = df_bio['bio_age_5_17'] + df_bio['bio_age_17_']
-    
-    if not df_enrol.empty:
-        df_enrol['total_enrol'] = df_enrol['age_0_5'] + df_enrol['age_5_17'] + df_enrol['age_18_greater']
-    
-    # Add week column
-    df_demo['week'] = df_demo['date'].dt.isocalendar().week
-    df_demo['year'] = df_demo['date'].dt.year
-    df_bio['week'] = df_bio['date'].dt.isocalendar().week
-    df_bio['year'] = df_bio['date'].dt.year
-    
-    if not df_enrol.empty:
-        df_enrol['week'] = df_enrol['date'].dt.isocalendar().week
-        df_enrol['year'] = df_enrol['date'].dt.year
-    
-    # Aggregate by state and week
-    demo_weekly = df_demo.groupby(['state', 'year', 'week']).agg({
-        'total_demo': 'sum',
-        'demo_age_5_17': 'sum',
-        'demo_age_17_': 'sum'
-    }).reset_index()
-    
-    bio_weekly = df_bio.groupby(['state', 'year', 'week']).agg({
-        'total_bio': 'sum',
-        'bio_age_5_17': 'sum',
-        'bio_age_17_': 'sum'
-    }).reset_index()
+    demo_weekly['total_demo'] = demo_weekly['demo_age_5_17'] + demo_weekly['demo_age_17_']
+    bio_weekly['total_bio'] = bio_weekly['bio_age_5_17'] + bio_weekly['bio_age_17_']
     
     # Merge demo and bio
     weekly = pd.merge(demo_weekly, bio_weekly, on=['state', 'year', 'week'], how='outer')
     weekly = weekly.fillna(0)
     
     # Merge enrolment if available
-    if not df_enrol.empty:
-        enrol_weekly = df_enrol.groupby(['state', 'year', 'week']).agg({
-            'total_enrol': 'sum',
-            'age_0_5': 'sum',
-            'age_5_17': 'sum',
-            'age_18_greater': 'sum'
-        }).reset_index()
+    if not enrol_weekly.empty:
+        enrol_weekly['total_enrol'] = enrol_weekly['age_0_5'] + enrol_weekly['age_5_17'] + enrol_weekly['age_18_greater']
         weekly = pd.merge(weekly, enrol_weekly, on=['state', 'year', 'week'], how='outer')
         weekly = weekly.fillna(0)
     else:
@@ -993,13 +1419,162 @@ def build_backlog_prediction_model(df_demo, df_bio, df_enrol):
     print(f"  💾 Saved: {importance_path}")
 
 
+# ================================================================================
+# LAZY PLAN EXECUTION
+# ================================================================================
+
+def _tier_keys(districts):
+    """Tier of each row of a (state, district) frame (derived key of the lazy plan)."""
+    locations = pd.MultiIndex.from_frame(districts[['state', 'district']])
+    return _tier_lookup(districts).reindex(locations).values
+
+
+def run_report_plan(monitor=None):
+    """
+    Run sections 2-5 as one optimized lazy plan.
+    
+    Every aggregate the sections need is declared up front; the plan shares
+    identical aggregates, rolls coarse ones (weekly, per tier, totals) up
+    from finer ones, and makes a single record-level pass per dataset.
+    Each dataset is loaded only when the plan reaches it and released right
+    after its pass. States in the lag report come out in alphabetical order.
+    
+    Args:
+        monitor: Optional StageMemoryMonitor (records loads and report sections)
+    """
+    monitor = monitor or StageMemoryMonitor("comprehensive")
+    print("\n" + "=" * 80)
+    print("SECTION 1: DATA INGESTION & CLEANING (LAZY PLAN)")
+    print("=" * 80)
+    
+    demo_cols = _get_numeric_columns("demographic")
+    enrol_cols = _get_numeric_columns("enrolment")
+    bio_cols = _get_numeric_columns("biometric")
+    week_keys = ['state', 'year', 'week']
+    tier_measures = {'size': True, 'nunique': {'pincodes': 'pincode', 'days': 'date'}}
+    
+    plan = AggregatePlan()
+    plan.derive('year', ['date'], lambda f: f['date'].dt.year)
+    plan.derive('week', ['date'], lambda f: f['date'].dt.isocalendar().week)
+    plan.derive('tier', ['state', 'district'], _tier_keys)
+    
+    demo_daily = plan.aggregate("demographic", ['state', 'date'], demo_cols)
+    bio_daily = plan.aggregate("biometric", ['state', 'date'], bio_cols)
+    enrol_totals = plan.aggregate("enrolment", [], enrol_cols)
+    enrol_district_daily = plan.aggregate("enrolment", ['date', 'state', 'district'], enrol_cols)
+    enrol_locations = plan.aggregate("enrolment", ['state', 'district', 'pincode', 'date'], enrol_cols)
+    enrol_tiers = plan.aggregate("enrolment", ['tier'], enrol_cols, **tier_measures)
+    bio_tiers = plan.aggregate("biometric", ['tier'], bio_cols, **tier_measures)
+    demo_weekly = plan.aggregate("demographic", week_keys, demo_cols)
+    bio_weekly = plan.aggregate("biometric", week_keys, bio_cols)
+    enrol_weekly = plan.aggregate("enrolment", week_keys, enrol_cols)
+    
+    print("\n🧭 Optimized plan:")
+    for line in plan.explain():
+        print(f"  {line}")
+    
+    results = plan.execute({
+        data_type: (lambda data_type=data_type: _load_dataset(data_type, monitor))
+        for data_type in ("demographic", "enrolment", "biometric")
+    })
+    print(f"\n  Record-level passes: {plan.scan_passes} | Rollups: {plan.rollups}")
+    
+    lag_demo = results[demo_daily]
+    with monitor.stage("lag", mode="lazy"):
+        _report_biometric_lag(lag_demo, results[bio_daily], lag_demo['state'].unique())
+    
+    locations = results[enrol_locations]
+    with monitor.stage("cohort", mode="lazy"):
+        _report_age_cohort_efficiency(
+            results[enrol_totals].iloc[0],
+            results[enrol_district_daily],
+            {col: _reenrolment_counts(locations, col) for col in enrol_cols}
+        )
+    
+    with monitor.stage("tier", mode="lazy"):
+        _report_geographic_efficiency(results[enrol_tiers].set_index('tier'), results[bio_tiers].set_index('tier'))
+    
+    with monitor.stage("model", mode="lazy"):
+        _report_backlog_model(results[demo_weekly], results[bio_weekly], results[enrol_weekly])
+
+
+# ================================================================================
+# MEMORY BUDGET
+# ================================================================================
+
+def _out_of_core_available():
+    """True if the SQL backend can take over stages that exceed the memory budget."""
+    if sql_backend.duckdb is None:
+        print("\n  ⚠️ Memory budget exceeded but duckdb is not installed; running in memory")
+        return False
+    return True
+
+
+class _OutOfCoreFallback:
+    """SQL backend connection, opened the first time a stage exceeds the memory budget."""
+    
+    def __init__(self, memory_limit):
+        self.memory_limit = memory_limit
+        self.con = None
+    
+    def connection(self):
+        if self.con is None:
+            print(f"\n🗄️  Loading the datasets into the SQL backend (memory limit {self.memory_limit})...")
+            self.con, _ = sql_backend.connect(memory_limit=self.memory_limit)
+        return self.con
+    
+    def close(self):
+        if self.con is not None:
+            self.con.close()
+            self.con = None
+
+
+def _run_stage(monitor, name, frames, compute, compute_sql, fallback):
+    """
+    Run one analysis stage under the memory monitor.
+    
+    If the stage's estimated peak does not fit the memory budget, its SQL
+    variant runs on the out-of-core backend instead of the in-memory frames.
+    
+    Args:
+        monitor: StageMemoryMonitor
+        name: Stage name (lag, cohort, tier, model)
+        frames: Input DataFrames, passed to compute in order
+        compute: In-memory implementation
+        compute_sql: SQL backend implementation (takes the connection)
+        fallback: _OutOfCoreFallback providing the connection
+    """
+    input_mb = frame_mb(*frames)
+    if monitor.exceeds_budget(name, input_mb) and _out_of_core_available():
+        con = fallback.connection()
+        with monitor.stage(name, mode="out-of-core"):
+            compute_sql(con)
+    else:
+        with monitor.stage(name, input_mb=input_mb):
+            compute(*frames)
+
+
 # ================================================================================
 # MAIN EXECUTION
 # ================================================================================
 
-def main():
+def main(backend="pandas", memory_limit=sql_backend.MEMORY_LIMIT, lazy=False,
+         profile_memory=False, memory_budget_mb=None, load_workers=LOAD_WORKERS):
     """
     Main execution function - runs all analysis components.
+    
+    Args:
+        backend: "pandas" (in memory) or "duckdb" (out-of-core SQL aggregation)
+        memory_limit: SQL engine memory cap for the duckdb backend
+        lazy: Run the pandas backend as one optimized lazy plan (run_report_plan())
+        profile_memory: Record peak memory, copies and largest frames per stage
+        memory_budget_mb: Memory budget in MB; stages expected to exceed it
+                          run out-of-core on the SQL backend
+        load_workers: Processes loading and cleaning the datasets (None = one per core)
+    
+    With the aggregate service configured (UIDAI_AGGREGATE_SERVICE), the pandas
+    backend reads the lag and backlog totals from it; the other stages need
+    record-level data and still run on the loaded frames.
     """
     print("\n" + "=" * 80)
     print("╔════════════════════════════════════════════════════════════════════════════╗")
@@ -1015,30 +1590,73 @@ def main():
     os.makedirs(OUTPUT_DIR, exist_ok=True)
     print(f"\n📁 Output directory: {os.path.abspath(OUTPUT_DIR)}")
     
-    # -------------------------------------------------------------------------
-    # STEP 1: Load and Clean Data
-    # -------------------------------------------------------------------------
-    df_demo, df_enrol, df_bio = load_and_clean_data()
-    
-    # -------------------------------------------------------------------------
-    # STEP 2: Biometric Lag Analysis
-    # -------------------------------------------------------------------------
-    compute_biometric_lag(df_demo, df_bio)
-    
-    # -------------------------------------------------------------------------
-    # STEP 3: Age Cohort Efficiency
-    # -------------------------------------------------------------------------
-    compute_age_cohort_efficiency(df_enrol)
-    
-    # -------------------------------------------------------------------------
-    # STEP 4: Geographic Tier Efficiency
-    # -------------------------------------------------------------------------
-    compute_geographic_efficiency(df_demo, df_enrol, df_bio)
+    monitor = StageMemoryMonitor("comprehensive", enabled=profile_memory, budget_mb=memory_budget_mb)
+    
+    # Datasets that would not fit the budget once loaded go out-of-core as a whole
+    if backend == "pandas" and not lazy:
+        csv_mb = sum(os.path.getsize(_dataset_path(d)) for d in sql_backend.DATASETS) / 2**20
+        if monitor.exceeds_budget("load", csv_mb) and _out_of_core_available():
+            backend = "duckdb"
+    
+    if backend == "duckdb":
+        # Same steps, with the aggregations run by the SQL engine
+        with monitor.stage("load", mode="out-of-core"):
+            con = load_data_sql(memory_limit)
+        with monitor.stage("lag", mode="out-of-core"):
+            compute_biometric_lag_sql(con)
+        with monitor.stage("cohort", mode="out-of-core"):
+            compute_age_cohort_efficiency_sql(con)
+        with monitor.stage("tier", mode="out-of-core"):
+            compute_geographic_efficiency_sql(con)
+        with monitor.stage("model", mode="out-of-core"):
+            build_backlog_prediction_model_sql(con)
+        con.close()
+    elif lazy:
+        run_report_plan(monitor)
+    else:
+        fallback = _OutOfCoreFallback(memory_limit)
+        service_totals = load_service_totals()
+        
+        # ---------------------------------------------------------------------
+        # STEP 1: Load and Clean Data
+        # ---------------------------------------------------------------------
+        df_demo, df_enrol, df_bio = load_and_clean_data(monitor, workers=load_workers)
+        
+        # ---------------------------------------------------------------------
+        # STEP 2: Biometric Lag Analysis
+        # ---------------------------------------------------------------------
+        if service_totals is not None:
+            with monitor.stage("lag", mode="service"):
+                compute_biometric_lag_service(service_totals)
+        else:
+            _run_stage(monitor, "lag", [df_demo, df_bio],
+                       compute_biometric_lag, compute_biometric_lag_sql, fallback)
+        
+        # ---------------------------------------------------------------------
+        # STEP 3: Age Cohort Efficiency
+        # ---------------------------------------------------------------------
+        _run_stage(monitor, "cohort", [df_enrol],
+                   compute_age_cohort_efficiency, compute_age_cohort_efficiency_sql, fallback)
+        
+        # ---------------------------------------------------------------------
+        # STEP 4: Geographic Tier Efficiency
+        # ---------------------------------------------------------------------
+        _run_stage(monitor, "tier", [df_demo, df_enrol, df_bio],
+                   compute_geographic_efficiency, compute_geographic_efficiency_sql, fallback)
+        
+        # ---------------------------------------------------------------------
+        # STEP 5: Predictive Model
+        # ---------------------------------------------------------------------
+        if service_totals is not None:
+            with monitor.stage("model", mode="service"):
+                build_backlog_prediction_model_service(service_totals)
+        else:
+            _run_stage(monitor, "model", [df_demo, df_bio, df_enrol],
+                       build_backlog_prediction_model, build_backlog_prediction_model_sql, fallback)
+        fallback.close()
     
-    # -------------------------------------------------------------------------
-    # STEP 5: Predictive Model
-    # -------------------------------------------------------------------------
-    build_backlog_prediction_model(df_demo, df_bio, df_enrol)
+    if monitor.enabled:
+        monitor.print_report(monitor.finish())
     
     # -------------------------------------------------------------------------
     # COMPLETION SUMMARY
@@ -1085,4 +1703,31 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="UIDAI comprehensive analysis")
+    parser.add_argument("--backend", choices=["pandas", "duckdb"], default="pandas",
+                        help="duckdb: aggregate out-of-core with the embedded SQL engine "
+                             "instead of loading the datasets into pandas")
+    parser.add_argument("--memory-limit", default=sql_backend.MEMORY_LIMIT,
+                        help="SQL engine memory cap, e.g. 2GB (duckdb backend)")
+    parser.add_argument("--lazy", action="store_true",
+                        help="run the report as one optimized lazy aggregation plan "
+                             "(one pass over each dataset, pandas backend)")
+    parser.add_argument("--profile-memory", action="store_true",
+                        help="record peak memory, copies and largest frames per stage "
+                             "(appended to outputs/stage_memory_profile.csv)")
+    parser.add_argument("--memory-budget", type=float, metavar="MB",
+                        help="memory budget; stages expected to exceed it run out-of-core "
+                             "on the SQL backend")
+    parser.add_argument("--load-workers", type=int, metavar="N", default=LOAD_WORKERS,
+                        help="processes loading and cleaning the datasets in chunks "
+                             "(default: one per core; 1 loads them one after the other)")
+    args = parser.parse_args()
+    if args.backend == "duckdb" and sql_backend.duckdb is None:
+        raise SystemExit("[ERROR] --backend duckdb needs duckdb (pip install duckdb)")
+    if args.lazy and args.backend != "pandas":
+        raise SystemExit("[ERROR] --lazy runs on the pandas backend")
+    if args.load_workers is not None and args.load_workers < 1:
+        raise SystemExit("[ERROR] --load-workers must be at least 1")
+    main(backend=args.backend, memory_limit=args.memory_limit, lazy=args.lazy,
+         profile_memory=args.profile_memory, memory_budget_mb=args.memory_budget,
+         load_workers=args.load_workers)